@@ -0,0 +1,26 @@
+"""Container for patterns drafted for many subjects at once."""
+
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+@dataclass
+class PatternBatch:
+    """Construction and helper points for N subjects.
+
+    Every point is stored as an (N, 2) array whose row i belongs to subject i.
+    """
+    points: dict[str, NDArray[np.float64]]
+    helper_points: dict[str, NDArray[np.float64]]
+
+    def __len__(self) -> int:
+        return next(iter(self.points.values())).shape[0]
+
+    def subject(self, i: int) -> tuple[dict[str, NDArray[np.float64]], dict[str, NDArray[np.float64]]]:
+        """Return the (points, helper_points) dicts of a single subject."""
+        return (
+            {name: p[i].copy() for name, p in self.points.items()},
+            {name: p[i].copy() for name, p in self.helper_points.items()},
+        )
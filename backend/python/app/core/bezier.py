@@ -0,0 +1,129 @@
+"""Metrics of cubic Bezier segments, vectorized over many segments.
+
+Segments are given as control points of shape (..., 4, 2): a single segment
+is (4, 2), a curve of K segments (K, 4, 2), a batch of N curves (N, K, 4, 2).
+Curve parameters t broadcast against the leading dimensions, so t can be a
+scalar, one value per segment, or any compatible array.
+
+Arc length uses Gauss-Legendre quadrature of the speed |B'(t)|, which is
+smooth on pattern curves; 16 nodes on 2 sub-intervals are accurate to well
+below 1e-6 cm for any segment that does not have a cusp.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from app.core.roots import illinois
+
+
+@lru_cache(maxsize=None)
+def _gauss_legendre(order: int, intervals: int) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """Composite Gauss-Legendre nodes and weights on [0, 1]."""
+    x, w = np.polynomial.legendre.leggauss(order)
+    starts = np.arange(intervals) / intervals
+    nodes = (starts[:, None] + (x + 1) / (2 * intervals)).ravel()
+    weights = np.tile(w / (2 * intervals), intervals)
+    return nodes, weights
+
+
+def _param(t: ArrayLike) -> NDArray[np.float64]:
+    return np.asarray(t, dtype=float)
+
+
+def point(ctrl: ArrayLike, t: ArrayLike) -> NDArray[np.float64]:
+    """Point B(t) of each segment; shape (..., 2)."""
+    t = _param(t)[..., None]
+    s = 1 - t
+    basis = np.concatenate([s**3, 3 * s * s * t, 3 * s * t * t, t**3], axis=-1)
+    return np.einsum('...k,...kd->...d', basis, np.asarray(ctrl, dtype=float))
+
+
+def derivative(ctrl: ArrayLike, t: ArrayLike) -> NDArray[np.float64]:
+    """First derivative B'(t) of each segment; shape (..., 2)."""
+    ctrl = np.asarray(ctrl, dtype=float)
+    d = 3 * np.diff(ctrl, axis=-2)
+    t = _param(t)[..., None]
+    s = 1 - t
+    basis = np.concatenate([s * s, 2 * s * t, t * t], axis=-1)
+    return np.einsum('...k,...kd->...d', basis, d)
+
+
+def second_derivative(ctrl: ArrayLike, t: ArrayLike) -> NDArray[np.float64]:
+    """Second derivative B''(t) of each segment; shape (..., 2)."""
+    ctrl = np.asarray(ctrl, dtype=float)
+    dd = 6 * np.diff(ctrl, n=2, axis=-2)
+    t = _param(t)[..., None]
+    return dd[..., 0, :] * (1 - t) + dd[..., 1, :] * t
+
+
+def tangent(ctrl: ArrayLike, t: ArrayLike) -> NDArray[np.float64]:
+    """Unit tangent at t (zero where the curve is stationary); shape (..., 2)."""
+    d = derivative(ctrl, t)
+    norm = np.linalg.norm(d, axis=-1, keepdims=True)
+    return np.divide(d, norm, out=np.zeros_like(d), where=norm > 0)
+
+
+def curvature(ctrl: ArrayLike, t: ArrayLike) -> NDArray[np.float64]:
+    """Signed curvature at t (positive when turning counter-clockwise); shape (...)."""
+    d = derivative(ctrl, t)
+    dd = second_derivative(ctrl, t)
+    cross = d[..., 0] * dd[..., 1] - d[..., 1] * dd[..., 0]
+    speed = np.linalg.norm(d, axis=-1)
+    return np.divide(cross, speed**3, out=np.zeros_like(cross), where=speed > 0)
+
+
+def arc_length(ctrl: ArrayLike, t: ArrayLike = 1.0, *, order: int = 16, intervals: int = 2) -> NDArray[np.float64]:
+    """Length of each segment from parameter 0 to t; shape (...).
+
+    Args:
+        ctrl: Control points (..., 4, 2).
+        t: End parameter(s), broadcast against the leading dimensions.
+        order: Gauss-Legendre nodes per sub-interval.
+        intervals: Number of equal sub-intervals of [0, t].
+    """
+    ctrl = np.asarray(ctrl, dtype=float)
+    nodes, weights = _gauss_legendre(order, intervals)
+    t = _param(t)[..., None]
+    speed = np.linalg.norm(derivative(ctrl[..., None, :, :], t * nodes), axis=-1)
+    return t[..., 0] * (speed @ weights)
+
+
+def param_at_length(ctrl: ArrayLike, s: ArrayLike, *, xtol: float = 1e-10) -> NDArray[np.float64]:
+    """Parameter t at which each segment has arc length s from its start; shape (...).
+
+    s is clipped to [0, segment length].
+    """
+    ctrl = np.asarray(ctrl, dtype=float)
+    total = arc_length(ctrl)
+    s = np.clip(np.broadcast_to(_param(s), total.shape), 0, total)
+    result = illinois(lambda t: arc_length(ctrl, t) - s, 0.0, 1.0, xtol=xtol, fa=-s, fb=total - s)
+    return np.asarray(result.root, dtype=float).reshape(total.shape)
+
+
+def _derivative_roots(ctrl: NDArray[np.float64]) -> NDArray[np.float64]:
+    """Parameters in [0, 1] where B'(t) vanishes per axis; shape (..., 4), unused entries 0."""
+    p0, p1, p2, p3 = (ctrl[..., i, :] for i in range(4))
+    a = -p0 + 3 * p1 - 3 * p2 + p3
+    b = 2 * (p0 - 2 * p1 + p2)
+    c = p1 - p0
+    disc = b * b - 4 * a * c
+    sq = np.sqrt(np.maximum(disc, 0))
+    quadratic = np.abs(a) > 1e-12
+    safe_a = np.where(quadratic, a, 1)
+    safe_b = np.where(np.abs(b) > 1e-12, b, 1)
+    r1 = np.where(quadratic, (-b + sq) / (2 * safe_a), -c / safe_b)
+    r2 = np.where(quadratic, (-b - sq) / (2 * safe_a), -c / safe_b)
+    roots = np.concatenate([r1, r2], axis=-1)
+    valid = np.concatenate([disc >= 0, disc >= 0], axis=-1) & (roots >= 0) & (roots <= 1)
+    return np.where(valid, roots, 0.0)
+
+
+def bounding_box(ctrl: ArrayLike) -> NDArray[np.float64]:
+    """Exact axis-aligned bounding box of each segment; shape (..., 2, 2) as [min_xy, max_xy]."""
+    ctrl = np.asarray(ctrl, dtype=float)
+    lead = ctrl.shape[:-2]
+    candidates = np.concatenate([np.zeros(lead + (1,)), np.ones(lead + (1,)), _derivative_roots(ctrl)], axis=-1)
+    pts = point(ctrl[..., None, :, :], candidates)
+    return np.stack([pts.min(axis=-2), pts.max(axis=-2)], axis=-2)
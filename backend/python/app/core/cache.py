@@ -0,0 +1,102 @@
+"""Bounded in-process LRU cache with byte accounting.
+
+Used to keep finished pattern artifacts (SVG/PDF bytes) in memory so that
+identical generate requests do not redraft and rerender the pattern.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Hashable
+
+
+@dataclass
+class CacheStats:
+    """Snapshot of cache counters."""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    size_bytes: int = 0
+    max_bytes: int = 0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class LRUCache:
+    """Least-recently-used cache bounded by the total size of its values.
+
+    Thread-safe: FastAPI runs sync endpoints in a threadpool, so every access
+    goes through a single lock.
+    """
+
+    def __init__(self, max_bytes: int, sizeof: Callable[[Any], int] = len):
+        """Initialize the cache.
+
+        Args:
+            max_bytes: Upper bound on the summed size of cached values.
+                       Values larger than this are never stored.
+            sizeof: Function returning the size in bytes of a value.
+        """
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._data: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the value for key and mark it as most recently used."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self._misses += 1
+                return default
+            self._data.move_to_end(key)
+            self._hits += 1
+            return item[0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting least recently used entries to fit."""
+        size = self._sizeof(value)
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._size -= old[1]
+            if size > self.max_bytes:
+                return
+            self._data[key] = (value, size)
+            self._size += size
+            while self._size > self.max_bytes:
+                _, (_, evicted_size) = self._data.popitem(last=False)
+                self._size -= evicted_size
+                self._evictions += 1
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._data.clear()
+            self._size = 0
+
+    def stats(self) -> CacheStats:
+        """Return a snapshot of the hit/miss/eviction counters and size."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._data),
+                size_bytes=self._size,
+                max_bytes=self.max_bytes,
+            )
@@ -0,0 +1,187 @@
+"""Response compression middleware: brotli when available, else gzip.
+
+Pattern responses are SVG text and JSON holding SVG, which compress several
+times over. The middleware picks brotli when the client accepts it and the
+optional `brotli` package is installed, and gzip otherwise. Responses that
+are already compressed (PDF, images, archives), already encoded, partial or
+smaller than minimum_size are sent as they are.
+
+Streamed responses (NDJSON garment pieces) are compressed as they go, each
+chunk flushed so the client can decode it on arrival. The ETag of a
+compressed response (and of a 304 to a client accepting compression) is
+made weak: the encoded bytes differ from the ones the strong ETag names,
+and caches must not serve one encoding for the other as byte-identical.
+If-None-Match matching in the routers ignores the W/ prefix.
+"""
+
+import zlib
+
+try:
+    import brotli
+except ImportError:  # optional dependency; brotlicffi has the same API
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+# Other modules named brotli (old bindings) lack the streaming compressor
+if brotli is not None and not (hasattr(brotli, "Compressor") and hasattr(brotli, "MODE_TEXT")):
+    brotli = None
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Media types (or whole top-level types, as "video/*") never compressed:
+# formats compressed already. SVG is text and is compressed.
+EXCLUDED_MEDIA_TYPES = frozenset({
+    "application/pdf",
+    "application/zip",
+    "application/gzip",
+    "image/png",
+    "image/jpeg",
+    "image/gif",
+    "image/webp",
+    "font/woff2",
+    "audio/*",
+    "video/*",
+})
+
+
+def accepted_encodings(accept_encoding: str) -> set[str]:
+    """Content codings an Accept-Encoding header accepts (q > 0), lower-cased."""
+    accepted = set()
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding.strip() and q > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def _weaken_etag(headers: MutableHeaders) -> None:
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = "W/" + etag
+
+
+class _Gzip:
+    encoding = "gzip"
+
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, body: bytes, more_body: bool) -> bytes:
+        data = self._compressor.compress(body)
+        return data + self._compressor.flush(zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH)
+
+
+class _Brotli:
+    encoding = "br"
+
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(mode=brotli.MODE_TEXT, quality=quality)
+
+    def compress(self, body: bytes, more_body: bool) -> bytes:
+        data = self._compressor.process(body)
+        return data + (self._compressor.flush() if more_body else self._compressor.finish())
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing HTTP responses with brotli or gzip."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 500,
+        gzip_level: int = 6,
+        brotli_quality: int = 5,
+        exclude_media_types: frozenset[str] = EXCLUDED_MEDIA_TYPES,
+    ):
+        """Initialize the middleware.
+
+        Args:
+            app: The wrapped application.
+            minimum_size: Smallest complete body (bytes) worth compressing.
+            gzip_level: zlib compression level (1-9).
+            brotli_quality: brotli quality (0-11); 5 takes under a
+                            millisecond on a pattern SVG and comes out about
+                            10% smaller than gzip; 11 is ~50x slower.
+            exclude_media_types: Media types sent uncompressed.
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.exclude_media_types = exclude_media_types
+
+    def _codec(self, scope: Scope):
+        accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        if brotli is not None and "br" in accepted:
+            return _Brotli(self.brotli_quality)
+        if "gzip" in accepted:
+            return _Gzip(self.gzip_level)
+        return None
+
+    def _excluded(self, headers: Headers) -> bool:
+        media_type = headers.get("content-type", "").partition(";")[0].strip().lower()
+        return media_type in self.exclude_media_types or media_type.partition("/")[0] + "/*" in self.exclude_media_types
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        codec = self._codec(scope) if scope["type"] == "http" else None
+        if codec is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Message | None = None
+        # None until the first body message decides; then whether to compress
+        compressing: bool | None = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, compressing
+            if message["type"] == "http.response.start":
+                start = message
+                headers = Headers(raw=message["headers"])
+                if "content-encoding" in headers or message["status"] == 206 or self._excluded(headers):
+                    compressing = False
+                    await send(message)
+                elif message["status"] == 304:
+                    compressing = False
+                    _weaken_etag(MutableHeaders(raw=message["headers"]))
+                    await send(message)
+                return
+            if message["type"] != "http.response.body" or compressing is False:
+                if start is not None and compressing is None:
+                    compressing = False
+                    await send(start)
+                await send(message)
+                return
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressing is None:
+                compressing = more_body or len(body) >= self.minimum_size
+                headers = MutableHeaders(raw=start["headers"])
+                headers.add_vary_header("Accept-Encoding")
+                if compressing:
+                    headers["Content-Encoding"] = codec.encoding
+                    _weaken_etag(headers)
+                    if "content-length" in headers:
+                        del headers["Content-Length"]
+                if compressing and not more_body:
+                    body = codec.compress(body, False)
+                    headers["Content-Length"] = str(len(body))
+                    await send(start)
+                    await send({**message, "body": body})
+                    return
+                await send(start)
+                if not compressing:
+                    await send(message)
+                    return
+            await send({**message, "body": codec.compress(body, more_body)})
+
+        await self.app(scope, receive, send_compressed)
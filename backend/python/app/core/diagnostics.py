@@ -0,0 +1,41 @@
+"""Context-local channel for drafting and rendering diagnostics.
+
+Checks such as Bezier validation call report(). Inside a collect() block the
+message goes to that block's list; the sink lives in a ContextVar, so
+concurrent generations in different threads (or asyncio tasks) each see only
+their own diagnostics. Outside any collector, report() falls back to a
+UserWarning so scripts and the CLI still see the message.
+
+Unlike warnings.catch_warnings, nothing here touches process-global state.
+"""
+
+import warnings
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+_sink: ContextVar[list[str] | None] = ContextVar("diagnostics_sink", default=None)
+
+
+def report(message: str) -> None:
+    """Report a diagnostic to the active collector, or warn if there is none."""
+    sink = _sink.get()
+    if sink is None:
+        warnings.warn(message, UserWarning, stacklevel=2)
+    else:
+        sink.append(message)
+
+
+@contextmanager
+def collect() -> Iterator[list[str]]:
+    """Collect the diagnostics reported inside the block into a list.
+
+    Collectors nest: an inner block captures its own reports, which the outer
+    block does not see unless they are reported again.
+    """
+    sink: list[str] = []
+    token = _sink.set(sink)
+    try:
+        yield sink
+    finally:
+        _sink.reset(token)
@@ -0,0 +1,145 @@
+"""Renderer-agnostic display list for pattern drawings.
+
+A pattern is plotted once into a DisplayList, which records every drawing
+primitive (same API as SVGRenderer and PDFRenderer) tagged with a layer.
+The recording is then replayed into any number of renderers; the
+construction sheet and the printable pattern are layer filters over the
+same recording.
+
+Storage is array-backed: one int32 row per primitive (kind, layer, params,
+first and last coordinate index) and one float64 (P, 2) coordinate table.
+Styles and text parameters are interned in a small side table.
+"""
+
+from contextlib import contextmanager
+
+import numpy as np
+from numpy.typing import NDArray
+
+LINE, POLYLINE, BEZIER, CIRCLE, TEXT = range(5)
+
+# guides:   construction lines (rectangles, levels, helper verticals)
+# outline:  the stitch lines of each piece
+# cut:      the cutting lines, at the seam allowance around the stitch lines
+# points:   point markers and their labels
+# measures: construction-only annotations (control lengths, ...)
+# labels:   piece names and the scale bar
+LAYERS = ("guides", "outline", "cut", "points", "measures", "labels")
+
+VARIANT_LAYERS = {
+    "construction": frozenset(LAYERS),
+    "pattern": frozenset({"outline", "cut", "labels"}),
+}
+
+
+class DisplayList:
+    """Records drawing primitives and replays them into renderers."""
+
+    def __init__(self):
+        self.layer = "outline"
+        self.layers: list[str] = []
+        self.params: list[tuple] = []
+        self.warnings: list[str] = []
+        self._layer_ids: dict[str, int] = {}
+        self._param_ids: dict[tuple, int] = {}
+        self._rows: list[tuple[int, int, int, int, int]] = []
+        self._points: list[tuple[float, float]] = []
+        self.ops: NDArray[np.int32] = np.zeros((0, 5), dtype=np.int32)
+        self.coords: NDArray[np.float64] = np.zeros((0, 2))
+
+    # -- recording ------------------------------------------------------------
+
+    @contextmanager
+    def on_layer(self, name: str):
+        """Record the primitives drawn inside the block on the given layer."""
+        previous, self.layer = self.layer, name
+        try:
+            yield self
+        finally:
+            self.layer = previous
+
+    def _intern(self, table: dict, values: list, key):
+        idx = table.get(key)
+        if idx is None:
+            idx = table[key] = len(values)
+            values.append(key)
+        return idx
+
+    def _record(self, kind: int, points, params: tuple) -> None:
+        # Coordinate indices continue after the already frozen coordinates
+        start = len(self.coords) + len(self._points)
+        self._points.extend((float(x), float(y)) for x, y in points)
+        self._rows.append((
+            kind,
+            self._intern(self._layer_ids, self.layers, self.layer),
+            self._intern(self._param_ids, self.params, params),
+            start,
+            len(self.coords) + len(self._points),
+        ))
+
+    def line(self, x1, y1, x2, y2, color='black', style='-', width=1):
+        """Record a line from (x1, y1) to (x2, y2)."""
+        self._record(LINE, ((x1, y1), (x2, y2)), (color, style, width))
+
+    def polyline(self, points, color='black', style='-', width=1):
+        """Record a polyline through a sequence of (x, y) points."""
+        self._record(POLYLINE, points, (color, style, width))
+
+    def bezier(self, p0, p1, p2, p3, color='black', style='-', width=1):
+        """Record a cubic Bezier curve."""
+        self._record(BEZIER, (p0, p1, p2, p3), (color, style, width))
+
+    def circle(self, x, y, r, color='black'):
+        """Record a filled circle at (x, y) with radius r."""
+        self._record(CIRCLE, ((x, y),), (r, color))
+
+    def text(self, x, y, content, size=8, color='black', ha='left', fontweight='normal'):
+        """Record text at (x, y)."""
+        self._record(TEXT, ((x, y),), (str(content), size, color, ha, fontweight))
+
+    def freeze(self) -> "DisplayList":
+        """Pack the recorded primitives into arrays; returns self."""
+        if self._rows:
+            self.ops = np.vstack([self.ops, np.array(self._rows, dtype=np.int32)])
+            self.coords = np.vstack([self.coords, np.array(self._points).reshape(-1, 2)])
+            self._rows, self._points = [], []
+        return self
+
+    # -- playback -------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.ops) + len(self._rows)
+
+    def layer_mask(self, layers=None) -> NDArray[np.bool_]:
+        """Boolean mask of the primitives that belong to the given layers (all if None)."""
+        if layers is None:
+            return np.ones(len(self.ops), dtype=bool)
+        ids = [i for i, name in enumerate(self.layers) if name in layers]
+        return np.isin(self.ops[:, 1], ids)
+
+    def replay(self, renderer, layers=None) -> None:
+        """Draw the recorded primitives on the given layers into a renderer.
+
+        Args:
+            renderer: Any object with the line/polyline/bezier/circle/text API.
+            layers: Collection of layer names to draw, or None for all.
+        """
+        self.freeze()
+        coords = self.coords.tolist()
+        for kind, _, param, start, stop in self.ops[self.layer_mask(layers)].tolist():
+            params = self.params[param]
+            if kind == BEZIER:
+                p0, p1, p2, p3 = coords[start:stop]
+                renderer.bezier(p0, p1, p2, p3, color=params[0], style=params[1], width=params[2])
+            elif kind == LINE:
+                (x1, y1), (x2, y2) = coords[start:stop]
+                renderer.line(x1, y1, x2, y2, color=params[0], style=params[1], width=params[2])
+            elif kind == POLYLINE:
+                renderer.polyline(coords[start:stop], color=params[0], style=params[1], width=params[2])
+            elif kind == CIRCLE:
+                (x, y), = coords[start:stop]
+                renderer.circle(x, y, params[0], color=params[1])
+            else:
+                (x, y), = coords[start:stop]
+                content, size, color, ha, fontweight = params
+                renderer.text(x, y, content, size=size, color=color, ha=ha, fontweight=fontweight)
@@ -0,0 +1,111 @@
+"""Flattening of cubic Bezier segments into polylines to a distance tolerance.
+
+Every consumer that needs straight segments (plotter and cutting formats,
+rasterizing, area and collision tests, seam offsets) should flatten through
+this module instead of sampling curves at a fixed count.
+
+Each segment is split into n equal parameter steps, with n chosen from the
+second differences of its control points so that the polyline stays within
+the tolerance of the curve: for a cubic, the chord error of n uniform steps
+is at most max|B''| / (8 n^2), and max|B''| <= 6 max(|P0 - 2P1 + P2|,
+|P1 - 2P2 + P3|). Short or flat segments get few points, long tight curves
+many, and the whole batch is flattened in one vectorized pass.
+"""
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from app.core import bezier
+
+# Maximum distance (cm) between a curve and its polyline, per output
+TOLERANCES: dict[str, float] = {
+    "preview": 0.05,    # on-screen preview
+    "print": 0.01,      # 1:1 printed pattern (0.1 mm)
+    "plotter": 0.0025,  # pen plotters and cutting machines
+}
+
+
+def _tolerance(tolerance: float | str) -> float:
+    if isinstance(tolerance, str):
+        if tolerance not in TOLERANCES:
+            raise ValueError(f"Unknown flattening tolerance {tolerance!r}; expected one of {sorted(TOLERANCES)}")
+        return TOLERANCES[tolerance]
+    if tolerance <= 0:
+        raise ValueError("Flattening tolerance must be positive")
+    return float(tolerance)
+
+
+def segment_counts(ctrl: ArrayLike, tolerance: float | str = "print", max_steps: int = 1024) -> NDArray[np.int64]:
+    """Number of straight steps needed for each segment; shape (K,).
+
+    Args:
+        ctrl: Control points (K, 4, 2), or (4, 2) for one segment.
+        tolerance: Maximum chord error in cm, or a TOLERANCES preset name.
+        max_steps: Upper bound on the steps of one segment.
+
+    Raises:
+        ValueError: If a control point is not finite (NaN or infinite).
+    """
+    ctrl = np.asarray(ctrl, dtype=float).reshape(-1, 4, 2)
+    finite = np.isfinite(ctrl).all(axis=(-2, -1))
+    if not finite.all():
+        raise ValueError(f"Cannot flatten segment {int(np.argmin(finite))}: its control points are not finite")
+    dd = np.linalg.norm(np.diff(ctrl, n=2, axis=-2), axis=-1).max(axis=-1)
+    steps = np.ceil(np.sqrt(0.75 * dd / _tolerance(tolerance)))
+    return np.clip(steps, 1, max_steps).astype(np.int64)
+
+
+def flatten(ctrl: ArrayLike, tolerance: float | str = "print",
+            max_steps: int = 1024) -> tuple[NDArray[np.float64], NDArray[np.int64]]:
+    """Flatten K segments into one flat point array.
+
+    Args:
+        ctrl: Control points (K, 4, 2), or (4, 2) for one segment.
+        tolerance: Maximum chord error in cm, or a TOLERANCES preset name.
+        max_steps: Upper bound on the steps of one segment.
+
+    Returns:
+        (points, offsets): points is (P, 2); the polyline of segment k is
+        points[offsets[k]:offsets[k + 1]] and includes both end points.
+    """
+    ctrl = np.asarray(ctrl, dtype=float).reshape(-1, 4, 2)
+    owner, t, offsets = flatten_params(ctrl, tolerance, max_steps)
+    return bezier.point(ctrl[owner], t), offsets
+
+
+def flatten_params(ctrl: ArrayLike, tolerance: float | str = "print",
+                   max_steps: int = 1024) -> tuple[NDArray[np.int64], NDArray[np.float64], NDArray[np.int64]]:
+    """Segment index and curve parameter of every point flatten() would return.
+
+    Useful to evaluate more than positions (tangents, normals, ...) at the
+    flattened points.
+
+    Returns:
+        (owner, t, offsets): owner and t are (P,); offsets as in flatten().
+    """
+    steps = segment_counts(ctrl, tolerance, max_steps)
+    offsets = np.zeros(len(steps) + 1, dtype=np.int64)
+    np.cumsum(steps + 1, out=offsets[1:])
+    owner = np.repeat(np.arange(len(steps)), steps + 1)
+    t = (np.arange(offsets[-1]) - offsets[owner]) / steps[owner]
+    return owner, t, offsets
+
+
+def flatten_path(ctrl: ArrayLike, tolerance: float | str = "print", max_steps: int = 1024) -> NDArray[np.float64]:
+    """Flatten a chain of connected segments into a single polyline.
+
+    The end point of each segment is shared with the start of the next and
+    appears once.
+
+    Args:
+        ctrl: Control points (K, 4, 2) of consecutive segments.
+        tolerance: Maximum chord error in cm, or a TOLERANCES preset name.
+        max_steps: Upper bound on the steps of one segment.
+
+    Returns:
+        (P, 2) polyline.
+    """
+    points, offsets = flatten(ctrl, tolerance, max_steps)
+    keep = np.ones(len(points), dtype=bool)
+    keep[offsets[1:-1]] = False
+    return points[keep]
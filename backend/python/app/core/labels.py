@@ -0,0 +1,211 @@
+"""Collision-free placement of point labels.
+
+Labels are placed after the rest of a drawing has been recorded into a
+DisplayList: every line, polyline, flattened Bezier, point marker and text
+already recorded becomes an obstacle in a uniform grid index. Each label then
+tries candidate positions around its point (right first, where labels were
+always drawn, then above, below, left, ...) and takes the first whose text
+box hits no obstacle; the placed box becomes an obstacle for the next labels.
+A query only looks at the grid cells the box covers, so placing n labels is
+roughly linear in n.
+
+Text boxes are estimated from the font size (the renderers draw size * 0.035
+cm text, 1.2 em line spacing) with an average glyph width.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import NDArray
+
+from app.core.diagnostics import report
+from app.core.display_list import BEZIER, CIRCLE, LINE, POLYLINE, TEXT, DisplayList
+from app.core.flatten import flatten
+
+# Renderer font size in cm per point of label size
+EM_PER_SIZE = 0.035
+LINE_SPACING = 1.2
+# Average glyph width and extents above / below the baseline, in em
+GLYPH_WIDTH = 0.55
+ASCENT = 0.8
+DESCENT = 0.25
+
+
+@dataclass
+class Label:
+    """Text to place next to the point (x, y)."""
+    x: float
+    y: float
+    text: str
+    size: float = 8
+    color: str = 'black'
+
+
+def text_box(x: float, y: float, content: str, size: float = 8, ha: str = 'left',
+             y_flip: bool = False) -> tuple[float, float, float, float]:
+    """Estimated (min_x, min_y, max_x, max_y) of text drawn at (x, y), in drawing coordinates.
+
+    Args:
+        y_flip: The drawing's y axis points up (lines of text then go down in y).
+    """
+    em = size * EM_PER_SIZE
+    lines = str(content).split('\n')
+    width = max(len(line) for line in lines) * GLYPH_WIDTH * em
+    below = ((len(lines) - 1) * LINE_SPACING + DESCENT) * em
+    above = ASCENT * em
+    x0 = {'center': x - width / 2, 'right': x - width}.get(ha, x)
+    if y_flip:
+        return x0, y - below, x0 + width, y + above
+    return x0, y - above, x0 + width, y + below
+
+
+class GridIndex:
+    """Uniform grid of boxes and segments, for overlap queries against a box."""
+
+    def __init__(self, cell: float = 2.0):
+        self.cell = cell
+        self._boxes: list[tuple[float, float, float, float]] = []
+        self._segments: list[tuple[float, float, float, float]] = []
+        self._box_cells: dict[tuple[int, int], list[int]] = defaultdict(list)
+        self._segment_cells: dict[tuple[int, int], list[int]] = defaultdict(list)
+
+    def _cells(self, x0, y0, x1, y1):
+        if not np.isfinite((x0, y0, x1, y1)).all():
+            # Geometry of an unsolvable draft: indexed nowhere, overlaps nothing
+            return ()
+        i0, j0 = int(np.floor(x0 / self.cell)), int(np.floor(y0 / self.cell))
+        i1, j1 = int(np.floor(x1 / self.cell)), int(np.floor(y1 / self.cell))
+        return ((i, j) for i in range(i0, i1 + 1) for j in range(j0, j1 + 1))
+
+    def add_box(self, box) -> None:
+        """Add an axis-aligned box (min_x, min_y, max_x, max_y)."""
+        idx = len(self._boxes)
+        self._boxes.append(tuple(box))
+        for key in self._cells(*box):
+            self._box_cells[key].append(idx)
+
+    def add_polyline(self, points) -> None:
+        """Add the segments of a polyline (N, 2)."""
+        points = np.asarray(points, dtype=float)
+        for (ax, ay), (bx, by) in zip(points[:-1].tolist(), points[1:].tolist()):
+            idx = len(self._segments)
+            self._segments.append((ax, ay, bx, by))
+            for key in self._cells(min(ax, bx), min(ay, by), max(ax, bx), max(ay, by)):
+                self._segment_cells[key].append(idx)
+
+    def _candidates(self, table, cells, box) -> NDArray[np.float64]:
+        ids = {i for key in self._cells(*box) for i in cells.get(key, ())}
+        return np.array([table[i] for i in ids]).reshape(-1, 4)
+
+    def hits(self, box) -> bool:
+        """True if the box overlaps an indexed box or crosses an indexed segment."""
+        x0, y0, x1, y1 = box
+        boxes = self._candidates(self._boxes, self._box_cells, box)
+        if np.any((boxes[:, 0] < x1) & (boxes[:, 2] > x0) & (boxes[:, 1] < y1) & (boxes[:, 3] > y0)):
+            return True
+        seg = self._candidates(self._segments, self._segment_cells, box)
+        if len(seg) == 0:
+            return False
+        # Liang-Barsky clipping of every candidate segment against the box
+        px, py = seg[:, 0], seg[:, 1]
+        dx, dy = seg[:, 2] - px, seg[:, 3] - py
+        p = np.stack([-dx, dx, -dy, dy])
+        q = np.stack([px - x0, x1 - px, py - y0, y1 - py])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r = q / p
+        outside = np.any((p == 0) & (q < 0), axis=0)
+        t0 = np.max(np.where(p < 0, r, 0.0), axis=0)
+        t1 = np.min(np.where(p > 0, r, 1.0), axis=0)
+        return bool(np.any(~outside & (t0 <= t1)))
+
+
+def _obstacles(dl: DisplayList, y_flip: bool, cell: float) -> GridIndex:
+    """Index everything recorded so far in a display list."""
+    index = GridIndex(cell)
+    dl.freeze()
+    curves = []
+    for kind, _, param, start, stop in dl.ops.tolist():
+        coords = dl.coords[start:stop]
+        params = dl.params[param]
+        if kind in (LINE, POLYLINE):
+            index.add_polyline(coords)
+        elif kind == BEZIER and np.isfinite(coords).all():
+            curves.append(coords)
+        elif kind == CIRCLE:
+            (x, y), r = coords[0], params[0]
+            index.add_box((x - r, y - r, x + r, y + r))
+        elif kind == TEXT:
+            content, size, _, ha, _ = params
+            index.add_box(text_box(*coords[0], content, size, ha, y_flip))
+    if curves:
+        points, offsets = flatten(np.stack(curves), "preview")
+        for k in range(len(curves)):
+            index.add_polyline(points[offsets[k]:offsets[k + 1]])
+    return index
+
+
+def _candidates(label: Label, gap: float, y_flip: bool):
+    """Anchor positions (x, y, ha) around the labelled point, in order of preference.
+
+    Eight positions at the given gap, then the same eight three times farther.
+    """
+    em = label.size * EM_PER_SIZE
+    n_lines = label.text.count('\n') + 1
+    up = 1.0 if y_flip else -1.0
+    x, y = label.x, label.y
+    candidates = []
+    for distance in (gap, 3 * gap):
+        side = max(distance, 0.5)
+        above = y + up * (distance + ((n_lines - 1) * LINE_SPACING + DESCENT) * em)
+        below = y - up * (distance + ASCENT * em)
+        candidates += [
+            (x + side, y, 'left'),
+            (x + distance, above, 'left'),
+            (x + distance, below, 'left'),
+            (x - side, y, 'right'),
+            (x - distance, above, 'right'),
+            (x - distance, below, 'right'),
+            (x, above, 'center'),
+            (x, below, 'center'),
+        ]
+    return candidates
+
+
+def place_labels(r: DisplayList, labels: list[Label], *, y_flip: bool = False, gap: float = 0.3,
+                 cell: float = 2.0) -> list[Label]:
+    """Draw labels into r where they overlap nothing already recorded.
+
+    Labels are placed in the order given. A label with no free candidate
+    position is drawn at its preferred position (right of the point) and
+    reported through app.core.diagnostics.
+
+    Args:
+        r: Display list holding the rest of the drawing.
+        labels: Labels to place.
+        y_flip: The drawing's y axis points up (as rendered with y_flip=True).
+        gap: Distance in cm between a point and its label box.
+        cell: Grid index cell size in cm.
+
+    Returns:
+        The labels that could not be placed without overlap.
+    """
+    index = _obstacles(r, y_flip, cell)
+    unplaced = []
+    for label in labels:
+        candidates = _candidates(label, gap, y_flip)
+        chosen = None
+        for x, y, ha in candidates:
+            box = text_box(x, y, label.text, label.size, ha, y_flip)
+            if not index.hits(box):
+                chosen = (x, y, ha, box)
+                break
+        if chosen is None:
+            x, y, ha = candidates[0]
+            chosen = (x, y, ha, text_box(x, y, label.text, label.size, ha, y_flip))
+            unplaced.append(label)
+            report(f"Label '{label.text.splitlines()[0]}' could not be placed without overlap")
+        x, y, ha, box = chosen
+        index.add_box(box)
+        r.text(x, y, label.text, size=label.size, color=label.color, ha=ha)
+    return unplaced
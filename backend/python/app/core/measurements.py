@@ -6,9 +6,14 @@ sizing standards (T36-T44), with T38 as the base size.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from enum import StrEnum, auto
-from typing import ClassVar
+from typing import ClassVar, Sequence, TypeVar
+
+import numpy as np
+from numpy.typing import NDArray
+
+T = TypeVar("T")
 
 
 @dataclass
@@ -67,6 +72,83 @@ class FullMeasurements:
         "side_waist_to_floor",        # 24. Hauteur taille côté à terre
     ]
 
+    @classmethod
+    def field_names(cls) -> list[str]:
+        """Return the measurement names in column order of the measurement matrix."""
+        return [f.name for f in fields(cls)]
+
+    @classmethod
+    def to_matrix(cls, items: Sequence[FullMeasurements]) -> NDArray[np.float64]:
+        """Stack N measurement sets into an (N, n_fields) matrix."""
+        names = cls.field_names()
+        return np.array([[getattr(fm, name) for name in names] for fm in items], dtype=float)
+
+    @classmethod
+    def from_matrix(cls, matrix: NDArray[np.float64]) -> FullMeasurements:
+        """Build batched measurements from an (N, n_fields) matrix.
+
+        Each field of the returned instance holds an (N,) column, which the
+        drafting code consumes as N independent subjects.
+        """
+        matrix = np.asarray(matrix, dtype=float)
+        names = cls.field_names()
+        if matrix.ndim != 2 or matrix.shape[1] != len(names):
+            raise ValueError(f"Expected an (N, {len(names)}) matrix, got shape {matrix.shape}")
+        return cls(**{name: matrix[:, i] for i, name in enumerate(names)})
+
+
+def stack_measurements(items: Sequence[T]) -> T:
+    """Combine N measurement dataclasses into one whose fields are (N,) arrays."""
+    if not items:
+        raise ValueError("Need at least one set of measurements")
+    cls = type(items[0])
+    return cls(**{
+        f.name: np.array([getattr(item, f.name) for item in items], dtype=float)
+        for f in fields(cls)
+    })
+
+
+def broadcast_measurements(m: T) -> T:
+    """Return a copy of a measurement dataclass with every field as a 1-D array.
+
+    Scalar fields become length-1 arrays, so single-subject and batched
+    measurements go through the same drafting code.
+    """
+    names = [f.name for f in fields(m)]
+    columns = np.broadcast_arrays(*(np.atleast_1d(np.asarray(getattr(m, n), dtype=float)) for n in names))
+    return type(m)(**dict(zip(names, columns)))
+
+
+STANDARD_SIZES: tuple[int, ...] = (34, 36, 38, 40, 42, 44, 46, 48)
+
+# (base T38, increment per size) from French sizing table
+SIZE_TABLE: dict[str, tuple[float, float]] = {
+    "back_waist_length":        (41.0,  0.5),
+    "front_waist_length":       (37.0,  0.5),
+    "full_bust":                (88.0,  4.0),
+    "bust_height":              (22.0,  0.5),
+    "half_bust_point_distance": (9.25,  0.25),
+    "full_waist":               (68.0,  4.0),
+    "small_hip":                (85.0,  4.0),
+    "full_hip":                 (94.0,  4.0),
+    "neck_circumference":       (36.0,  1.0),
+    "half_back_width":          (17.5,  0.25),
+    "half_front_width":         (16.5,  0.25),
+    "shoulder_length":          (12.0,  0.4),
+    "armhole_circumference":    (39.5,  1.0),
+    "underarm_height":          (21.5,  0.25),
+    "arm_length":               (60.0,  0.0),
+    "upper_arm":                (26.0,  1.0),
+    "elbow_height":             (35.0,  0.0),
+    "wrist":                    (16.0,  0.25),
+    "waist_to_hip":             (22.0,  0.0),
+    "crotch_depth":             (26.5,  0.5),
+    "crotch_length":            (60.0,  2.0),
+    "waist_to_knee":            (58.0,  1.0),
+    "waist_to_floor":           (105.0, 0.5),
+    "side_waist_to_floor":      (105.5, 1.0),
+}
+
 
 def default_measurements(size: int = 38) -> FullMeasurements:
     """Return FullMeasurements for a standard French size.
@@ -74,41 +156,11 @@ def default_measurements(size: int = 38) -> FullMeasurements:
     Based on French sizing table (T36-T44), with T38 as base.
     Supported sizes: 34, 36, 38, 40, 42, 44, 46, 48.
     """
-    # (base T38, increment per size) from French sizing table
-    table: dict[str, tuple[float, float]] = {
-        "back_waist_length":        (41.0,  0.5),
-        "front_waist_length":       (37.0,  0.5),
-        "full_bust":                (88.0,  4.0),
-        "bust_height":              (22.0,  0.5),
-        "half_bust_point_distance": (9.25,  0.25),
-        "full_waist":               (68.0,  4.0),
-        "small_hip":                (85.0,  4.0),
-        "full_hip":                 (94.0,  4.0),
-        "neck_circumference":       (36.0,  1.0),
-        "half_back_width":          (17.5,  0.25),
-        "half_front_width":         (16.5,  0.25),
-        "shoulder_length":          (12.0,  0.4),
-        "armhole_circumference":    (39.5,  1.0),
-        "underarm_height":          (21.5,  0.25),
-        "arm_length":               (60.0,  0.0),
-        "upper_arm":                (26.0,  1.0),
-        "elbow_height":             (35.0,  0.0),
-        "wrist":                    (16.0,  0.25),
-        "waist_to_hip":             (22.0,  0.0),
-        "crotch_depth":             (26.5,  0.5),
-        "crotch_length":            (60.0,  2.0),
-        "waist_to_knee":            (58.0,  1.0),
-        "waist_to_floor":           (105.0, 0.5),
-        "side_waist_to_floor":      (105.5, 1.0),
-    }
-
     size_diff = (size - 38) // 2
-    measurements = {
+    return FullMeasurements(**{
         name: base + (incr * size_diff)
-        for name, (base, incr) in table.items()
-    }
-
-    return FullMeasurements(**measurements)
+        for name, (base, incr) in SIZE_TABLE.items()
+    })
 
 
 class Person(StrEnum):
@@ -0,0 +1,328 @@
+"""Marker making: nest piece outlines onto a fabric roll of fixed width.
+
+Pieces are rasterized once at the marker resolution (a cell is occupied if
+any part of the piece, grown by half the gap, touches it). The grainline of
+every piece (its drafting y axis) runs along the roll; allowed orientations
+are the 180 degree turn and, for fabrics without a face side, the mirror
+image, all of which are flips of the same raster.
+
+Placement is greedy bottom-left fill: largest pieces first, each put at the
+left-most, then lowest, free position over all of its orientations. Free
+positions for an orientation are found for the whole marker at once by
+correlating the occupancy grid with the piece raster through FFTs. The
+first pass always completes, at a coarser resolution if it cannot finish
+within the time limit; the rest of the time budget is spent on perturbed
+piece orders, keeping the shortest marker.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from app.core.diagnostics import report
+from app.core.seam import signed_area
+
+# Orientations of a grain-aligned piece: (turned 180 degrees, mirrored)
+ORIENTATIONS = ((False, False), (True, False), (False, True), (True, True))
+
+# Default seconds a whole nest() may take, below the 30 s generation pool timeout
+TIME_LIMIT = 25.0
+
+# Times a first pass too slow for the time limit is retried at twice the cell size
+COARSENINGS = 3
+
+
+@dataclass
+class NestPiece:
+    """A piece to place: closed polygon (P, 2) in drafting coordinates, grain along y."""
+    name: str
+    polygon: NDArray[np.float64]
+    allow_turn: bool = True
+    allow_mirror: bool = False
+
+    @property
+    def area(self) -> float:
+        return abs(signed_area(self.polygon))
+
+
+@dataclass
+class Placement:
+    """Where a piece ended up; polygon is in marker coordinates (x along the roll)."""
+    name: str
+    x: float
+    y: float
+    turned: bool
+    mirrored: bool
+    polygon: NDArray[np.float64]
+
+
+@dataclass
+class Marker:
+    """A finished marker."""
+    width: float
+    length: float
+    placements: list[Placement]
+    utilization: float
+    resolution: float
+    attempts: int = 1
+    seconds: float = 0.0
+
+
+def rasterize(polygon: ArrayLike, resolution: float, pad: int = 0) -> NDArray[np.bool_]:
+    """Cells of a (rows, cols) grid with origin at the polygon's minimum corner touched by the polygon.
+
+    Rows run along y, columns along x. Cells whose centre is inside are
+    found with a vectorized even-odd crossing count; boundary cells are
+    added by sampling the edges at half the cell size. The result is then
+    grown by pad cells in every direction.
+    """
+    p = np.asarray(polygon, dtype=float)
+    p = p - p.min(axis=0)
+    cols, rows = (np.ceil(p.max(axis=0) / resolution).astype(int) + 1)
+    a, b = p, np.roll(p, -1, axis=0)
+
+    # Interior: crossings of every row centre line with every edge
+    yc = (np.arange(rows) + 0.5) * resolution
+    spans = (a[:, 1] <= yc[:, None]) != (b[:, 1] <= yc[:, None])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        xs = a[:, 0] + (yc[:, None] - a[:, 1]) * (b[:, 0] - a[:, 0]) / (b[:, 1] - a[:, 1])
+    xs = np.where(spans, xs, np.inf)
+    xc = (np.arange(cols) + 0.5) * resolution
+    mask = (xs[:, None, :] < xc[None, :, None]).sum(axis=-1) % 2 == 1
+
+    # Boundary: edges sampled at half a cell
+    lengths = np.linalg.norm(b - a, axis=-1)
+    steps = np.maximum(np.ceil(2 * lengths / resolution).astype(int), 1)
+    owner = np.repeat(np.arange(len(a)), steps)
+    t = (np.arange(steps.sum()) - np.repeat(np.cumsum(steps) - steps, steps)) / steps[owner]
+    samples = a[owner] + t[:, None] * (b[owner] - a[owner])
+    cells = np.minimum((samples / resolution).astype(int), [cols - 1, rows - 1])
+    mask[cells[:, 1], cells[:, 0]] = True
+
+    if pad:
+        mask = np.pad(mask, pad)
+        for axis in (0, 1):
+            grown = mask.copy()
+            for shift in range(1, pad + 1):
+                grown |= np.roll(mask, shift, axis=axis) | np.roll(mask, -shift, axis=axis)
+            mask = grown
+    return mask
+
+
+def _grain_aligned(polygon: NDArray[np.float64]) -> NDArray[np.float64]:
+    """Turn a drafting polygon so its grainline (y) runs along the roll (x)."""
+    return np.stack([polygon[:, 1], -polygon[:, 0]], axis=-1)
+
+
+def _orient(local: NDArray[np.float64], box: NDArray[np.float64], turned: bool, mirrored: bool):
+    """Polygon within its raster box (cm) for an orientation."""
+    out = local.copy()
+    if mirrored:
+        out[:, 1] = box[1] - out[:, 1]
+    if turned:
+        out = box - out
+    return out
+
+
+def _orient_mask(mask: NDArray[np.bool_], turned: bool, mirrored: bool) -> NDArray[np.bool_]:
+    if mirrored:
+        mask = mask[::-1, :]
+    if turned:
+        mask = mask[::-1, ::-1]
+    return mask
+
+
+@dataclass
+class _Shape:
+    piece: NestPiece
+    local: NDArray[np.float64]
+    box: NDArray[np.float64]
+    origin: NDArray[np.float64]
+    masks: list[tuple[tuple[bool, bool], NDArray[np.bool_]]]
+
+
+def _prepare(piece: NestPiece, resolution: float, pad: int, rows: int) -> _Shape:
+    aligned = _grain_aligned(np.asarray(piece.polygon, dtype=float))
+    local = aligned - aligned.min(axis=0)
+    mask = rasterize(local, resolution, pad)
+    if mask.shape[0] > rows:
+        raise ValueError(f"Piece {piece.name!r} is wider ({local[:, 1].max():.1f} cm) than the fabric")
+    box = np.array([mask.shape[1] - 2 * pad, mask.shape[0] - 2 * pad]) * resolution
+    orientations = [
+        (turned, mirrored) for turned, mirrored in ORIENTATIONS
+        if (piece.allow_turn or not turned) and (piece.allow_mirror or not mirrored)
+    ]
+    masks = [(o, _orient_mask(mask, *o)) for o in orientations]
+    return _Shape(piece, local, box, np.full(2, pad * resolution), masks)
+
+
+def _longest_runs(cells: NDArray[np.bool_]) -> NDArray[np.int64]:
+    """Length of the longest vertical run of True cells in every column."""
+    rows = np.arange(len(cells))[:, None]
+    last_false = np.maximum.accumulate(np.where(cells, -1, rows), axis=0)
+    return (rows - last_false).max(axis=0)
+
+
+def _free_position(grid: NDArray[np.bool_], used: int, mask: NDArray[np.bool_], need: NDArray[np.int64]):
+    """Left-most, then lowest, (row, col) where mask fits on grid, or None.
+
+    Columns where some column of the mask cannot fit in the longest free
+    vertical run of the grid are skipped; the remaining window is searched
+    exactly by FFT correlation.
+    """
+    rows, width = mask.shape
+    cols = min(grid.shape[1], used + width)
+    runs = _longest_runs(~grid[:, :cols])
+    fits = (np.lib.stride_tricks.sliding_window_view(runs, width) >= need).all(axis=1)
+    candidates = np.flatnonzero(fits)
+    if len(candidates) == 0:
+        return None
+    start = int(candidates[0])
+    window = grid[:, start:cols].astype(float)
+    kernel = np.fft.rfft2(mask.astype(float), s=window.shape)
+    overlap = np.fft.irfft2(np.fft.rfft2(window) * np.conj(kernel), s=window.shape)
+    free = overlap[:grid.shape[0] - rows + 1, :cols - start - width + 1] < 0.5
+    free &= fits[start:][None, :]
+    free_cols = np.flatnonzero(free.any(axis=0))
+    if len(free_cols) == 0:
+        return None
+    col = int(free_cols[0])
+    return int(np.argmax(free[:, col])), start + col
+
+
+def _place_all(shapes: list[_Shape], order, rows: int, resolution: float, deadline: float | None):
+    """One bottom-left fill pass; None if the deadline passes first."""
+    total_cols = sum(s.masks[0][1].shape[1] for s in shapes) + 1
+    grid = np.zeros((rows, total_cols), dtype=bool)
+    used = 0
+    placed = []
+    for index in order:
+        if deadline is not None and time.perf_counter() > deadline:
+            return None
+        shape = shapes[index]
+        best = None
+        for orientation, mask in shape.masks:
+            position = _free_position(grid, used, mask, _longest_runs(mask))
+            if position is not None and (best is None or position[1] < best[0][1]):
+                best = (position, orientation, mask)
+        (row, col), orientation, mask = best
+        grid[row:row + mask.shape[0], col:col + mask.shape[1]] |= mask
+        used = max(used, col + mask.shape[1])
+        placed.append((index, row, col, orientation))
+    return placed
+
+
+def _build_marker(shapes, placed, width: float, resolution: float) -> Marker:
+    placements = []
+    for index, row, col, (turned, mirrored) in placed:
+        shape = shapes[index]
+        offset = np.array([col, row]) * resolution + shape.origin
+        polygon = _orient(shape.local, shape.box, turned, mirrored) + offset
+        placements.append(Placement(
+            name=shape.piece.name,
+            x=float(offset[0]),
+            y=float(offset[1]),
+            turned=turned,
+            mirrored=mirrored,
+            polygon=polygon,
+        ))
+    length = max((float(p.polygon[:, 0].max()) for p in placements), default=0.0)
+    area = sum(s.piece.area for s in shapes)
+    return Marker(
+        width=width,
+        length=length,
+        placements=placements,
+        utilization=area / (width * length) if length else 0.0,
+        resolution=resolution,
+    )
+
+
+def nest(
+    pieces: list[NestPiece],
+    width: float,
+    *,
+    resolution: float = 0.5,
+    gap: float = 0.0,
+    time_budget: float = 2.0,
+    time_limit: float = TIME_LIMIT,
+    seed: int = 0,
+) -> Marker:
+    """Lay pieces onto a roll of the given width, minimizing the marker length.
+
+    Args:
+        pieces: Pieces to place; each is placed once.
+        width: Usable fabric width in cm.
+        resolution: Raster cell size in cm; smaller packs tighter but slower.
+        gap: Minimum distance in cm kept between pieces.
+        time_budget: Seconds after which no new attempt is started; the first
+                     pass always completes.
+        time_limit: Seconds the whole call should take at most. A first pass
+                    still running after half of the time left is abandoned
+                    and restarted at twice the cell size (reported through
+                    app.core.diagnostics), up to COARSENINGS times; the last
+                    one runs to completion.
+        seed: Seed of the order perturbations, for reproducible markers.
+
+    Raises:
+        ValueError: If a piece is wider than the fabric in every orientation.
+    """
+    start = time.perf_counter()
+    limit = start + time_limit
+    for coarsening in range(COARSENINGS + 1):
+        rows = int(math.floor(width / resolution))
+        pad = math.ceil(gap / 2 / resolution)
+        shapes = [_prepare(piece, resolution, pad, rows) for piece in pieces]
+        order = sorted(range(len(shapes)), key=lambda i: -shapes[i].piece.area)
+        now = time.perf_counter()
+        pass_deadline = None if coarsening == COARSENINGS else now + (limit - now) / 2
+        placed = _place_all(shapes, order, rows, resolution, pass_deadline)
+        if placed is not None:
+            break
+        resolution *= 2
+        report(f"Marker could not be nested in time; retrying at a {resolution:g} cm resolution")
+
+    best = _build_marker(shapes, placed, width, resolution)
+    rng = np.random.default_rng(seed)
+    attempts = 1
+    deadline = min(start + time_budget, limit)
+    while len(order) > 1 and time.perf_counter() < deadline:
+        trial = list(order)
+        for _ in range(max(1, len(trial) // 10)):
+            i = int(rng.integers(len(trial) - 1))
+            trial[i], trial[i + 1] = trial[i + 1], trial[i]
+        placed = _place_all(shapes, trial, rows, resolution, deadline)
+        if placed is None:
+            break
+        attempts += 1
+        marker = _build_marker(shapes, placed, width, resolution)
+        if marker.length < best.length:
+            best, order = marker, trial
+
+    best.attempts = attempts
+    best.seconds = time.perf_counter() - start
+    return best
+
+
+def render_marker(marker: Marker, renderer_cls, *, title: str | None = None, **options):
+    """Draw a marker: the fabric edges, every placed piece and its name.
+
+    Returns:
+        The renderer, ready to be serialized.
+    """
+    margin = 2.0
+    bounds = (-margin, marker.length + margin, -margin, marker.width + margin)
+    r = renderer_cls(bounds, y_flip=True, title=title, **options)
+    r.line(0, 0, marker.length, 0, color='gray', style='--')
+    r.line(0, marker.width, marker.length, marker.width, color='gray', style='--')
+    r.line(marker.length, 0, marker.length, marker.width, color='red', style='--')
+    for placement in marker.placements:
+        polygon = placement.polygon
+        r.polyline(np.vstack([polygon, polygon[:1]]).tolist(), color='black')
+        cx, cy = polygon.mean(axis=0)
+        r.text(cx, cy, placement.name, size=6, ha='center')
+    return r
@@ -1,13 +1,20 @@
 """Lightweight PDF renderer for sewing patterns using fpdf2.
 
 Same drawing interface as SVGRenderer, backed by fpdf2 for accurate
-physical-unit (cm) output suitable for 1:1 printing.
+physical-unit (cm) output suitable for 1:1 printing. Curves are written as
+native PDF cubic operators, and connected strokes of the same style are
+merged into a single path. Paths go through fpdf2's public drawing API
+(PaintedPath in a drawing context), consecutive ones in one context.
 """
 
 import io
 
 import numpy as np
 from fpdf import FPDF
+from fpdf.drawing import DeviceRGB, PaintedPath
+from fpdf.enums import PathPaintRule
+
+from app.core.flatten import flatten
 
 
 class PDFRenderer:
@@ -20,7 +27,7 @@ class PDFRenderer:
         '-.': (2, 0.5, 0.5, 0.5),
     }
 
-    def __init__(self, bounds, *, y_flip=False, title=None):
+    def __init__(self, bounds, *, y_flip=False, title=None, curve_tolerance=None):
         """Initialize the renderer.
 
         Args:
@@ -28,10 +35,23 @@ class PDFRenderer:
             y_flip: If True, flip the y-axis (mathematical coords, y up).
                     If False, y increases downward (screen coords).
             title: Optional title string rendered at the top.
+            curve_tolerance: If set, Bezier curves are flattened to polylines
+                             within this distance in cm (or a preset name
+                             from app.core.flatten.TOLERANCES) instead of
+                             using native PDF curves.
         """
         self.min_x, self.max_x, self.min_y, self.max_y = bounds
         self.y_flip = y_flip
         self.title = title
+        self.curve_tolerance = curve_tolerance
+        # Pending path: start point and (operator, coordinates) pairs, in page cm
+        self._path_start = None
+        self._path: list[tuple[str, tuple[float, ...]]] = []
+        self._path_stroke = None
+        self._path_end = None
+        # Finished paths not yet written to the page
+        self._drawn: list[PaintedPath] = []
+        self._text_widths: dict[tuple[str, float, str], float] = {}
 
         width_cm = self.max_x - self.min_x
         height_cm = self.max_y - self.min_y
@@ -75,55 +95,111 @@ class PDFRenderer:
         }
         return COLORS.get(color, (0, 0, 0))
 
+    # -- path assembly ----------------------------------------------------------
+
+    def _page_coords(self, points):
+        """Page coordinates (cm, y down) of pattern points (N, 2), rounded to 1e-4 cm."""
+        pts = np.asarray(points, dtype=float)
+        x = pts[:, 0] - self.min_x
+        y = self.max_y - pts[:, 1] if self.y_flip else pts[:, 1] - self.min_y
+        return [tuple(p) for p in np.round(np.column_stack([x, y]), 4).tolist()]
+
+    def _extend_path(self, start, ops, end, stroke):
+        """Append path operators, continuing the open path when possible.
+
+        Consecutive strokes with the same style where one starts at the end
+        of the previous one are emitted as a single PDF path, so that a chain
+        of segments costs one graphics-state setup and one stroke operator.
+        """
+        if not (self._path and stroke == self._path_stroke and start == self._path_end):
+            self._end_path()
+            self._path_start = start
+            self._path_stroke = stroke
+        self._path.extend(ops)
+        self._path_end = end
+
+    def _end_path(self):
+        """Finish the pending path, if any, as an fpdf2 PaintedPath."""
+        if not self._path:
+            return
+        color, style, width = self._path_stroke
+        path = PaintedPath(*self._path_start)
+        path.style.paint_rule = PathPaintRule.STROKE
+        path.style.auto_close = False
+        path.style.stroke_color = DeviceRGB(*(c / 255 for c in self._parse_color(color)))
+        path.style.stroke_width = width * 0.03
+        dash = self.DASH_PATTERNS.get(style)
+        if dash:
+            path.style.stroke_dash_pattern = dash[:2]
+        for op, values in self._path:
+            if op == 'l':
+                path.line_to(*values)
+            else:
+                path.curve_to(*values)
+        self._drawn.append(path)
+        self._path = []
+        self._path_end = None
+
+    def _flush_path(self):
+        """Write the finished paths to the page, in one fpdf2 drawing context."""
+        self._end_path()
+        if not self._drawn:
+            return
+        with self.pdf.drawing_context() as context:
+            for path in self._drawn:
+                # Second argument: no defensive copy (named copy or clone across versions)
+                context.add_item(path, False)
+        self._drawn = []
+
     # -- drawing primitives ---------------------------------------------------
 
     def line(self, x1, y1, x2, y2, color='black', style='-', width=1):
         """Draw a line from (x1, y1) to (x2, y2)."""
-        r, g, b = self._parse_color(color)
-        self.pdf.set_draw_color(r, g, b)
-        self.pdf.set_line_width(width * 0.03)
-        self._set_dash(style)
-        self.pdf.line(self._tx(x1), self._ty(y1), self._tx(x2), self._ty(y2))
-        self._set_dash('-')
+        start, end = self._page_coords([(x1, y1), (x2, y2)])
+        self._extend_path(start, [('l', end)], end, (color, style, width))
 
     def polyline(self, points, color='black', style='-', width=1):
         """Draw a polyline through a sequence of (x, y) points."""
         if len(points) < 2:
             return
-        for i in range(len(points) - 1):
-            self.line(points[i][0], points[i][1],
-                      points[i + 1][0], points[i + 1][1],
-                      color=color, style=style, width=width)
+        coords = self._page_coords(points)
+        self._extend_path(coords[0], [('l', c) for c in coords[1:]], coords[-1], (color, style, width))
 
     def bezier(self, p0, p1, p2, p3, color='black', style='-', width=1):
-        """Draw a cubic Bezier curve by sampling points."""
-        r, g, b = self._parse_color(color)
-        self.pdf.set_draw_color(r, g, b)
-        self.pdf.set_line_width(width * 0.03)
-        self._set_dash(style)
-
-        num = 64
-        t = np.linspace(0, 1, num)
-        pts = (np.outer((1 - t)**3, p0) +
-               np.outer(3 * (1 - t)**2 * t, p1) +
-               np.outer(3 * (1 - t) * t**2, p2) +
-               np.outer(t**3, p3))
+        """Draw a cubic Bezier curve.
 
-        for i in range(num - 1):
-            self.pdf.line(self._tx(pts[i, 0]), self._ty(pts[i, 1]),
-                          self._tx(pts[i + 1, 0]), self._ty(pts[i + 1, 1]))
-
-        self._set_dash('-')
+        Emitted as a native PDF curve, or as a polyline when the renderer
+        was created with curve_tolerance set.
+        """
+        ctrl = np.array([p0, p1, p2, p3], dtype=float)
+        if self.curve_tolerance:
+            pts, _ = flatten(ctrl, self.curve_tolerance)
+            coords = self._page_coords(pts)
+            ops = [('l', c) for c in coords[1:]]
+        else:
+            coords = self._page_coords(ctrl)
+            ops = [('c', coords[1] + coords[2] + coords[3])]
+        self._extend_path(coords[0], ops, coords[-1], (color, style, width))
 
     def circle(self, x, y, r, color='black'):
         """Draw a filled circle at (x, y) with radius r."""
+        self._flush_path()
         rc, gc, bc = self._parse_color(color)
         self.pdf.set_fill_color(rc, gc, bc)
         sx, sy = self._tx(x), self._ty(y)
         self.pdf.ellipse(sx - r, sy - r, r * 2, r * 2, style='F')
 
+    def _string_width(self, text, style, size):
+        """Width of a string in cm, cached per font style and size."""
+        key = (style, size, text)
+        width = self._text_widths.get(key)
+        if width is None:
+            width = self._text_widths[key] = self.pdf.get_string_width(text)
+        return width
+
     def text(self, x, y, content, size=8, color='black', ha='left', fontweight='normal'):
         """Draw text at (x, y) with the given size and alignment."""
+        self._flush_path()
         rc, gc, bc = self._parse_color(color)
         self.pdf.set_text_color(rc, gc, bc)
         style = 'B' if fontweight == 'bold' else ''
@@ -135,19 +211,18 @@ class PDFRenderer:
 
         for i, line_text in enumerate(lines):
             ly = sy + i * line_height
-            tw = self.pdf.get_string_width(line_text)
-            if ha == 'center':
-                lx = sx - tw / 2
-            elif ha == 'right':
-                lx = sx - tw
-            else:
+            if ha == 'left':
                 lx = sx
+            else:
+                tw = self._string_width(line_text, style, size)
+                lx = sx - tw / 2 if ha == 'center' else sx - tw
             self.pdf.text(lx, ly, line_text)
 
     # -- output ---------------------------------------------------------------
 
     def to_pdf(self) -> bytes:
         """Render and return the PDF document as bytes."""
+        self._flush_path()
         buf = io.BytesIO()
         self.pdf.output(buf)
         buf.seek(0)
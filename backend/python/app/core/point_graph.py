@@ -0,0 +1,239 @@
+"""Declarative dependency graph of the points of a drafting.
+
+A pattern declares its drafting once, at import, as a graph of nodes. Each
+node is a function of named inputs (measurement fields and control
+parameters) and of earlier nodes: construction points, helper points, or
+intermediate values such as a direction or a solved length. A node may only
+use nodes declared before it, so declaration order is an evaluation order
+and the graph has no cycles.
+
+PointGraph.evaluate() computes every node and returns a Drafting that keeps
+all values. Drafting.update() then recomputes only the nodes downstream of
+the inputs that changed, and stops at any node whose value comes out the
+same; the new Drafting lists the nodes whose value changed. Values carry a
+leading subject axis ((N,) or (N, 2) arrays), so the same graph drafts one
+subject or a batch.
+
+Diagnostics a node function reports (see app.core.diagnostics) are kept
+with its value, and every evaluation or update reports those of all nodes
+again, recomputed or not: an update reports what a full evaluation would.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, Mapping
+
+import numpy as np
+
+from app.core.diagnostics import collect, report
+from app.core.measurements import broadcast_measurements
+
+POINT, HELPER, VALUE = "point", "helper", "value"
+
+
+@dataclass(frozen=True)
+class Node:
+    """A drafting step: name = fn(*inputs)."""
+    name: str
+    inputs: tuple[str, ...]
+    fn: Callable[..., Any]
+    kind: str = VALUE
+    doc: str = ""
+
+
+def _same(a: Any, b: Any) -> bool:
+    return np.array_equal(np.asarray(a), np.asarray(b))
+
+
+def _call(node: Node, values: Mapping[str, Any], notes: dict[str, tuple[str, ...]]) -> Any:
+    """Value of a node, recording in notes the diagnostics its function reports."""
+    with collect() as reported:
+        value = node.fn(*(values[name] for name in node.inputs))
+    if reported:
+        notes[node.name] = tuple(reported)
+    else:
+        notes.pop(node.name, None)
+    return value
+
+
+def draft_inputs(*objects) -> dict[str, Any]:
+    """Graph inputs from dataclasses (measurements, control parameters).
+
+    Every field becomes an input of the same name, as a 1-D array (see
+    broadcast_measurements).
+
+    Raises:
+        ValueError: If two dataclasses have a field of the same name.
+    """
+    values: dict[str, Any] = {}
+    for obj in objects:
+        column = broadcast_measurements(obj)
+        for f in fields(column):
+            if f.name in values:
+                raise ValueError(f"Input {f.name!r} is given twice")
+            values[f.name] = getattr(column, f.name)
+    return values
+
+
+class PointGraph:
+    """Nodes of a drafting, in declaration order."""
+
+    def __init__(self):
+        self.nodes: dict[str, Node] = {}
+        self._used: set[str] = set()
+
+    def node(self, name: str, *inputs: str, kind: str = VALUE, doc: str | None = None):
+        """Decorator declaring a node computed by the function from the values of inputs.
+
+        Names that are not nodes are graph inputs.
+
+        Raises:
+            ValueError: If the node is declared twice, or after a node using it.
+        """
+        def register(fn):
+            if name in self.nodes:
+                raise ValueError(f"Node {name!r} is declared twice")
+            if name in self._used:
+                raise ValueError(f"Node {name!r} is declared after a node using it")
+            text = doc if doc is not None else (fn.__doc__ or "").strip()
+            self.nodes[name] = Node(name, tuple(inputs), fn, kind, text)
+            self._used.update(inputs)
+            return fn
+        return register
+
+    def point(self, name: str, *inputs: str, doc: str | None = None):
+        """Decorator declaring a construction point."""
+        return self.node(name, *inputs, kind=POINT, doc=doc)
+
+    def helper(self, name: str, *inputs: str, doc: str | None = None):
+        """Decorator declaring a helper point (Bezier control point, guide)."""
+        return self.node(name, *inputs, kind=HELPER, doc=doc)
+
+    @property
+    def inputs(self) -> frozenset[str]:
+        """Names the graph reads but does not compute."""
+        return frozenset(self._used - self.nodes.keys())
+
+    def upstream(self, name: str) -> set[str]:
+        """Every node and input the value of name depends on."""
+        seen: set[str] = set()
+        stack = list(self.nodes[name].inputs)
+        while stack:
+            dep = stack.pop()
+            if dep not in seen:
+                seen.add(dep)
+                if dep in self.nodes:
+                    stack.extend(self.nodes[dep].inputs)
+        return seen
+
+    def downstream(self, names) -> set[str]:
+        """Every node whose value depends on one of names."""
+        dirty = set(names)
+        found = set()
+        for node in self.nodes.values():
+            if not dirty.isdisjoint(node.inputs):
+                dirty.add(node.name)
+                found.add(node.name)
+        return found
+
+    def derivation(self, name: str) -> str:
+        """One-line account of how a node is drafted, e.g. for a construction sheet."""
+        node = self.nodes[name]
+        text = f"{name}: {node.doc}" if node.doc else name
+        return f"{text} [from {', '.join(node.inputs)}]" if node.inputs else text
+
+    def evaluate(self, inputs: Mapping[str, Any]) -> Drafting:
+        """Compute every node.
+
+        Args:
+            inputs: Value of every graph input; extra names are kept and can
+                    be updated later, but are not read.
+
+        Raises:
+            ValueError: If an input is missing.
+        """
+        missing = self.inputs - inputs.keys()
+        if missing:
+            raise ValueError(f"Missing drafting inputs: {sorted(missing)}")
+        values = dict(inputs)
+        notes: dict[str, tuple[str, ...]] = {}
+        for node in self.nodes.values():
+            values[node.name] = _call(node, values, notes)
+        return Drafting(self, values, frozenset(self.nodes), len(self.nodes), notes).reported()
+
+
+@dataclass(frozen=True)
+class Drafting:
+    """Values of every node of a graph for one set of inputs.
+
+    Attributes:
+        changed: Nodes whose value changed in the evaluation or update that
+                 made this drafting (all nodes after evaluate()).
+        evaluations: Node functions called by that evaluation or update.
+        notes: Diagnostics reported by the function of each node, for the
+               nodes that reported any.
+    """
+    graph: PointGraph
+    values: Mapping[str, Any]
+    changed: frozenset[str]
+    evaluations: int
+    notes: Mapping[str, tuple[str, ...]] = field(default_factory=dict)
+
+    def __getitem__(self, name: str) -> Any:
+        return self.values[name]
+
+    def _of_kind(self, kind: str) -> dict[str, Any]:
+        return {name: self.values[name] for name, node in self.graph.nodes.items() if node.kind == kind}
+
+    def points(self) -> dict[str, Any]:
+        """Construction points, in declaration order."""
+        return self._of_kind(POINT)
+
+    def helper_points(self) -> dict[str, Any]:
+        """Helper points, in declaration order."""
+        return self._of_kind(HELPER)
+
+    def diagnostics(self) -> tuple[str, ...]:
+        """Diagnostics of every node, in declaration order."""
+        return tuple(message for name in self.graph.nodes for message in self.notes.get(name, ()))
+
+    def reported(self) -> Drafting:
+        """Report the diagnostics of every node and return this drafting."""
+        for message in self.diagnostics():
+            report(message)
+        return self
+
+    def changed_points(self) -> frozenset[str]:
+        """Construction and helper points among the changed nodes."""
+        return frozenset(name for name in self.changed if self.graph.nodes[name].kind != VALUE)
+
+    def update(self, changes: Mapping[str, Any]) -> Drafting:
+        """Return the drafting for new values of some inputs; this one is unchanged.
+
+        Inputs whose value is the same as before are ignored.
+
+        Raises:
+            ValueError: If a name is not an input of this drafting.
+        """
+        values = dict(self.values)
+        notes = dict(self.notes)
+        dirty = set()
+        for name, value in changes.items():
+            if name not in values or name in self.graph.nodes:
+                raise ValueError(f"Unknown drafting input {name!r}")
+            if not _same(values[name], value):
+                values[name] = value
+                dirty.add(name)
+        changed = set()
+        evaluations = 0
+        for node in self.graph.nodes.values():
+            if dirty.isdisjoint(node.inputs):
+                continue
+            value = _call(node, values, notes)
+            evaluations += 1
+            if not _same(value, values[node.name]):
+                values[node.name] = value
+                dirty.add(node.name)
+                changed.add(node.name)
+        return Drafting(self.graph, values, frozenset(changed), evaluations, notes).reported()
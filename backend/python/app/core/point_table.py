@@ -0,0 +1,174 @@
+"""Structure-of-arrays storage for the named points of a pattern.
+
+All points of a pattern (construction and helper) live in one contiguous
+(n, 2) float array, with a name -> row index map and a helper flag per row.
+Whole-pattern operations (stretch, mirror, bounds, affine transforms) are
+single array operations over that table.
+
+PointView keeps the dict-like access the drafting and plotting code uses:
+pattern.points['A'] returns the (2,) row of the table as a view, so in-place
+updates write through to the table.
+"""
+
+from collections.abc import Iterator, MutableMapping
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+
+class PointTable:
+    """Named 2D points in one contiguous array."""
+
+    def __init__(self, capacity: int = 32):
+        self._coords = np.zeros((capacity, 2))
+        self._helper = np.zeros(capacity, dtype=bool)
+        self._names: list[str] = []
+        self._index: dict[str, int] = {}
+        self.points = PointView(self, helper=False)
+        self.helper_points = PointView(self, helper=True)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._index
+
+    @property
+    def names(self) -> list[str]:
+        """Point names in row order."""
+        return list(self._names)
+
+    @property
+    def coords(self) -> NDArray[np.float64]:
+        """The (n, 2) coordinate table (a view; writes go to the table)."""
+        return self._coords[:len(self._names)]
+
+    @property
+    def helper_mask(self) -> NDArray[np.bool_]:
+        """Boolean (n,) array, True on the rows of helper points."""
+        return self._helper[:len(self._names)]
+
+    def index(self, name: str) -> int:
+        """Row of a point in the coordinate table."""
+        return self._index[name]
+
+    def add(self, name: str, xy: ArrayLike, helper: bool = False) -> None:
+        """Insert a point, or overwrite the coordinates of an existing one.
+
+        Raises:
+            ValueError: If the name exists with the other helper flag.
+        """
+        idx = self._index.get(name)
+        if idx is None:
+            idx = len(self._names)
+            if idx == len(self._coords):
+                self._grow()
+            self._names.append(name)
+            self._index[name] = idx
+            self._helper[idx] = helper
+        elif self._helper[idx] != helper:
+            kind = "helper" if self._helper[idx] else "construction"
+            raise ValueError(f"'{name}' is already a {kind} point")
+        self._coords[idx] = xy
+
+    def remove(self, name: str) -> None:
+        """Delete a point; the rows after it move up by one."""
+        idx = self._index.pop(name)
+        n = len(self._names)
+        self._coords[idx:n - 1] = self._coords[idx + 1:n]
+        self._helper[idx:n - 1] = self._helper[idx + 1:n]
+        del self._names[idx]
+        for i in range(idx, n - 1):
+            self._index[self._names[i]] = i
+
+    def _grow(self) -> None:
+        # Rows handed out before growing keep their old storage and stop
+        # tracking the table, like any numpy view of a reallocated array.
+        capacity = 2 * len(self._coords)
+        coords = np.zeros((capacity, 2))
+        helper = np.zeros(capacity, dtype=bool)
+        coords[:len(self._coords)] = self._coords
+        helper[:len(self._helper)] = self._helper
+        self._coords, self._helper = coords, helper
+
+    def copy(self) -> "PointTable":
+        """Independent copy of the table."""
+        other = PointTable(capacity=max(len(self._coords), 1))
+        other._coords[:] = self._coords
+        other._helper[:] = self._helper
+        other._names = list(self._names)
+        other._index = dict(self._index)
+        return other
+
+    def _mask(self, helper: bool | None) -> slice | NDArray[np.bool_]:
+        if helper is None:
+            return slice(None)
+        return self.helper_mask == helper
+
+    def transform(self, matrix: ArrayLike, offset: ArrayLike = (0.0, 0.0), helper: bool | None = None) -> None:
+        """Apply p -> matrix @ p + offset in place.
+
+        Args:
+            matrix: 2x2 linear part.
+            offset: Translation.
+            helper: Restrict to helper (True) or construction (False) points;
+                    None transforms every point.
+        """
+        coords = self.coords
+        mask = self._mask(helper)
+        coords[mask] = coords[mask] @ np.asarray(matrix, dtype=float).T + np.asarray(offset, dtype=float)
+
+    def scale(self, sx: float, sy: float) -> None:
+        """Scale every point in place, about the origin."""
+        self.coords[:] *= (sx, sy)
+
+    def mirrored(self, gap: float = 0.0) -> "PointTable":
+        """Copy of the table reflected across the vertical axis: (x, y) -> (gap - x, y)."""
+        other = self.copy()
+        other.transform(((-1.0, 0.0), (0.0, 1.0)), (gap, 0.0))
+        return other
+
+    def bounds(self, helper: bool | None = None) -> tuple[float, float, float, float]:
+        """Return (min_x, max_x, min_y, max_y) over the selected points."""
+        coords = self.coords[self._mask(helper)]
+        lo = coords.min(axis=0)
+        hi = coords.max(axis=0)
+        return float(lo[0]), float(hi[0]), float(lo[1]), float(hi[1])
+
+
+class PointView(MutableMapping):
+    """Dict-like view of the construction or helper points of a PointTable."""
+
+    def __init__(self, table: PointTable, helper: bool):
+        self._table = table
+        self._helper = helper
+
+    def _has(self, name: object) -> bool:
+        idx = self._table._index.get(name)
+        return idx is not None and bool(self._table._helper[idx]) == self._helper
+
+    def __getitem__(self, name: str) -> NDArray[np.float64]:
+        if not self._has(name):
+            raise KeyError(name)
+        return self._table._coords[self._table._index[name]]
+
+    def __setitem__(self, name: str, xy: ArrayLike) -> None:
+        self._table.add(name, xy, helper=self._helper)
+
+    def __delitem__(self, name: str) -> None:
+        if not self._has(name):
+            raise KeyError(name)
+        self._table.remove(name)
+
+    def __contains__(self, name: object) -> bool:
+        return self._has(name)
+
+    def __iter__(self) -> Iterator[str]:
+        table = self._table
+        return iter([n for n, h in zip(table._names, table.helper_mask) if h == self._helper])
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self._table.helper_mask == self._helper))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self.items())!r})"
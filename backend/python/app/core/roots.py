@@ -0,0 +1,244 @@
+"""Bracketed root finders for pattern construction.
+
+Drafting solves small monotone equations (neck width from neck circumference,
+Bezier parameter through an armhole point). These solvers never re-evaluate
+a bracket endpoint, accept endpoint values the caller already knows, stop on
+an iteration budget, and report how many times f was called.
+
+- brent: scalar Brent-Dekker (inverse quadratic interpolation + bisection).
+- illinois: Illinois-modified regula falsi, vectorized over independent
+  brackets so thousands of subjects are solved with one call of f per step.
+"""
+
+import threading
+from dataclasses import asdict, dataclass
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+@dataclass
+class RootResult:
+    """Outcome of a root solve.
+
+    For array solves, root and converged are arrays with one entry per bracket
+    and evaluations counts vectorized calls of f.
+    """
+    root: float | NDArray[np.float64]
+    converged: bool | NDArray[np.bool_]
+    iterations: int
+    evaluations: int
+
+
+@dataclass
+class SolverStats:
+    """Cumulative counters across all solves, for benchmarking."""
+    solves: int = 0
+    evaluations: int = 0
+    iterations: int = 0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+_stats: dict[str, SolverStats] = {}
+_stats_lock = threading.Lock()
+
+
+def _record(solver: str, result: RootResult) -> RootResult:
+    with _stats_lock:
+        stats = _stats.setdefault(solver, SolverStats())
+        stats.solves += 1
+        stats.evaluations += result.evaluations
+        stats.iterations += result.iterations
+    return result
+
+
+def solver_stats() -> dict[str, SolverStats]:
+    """Return a copy of the per-solver evaluation counters."""
+    with _stats_lock:
+        return {name: SolverStats(**asdict(s)) for name, s in _stats.items()}
+
+
+def reset_solver_stats() -> None:
+    """Zero the per-solver evaluation counters."""
+    with _stats_lock:
+        _stats.clear()
+
+
+def brent(f, a, b, *, xtol=1e-10, rtol=4 * np.finfo(float).eps, maxiter=100, fa=None, fb=None) -> RootResult:
+    """Find a root of a scalar function in [a, b] with Brent's method.
+
+    Args:
+        f: Scalar function with opposite signs at a and b.
+        a: Lower bound of the bracket.
+        b: Upper bound of the bracket.
+        xtol: Absolute tolerance on the root.
+        rtol: Relative tolerance on the root.
+        maxiter: Maximum number of iterations.
+        fa: f(a), if already known.
+        fb: f(b), if already known.
+
+    Returns:
+        RootResult with a float root.
+
+    Raises:
+        ValueError: If f(a) and f(b) have the same sign.
+    """
+    evaluations = 0
+    if fa is None:
+        fa = f(a)
+        evaluations += 1
+    if fb is None:
+        fb = f(b)
+        evaluations += 1
+    fa, fb = float(fa), float(fb)
+    if fa == 0:
+        return _record("brent", RootResult(float(a), True, 0, evaluations))
+    if fb == 0:
+        return _record("brent", RootResult(float(b), True, 0, evaluations))
+    if fa * fb > 0:
+        raise ValueError("Root is not bracketed: f(a) and f(b) have the same sign")
+
+    # b is the best estimate, a the previous one, c the contrapoint (root in [b, c])
+    c, fc = a, fa
+    d = e = b - a
+    for iteration in range(1, maxiter + 1):
+        if fb * fc > 0:
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+
+        tol = 2 * rtol * abs(b) + xtol / 2
+        m = (c - b) / 2
+        if abs(m) <= tol or fb == 0:
+            return _record("brent", RootResult(float(b), True, iteration - 1, evaluations))
+
+        if abs(e) >= tol and abs(fa) > abs(fb):
+            # Interpolate: secant if a == c, inverse quadratic otherwise
+            s = fb / fa
+            if a == c:
+                p = 2 * m * s
+                q = 1 - s
+            else:
+                q = fa / fc
+                r = fb / fc
+                p = s * (2 * m * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if p > 0:
+                q = -q
+            else:
+                p = -p
+            if 2 * p < min(3 * m * q - abs(tol * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = m
+        else:
+            d = e = m
+
+        a, fa = b, fb
+        b = b + (d if abs(d) > tol else (tol if m > 0 else -tol))
+        fb = float(f(b))
+        evaluations += 1
+
+    return _record("brent", RootResult(float(b), False, maxiter, evaluations))
+
+
+def illinois(f, a, b, *, xtol=1e-10, maxiter=100, fa=None, fb=None) -> RootResult:
+    """Find roots of independent brackets at once with the Illinois method.
+
+    f is called with an array of abscissae (one per bracket) and must return
+    the array of function values; scalar brackets work the same way.
+
+    Args:
+        f: Vectorized function with opposite signs at a and b.
+        a: Lower bounds, scalar or array.
+        b: Upper bounds, scalar or array.
+        xtol: Absolute tolerance on the bracket width.
+        maxiter: Maximum number of iterations.
+        fa: f(a), if already known.
+        fb: f(b), if already known.
+
+    Returns:
+        RootResult whose root and converged fields match the bracket shape.
+        Brackets without a sign change are returned unconverged, at the
+        endpoint with the smaller |f|.
+    """
+    evaluations = 0
+    if fa is None:
+        fa = f(a)
+        evaluations += 1
+    if fb is None:
+        fb = f(b)
+        evaluations += 1
+    a, b, fa, fb = (np.array(v, dtype=float) for v in np.broadcast_arrays(a, b, fa, fb))
+
+    # Brackets without a sign change cannot be solved; report them as not
+    # converged at the endpoint closest to a root instead of failing the batch.
+    unbracketed = fa * fb > 0
+    if np.any(unbracketed):
+        closest = np.where(np.abs(fa) < np.abs(fb), a, b)
+        closest_f = np.where(np.abs(fa) < np.abs(fb), fa, fb)
+        a = np.where(unbracketed, closest, a)
+        b = np.where(unbracketed, closest, b)
+        fa = np.where(unbracketed, closest_f, fa)
+        fb = np.where(unbracketed, closest_f, fb)
+
+    if a.size == 1:
+        # A single bracket (e.g. a one-subject batch): plain floats are much
+        # cheaper than masked array updates.
+        root, converged, iteration, calls = _illinois_scalar(
+            f, a.item(), b.item(), fa.item(), fb.item(), xtol, maxiter
+        )
+        converged = converged and not unbracketed.item()
+        if a.ndim:
+            root, converged = np.full(a.shape, root), np.full(a.shape, converged)
+        return _record("illinois", RootResult(root, converged, iteration, evaluations + calls))
+
+    # Invariant: the root lies between b (latest estimate) and a (retained end)
+    done = (np.abs(b - a) <= xtol) | (fa == 0) | (fb == 0)
+    b = np.where(fa == 0, a, b)
+    fb = np.where(fa == 0, 0.0, fb)
+    iteration = 0
+    while not np.all(done) and iteration < maxiter:
+        iteration += 1
+        denom = fb - fa
+        c = np.where(denom != 0, b - fb * (b - a) / np.where(denom != 0, denom, 1), (a + b) / 2)
+        fc = np.asarray(f(c), dtype=float)
+        evaluations += 1
+
+        # Sign change between b and c: keep b as the retained end.
+        # Otherwise keep a, halving its value (the Illinois modification).
+        active = ~done
+        crossed = active & (fc * fb < 0)
+        kept = active & ~crossed
+        a[crossed] = b[crossed]
+        fa[crossed] = fb[crossed]
+        fa[kept] /= 2
+        b[active] = c[active]
+        fb[active] = fc[active]
+        done |= (np.abs(b - a) <= xtol) | (fb == 0)
+
+    return _record("illinois", RootResult(b, done & ~unbracketed, iteration, evaluations))
+
+
+def _illinois_scalar(f, a, b, fa, fb, xtol, maxiter):
+    """Illinois iteration on a single bracket; returns (root, converged, iterations, evaluations)."""
+    if fa == 0:
+        return a, True, 0, 0
+    evaluations = 0
+    for iteration in range(1, maxiter + 1):
+        if abs(b - a) <= xtol or fb == 0:
+            return b, True, iteration - 1, evaluations
+        c = b - fb * (b - a) / (fb - fa) if fb != fa else (a + b) / 2
+        fc = np.asarray(f(c), dtype=float).item()
+        evaluations += 1
+        if fc * fb < 0:
+            a, fa = b, fb
+        else:
+            fa /= 2
+        b, fb = c, fc
+    converged = abs(b - a) <= xtol or fb == 0
+    return b, converged, maxiter, evaluations
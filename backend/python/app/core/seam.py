@@ -0,0 +1,242 @@
+"""Seam allowance: offset cutting lines around closed piece outlines.
+
+A piece outline is a closed chain of edges, each a straight line or a cubic
+Bezier, given in drawing order. offset_outline() flattens every edge to the
+print tolerance, pushes each flattened point outward along the curve normal
+by the allowance of its edge, fills the gaps at corners with a miter, bevel
+or square join, and finally cuts out the loops that offsetting creates at
+concave corners and where a curve is tighter than its allowance.
+
+Positions, normals and joins are computed for all edges in one vectorized
+pass; loop removal tests every pair of polygon segments at once.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Mapping
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from app.core import bezier
+from app.core.flatten import flatten_params
+
+# Default allowance (cm) added around every edge of a piece
+DEFAULT_SEAM_ALLOWANCE = 1.0
+
+JOINS = ("miter", "bevel", "square")
+
+# Parameter nudge so tangents are taken inside the segment, where a
+# control point coinciding with an end point does not zero the derivative
+_T_EPS = 1e-6
+
+
+def _cross(a: NDArray, b: NDArray) -> NDArray:
+    return a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0]
+
+
+@dataclass(frozen=True)
+class Outline:
+    """Closed outline of a piece: K named edges as cubic control points (K, 4, 2)."""
+    names: tuple[str, ...]
+    ctrl: NDArray[np.float64]
+
+    @classmethod
+    def from_edges(cls, edges: Mapping[str, ArrayLike], tol: float = 1e-6) -> Outline:
+        """Build an outline from edges in drawing order.
+
+        Args:
+            edges: Edge name -> (2, 2) line end points or (4, 2) Bezier
+                   control points. Each edge must start where the previous
+                   one ends, and the last must end where the first starts.
+            tol: Largest gap (cm) accepted between consecutive edges.
+
+        Raises:
+            ValueError: If an edge has the wrong shape or the chain is not closed.
+        """
+        segments = []
+        for name, points in edges.items():
+            points = np.asarray(points, dtype=float)
+            if points.shape == (2, 2):
+                points = points[0] + np.linspace(0, 1, 4)[:, None] * (points[1] - points[0])
+            elif points.shape != (4, 2):
+                raise ValueError(f"Edge {name!r} must be a (2, 2) line or (4, 2) Bezier, got {points.shape}")
+            segments.append(points)
+        ctrl = np.stack(segments)
+        gaps = np.linalg.norm(ctrl[:, 3] - np.roll(ctrl[:, 0], -1, axis=0), axis=-1)
+        if np.any(gaps > tol):
+            k = int(np.argmax(gaps > tol))
+            raise ValueError(f"Outline is not closed after edge {list(edges)[k]!r} (gap {gaps[k]:.4g} cm)")
+        return cls(names=tuple(edges), ctrl=ctrl)
+
+    def allowances(self, default: float = DEFAULT_SEAM_ALLOWANCE,
+                   overrides: Mapping[str, float] | None = None) -> NDArray[np.float64]:
+        """Allowance of every edge, shape (K,).
+
+        An override applies to the edge of that exact name, or else to every
+        edge having it as one of its underscore-separated words ('hem',
+        'armhole', 'front', ...); exact names win, then the first matching
+        key in the order given.
+        """
+        overrides = overrides or {}
+        values = []
+        for name in self.names:
+            if name in overrides:
+                values.append(overrides[name])
+                continue
+            words = set(name.split("_"))
+            values.append(next((v for key, v in overrides.items() if key in words), default))
+        return np.asarray(values, dtype=float)
+
+    def matched(self, overrides: Mapping[str, float]) -> set[str]:
+        """Keys of overrides that name an edge of this outline or one of its words."""
+        words = set(self.names).union(*(name.split("_") for name in self.names))
+        return words & set(overrides)
+
+    def smooth_joints(self) -> NDArray[np.bool_]:
+        """Which joints must be tangent-continuous, shape (K,); entry k is the end of edge k.
+
+        Edges are named <kind>_<from>_<to>; the joint between two consecutive
+        edges of the same kind ('side_A1_B1' then 'side_B1_C1', or two
+        segments of the sleeve cap) is a point of one seam, where the curve
+        has to stay smooth. Joints between edges of different kinds are
+        corners.
+        """
+        kinds = [name.rsplit("_", 2)[0] for name in self.names]
+        return np.array([a == b for a, b in zip(kinds, kinds[1:] + kinds[:1])])
+
+
+def signed_area(polygon: ArrayLike) -> float:
+    """Shoelace area of a closed polygon (N, 2); positive when counter-clockwise."""
+    p = np.asarray(polygon, dtype=float)
+    return 0.5 * float(_cross(p, np.roll(p, -1, axis=0)).sum())
+
+
+def _crossings(polygon: NDArray[np.float64]) -> tuple[NDArray[np.int64], NDArray[np.int64], NDArray[np.float64]]:
+    """Every proper crossing of two non-adjacent segments of a closed polygon.
+
+    Returns:
+        (i, j, u): segment indices i < j and the parameter of the crossing
+        along segment i.
+    """
+    n = len(polygon)
+    a = polygon
+    r = np.roll(polygon, -1, axis=0) - a
+    denom = _cross(r[:, None], r[None, :])
+    qp = a[None, :] - a[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        u = _cross(qp, r[None, :]) / denom
+        v = _cross(qp, r[:, None]) / denom
+    idx = np.arange(n)
+    candidate = (idx[None, :] > idx[:, None] + 1) & ~((idx[:, None] == 0) & (idx[None, :] == n - 1))
+    hit = candidate & (denom != 0) & (u >= 0) & (u < 1) & (v >= 0) & (v < 1)
+    i, j = np.nonzero(hit)
+    return i, j, u[i, j]
+
+
+def remove_self_intersections(polygon: ArrayLike, orientation: float | None = None) -> NDArray[np.float64]:
+    """Cut the loops out of a self-intersecting closed polygon.
+
+    At each crossing the polygon splits in two loops; the one kept has the
+    polygon's overall orientation and, between two such loops, the larger
+    area. The smallest loops are resolved first.
+
+    Args:
+        polygon: Closed polygon (N, 2), first point not repeated.
+        orientation: Sign of the orientation to keep (+1 counter-clockwise);
+                     defaults to the orientation of the input.
+
+    Returns:
+        Simple polygon (M, 2), M <= N.
+    """
+    p = np.asarray(polygon, dtype=float)
+    if orientation is None:
+        orientation = np.sign(signed_area(p)) or 1.0
+    while len(p) > 3:
+        i, j, u = _crossings(p)
+        if len(i) == 0:
+            break
+        n = len(p)
+        size = np.minimum(j - i, n - (j - i))
+        k = int(np.argmin(size))
+        i, j, u = int(i[k]), int(j[k]), u[k]
+        cross_point = p[i] + u * (p[(i + 1) % n] - p[i])
+        inner = np.vstack([cross_point, p[i + 1:j + 1]])
+        outer = np.vstack([p[:i + 1], cross_point, p[j + 1:]])
+        keys = [(np.sign(signed_area(loop)) == orientation, abs(signed_area(loop))) for loop in (inner, outer)]
+        p = inner if keys[0] > keys[1] else outer
+    return p
+
+
+def offset_outline(
+    outline: Outline,
+    allowance: float | ArrayLike = DEFAULT_SEAM_ALLOWANCE,
+    *,
+    join: str = "miter",
+    miter_limit: float = 4.0,
+    tolerance: float | str = "print",
+) -> NDArray[np.float64]:
+    """Cutting line of a piece: its outline offset outward by the seam allowance.
+
+    Args:
+        outline: Closed piece outline, in either orientation.
+        allowance: One allowance in cm, or one per edge (K,). Zero-allowance
+                   edges (folds) keep the stitch line.
+        join: Corner join where the offsets of two edges separate: "miter"
+              (extend both to their intersection), "bevel" (straight
+              cut between them) or "square" (extend each by its allowance).
+        miter_limit: Miters longer than miter_limit x allowance from the
+                     corner are beveled.
+        tolerance: Flattening tolerance of the curves (cm or preset name).
+
+    Returns:
+        Simple closed polygon (P, 2) in the orientation of the outline,
+        first point not repeated.
+
+    Raises:
+        ValueError: If join is unknown or an allowance is negative.
+    """
+    if join not in JOINS:
+        raise ValueError(f"Unknown join {join!r}; expected one of {JOINS}")
+    ctrl = outline.ctrl
+    k = len(ctrl)
+    d = np.broadcast_to(np.asarray(allowance, dtype=float), (k,))
+    if np.any(d < 0):
+        raise ValueError("Seam allowances must be non-negative")
+
+    owner, t, offsets = flatten_params(ctrl, tolerance)
+    points = bezier.point(ctrl[owner], t)
+    tangents = bezier.tangent(ctrl[owner], np.clip(t, _T_EPS, 1 - _T_EPS))
+    orientation = np.sign(signed_area(points)) or 1.0
+    # Outward normal: right of the direction of travel for a counter-clockwise outline
+    normals = orientation * np.stack([tangents[:, 1], -tangents[:, 0]], axis=-1)
+    shifted = points + d[owner, None] * normals
+
+    # Joins between the end of each edge and the start of the next
+    nxt = np.roll(np.arange(k), -1)
+    end, start = offsets[1:] - 1, offsets[nxt]
+    t_in, t_out = tangents[end], tangents[start]
+    q_in, q_out = shifted[end], shifted[start]
+    d_in, d_out = d, d[nxt]
+    turn = orientation * _cross(t_in, t_out)
+    convex = (turn > 1e-9) & (np.maximum(d_in, d_out) > 0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        reach = _cross(q_out - q_in, t_out) / _cross(t_in, t_out)
+    miter = q_in + reach[:, None] * t_in
+    corner = ctrl[:, 3]
+    miter_ok = convex & (np.linalg.norm(miter - corner, axis=-1) <= miter_limit * np.maximum(d_in, d_out))
+
+    pieces = []
+    for e in range(k):
+        pieces.append(shifted[offsets[e]:offsets[e + 1]])
+        if join == "miter" and miter_ok[e]:
+            pieces.append(miter[e:e + 1])
+        elif join == "square" and convex[e]:
+            pieces.append(np.stack([q_in[e] + d_in[e] * t_in[e], q_out[e] - d_out[e] * t_out[e]]))
+    polygon = np.concatenate(pieces)
+
+    # Drop repeated points (smooth joins, zero allowances) before loop removal
+    keep = np.linalg.norm(polygon - np.roll(polygon, 1, axis=0), axis=-1) > 1e-9
+    return remove_self_intersections(polygon[keep], orientation)
@@ -0,0 +1,86 @@
+"""Single-flight coalescing of identical concurrent computations.
+
+When several callers ask for the same key at the same time, only the first
+(the leader) runs the computation; the others await the leader's outcome and
+receive the same result or exception. Unlike a cache, nothing is kept once
+the computation finishes: the next call for that key starts a new flight.
+
+Flights are concurrent.futures.Future objects, so callers on different
+threads or event loops can share them. The computation runs in a task of
+its own rather than in the leader's: a leader that is cancelled (its
+client went away) stops waiting like any follower, and the computation
+still completes for everyone else.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Hashable
+
+
+@dataclass
+class SingleFlightStats:
+    """Counters of a SingleFlight group."""
+    leaders: int = 0
+    coalesced: int = 0
+    in_flight: int = 0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class SingleFlight:
+    """Deduplicates concurrent async computations by key."""
+
+    def __init__(self):
+        self._flights: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._stats = SingleFlightStats()
+        # Running computations, referenced until they finish
+        self._tasks: set[asyncio.Task] = set()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the result of fn(), shared with concurrent calls for the same key.
+
+        Cancelling a caller, the leader included, only stops that caller's
+        wait; fn() runs to completion while the flight lasts.
+
+        Args:
+            key: Identity of the computation (e.g. a canonical request hash).
+            fn: Coroutine function computing the result; only the leader calls it.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = Future()
+                self._stats.leaders += 1
+            else:
+                self._stats.coalesced += 1
+        if leader:
+            task = asyncio.ensure_future(fn())
+            self._tasks.add(task)
+            task.add_done_callback(lambda done: self._land(key, flight, done))
+        return await asyncio.shield(asyncio.wrap_future(flight))
+
+    def _land(self, key: Hashable, flight: Future, task: asyncio.Task) -> None:
+        """End a flight with the outcome of its computation."""
+        self._tasks.discard(task)
+        with self._lock:
+            del self._flights[key]
+        if task.cancelled():
+            flight.cancel()
+        elif task.exception() is not None:
+            flight.set_exception(task.exception())
+        else:
+            flight.set_result(task.result())
+
+    def stats(self) -> SingleFlightStats:
+        """Return a snapshot of the counters."""
+        with self._lock:
+            return SingleFlightStats(
+                leaders=self._stats.leaders,
+                coalesced=self._stats.coalesced,
+                in_flight=len(self._flights),
+            )
@@ -1,18 +1,119 @@
 """Base class for patterns with fabric stretch support."""
 
+import copy
+import dataclasses
+
 import numpy as np
-from numpy.typing import NDArray
+from numpy.typing import ArrayLike, NDArray
+
+from app.core.bezier import arc_length
+from app.core.diagnostics import collect, report
+from app.core.display_list import VARIANT_LAYERS, DisplayList
+from app.core.point_graph import HELPER, VALUE, Drafting, PointGraph, draft_inputs
+from app.core.point_table import PointTable, PointView
+from app.core.seam import DEFAULT_SEAM_ALLOWANCE, Outline, offset_outline
+from app.core.validation import Issue, validate_outline
+
+
+def stretch_factors(horizontal: ArrayLike = 0.0, vertical: ArrayLike = 0.0, usage: ArrayLike = 1) -> tuple:
+    """Return the (horizontal, vertical) scale factors for a fabric stretch.
+
+    Accepts scalars or arrays (one entry per stretch value).
+    """
+    h = 1 / (1 + np.asarray(horizontal, dtype=float) * usage)
+    v = 1 / (1 + np.asarray(vertical, dtype=float) * usage)
+    return h, v
 
 
 class StretchPattern:
-    """Base class for pattern with stretch support."""
+    """Base class for pattern with stretch support.
+
+    Points are stored in a PointTable; points and helper_points are its
+    dict-like construction and helper views. A drafted pattern can be treated
+    as an immutable base: with_stretch() returns a stretched child and leaves
+    the base untouched, so one draft serves any number of fabrics.
+
+    Subclasses declare their drafting as a PointGraph (graph) read from the
+    dataclasses named in graph_inputs, and call draft() once their inputs are
+    set; with_changes() then redrafts only what a changed input affects.
+    They implement _plot(r), drawing every layer into a DisplayList;
+    the recording is made once and shared by all renders until the geometry
+    changes. They describe each piece's closed stitch line in outlines(), from
+    which cut_lines() derives the cutting lines at the seam allowance and
+    validate() checks the geometry.
+    """
+
+    # Drafting graph, and the attributes holding its input dataclasses
+    graph: PointGraph | None = None
+    graph_inputs: tuple[str, ...] = ()
+    # The drafting y axis points up (renderers flip it)
+    y_flip: bool = False
 
     def __init__(self):
         self.stretched: bool = False
         self.h_factor: float = 1.0
         self.v_factor: float = 1.0
-        self.points: dict[str, NDArray[np.float64]] = {}
-        self.helper_points: dict[str, NDArray[np.float64]] = {}
+        self.table = PointTable()
+        self.points: PointView = self.table.points
+        self.helper_points: PointView = self.table.helper_points
+        self.seam_allowance: float = DEFAULT_SEAM_ALLOWANCE
+        self.edge_allowances: dict[str, float] = {}
+        self._display_list: DisplayList | None = None
+        self._issues: tuple[Issue, ...] | None = None
+        self.drafting: Drafting | None = None
+        # Points whose coordinates differ from the parent's (see with_changes)
+        self.changed_points: frozenset[str] = frozenset()
+
+    def _draft_inputs(self) -> dict:
+        return draft_inputs(*(getattr(self, attr) for attr in self.graph_inputs))
+
+    def _write_points(self, names) -> None:
+        """Copy points of the drafting into the table, at the pattern's stretch."""
+        factors = np.array([self.h_factor, self.v_factor])
+        for name in names:
+            view = self.helper_points if self.graph.nodes[name].kind == HELPER else self.points
+            view[name] = self.drafting[name][0] * factors
+
+    def draft(self) -> None:
+        """Evaluate the drafting graph and fill the point table."""
+        self.drafting = self.graph.evaluate(self._draft_inputs())
+        self._write_points(name for name, node in self.graph.nodes.items() if node.kind != VALUE)
+
+    def with_changes(self, **values: float) -> "StretchPattern":
+        """Return a child with some measurements or control parameters changed.
+
+        Only the points downstream of the changed values are recomputed (see
+        app.core.point_graph); the child's changed_points names the points
+        whose coordinates moved. Stretch and seam allowances carry over, and
+        this pattern is left unchanged.
+
+        Args:
+            **values: New values, by measurement or control parameter field name.
+
+        Raises:
+            ValueError: If a name is not a field of the pattern's inputs.
+        """
+        child = copy.copy(self)
+        known = set()
+        for attr in self.graph_inputs:
+            inputs = getattr(self, attr)
+            names = {f.name for f in dataclasses.fields(inputs)}
+            known |= names
+            ours = {name: value for name, value in values.items() if name in names}
+            if ours:
+                setattr(child, attr, dataclasses.replace(inputs, **ours))
+        unknown = sorted(values.keys() - known)
+        if unknown:
+            raise ValueError(f"Unknown measurements or control parameters: {unknown}")
+        child.table = self.table.copy()
+        child.points = child.table.points
+        child.helper_points = child.table.helper_points
+        child._display_list = None
+        child._issues = None
+        child.drafting = self.drafting.update(child._draft_inputs())
+        child.changed_points = child.drafting.changed_points()
+        child._write_points(name for name in child.graph.nodes if name in child.changed_points)
+        return child
 
     def stretch(self, horizontal: float = 0.0, vertical: float = 0.0, usage: float = 1) -> None:
         """Apply stretch factors in place.
@@ -24,14 +125,148 @@ class StretchPattern:
         """
         if self.stretched:
             raise ValueError("Can not stretch a pattern that is already stretched.")
-        h = 1 / (1 + horizontal * usage)
-        v = 1 / (1 + vertical * usage)
-        self.h_factor = h
-        self.v_factor = v
-        for key in self.points:
-            self.points[key][0] *= h
-            self.points[key][1] *= v
-        for key in self.helper_points:
-            self.helper_points[key][0] *= h
-            self.helper_points[key][1] *= v
+        h, v = stretch_factors(horizontal, vertical, usage)
+        self.h_factor = float(h)
+        self.v_factor = float(v)
+        self.table.scale(h, v)
         self.stretched = True
+        self._display_list = None
+        self._issues = None
+
+    def with_stretch(self, horizontal: float = 0.0, vertical: float = 0.0, usage: float = 1) -> "StretchPattern":
+        """Return a stretched child of this pattern, leaving this one unchanged.
+
+        The child shares measurements and control parameters with its parent
+        and owns a copy of the point table.
+
+        Args:
+            horizontal: Fabric horizontal stretch capacity (0.0 = none, 1.0 = 100%).
+            vertical: Fabric vertical stretch capacity (0.0 = none, 1.0 = 100%).
+            usage: How much of the stretch to use (0.5 = 50% for comfort).
+        """
+        child = copy.copy(self)
+        child.table = self.table.copy()
+        child.points = child.table.points
+        child.helper_points = child.table.helper_points
+        child._display_list = None
+        child._issues = None
+        child.stretch(horizontal, vertical, usage)
+        return child
+
+    def with_seam_allowance(self, allowance: float = DEFAULT_SEAM_ALLOWANCE,
+                            edges: dict[str, float] | None = None) -> "StretchPattern":
+        """Return a child of this pattern cut with another seam allowance.
+
+        The child shares the point table with its parent; only its recording
+        differs. Returns this pattern itself when the allowances are unchanged,
+        so its recording keeps being reused.
+
+        Args:
+            allowance: Allowance in cm for every edge (0 draws no cut line).
+            edges: Per-edge overrides, by edge name or edge name word
+                   (see Outline.allowances).
+        """
+        edges = dict(edges or {})
+        if float(allowance) == self.seam_allowance and edges == self.edge_allowances:
+            return self
+        child = copy.copy(self)
+        child.seam_allowance = float(allowance)
+        child.edge_allowances = edges
+        child._display_list = None
+        return child
+
+    def stretched_coords(self, horizontal: ArrayLike, vertical: ArrayLike, usage: ArrayLike = 1) -> NDArray[np.float64]:
+        """Point coordinates for S stretch values at once, without modifying the pattern.
+
+        Args:
+            horizontal: (S,) horizontal stretch capacities.
+            vertical: (S,) vertical stretch capacities.
+            usage: (S,) or scalar stretch usage.
+
+        Returns:
+            (S, n, 2) array, rows in the order of self.table.names.
+        """
+        h, v = np.broadcast_arrays(*stretch_factors(horizontal, vertical, usage))
+        factors = np.stack([np.atleast_1d(h), np.atleast_1d(v)], axis=-1)
+        return self.table.coords[None, :, :] * factors[:, None, :]
+
+    def bezier_segments(self) -> dict[str, NDArray[np.float64]]:
+        """Control points (4, 2) of every outline curve, by curve name."""
+        raise NotImplementedError
+
+    def curve_lengths(self) -> dict[str, float]:
+        """Arc length of every outline curve, by curve name, in cm."""
+        segments = self.bezier_segments()
+        lengths = arc_length(np.stack(list(segments.values())))
+        return dict(zip(segments, lengths.tolist()))
+
+    def outlines(self) -> dict[str, Outline]:
+        """Closed stitch line of every piece, by piece name, in drafting coordinates."""
+        raise NotImplementedError
+
+    def piece_transforms(self) -> dict[str, tuple[float, ...]]:
+        """Affine transform (a, b, c, d, e, f), as in SVG, placing each piece on the sheet.
+
+        Pieces not listed are drawn in drafting coordinates.
+        """
+        return {}
+
+    def cut_lines(self) -> dict[str, NDArray[np.float64]]:
+        """Cutting line (P, 2) of every piece at the pattern's seam allowances.
+
+        Pieces whose edges all have a zero allowance are left out, and so
+        are pieces whose outline is not finite (measurements the drafting
+        cannot solve), which are reported instead. Edge allowance keys
+        matching no edge are reported too.
+        """
+        lines = {}
+        unmatched = set(self.edge_allowances)
+        for piece, outline in self.outlines().items():
+            unmatched -= outline.matched(self.edge_allowances)
+            if not np.isfinite(outline.ctrl).all():
+                report(f"Piece '{piece}' has a non-finite outline; its cutting line is left out")
+                continue
+            allowance = outline.allowances(self.seam_allowance, self.edge_allowances)
+            if np.any(allowance > 0):
+                lines[piece] = offset_outline(outline, allowance)
+        for key in sorted(unmatched):
+            report(f"Edge allowance '{key}' matches no edge of the pattern and is ignored")
+        return lines
+
+    def validate(self) -> tuple[Issue, ...]:
+        """Geometric issues of every piece outline (see app.core.validation).
+
+        Computed once per geometry: children sharing the point table (see
+        with_seam_allowance) share the result, stretched children recompute it.
+        """
+        if self._issues is None:
+            self._issues = tuple(
+                issue for outline in self.outlines().values() for issue in validate_outline(outline)
+            )
+        return self._issues
+
+    def _plot(self, r) -> None:
+        raise NotImplementedError
+
+    def record(self) -> DisplayList:
+        """Return the display list of the pattern, plotting it on first use.
+
+        The messages of validate() and the diagnostics reported while plotting
+        are kept on the recording and reported again by every replay.
+        """
+        if self._display_list is None:
+            dl = DisplayList()
+            with collect() as messages:
+                for issue in self.validate():
+                    report(issue.message)
+                self._plot(dl)
+            dl.warnings = messages
+            self._display_list = dl.freeze()
+        return self._display_list
+
+    def replay(self, r, variant: str = "construction") -> None:
+        """Draw the layers of a variant ("construction" or "pattern") into a renderer."""
+        dl = self.record()
+        for message in dl.warnings:
+            report(message)
+        dl.replay(r, VARIANT_LAYERS[variant])
@@ -3,8 +3,17 @@
 Provides a drawing API that assembles native SVG elements, replacing matplotlib
 for pattern output. Coordinates are in cm; the SVG uses mm units for correct
 physical sizing when printed.
+
+SVGRenderer writes one self-styled element per primitive. CompactSVGRenderer
+draws the same picture in a fraction of the bytes, for clients that support
+<style> and <use> (browsers; not react-native-svg's SvgXml).
 """
 
+import hashlib
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
 CM_TO_MM = 10.0
 
 
@@ -145,3 +154,292 @@ class SVGRenderer:
         body = '\n'.join(f'  {el}' for el in self._elements)
         footer = '\n</svg>\n'
         return header + body + footer
+
+
+def _format_units(k: NDArray[np.int64], precision: int) -> list[str]:
+    """Shortest decimal strings of k / 10**precision, e.g. '12', '-.5', '3.25'.
+
+    Numbers are grouped by the decimals they need once trailing zeros are
+    dropped, and each group is formatted by a single % operation.
+    """
+    scale = 10 ** precision
+    decimals = np.full(k.shape, precision)
+    for j in range(1, precision + 1):
+        decimals[k % 10 ** j == 0] = precision - j
+    out = np.empty(len(k), dtype=object)
+    for q in range(precision + 1):
+        mask = decimals == q
+        count = int(np.count_nonzero(mask))
+        if count == 0:
+            continue
+        text = (f'\0%.{q}f' * count) % tuple((k[mask] / scale).tolist())
+        if q:
+            text = text.replace('\x000.', '\x00.').replace('\x00-0.', '\x00-.')
+        out[mask] = text.split('\0')[1:]
+    return out.tolist()
+
+
+def format_numbers(values: ArrayLike, precision: int = 2) -> list[str]:
+    """Shortest decimal strings of values rounded to precision decimals."""
+    k = np.rint(np.asarray(values, dtype=float).ravel() * 10 ** precision).astype(np.int64)
+    return _format_units(k, precision)
+
+
+def _short(value: float, precision: int) -> str:
+    """Shortest decimal string of one value (as format_numbers)."""
+    text = f'{value:.{precision}f}'
+    if '.' in text:
+        text = text.rstrip('0').rstrip('.')
+    text = text.replace('0.', '.', 1) if text.lstrip('-').startswith('0.') else text
+    return '0' if text == '-0' else text
+
+
+# Axis sign flips under which a repeated path is recognized: shifted,
+# mirrored left to right or top to bottom, and turned half a turn
+_FLIPS = ((1, 1), (-1, 1), (1, -1), (-1, -1))
+
+
+def _content_id(prefix: str, content: str, length: int = 4) -> str:
+    # Ids and class names derived from what they name, so that several
+    # documents inlined in one page never give one name two meanings
+    return prefix + hashlib.sha1(content.encode()).hexdigest()[:length]
+
+
+def _escape(text: str) -> str:
+    return str(text).replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+class CompactSVGRenderer(SVGRenderer):
+    """Renderer emitting the same drawing as SVGRenderer in a compact encoding.
+
+    - Consecutive strokes (lines, polylines, Beziers) of one style become a
+      single <path> of relative commands; a stroke starting where the
+      previous one ended continues its subpath.
+    - Stroke, fill and font attributes are <style> classes.
+    - Point markers are one <symbol> per radius and colour, placed by <use>.
+    - A path repeating an earlier one shifted, mirrored or turned half a
+      turn is a <use> of it with an offset or a transform.
+    - Coordinates are rounded to `precision` decimals of a mm, relative to
+      the start of their path, and formatted in one vectorized pass.
+    """
+
+    def __init__(self, bounds, *, y_flip=False, title=None, precision=2):
+        """Initialize the renderer.
+
+        Args:
+            bounds: (min_x, max_x, min_y, max_y) in cm.
+            y_flip: If True, flip the y-axis (mathematical coords, y up).
+            title: Optional title string (not drawn, as with SVGRenderer).
+            precision: Decimals kept on coordinates in mm.
+        """
+        super().__init__(bounds, y_flip=y_flip, title=title)
+        self.precision = precision
+        # (kind, style key, first point, end point, text content)
+        self._primitives: list[tuple] = []
+        self._points: list[tuple[float, float]] = []
+
+    def _add(self, kind, points, key, content=None):
+        start = len(self._points)
+        self._points.extend((float(x), float(y)) for x, y in points)
+        self._primitives.append((kind, key, start, len(self._points), content))
+
+    def line(self, x1, y1, x2, y2, color='black', style='-', width=1):
+        """Draw a line from (x1, y1) to (x2, y2)."""
+        self._add('l', ((x1, y1), (x2, y2)), (color, style, width))
+
+    def polyline(self, points, color='black', style='-', width=1):
+        """Draw a polyline through a sequence of (x, y) points."""
+        self._add('l', points, (color, style, width))
+
+    def bezier(self, p0, p1, p2, p3, color='black', style='-', width=1):
+        """Draw a cubic Bezier curve."""
+        self._add('c', (p0, p1, p2, p3), (color, style, width))
+
+    def circle(self, x, y, r, color='black'):
+        """Draw a filled circle at (x, y) with radius r."""
+        self._add('dot', ((x, y),), (r, color))
+
+    def text(self, x, y, content, size=8, color='black', ha='left', fontweight='normal'):
+        """Draw text at (x, y) with the given size and alignment."""
+        self._add('text', ((x, y),), (size, color, ha, fontweight), str(content))
+
+    # -- output ---------------------------------------------------------------
+
+    def to_svg(self) -> str:
+        """Render and return the complete SVG document as a string."""
+        scale = 10 ** self.precision
+        pts = np.asarray(self._points, dtype=float).reshape(-1, 2)
+        xy = np.column_stack([
+            _mm(pts[:, 0] - self.min_x),
+            _mm(self.max_y - pts[:, 1]) if self.y_flip else _mm(pts[:, 1] - self.min_y),
+        ])
+        # Output is a list of strings and of indices into numbers, the
+        # integer arrays (in 1/scale mm) formatted together at the end
+        out: list = []
+        numbers: list[NDArray[np.int64]] = []
+        # CSS rule -> class name
+        styles: dict[str, str] = {}
+        symbols: dict[str, str] = {}
+        # Path shape -> (index in out of its id slot, its id, start point)
+        shapes: dict[bytes, tuple[int, str, NDArray]] = {}
+
+        def emit(values) -> None:
+            numbers.append(np.asarray(values, dtype=np.int64).ravel())
+            out.append(len(numbers) - 1)
+
+        def css_class(prefix: str, rule: str) -> str:
+            name = styles.get(rule)
+            if name is None:
+                name = styles[rule] = _content_id(prefix, rule)
+            return name
+
+        # Style key -> CSS class, or symbol id for point markers
+        classes: dict[tuple, str] = {}
+        items = self._primitives
+        # Positions of point markers and texts, formatted in one pass
+        anchors = [item[2] for item in items if item[0] in ('dot', 'text')]
+        anchor_strings = iter(_format_units(np.rint(xy[anchors] * scale).astype(np.int64).ravel(), self.precision))
+        i = 0
+        while i < len(items):
+            kind, key = items[i][:2]
+            if kind in ('l', 'c'):
+                j = i
+                while j < len(items) and items[j][0] in ('l', 'c') and items[j][1] == key:
+                    j += 1
+                if key not in classes:
+                    color, style, width = key
+                    dash = self.STROKE_DASHARRAY.get(style)
+                    classes[key] = css_class('s', (
+                        f'stroke:{color};stroke-width:{_short(_mm(width * 0.03), self.precision)}'
+                        + (f';stroke-dasharray:{dash}' if dash else '')))
+                self._path(items[i:j], xy, scale, classes[key], out, emit, shapes)
+                i = j
+                continue
+            x, y = next(anchor_strings), next(anchor_strings)
+            if kind == 'dot':
+                symbol = classes.get(key)
+                if symbol is None:
+                    r, color = key
+                    circle = f'<circle r="{_short(_mm(r), self.precision)}" fill="{color}"/>'
+                    symbol = classes[key] = _content_id('d', circle)
+                    symbols[symbol] = circle
+                out.append(f'<use href="#{symbol}" x="{x}" y="{y}"/>')
+            else:
+                name = classes.get(key)
+                if name is None:
+                    size, color, ha, fontweight = key
+                    anchor = {'left': 'start', 'center': 'middle', 'right': 'end'}.get(ha, 'start')
+                    rule = (f'font-size:{_short(_mm(size * 0.035), self.precision)}px;fill:{color}'
+                            + (f';text-anchor:{anchor}' if anchor != 'start' else '')
+                            + (';font-weight:bold' if fontweight == 'bold' else ''))
+                    name = classes[key] = css_class('t', rule)
+                lines = _escape(items[i][4]).split('\n')
+                if len(lines) > 1:
+                    dy = ' dy="1.2em"'
+                    lines = [f'<tspan x="{x}"{dy if n else ""}>{line}</tspan>' for n, line in enumerate(lines)]
+                out.append(f'<text x="{x}" y="{y}" class="{name}">{"".join(lines)}</text>')
+            i += 1
+
+        strings = _format_units(np.concatenate(numbers) if numbers else np.zeros(0, np.int64), self.precision)
+        offsets = np.cumsum([0] + [len(chunk) for chunk in numbers]).tolist()
+        body = ''.join(
+            part if isinstance(part, str) else ' '.join(strings[offsets[part]:offsets[part + 1]]).replace(' -', '-')
+            for part in out
+        )
+        width_mm = _mm(self.max_x - self.min_x)
+        height_mm = _mm(self.max_y - self.min_y)
+        css = 'path{fill:none}text{font-family:Arial,sans-serif}' + ''.join(
+            f'.{name}{{{rule}}}' for rule, name in styles.items())
+        defs = ''.join(f'<symbol id="{name}" overflow="visible">{circle}</symbol>' for name, circle in symbols.items())
+        return (
+            f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {_fmt(width_mm)} {_fmt(height_mm)}">'
+            f'<style>{css}</style>' + (f'<defs>{defs}</defs>' if defs else '') + body + '</svg>\n'
+        )
+
+    def _path(self, run, xy, scale, css, out, emit, shapes) -> None:
+        """Append one <path> for a run of strokes of one style, or a <use> of an identical earlier one."""
+        first, end = run[0][2], run[-1][3]
+        origin = np.rint(xy[first] * scale).astype(np.int64)
+        # Integer positions relative to the path start, so that a shifted
+        # copy of the path gets exactly the same ones
+        relative = np.rint((xy[first:end] - xy[first]) * scale).astype(np.int64)
+        listed = relative.tolist()
+        # Letters and positions of every command
+        letters, positions = [], []
+        current = subpath = None
+        for kind, _, a, b, _ in run:
+            a, b = a - first, b - first
+            if listed[a] != current:
+                letters.append('m' if current is not None else 'M')
+                positions.append(relative[a:a + 1])
+                subpath = listed[a]
+            if kind == 'c':
+                letters.append('c')
+                positions.append(relative[a + 1:b])
+                current = listed[b - 1]
+            elif b - a > 3 and listed[b - 1] == subpath:
+                letters += ['l', 'z']
+                positions += [relative[a + 1:b - 1], relative[:0]]
+                current = subpath
+            elif b - a > 1:
+                letters.append('l')
+                positions.append(relative[a + 1:b])
+                current = listed[b - 1]
+
+        shape = np.concatenate(positions)
+        signature = ''.join(letters).encode() + css.encode()
+        if len(shape) >= 4:
+            for flip in _FLIPS:
+                found = shapes.get(signature + (shape * flip).tobytes())
+                if found is None:
+                    continue
+                slot, path_id, start = found
+                out[slot] = f' id="{path_id}"'
+                if flip == (1, 1):
+                    out.append(f'<use href="#{path_id}" x="')
+                    emit([origin[0] - start[0]])
+                    out.append('" y="')
+                    emit([origin[1] - start[1]])
+                    out.append('"/>')
+                else:
+                    out.append(f'<use href="#{path_id}" transform="matrix({flip[0]} 0 0 {flip[1]} ')
+                    emit(origin - np.multiply(flip, start))
+                    out.append(')"/>')
+                return
+            shapes[signature + shape.tobytes()] = (
+                len(out) + 1, _content_id('p', (signature + shape.tobytes()).hex(), 6), origin)
+
+        # Relative commands; h and v for single axis-aligned lines, and a
+        # letter repeating the previous one is left out
+        commands: list[tuple[str, NDArray]] = []
+        position = subpath = relative[0]
+        for letter, q in zip(letters, positions):
+            if letter == 'z':
+                commands.append(('z', q))
+                position = subpath
+                continue
+            if letter == 'M':
+                values = origin
+            elif letter == 'c':
+                values = q - position
+            else:
+                values = np.diff(q, axis=0, prepend=position[None, :])
+                if len(values) > 1:
+                    # Repeated points draw nothing
+                    values = values[values.any(axis=1)]
+            if letter in 'Mm':
+                subpath = q[0]
+            elif letter == 'l' and len(values) == 1 and not values.all():
+                letter, values = ('h', values[0, :1]) if values[0, 1] == 0 else ('v', values[0, 1:])
+            if commands and commands[-1][0] == letter and letter in 'lchv':
+                commands[-1] = (letter, np.concatenate([commands[-1][1].ravel(), values.ravel()]))
+            else:
+                commands.append((letter, values))
+            position = q[-1]
+
+        out += ['<path', '', f' class="{css}" d="']
+        for letter, values in commands:
+            out.append(letter)
+            if letter != 'z':
+                emit(values)
+        out.append('"/>')
@@ -1,9 +1,37 @@
 """Utility functions for pattern computation."""
 
+import numpy as np
+from numpy.typing import NDArray
+
+
+def xy(x, y) -> NDArray[np.float64]:
+    """Stack x and y coordinates (scalars or (N,) arrays) into points of shape (..., 2)."""
+    return np.stack(np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float)), axis=-1)
+
+
+def perpendicular(v: NDArray[np.float64]) -> NDArray[np.float64]:
+    """Rotate vectors of shape (..., 2) by 90° counter-clockwise."""
+    return np.stack([-v[..., 1], v[..., 0]], axis=-1)
+
+
+def unit(v: NDArray[np.float64]) -> NDArray[np.float64]:
+    """Normalize vectors of shape (..., 2) to unit length."""
+    return v / np.linalg.norm(v, axis=-1, keepdims=True)
+
+
+def orient_towards(v: NDArray[np.float64], target: NDArray[np.float64]) -> NDArray[np.float64]:
+    """Flip vectors of shape (..., 2) that point away from target directions."""
+    sign = np.where(np.sum(v * target, axis=-1, keepdims=True) < 0, -1.0, 1.0)
+    return v * sign
+
 
 def dichotomic_search(f, a, b, tol=1e-6):
     """Find root of f in interval [a, b] using bisection method.
 
+    Works element-wise when the bounds or the values of f are arrays, so
+    independent brackets (one per subject of a batch) are bisected together.
+    Drafting code uses the faster solvers in app.core.roots instead.
+
     Args:
         f: Function for which to find root (must have opposite signs at a and b).
         a: Lower bound of interval.
@@ -11,16 +39,19 @@ def dichotomic_search(f, a, b, tol=1e-6):
         tol: Tolerance for convergence (default 1e-6).
 
     Returns:
-        Approximate root x where f(x) ≈ 0.
+        Approximate root x where f(x) ≈ 0 (a float, or an array for batched input).
     """
-    lo, hi = a, b
-    while hi - lo > tol:
+    f_lo = np.asarray(f(a), dtype=float)
+    lo, hi, f_lo = (np.array(v, dtype=float) for v in np.broadcast_arrays(a, b, f_lo))
+    while np.max(hi - lo) > tol:
         mid = (lo + hi) / 2
-        if f(mid) * f(lo) < 0:
-            hi = mid
-        else:
-            lo = mid
-    return (lo + hi) / 2
+        f_mid = np.asarray(f(mid), dtype=float)
+        left = f_mid * f_lo < 0
+        hi = np.where(left, mid, hi)
+        lo = np.where(left, lo, mid)
+        f_lo = np.where(left, f_lo, f_mid)
+    root = (lo + hi) / 2
+    return float(root) if root.ndim == 0 else root
 
 
 def cubic_spline_to_beziers(points):
@@ -36,78 +67,132 @@ def cubic_spline_to_beziers(points):
         List of (P0, P1, P2, P3) tuples, each a numpy array of shape (2,).
         For N points, returns N-1 Bezier segments.
     """
-    import numpy as np
+    return [tuple(segment) for segment in cubic_spline_control_points(points)]
+
+
+def solve_tridiagonal(a, b, c, d):
+    """Solve a batch of tridiagonal systems with the Thomas algorithm.
+
+    Row i reads a[i] x[i-1] + b[i] x[i] + c[i] x[i+1] = d[i]; a[..., 0] and
+    c[..., -1] are ignored. The elimination runs over rows and is vectorized
+    over every leading batch axis and over the trailing right-hand-side axis.
+
+    Args:
+        a, b, c: Sub-, main and super-diagonals, shape (..., n).
+        d: Right-hand sides, shape (..., n, r).
+
+    Returns:
+        Solutions of shape (..., n, r).
+    """
+    n = b.shape[-1]
+    c_prime = np.empty(np.broadcast_shapes(b.shape, c.shape))
+    d_prime = np.empty(np.broadcast_shapes(b.shape + (1,), d.shape))
+    c_prime[..., 0] = c[..., 0] / b[..., 0]
+    d_prime[..., 0, :] = d[..., 0, :] / b[..., 0, None]
+    for i in range(1, n):
+        denom = b[..., i] - a[..., i] * c_prime[..., i - 1]
+        c_prime[..., i] = c[..., i] / denom
+        d_prime[..., i, :] = (d[..., i, :] - a[..., i, None] * d_prime[..., i - 1, :]) / denom[..., None]
+    x = np.empty_like(d_prime)
+    x[..., -1, :] = d_prime[..., -1, :]
+    for i in range(n - 2, -1, -1):
+        x[..., i, :] = d_prime[..., i, :] - c_prime[..., i, None] * x[..., i + 1, :]
+    return x
+
+
+def solve_cyclic_tridiagonal(a, b, c, d):
+    """Solve a batch of cyclic tridiagonal systems (Sherman-Morrison).
+
+    Same conventions as solve_tridiagonal, except that a[..., 0] couples the
+    first row to the last unknown and c[..., -1] the last row to the first.
+    """
+    gamma = -b[..., 0]
+    b_mod = b.copy()
+    b_mod[..., 0] -= gamma
+    b_mod[..., -1] -= a[..., 0] * c[..., -1] / gamma
+    u = np.zeros(b.shape + (1,))
+    u[..., 0, 0] = gamma
+    u[..., -1, 0] = c[..., -1]
+    x = solve_tridiagonal(a, b_mod, c, d)
+    z = solve_tridiagonal(a, b_mod, c, u)
+    # v = (1, 0, ..., 0, a[0] / gamma)
+    v_x = x[..., 0, :] + (a[..., 0] / gamma)[..., None] * x[..., -1, :]
+    v_z = z[..., 0, :] + (a[..., 0] / gamma)[..., None] * z[..., -1, :]
+    return x - z * (v_x / (1 + v_z))[..., None, :]
+
+
+def cubic_spline_control_points(points, end_condition='natural', end_tangents=None):
+    """Interpolate polylines with cubic splines and return Bezier control points.
+
+    Each polyline is parameterized by chord length; the second derivatives at
+    the knots are found with one batched tridiagonal solve, then every
+    polynomial piece is converted to its four Bezier control points.
+
+    Args:
+        points: Array of shape (n, 2) or a stack of shape (K, n, 2), n >= 2.
+        end_condition: 'natural' (zero curvature at both ends), 'clamped'
+                       (prescribed end tangents) or 'periodic' (closed curve,
+                       the first and last points must coincide, n >= 4).
+        end_tangents: For 'clamped', the (start, end) tangent directions,
+                      each of shape (2,) or (K, 2).
 
-    pts = [np.asarray(p, dtype=float) for p in points]
-    n = len(pts)
+    Returns:
+        Control points of shape (n-1, 4, 2), or (K, n-1, 4, 2) for a stack.
+    """
+    pts = np.asarray(points, dtype=float)
+    single = pts.ndim == 2
+    if single:
+        pts = pts[None]
+    n = pts.shape[1]
     if n < 2:
         raise ValueError("Need at least 2 points")
-    if n == 2:
-        # Degenerate: straight line as a Bezier
-        p0, p3 = pts[0], pts[1]
-        p1 = p0 + (p3 - p0) / 3
-        p2 = p0 + 2 * (p3 - p0) / 3
-        return [(p0, p1, p2, p3)]
-
-    # Number of segments
-    m = n - 1
-
-    # Parameterize by chord length for better results
-    h = np.zeros(m)
-    for i in range(m):
-        h[i] = np.linalg.norm(pts[i + 1] - pts[i])
-        if h[i] < 1e-12:
-            h[i] = 1.0  # avoid division by zero for coincident points
-
-    # Build tridiagonal system for interior points (indices 1..n-2)
-    interior = n - 2
-    if interior == 0:
-        S = [np.zeros(2)] * n
+
+    # Parameterize by chord length, avoiding division by zero for coincident points
+    delta = np.diff(pts, axis=1)
+    h = np.linalg.norm(delta, axis=-1)
+    h = np.where(h < 1e-12, 1.0, h)
+    slope = delta / h[..., None]
+
+    K = pts.shape[0]
+    a = np.zeros((K, n))
+    b = np.ones((K, n))
+    c = np.zeros((K, n))
+    d = np.zeros((K, n, 2))
+    a[:, 1:-1] = h[:, :-1]
+    b[:, 1:-1] = 2 * (h[:, :-1] + h[:, 1:])
+    c[:, 1:-1] = h[:, 1:]
+    d[:, 1:-1] = 6 * (slope[:, 1:] - slope[:, :-1])
+
+    if end_condition == 'natural':
+        S = solve_tridiagonal(a, b, c, d)
+    elif end_condition == 'clamped':
+        if end_tangents is None:
+            raise ValueError("Clamped splines need end_tangents=(start, end)")
+        t0, t1 = (unit(np.broadcast_to(np.asarray(t, dtype=float), (K, 2))) for t in end_tangents)
+        b[:, 0], c[:, 0] = 2 * h[:, 0], h[:, 0]
+        d[:, 0] = 6 * (slope[:, 0] - t0)
+        a[:, -1], b[:, -1] = h[:, -1], 2 * h[:, -1]
+        d[:, -1] = 6 * (t1 - slope[:, -1])
+        S = solve_tridiagonal(a, b, c, d)
+    elif end_condition == 'periodic':
+        if n < 4:
+            raise ValueError("Periodic splines need at least 4 points")
+        if not np.allclose(pts[:, 0], pts[:, -1]):
+            raise ValueError("Periodic splines need the first and last points to coincide")
+        # Unknowns S_0 .. S_{n-2}; S_{n-1} = S_0
+        h_prev = np.roll(h, 1, axis=1)
+        slope_prev = np.roll(slope, 1, axis=1)
+        S = solve_cyclic_tridiagonal(h_prev, 2 * (h_prev + h), h, 6 * (slope - slope_prev))
+        S = np.concatenate([S, S[:, :1]], axis=1)
     else:
-        S = [np.zeros(2) for _ in range(n)]
-
-        a_diag = np.zeros(interior)
-        b_diag = np.zeros(interior)
-        c_diag = np.zeros(interior)
-        d_vec = [np.zeros(2) for _ in range(interior)]
-
-        for i in range(interior):
-            idx = i + 1
-            if i > 0:
-                a_diag[i] = h[idx - 1]
-            b_diag[i] = 2 * (h[idx - 1] + h[idx])
-            if i < interior - 1:
-                c_diag[i] = h[idx]
-            d_vec[i] = 6 * ((pts[idx + 1] - pts[idx]) / h[idx] - (pts[idx] - pts[idx - 1]) / h[idx - 1])
-
-        # Thomas algorithm (tridiagonal solver)
-        for i in range(1, interior):
-            w = a_diag[i] / b_diag[i - 1]
-            b_diag[i] -= w * c_diag[i - 1]
-            d_vec[i] = d_vec[i] - w * d_vec[i - 1]
-
-        result = [np.zeros(2) for _ in range(interior)]
-        result[-1] = d_vec[-1] / b_diag[-1]
-        for i in range(interior - 2, -1, -1):
-            result[i] = (d_vec[i] - c_diag[i] * result[i + 1]) / b_diag[i]
-
-        for i in range(interior):
-            S[i + 1] = result[i]
+        raise ValueError(f"Unknown end condition: {end_condition!r}")
 
     # Convert each spline segment to Bezier control points
-    beziers = []
-    for i in range(m):
-        hi = h[i]
-        a = pts[i]
-        b = (pts[i + 1] - pts[i]) / hi - hi * (2 * S[i] + S[i + 1]) / 6
-        c = S[i] / 2
-        d = (S[i + 1] - S[i]) / (6 * hi)
-
-        P0 = a
-        P1 = a + b * hi / 3
-        P2 = a + 2 * b * hi / 3 + c * hi**2 / 3
-        P3 = a + b * hi + c * hi**2 + d * hi**3
-
-        beziers.append((P0, P1, P2, P3))
-
-    return beziers
+    hh = h[..., None]
+    p0 = pts[:, :-1]
+    p3 = pts[:, 1:]
+    first = slope - hh * (2 * S[:, :-1] + S[:, 1:]) / 6
+    p1 = p0 + first * hh / 3
+    p2 = p0 + 2 * first * hh / 3 + S[:, :-1] * hh**2 / 6
+    beziers = np.stack([p0, p1, p2, p3], axis=2)
+    return beziers[0] if single else beziers
@@ -0,0 +1,326 @@
+"""Geometric validation of piece outlines.
+
+Checks every edge of an outline in one pass, for one pattern or a batch of
+N subjects stacked along a leading axis:
+
+- control_crossing: a Bezier curve crosses the line through P0-P1 or P3-P2,
+  i.e. a control handle points to the wrong side of the curve. Inflected
+  segments of a smooth seam (S-shaped seams) are exempt.
+- self_intersection: a cubic curve loops over itself. Solved in closed form:
+  B(s) = B(t) with s != t reduces to a quadratic in s + t and s * t.
+- outline_intersection: two edges of the same outline cross. Every pair of
+  edges is tested by recursive subdivision: pairs whose control-point
+  bounding boxes are disjoint are culled, the others are split in halves
+  until both boxes are smaller than the tolerance.
+- tangent_discontinuity: the outline turns by more than the angle tolerance
+  at a joint that must be smooth (see Outline.smooth_joints).
+
+Results are Issue records; their messages are what gets reported as
+diagnostics.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from app.core import bezier
+from app.core.seam import Outline
+
+CHECKS = ("control_crossing", "self_intersection", "outline_intersection", "tangent_discontinuity")
+
+# Largest turn (degrees) accepted at a smooth joint
+ANGLE_TOLERANCE = 0.5
+# Subdivided curve pieces smaller than this (cm) that still overlap are a crossing
+INTERSECTION_TOLERANCE = 1e-3
+
+# Parameter nudge so tangents are taken inside the segment (see app.core.seam)
+_T_EPS = 1e-6
+# Parameter distance from a shared end point within which adjacent edges may touch
+_END_EPS = 1e-3
+
+
+@dataclass(frozen=True)
+class Issue:
+    """A problem found by a geometric check.
+
+    Attributes:
+        check: One of CHECKS.
+        edges: Names of the edges involved.
+        message: Human-readable description, reported as a diagnostic.
+        point: Where the problem is, in drafting coordinates.
+        value: Measured quantity, e.g. the joint angle in degrees.
+    """
+    check: str
+    edges: tuple[str, ...]
+    message: str
+    point: tuple[float, float] | None = None
+    value: float | None = None
+
+
+def _cross(a: NDArray, b: NDArray) -> NDArray:
+    return a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0]
+
+
+def inflected(ctrl: ArrayLike) -> NDArray[np.bool_]:
+    """Whether each curve has an inflection point (its turning direction flips).
+
+    With B'(t) / 3 = a + 2 b t + c t^2, the curvature sign is that of
+    cross(B', B'') / 18 = cross(a, b) + cross(a, c) t + cross(b, c) t^2, a
+    quadratic whose extremes on [0, 1] are at the ends or at its vertex.
+
+    Args:
+        ctrl: Control points (..., 4, 2).
+
+    Returns:
+        Boolean array of shape (...).
+    """
+    p = np.asarray(ctrl, dtype=float)
+    p0, p1, p2, p3 = (p[..., i, :] for i in range(4))
+    a = p1 - p0
+    b = p2 - 2 * p1 + p0
+    c = p3 - 3 * p2 + 3 * p1 - p0
+    q2, q1, q0 = _cross(b, c), _cross(a, c), _cross(a, b)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vertex = np.clip(np.nan_to_num(-q1 / (2 * q2)), 0.0, 1.0)
+    values = np.stack([q0, q0 + q1 + q2, q0 + (q1 + q2 * vertex) * vertex])
+    eps = 1e-9 * np.maximum(np.abs(values).max(axis=0), 1e-12)
+    return (values.min(axis=0) < -eps) & (values.max(axis=0) > eps)
+
+
+def control_crossings(ctrl: ArrayLike) -> tuple[NDArray[np.bool_], NDArray[np.bool_]]:
+    """Whether each curve crosses the line P0-P1 (start) and the line P3-P2 (end).
+
+    The curve crosses the line through an end point and its control point
+    when the other two control points lie on opposite sides of it.
+
+    Args:
+        ctrl: Control points (..., 4, 2).
+
+    Returns:
+        (start, end) boolean arrays of shape (...).
+    """
+    p = np.asarray(ctrl, dtype=float)
+    p0, p1, p2, p3 = (p[..., i, :] for i in range(4))
+    handle = p1 - p0
+    start = (_cross(p2 - p0, handle) * _cross(p3 - p0, handle) < 0) & (np.linalg.norm(handle, axis=-1) >= 1e-10)
+    handle = p2 - p3
+    end = (_cross(p0 - p3, handle) * _cross(p1 - p3, handle) < 0) & (np.linalg.norm(handle, axis=-1) >= 1e-10)
+    return start, end
+
+
+def self_intersections(ctrl: ArrayLike, tol: float = 1e-6) -> tuple[NDArray[np.bool_], NDArray[np.float64]]:
+    """Loop of each cubic curve, if it has one.
+
+    With B(t) = a t^3 + b t^2 + c t + d, B(s) - B(t) = (s - t) (a (u^2 - v)
+    + b u + c) where u = s + t and v = s t; the cross product with a gives u,
+    the projection on a gives v, and s, t are the roots of z^2 - u z + v.
+
+    Args:
+        ctrl: Control points (..., 4, 2).
+        tol: Largest distance between B(s) and B(t) accepted as a crossing.
+
+    Returns:
+        (hit, st): hit has shape (...), st (..., 2) holds the parameters
+        s < t of the crossing (NaN where there is none).
+    """
+    p = np.asarray(ctrl, dtype=float)
+    p0, p1, p2, p3 = (p[..., i, :] for i in range(4))
+    a = -p0 + 3 * p1 - 3 * p2 + p3
+    b = 3 * (p0 - 2 * p1 + p2)
+    c = 3 * (p1 - p0)
+    aa = (a * a).sum(axis=-1)
+    ba = _cross(b, a)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        u = _cross(a, c) / ba
+        v = u * u + ((b * u[..., None] + c) * a).sum(axis=-1) / aa
+        root = np.sqrt(u * u - 4 * v)
+    st = np.stack([(u - root) / 2, (u + root) / 2], axis=-1)
+    valid = (np.abs(ba) > 1e-12) & (aa > 1e-12) & (root > 1e-9)
+    valid &= np.all((st >= 0) & (st <= 1), axis=-1)
+    st = np.where(valid[..., None], st, np.nan)
+    gap = np.linalg.norm(bezier.point(p, np.nan_to_num(st[..., 0]))
+                         - bezier.point(p, np.nan_to_num(st[..., 1])), axis=-1)
+    hit = valid & (gap <= tol)
+    return hit, np.where(hit[..., None], st, np.nan)
+
+
+def _halves(ctrl: NDArray[np.float64]) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """De Casteljau split of (M, 4, 2) curves at t = 0.5."""
+    p0, p1, p2, p3 = (ctrl[:, i] for i in range(4))
+    p01, p12, p23 = (p0 + p1) / 2, (p1 + p2) / 2, (p2 + p3) / 2
+    p012, p123 = (p01 + p12) / 2, (p12 + p23) / 2
+    mid = (p012 + p123) / 2
+    return np.stack([p0, p01, p012, mid], axis=1), np.stack([mid, p123, p23, p3], axis=1)
+
+
+def curve_intersections(
+    a: ArrayLike,
+    b: ArrayLike,
+    adjacent: ArrayLike | None = None,
+    *,
+    tol: float = INTERSECTION_TOLERANCE,
+    max_depth: int = 40,
+    max_pairs: int = 20_000,
+) -> tuple[NDArray[np.bool_], NDArray[np.float64], NDArray[np.bool_]]:
+    """Whether each curve a[i] meets the curve b[i], by bounding-box subdivision.
+
+    All pairs are subdivided together: at each level, sub-curve pairs with
+    disjoint bounding boxes are dropped and the others split in four. The
+    sub-curve pairs of each pair are capped separately, so a degenerate
+    pair cannot crowd out the others; a pair whose sub-curves were capped
+    and that was not found to meet is undetermined rather than clean.
+
+    Args:
+        a, b: Control points (M, 4, 2) of the curves to test pairwise.
+        adjacent: (M,) True where b[i] starts at the end of a[i]; touching
+                  at that shared point does not count.
+        tol: Size (cm) of the sub-curve boxes at which an overlap is a hit.
+        max_depth: Most subdivision levels.
+        max_pairs: Most sub-curve pairs of one pair kept per level
+                   (overlapping collinear curves would otherwise grow
+                   without bound).
+
+    Returns:
+        (hit, point, undetermined): hit and undetermined are (M,), point
+        (M, 2) is a meeting point (NaN if none).
+    """
+    ca, cb = np.asarray(a, dtype=float), np.asarray(b, dtype=float)
+    m = len(ca)
+    adjacent = np.zeros(m, dtype=bool) if adjacent is None else np.asarray(adjacent, dtype=bool)
+    hit = np.zeros(m, dtype=bool)
+    capped = np.zeros(m, dtype=bool)
+    point = np.full((m, 2), np.nan)
+    pair = np.arange(m)
+    # Parameter intervals of the sub-curves: start of a's, end of b's
+    a_start, b_end = np.zeros(m), np.ones(m)
+    size = 1.0
+    for _ in range(max_depth):
+        lo_a, hi_a = ca.min(axis=1), ca.max(axis=1)
+        lo_b, hi_b = cb.min(axis=1), cb.max(axis=1)
+        keep = ~hit[pair] & np.all((lo_a <= hi_b) & (lo_b <= hi_a), axis=-1)
+        keep &= ~(adjacent[pair] & (a_start >= 1 - _END_EPS) & (b_end <= _END_EPS))
+        small = keep & (np.max(hi_a - lo_a, axis=-1) < tol) & (np.max(hi_b - lo_b, axis=-1) < tol)
+        hit[pair[small]] = True
+        point[pair[small]] = (ca[small, 0] + cb[small, 0]) / 2
+        keep &= ~small
+        pair, ca, cb, a_start, b_end = pair[keep], ca[keep], cb[keep], a_start[keep], b_end[keep]
+        if len(pair) == 0:
+            break
+        # Rank of every sub-curve pair among those of the same pair
+        order = np.argsort(pair, kind="stable")
+        rank = np.empty(len(pair), dtype=np.int64)
+        rank[order] = np.arange(len(pair)) - np.searchsorted(pair[order], pair[order])
+        over = rank >= max_pairs
+        if over.any():
+            capped[pair[over]] = True
+            keep = ~over
+            pair, ca, cb, a_start, b_end = pair[keep], ca[keep], cb[keep], a_start[keep], b_end[keep]
+        size /= 2
+        (a0, a1), (b0, b1) = _halves(ca), _halves(cb)
+        pair = np.tile(pair, 4)
+        ca = np.concatenate([a0, a0, a1, a1])
+        cb = np.concatenate([b0, b1, b0, b1])
+        a_start = np.concatenate([a_start, a_start, a_start + size, a_start + size])
+        b_end = np.concatenate([b_end - size, b_end, b_end - size, b_end])
+    return hit, point, capped & ~hit
+
+
+def joint_angles(ctrl: ArrayLike) -> NDArray[np.float64]:
+    """Turn in degrees at the end of every edge of closed chains, shape (..., K).
+
+    Args:
+        ctrl: Control points (..., K, 4, 2); edge k + 1 (cyclically) starts
+              where edge k ends.
+    """
+    p = np.asarray(ctrl, dtype=float)
+    t_in = bezier.tangent(p, 1 - _T_EPS)
+    t_out = np.roll(bezier.tangent(p, _T_EPS), -1, axis=-2)
+    return np.degrees(np.arctan2(np.abs(_cross(t_in, t_out)), (t_in * t_out).sum(axis=-1)))
+
+
+def _xy(p: NDArray[np.float64]) -> tuple[float, float]:
+    return float(p[0]), float(p[1])
+
+
+def validate_outlines(
+    names: tuple[str, ...],
+    ctrl: ArrayLike,
+    smooth: ArrayLike | None = None,
+    *,
+    angle_tolerance: float = ANGLE_TOLERANCE,
+    tol: float = INTERSECTION_TOLERANCE,
+) -> list[list[Issue]]:
+    """Run every check on N outlines sharing the same edges.
+
+    Args:
+        names: Names of the K edges.
+        ctrl: Control points (N, K, 4, 2), one outline per subject.
+        smooth: (K,) joints that must be tangent-continuous (see
+                Outline.smooth_joints); none if omitted.
+        angle_tolerance: Largest turn in degrees accepted at a smooth joint.
+        tol: Intersection tolerance in cm.
+
+    Returns:
+        The issues of every subject, in check order.
+    """
+    p = np.asarray(ctrl, dtype=float)
+    n, k = p.shape[:2]
+    issues: list[list[Issue]] = [[] for _ in range(n)]
+
+    start, end = control_crossings(p)
+    if smooth is not None:
+        # An S-shaped seam (the sleeve cap) has its inflection inside one of
+        # its segments, which then crosses its handle lines by design
+        joints = np.asarray(smooth, dtype=bool)
+        exempt = inflected(p) & (joints | np.roll(joints, 1))
+        start, end = start & ~exempt, end & ~exempt
+    for s, e in zip(*np.nonzero(start | end)):
+        for crossed, line in ((start[s, e], "P0-P1"), (end[s, e], "P3-P2")):
+            if crossed:
+                issues[s].append(Issue("control_crossing", (names[e],),
+                                       f"Bezier curve '{names[e]}' crosses the {line} line"))
+
+    loops, st = self_intersections(p)
+    for s, e in zip(*np.nonzero(loops)):
+        where = _xy(bezier.point(p[s, e], st[s, e, 0]))
+        issues[s].append(Issue("self_intersection", (names[e],),
+                               f"Bezier curve '{names[e]}' intersects itself at ({where[0]:.1f}, {where[1]:.1f})",
+                               point=where))
+
+    # Every pair of distinct edges, adjacent pairs ordered so the second starts where the first ends
+    i, j = np.triu_indices(k, 1)
+    wrap = (i == 0) & (j == k - 1) & (k > 2)
+    i, j = np.where(wrap, j, i), np.where(wrap, i, j)
+    adjacent = (j == (i + 1) % k) & (k > 2)
+    hits, points, undetermined = curve_intersections(
+        p[:, i].reshape(-1, 4, 2), p[:, j].reshape(-1, 4, 2), np.tile(adjacent, n), tol=tol)
+    hits, points, undetermined = hits.reshape(n, -1), points.reshape(n, -1, 2), undetermined.reshape(n, -1)
+    for s, q in zip(*np.nonzero(hits)):
+        a, b = names[i[q]], names[j[q]]
+        where = _xy(points[s, q])
+        issues[s].append(Issue("outline_intersection", (a, b),
+                               f"Edges '{a}' and '{b}' intersect at ({where[0]:.1f}, {where[1]:.1f})",
+                               point=where))
+    for s, q in zip(*np.nonzero(undetermined)):
+        a, b = names[i[q]], names[j[q]]
+        issues[s].append(Issue("outline_intersection", (a, b),
+                               f"Edges '{a}' and '{b}' run too close together to check for an intersection"))
+
+    if smooth is not None:
+        angles = joint_angles(p)
+        kinks = np.asarray(smooth, dtype=bool)[None, :] & (angles > angle_tolerance)
+        for s, e in zip(*np.nonzero(kinks)):
+            a, b = names[e], names[(e + 1) % k]
+            angle = float(angles[s, e])
+            issues[s].append(Issue("tangent_discontinuity", (a, b),
+                                   f"Edges '{a}' and '{b}' meet at a {angle:.1f} degree angle instead of smoothly",
+                                   point=_xy(p[s, e, 3]), value=angle))
+    return issues
+
+
+def validate_outline(outline: Outline, **options) -> list[Issue]:
+    """Run every check on one piece outline (see validate_outlines for options)."""
+    return validate_outlines(outline.names, outline.ctrl[None], outline.smooth_joints(), **options)[0]
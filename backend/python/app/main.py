@@ -6,6 +6,9 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.core.compression import CompressionMiddleware
+from app.modelist.bank import BANK_DIR, BANK_ENABLED, bank
+from app.modelist.workers import pool
 from app.shop.router import router as shop_router
 from app.modelist.router import router as modelist_router
 from app.measurements.router import router as measurements_router
@@ -14,9 +17,13 @@ from database import init_db
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Create database tables on startup."""
+    """Create database tables, warm the artifact bank (if enabled) and start the generation pool."""
     init_db()
+    if BANK_ENABLED:
+        bank.warm(BANK_DIR)
+    pool.start()
     yield
+    pool.shutdown()
 
 
 app = FastAPI(title="Couture API", version="0.1.0", lifespan=lifespan)
@@ -39,6 +46,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Compress SVG and JSON responses (brotli if installed, else gzip)
+app.add_middleware(CompressionMiddleware)
 
 app.include_router(shop_router)
 app.include_router(modelist_router)
@@ -5,7 +5,7 @@ from dataclasses import asdict
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
-from app.core.measurements import Person, default_measurements, individual_measurements
+from app.core.measurements import STANDARD_SIZES, Person, default_measurements, individual_measurements
 from app.core.models import SavedMeasurements
 from app.schemas.measurements import (
     MeasurementsResponse,
@@ -16,7 +16,7 @@ from database import get_db
 
 router = APIRouter(prefix="/api/measurements", tags=["measurements"])
 
-AVAILABLE_SIZES = [34, 36, 38, 40, 42, 44, 46, 48]
+AVAILABLE_SIZES = list(STANDARD_SIZES)
 AVAILABLE_PRESETS = [p.value for p in Person]
 
 
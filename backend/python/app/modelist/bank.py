@@ -0,0 +1,152 @@
+"""Pre-generated artifacts for the standard sizes.
+
+Most generate requests are for a standard French size with default control
+parameters and no stretch. The bank generates every pattern type x standard
+size x output format once (the "all" format holds both the construction and
+printable variants) and serves matching requests without drafting.
+
+Entries are keyed by request_key(), so a request matches the bank exactly
+when it would have produced the same bytes. The bank can be saved to and
+reloaded from a directory; files are stored under the CODE_VERSION they were
+generated with, so a code change never reloads stale artifacts.
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from app.core.measurements import STANDARD_SIZES, default_measurements
+from app.modelist.generation import CODE_VERSION, GenerationResult, generate, request_key
+from app.schemas.patterns import OutputFormat, PatternRequest, PatternType
+
+# Set COUTURE_BANK=1 to build (or load) the bank when the API starts
+BANK_ENABLED = os.environ.get("COUTURE_BANK", "").lower() in ("1", "true", "yes")
+# Directory the bank is persisted to and reloaded from (optional)
+BANK_DIR = os.environ.get("COUTURE_BANK_DIR") or None
+
+# Bank entries never change for a given key (which includes the code
+# version); sent on GET /bank/{key}, not on the POST generate responses
+BANK_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@dataclass
+class BankStats:
+    """Size and warm-up cost of the artifact bank."""
+    entries: int = 0
+    size_bytes: int = 0
+    hits: int = 0
+    warmup_seconds: float = 0.0
+    source: str = "empty"
+    code_version: str = CODE_VERSION
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def standard_requests(sizes=STANDARD_SIZES) -> list[PatternRequest]:
+    """Every request the bank answers: pattern type x size x output format."""
+    return [
+        PatternRequest(
+            pattern_type=pattern_type,
+            measurements=asdict(default_measurements(size)),
+            output_format=output_format,
+        )
+        for pattern_type in PatternType
+        for size in sizes
+        for output_format in OutputFormat
+    ]
+
+
+class ArtifactBank:
+    """In-memory, read-mostly store of pre-generated results."""
+
+    def __init__(self):
+        self._entries: dict[str, GenerationResult] = {}
+        self._stats = BankStats()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> GenerationResult | None:
+        """Return the banked result for a request key, or None."""
+        result = self._entries.get(key)
+        if result is not None:
+            with self._lock:
+                self._stats.hits += 1
+        return result
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _replace(self, entries: dict[str, GenerationResult], source: str, seconds: float) -> None:
+        with self._lock:
+            self._entries = entries
+            self._stats = BankStats(
+                entries=len(entries),
+                size_bytes=sum(r.nbytes for r in entries.values()),
+                warmup_seconds=seconds,
+                source=source,
+            )
+
+    def build(self, sizes=STANDARD_SIZES) -> None:
+        """Generate every standard request and replace the bank contents."""
+        start = time.perf_counter()
+        entries = {request_key(req): generate(req) for req in standard_requests(sizes)}
+        self._replace(entries, "built", time.perf_counter() - start)
+
+    def save(self, directory: str | Path) -> Path:
+        """Write the bank to directory/CODE_VERSION; returns that path."""
+        path = Path(directory) / CODE_VERSION
+        path.mkdir(parents=True, exist_ok=True)
+        index = {}
+        for key, result in self._entries.items():
+            (path / f"{key}.bin").write_bytes(result.body)
+            index[key] = {"media_type": result.media_type, "warnings": list(result.warnings)}
+        (path / "index.json").write_text(json.dumps(index))
+        return path
+
+    def load(self, directory: str | Path) -> bool:
+        """Replace the bank with the one saved for this code version, if any.
+
+        Returns:
+            True if a saved bank was found and loaded.
+        """
+        start = time.perf_counter()
+        path = Path(directory) / CODE_VERSION
+        index_path = path / "index.json"
+        if not index_path.is_file():
+            return False
+        entries = {
+            key: GenerationResult(
+                body=(path / f"{key}.bin").read_bytes(),
+                media_type=meta["media_type"],
+                warnings=tuple(meta["warnings"]),
+            )
+            for key, meta in json.loads(index_path.read_text()).items()
+        }
+        self._replace(entries, "disk", time.perf_counter() - start)
+        return True
+
+    def warm(self, directory: str | Path | None = None) -> BankStats:
+        """Load the bank from directory if saved there, else build it (and save it)."""
+        if directory is None or not self.load(directory):
+            self.build()
+            if directory is not None:
+                self.save(directory)
+        return self.stats()
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._replace({}, "empty", 0.0)
+
+    def stats(self) -> BankStats:
+        """Return a snapshot of the bank statistics."""
+        with self._lock:
+            return BankStats(**asdict(self._stats))
+
+
+bank = ArtifactBank()
@@ -4,16 +4,25 @@ Constructs front and back bodice pieces from body measurements using
 French pattern drafting methods with Bezier curve interpolation.
 """
 
-import warnings
 from dataclasses import dataclass, fields
+from functools import partial
+from typing import Sequence
 
 import numpy as np
+from numpy.typing import NDArray
 
-from app.core.measurements import FullMeasurements
+from app.core.batch import PatternBatch
+from app.core.diagnostics import report
+from app.core.labels import Label, place_labels
+from app.core.measurements import FullMeasurements, stack_measurements
 from app.core.pdf_renderer import PDFRenderer
+from app.core.point_graph import PointGraph, draft_inputs
+from app.core.point_table import PointTable
 from app.core.stretch_pattern import StretchPattern
-from app.core.svg_renderer import SVGRenderer
-from app.core.utils import dichotomic_search
+from app.core.svg_renderer import CompactSVGRenderer, SVGRenderer
+from app.core.roots import illinois
+from app.core.seam import Outline
+from app.core.utils import orient_towards, perpendicular, unit, xy
 
 
 @dataclass
@@ -39,7 +48,8 @@ class CorsetMeasurements:
         """Derive corset measurements from full body measurements.
 
         Computes neck_width numerically from neck_circumference using
-        quarter-ellipse arc approximation.
+        quarter-ellipse arc approximation. Fields of fm may be (N,) arrays,
+        in which case every derived field (including neck_width) is too.
         """
         kwargs = {f.name: getattr(fm, f.name) for f in fields(cls) if f.name not in ('stretched', '_horizontal', '_vertical', 'neck_width', 'neck_back_height')}
 
@@ -55,7 +65,11 @@ class CorsetMeasurements:
             return np.sqrt((a**2 + neck_back_height ** 2) / 2) + np.sqrt((a**2 + neck_front_height ** 2) / 2) - fm.neck_circumference / np.pi
 
         kwargs['neck_back_height'] = neck_back_height
-        kwargs['neck_width'] = dichotomic_search(f, 0.01, fm.neck_circumference / np.pi)
+        solve = illinois(f, 0.01, fm.neck_circumference / np.pi)
+        if not np.all(solve.converged):
+            report("Neck width could not be solved from neck_circumference; "
+                   "the neck curve uses the closest bound")
+        kwargs['neck_width'] = solve.root
 
         return cls(**kwargs)
 
@@ -70,166 +84,239 @@ class ControlParameters:
     armhole_curve: float = 0.4      # Ratio of underarm_height for CX1 offset from C1
 
 
+# Drafting graph: construction points first, then the Bezier helper points.
+# Helpers are only needed when drawing curves automatically; drafting by hand
+# with a French ruler only uses the construction points.
+DRAFT = PointGraph()
+
+
+# Waist as the reference
+@DRAFT.point('B', 'full_waist')
+def _b(full_waist):
+    """Waist level, at the origin"""
+    zero = np.zeros_like(full_waist)
+    return xy(zero, zero)
+
+
+@DRAFT.point('B1', 'B', 'full_waist')
+def _b1(B, full_waist):
+    """A quarter waist from B"""
+    return B - xy(full_waist / 4, np.zeros_like(full_waist))
+
+
+# Neck construction
+@DRAFT.point('E', 'front_waist_length')
+def _e(front_waist_length):
+    """Front top, a front waist length above B"""
+    return xy(np.zeros_like(front_waist_length), front_waist_length)
+
+
+@DRAFT.point('F', 'back_waist_length', 'neck_back_height')
+def _f(back_waist_length, neck_back_height):
+    """Back top, a back waist length and half a neck height above B"""
+    return xy(np.zeros_like(back_waist_length), back_waist_length + neck_back_height / 2)
+
+
+@DRAFT.node('G', 'E', 'neck_width')
+def _g(E, neck_width):
+    """A neck width from E"""
+    return E - xy(neck_width, np.zeros_like(neck_width))
+
+
+@DRAFT.point('H', 'F', 'neck_width', 'neck_back_height')
+def _h(F, neck_width, neck_back_height):
+    """Neck point, a neck width from F and half a neck height above"""
+    return F + xy(-neck_width, neck_back_height / 2)
+
+
+# Body construction
+@DRAFT.point('A', 'waist_to_hip')
+def _a(waist_to_hip):
+    """Hip level, a waist-to-hip height below B"""
+    return xy(np.zeros_like(waist_to_hip), -waist_to_hip)
+
+
+@DRAFT.point('A1', 'A', 'full_hip')
+def _a1(A, full_hip):
+    """A quarter hip from A"""
+    return A - xy(full_hip / 4, np.zeros_like(full_hip))
+
+
+@DRAFT.point('C', 'E', 'bust_height')
+def _c(E, bust_height):
+    """Bust level, a bust height below E"""
+    return xy(np.zeros_like(bust_height), E[:, 1] - bust_height)
+
+
+@DRAFT.point('C1', 'B1', 'full_hip', 'underarm_height')
+def _c1(B1, full_hip, underarm_height):
+    """Underarm, at the quarter hip line and an underarm height from B1"""
+    x = -full_hip / 4
+    dx = x - B1[:, 0]
+    dy = np.sqrt(underarm_height ** 2 - dx ** 2)
+    return xy(x, B1[:, 1] + dy)
+
+
+# Shoulder construction
+@DRAFT.point('D', 'F', 'C')
+def _d(F, C):
+    """Shoulder level, midway between F and C"""
+    return (F + C) / 2
+
+
+@DRAFT.point('D1', 'D', 'half_front_width')
+def _d1(D, half_front_width):
+    """Half a front width from D"""
+    return D - xy(half_front_width, np.zeros_like(half_front_width))
+
+
+@DRAFT.point('D2', 'D', 'half_back_width')
+def _d2(D, half_back_width):
+    """Half a back width from D"""
+    return D - xy(half_back_width, np.zeros_like(half_back_width))
+
+
+@DRAFT.node('J', 'G', 'H')
+def _j(G, H):
+    """A third of the way from G to H"""
+    return (2 * G + H) / 3
+
+
+@DRAFT.point('K', 'J', 'H', 'shoulder_length')
+def _k(J, H, shoulder_length):
+    """Shoulder tip, level with J, a shoulder length from H"""
+    width = np.sqrt(shoulder_length ** 2 - (H[:, 1] - J[:, 1]) ** 2)
+    return J - xy(width, np.zeros_like(width))
+
+
+# Neck helpers, from the control strengths as ratios of the neck width
+@DRAFT.helper('E1', 'E', 'front_neck_center', 'neck_width')
+def _e1(E, front_neck_center, neck_width):
+    """Front neck control at E, horizontal"""
+    return E - xy(front_neck_center * neck_width, np.zeros_like(neck_width))
+
+
+@DRAFT.helper('F1', 'F', 'back_neck_center', 'neck_width')
+def _f1(F, back_neck_center, neck_width):
+    """Back neck control at F, horizontal"""
+    return F + xy(-(back_neck_center * neck_width), np.zeros_like(neck_width))
+
+
+@DRAFT.node('perp_hk', 'H', 'K')
+def _perp_hk(H, K):
+    """Perpendicular to the shoulder H-K"""
+    return unit(perpendicular(K - H))
+
+
+@DRAFT.helper('H1', 'H', 'perp_hk', 'E', 'front_neck_top', 'neck_width')
+def _h1(H, perp_hk, E, front_neck_top, neck_width):
+    """Front neck control at H, perpendicular to the shoulder, toward E"""
+    return H + orient_towards(perp_hk, E - H) * (front_neck_top * neck_width)[:, None]
+
+
+@DRAFT.helper('H2', 'H', 'perp_hk', 'F', 'back_neck_top', 'neck_width')
+def _h2(H, perp_hk, F, back_neck_top, neck_width):
+    """Back neck control at H, perpendicular to the shoulder, toward F"""
+    return H + orient_towards(perp_hk, F - H) * (back_neck_top * neck_width)[:, None]
+
+
+# Armhole helpers
+@DRAFT.node('perp_kh', 'H', 'K', 'D1')
+def _perp_kh(H, K, D1):
+    """Perpendicular to the shoulder at K, toward the armhole"""
+    return orient_towards(unit(perpendicular(H - K)), D1 - K)
+
+
+@DRAFT.node('perp_b1c1', 'B1', 'C1')
+def _perp_b1c1(B1, C1):
+    """Perpendicular to the side B1-C1"""
+    return unit(perpendicular(C1 - B1))
+
+
+def _armhole_underarm_control(C1, perp_b1c1, DX, armhole_curve, underarm_height):
+    """Control point CX1: off C1 perpendicular to the side, toward DX."""
+    return C1 + (armhole_curve * underarm_height)[:, None] * orient_towards(perp_b1c1, DX - C1)
+
+
+def _armhole_shoulder_control(K, perp_kh, CX1, C1, DX, name='KX'):
+    """Control point KX on the perpendicular at K such that the curve passes through DX.
+
+    Where no such point exists (DX off every curve of this family, e.g. the
+    front armhole, K1, at size 48), the handle is reported and falls back to a
+    third of the K-C1 distance, toward DX.
+    """
+    # Solve for t such that the Bezier curve passes through DX
+    def remainder(t):
+        t = np.asarray(t)[..., None]
+        return DX - (1-t)**2*(1+2*t)*K - 3*(1-t)*t**2*CX1 - t**3*C1
+
+    def residual(t):
+        R = remainder(t)
+        return R[:, 0]*perp_kh[:, 1] - R[:, 1]*perp_kh[:, 0]
+
+    solve = illinois(residual, 0.01, 0.99)
+    t = solve.root
+
+    coeff = 3*(1-t)**2*t
+    lambda_val = np.sum(remainder(t) * perp_kh, axis=-1) / coeff
+    if not np.all(solve.converged):
+        report(f"Armhole control {name} cannot make the armhole pass through its D point; "
+               f"using a default handle length")
+        fallback = np.linalg.norm(C1 - K, axis=-1) / 3 * np.sign(np.sum((DX - K) * perp_kh, axis=-1))
+        lambda_val = np.where(solve.converged, lambda_val, fallback)
+    return K + lambda_val[:, None] * perp_kh
+
+
+for _x in ('1', '2'):
+    DRAFT.helper(f'C1{_x}', 'C1', 'perp_b1c1', f'D{_x}', 'armhole_curve', 'underarm_height',
+                 doc=f"Armhole control at C1, perpendicular to the side, toward D{_x}")(_armhole_underarm_control)
+    DRAFT.helper(f'K{_x}', 'K', 'perp_kh', f'C1{_x}', 'C1', f'D{_x}',
+                 doc=f"Armhole control at K, perpendicular to the shoulder, so the armhole passes D{_x}"
+                 )(partial(_armhole_shoulder_control, name=f'K{_x}'))
+
+
 class CorsetPattern(StretchPattern):
     """Corset / bodice block pattern with front and back pieces."""
 
+    graph = DRAFT
+    graph_inputs = ('m', 'b')
+    y_flip = True
+    # Horizontal offset (cm) of the mirrored back piece
+    pattern_gap = 5.0
+
     def __init__(self, measurements: CorsetMeasurements, control: ControlParameters = None):
         super().__init__()
 
         self.m = measurements
         self.b = control or ControlParameters()
 
-        self.build_construction_points()
-        self.build_bezier_helper_points()
-
-    def build_construction_points(self):
-        """Build the main construction points for front and back bodice."""
-        # Waist as the reference
-        # B: Waist level
-        self.points['B'] = np.array([0.0, 0.0])
-        width = self.m.full_waist / 4
-        self.points['B1'] = self.points['B'] - np.array([width, 0])
-
-        # Neck construction
-        # E: Front top
-        self.points['E'] = np.array([0.0, self.m.front_waist_length])
-        # F: Back top
-        self.points['F'] = np.array([0.0, self.m.back_waist_length + self.m.neck_back_height / 2])
-        # Use pre-computed neck_width
-        G = self.points['E'] - np.array([self.m.neck_width, 0])
-        self.points['H'] = self.points['F'] + np.array([-self.m.neck_width, self.m.neck_back_height / 2])
-
-        # Body construction
-        # A: Hip level
-        self.points['A'] = np.array([0.0, -self.m.waist_to_hip])
-        width = self.m.full_hip / 4
-        self.points['A1'] = self.points['A'] - np.array([width, 0])
-        # C: Bust level
-        coordinate = self.points['E'][1] - self.m.bust_height
-        self.points['C'] = np.array([0.0, coordinate])
-        width = self.m.full_hip / 4
-        # C1: defined by full_bust and underarm_height
-        x = - width
-        dx = x - self.points['B1'][0]
-        dy = np.sqrt(self.m.underarm_height ** 2 - dx ** 2)
-        y = self.points['B1'][1] + dy
-        self.points['C1'] = np.array([x, y])
-
-        # Shoulder construction
-        # D: Shoulder level, at the middle of F and C
-        self.points['D'] = (self.points['F'] + self.points['C']) / 2
-        width = self.m.half_front_width
-        self.points['D1'] = self.points['D'] - np.array([width, 0])
-        width = self.m.half_back_width
-        self.points['D2'] = self.points['D'] - np.array([width, 0])
-        # Shoulder top
-        # J is 1/3 of the way from G to H
-        J = (2 * G + self.points['H']) / 3
-        width = np.sqrt(self.m.shoulder_length ** 2 - (self.points['H'][1] - J[1]) ** 2)
-        self.points['K'] = J - np.array([width, 0])
-
-    def build_bezier_helper_points(self):
-        """Compute Bezier control points for computer-generated curves.
-
-        These helper points are only needed when drawing curves automatically.
-        For manual drafting with a French ruler, only the core construction
-        points from build_construction_points() are required.
+        self.draft()
+
+    @classmethod
+    def draft_batch(
+        cls,
+        measurements: CorsetMeasurements | Sequence[CorsetMeasurements],
+        control: ControlParameters = None,
+    ) -> PatternBatch:
+        """Draft construction and helper points for N subjects in a single pass.
+
+        Args:
+            measurements: A sequence of CorsetMeasurements, or one instance whose
+                          fields are (N,) arrays (e.g. derived from
+                          FullMeasurements.from_matrix).
+            control: Control parameters shared by all subjects.
+
+        Returns:
+            PatternBatch with every point as an (N, 2) array.
         """
-        # Compute actual Bezier control strengths from proportional ratios
-        front_neck_center_strength = self.b.front_neck_center * self.m.neck_width
-        back_neck_center_strength = self.b.back_neck_center * self.m.neck_width
-        front_neck_top_strength = self.b.front_neck_top * self.m.neck_width
-        back_neck_top_strength = self.b.back_neck_top * self.m.neck_width
-        armhole_curve_offset = self.b.armhole_curve * self.m.underarm_height
-
-        # Neck helpers
-        self.helper_points['E1'] = self.points['E'] - np.array([front_neck_center_strength, 0])
-        self.helper_points['F1'] = self.points['F'] + np.array([-back_neck_center_strength, 0])
-
-        # H1: perpendicular to H-K at H, toward E (for front neck curve)
-        vec_hk = self.points['K'] - self.points['H']
-        perp_hk = np.array([-vec_hk[1], vec_hk[0]])  # rotate 90°
-        perp_hk = perp_hk / np.linalg.norm(perp_hk)
-        if np.dot(perp_hk, self.points['E'] - self.points['H']) < 0:
-            perp_hk = -perp_hk
-        self.helper_points['H1'] = self.points['H'] + perp_hk * front_neck_top_strength
-
-        # H2: perpendicular to H-K at H, toward F (for back neck curve)
-        perp_hk_back = np.array([-vec_hk[1], vec_hk[0]])  # rotate 90°
-        perp_hk_back = perp_hk_back / np.linalg.norm(perp_hk_back)
-        if np.dot(perp_hk_back, self.points['F'] - self.points['H']) < 0:
-            perp_hk_back = -perp_hk_back
-        self.helper_points['H2'] = self.points['H'] + perp_hk_back * back_neck_top_strength
-
-        # Armhole helpers
-        K = self.points['K']
-        C1 = self.points['C1']
-        B1 = self.points['B1']
-
-        vec_kh = self.points['H'] - K
-        perp_kh = np.array([-vec_kh[1], vec_kh[0]])
-        perp_kh = perp_kh / np.linalg.norm(perp_kh)
-        if np.dot(perp_kh, self.points['D1'] - K) < 0:
-            perp_kh = -perp_kh
-
-        vec_b1c1 = C1 - B1
-        perp_b1c1 = np.array([-vec_b1c1[1], vec_b1c1[0]])  # rotate 90°
-        perp_b1c1 = perp_b1c1 / np.linalg.norm(perp_b1c1)
-
-        # Compute CX1 and KX for X = 1, 2
-        for x in ['1', '2']:
-            DX = self.points[f'D{x}']
-
-            perp_dir = perp_b1c1.copy()
-            if np.dot(perp_dir, DX - C1) < 0:
-                perp_dir = -perp_dir
-            CX1 = C1 + armhole_curve_offset * perp_dir
-            self.helper_points[f'C1{x}'] = CX1
-
-            # Solve for t such that the Bezier curve passes through DX
-            def residual(t):
-                R = DX - (1-t)**2*(1+2*t)*K - 3*(1-t)*t**2*CX1 - t**3*C1
-                return R[0]*perp_kh[1] - R[1]*perp_kh[0]
-
-            t = dichotomic_search(residual, 0.01, 0.99)
-
-            R = DX - (1-t)**2*(1+2*t)*K - 3*(1-t)*t**2*CX1 - t**3*C1
-            coeff = 3*(1-t)**2*t
-            lambda_val = np.dot(R, perp_kh) / coeff
-            KX = K + lambda_val * perp_kh
-            self.helper_points[f'K{x}'] = KX
-
-    def _validate_bezier_crossing(self, p0, p1, p2, p3, curve_name=None):
-        """Validate that a Bezier curve does not cross the P0-P1 or P3-P2 lines."""
-        curve_id = curve_name if curve_name else "unnamed"
-        valid = True
-
-        v1 = p1 - p0
-        if np.linalg.norm(v1) >= 1e-10:
-            v2 = p2 - p0
-            v3 = p3 - p0
-            c2 = v2[0] * v1[1] - v2[1] * v1[0]
-            c3 = v3[0] * v1[1] - v3[1] * v1[0]
-            if c2 * c3 < 0:
-                warnings.warn(f"Bezier curve '{curve_id}' crosses the P0-P1 line", UserWarning)
-                valid = False
-
-        v1_end = p2 - p3
-        if np.linalg.norm(v1_end) >= 1e-10:
-            v0 = p0 - p3
-            v1_pt = p1 - p3
-            c0 = v0[0] * v1_end[1] - v0[1] * v1_end[0]
-            c1 = v1_pt[0] * v1_end[1] - v1_pt[1] * v1_end[0]
-            if c0 * c1 < 0:
-                warnings.warn(f"Bezier curve '{curve_id}' crosses the P3-P2 line", UserWarning)
-                valid = False
-
-        return valid
-
-    def _mirror_point(self, p):
-        """Mirror a point for back pattern (flip x, add offset)."""
-        gap = getattr(self, 'pattern_gap', 5.0)
-        return np.array([-p[0] + gap, p[1]])
+        if not isinstance(measurements, CorsetMeasurements):
+            measurements = stack_measurements(measurements)
+        drafting = DRAFT.evaluate(draft_inputs(measurements, control or ControlParameters()))
+        return PatternBatch(points=drafting.points(), helper_points=drafting.helper_points())
+
+    def _mirrored(self) -> PointTable:
+        """All points mirrored for the back pattern (flip x, add offset)."""
+        return self.table.mirrored(self.pattern_gap)
 
     def _draw_line(self, r, k1, k2, style='-', color='black'):
         """Draw line between two point keys."""
@@ -237,35 +324,90 @@ class CorsetPattern(StretchPattern):
         if k1 in pts and k2 in pts:
             r.line(pts[k1][0], pts[k1][1], pts[k2][0], pts[k2][1], color=color, style=style)
 
-    def _draw_bezier(self, r, p0, p1, p2, p3, style='-', color='black', curve_name=None):
+    def _draw_bezier(self, r, p0, p1, p2, p3, style='-', color='black'):
         """Draw cubic Bezier curve."""
-        self._validate_bezier_crossing(p0, p1, p2, p3, curve_name)
         r.bezier(p0, p1, p2, p3, color=color, style=style)
 
-    def _plot_front_curves(self, r):
-        """Draw front pattern curves (blue)."""
+    def bezier_segments(self) -> dict[str, NDArray[np.float64]]:
+        """Control points (4, 2) of every curve of the outline, by curve name.
+
+        Back curves are given in drafting coordinates (before the back piece
+        is mirrored for display), so their lengths and shapes match the
+        garment.
+        """
         pts = self.points
+        helpers = self.helper_points
 
         # Side curve: A1 → B1 → C1
-        p0_a1b1 = pts['A1']
-        p3_a1b1 = pts['B1']
-        control_dist_a1 = np.linalg.norm(p3_a1b1 - p0_a1b1) / 3
-        p1_a1b1 = p0_a1b1 + np.array([0, control_dist_a1])
+        control_dist = np.linalg.norm(pts['B1'] - pts['A1']) / 3
         vec_be = pts['E'] - pts['B']
         unit_be = vec_be / np.linalg.norm(vec_be)
-        control_dist_b1 = np.linalg.norm(p3_a1b1 - p0_a1b1) / 3
-        p2_a1b1 = p3_a1b1 - unit_be * control_dist_b1
-        self._draw_bezier(r, p0_a1b1, p1_a1b1, p2_a1b1, p3_a1b1, '-', 'blue', curve_name='front_side_A1_B1')
-
-        # B1 to C1
-        p0_b1c1 = pts['B1']
-        p3_b1c1 = pts['C1']
-        p1_b1c1 = p0_b1c1 + unit_be * control_dist_b1
+        side_a1b1 = np.array([
+            pts['A1'],
+            pts['A1'] + np.array([0, control_dist]),
+            pts['B1'] - unit_be * control_dist,
+            pts['B1'],
+        ])
         vec_b1c1 = pts['C1'] - pts['B1']
         dist_b1c1 = np.linalg.norm(vec_b1c1)
-        unit_b1c1 = vec_b1c1 / dist_b1c1
-        p2_b1c1 = p3_b1c1 - unit_b1c1 * (dist_b1c1 * 0.3)
-        self._draw_bezier(r, p0_b1c1, p1_b1c1, p2_b1c1, p3_b1c1, '-', 'blue', curve_name='front_side_B1_C1')
+        side_b1c1 = np.array([
+            pts['B1'],
+            pts['B1'] + unit_be * control_dist,
+            pts['C1'] - vec_b1c1 / dist_b1c1 * (dist_b1c1 * 0.3),
+            pts['C1'],
+        ])
+
+        return {
+            'front_side_A1_B1': side_a1b1,
+            'front_side_B1_C1': side_b1c1,
+            'front_neck_H_E': np.array([pts['H'], helpers['H1'], helpers['E1'], pts['E']]),
+            'front_armhole_C1_K': np.array([pts['C1'], helpers['C11'], helpers['K1'], pts['K']]),
+            'back_side_A1_B1': side_a1b1.copy(),
+            'back_side_B1_C1': side_b1c1.copy(),
+            'back_neck_H_F': np.array([pts['H'], helpers['H2'], helpers['F1'], pts['F']]),
+            'back_armhole_C1_K': np.array([pts['C1'], helpers['C12'], helpers['K2'], pts['K']]),
+        }
+
+    def outlines(self) -> dict[str, Outline]:
+        """Closed stitch lines of the front and back pieces, in drafting coordinates.
+
+        Edges run A → A1 → B1 → C1 → K → H → neck point → A; each is named
+        after the points it runs between, in that order.
+        """
+        pts = self.points
+        seg = self.bezier_segments()
+        return {
+            piece: Outline.from_edges({
+                f'{piece}_hem_A_A1': [pts['A'], pts['A1']],
+                f'{piece}_side_A1_B1': seg[f'{piece}_side_A1_B1'],
+                f'{piece}_side_B1_C1': seg[f'{piece}_side_B1_C1'],
+                f'{piece}_armhole_C1_K': seg[f'{piece}_armhole_C1_K'],
+                f'{piece}_shoulder_H_K': [pts['K'], pts['H']],
+                f'{piece}_neck_H_{neck}': seg[f'{piece}_neck_H_{neck}'],
+                f'{piece}_center_{neck}_A': [pts[neck], pts['A']],
+            })
+            for piece, neck in (('front', 'E'), ('back', 'F'))
+        }
+
+    def piece_transforms(self) -> dict[str, tuple[float, ...]]:
+        """The back piece is mirrored and drawn right of the front."""
+        return {'back': (-1.0, 0.0, 0.0, 1.0, self.pattern_gap, 0.0)}
+
+    def armhole_lengths(self) -> dict[str, float]:
+        """Arc length of the front and back armhole curves (C1 → K), in cm."""
+        lengths = self.curve_lengths()
+        return {
+            'front': lengths['front_armhole_C1_K'],
+            'back': lengths['back_armhole_C1_K'],
+        }
+
+    def _plot_front_curves(self, r):
+        """Draw front pattern curves (blue)."""
+        pts = self.points
+        seg = self.bezier_segments()
+
+        self._draw_bezier(r, *seg['front_side_A1_B1'], '-', 'blue')
+        self._draw_bezier(r, *seg['front_side_B1_C1'], '-', 'blue')
 
         # Center line: A → E (vertical)
         r.line(pts['A'][0], pts['A'][1], pts['E'][0], pts['E'][1], color='blue')
@@ -274,168 +416,148 @@ class CorsetPattern(StretchPattern):
         r.line(pts['A'][0], pts['A'][1], pts['A1'][0], pts['A1'][1], color='blue')
 
         # Neck: H → E
-        p0_he = pts['H']
-        p3_he = pts['E']
-        p1_he = self.helper_points['H1']
-        p2_he = self.helper_points['E1']
-        self._draw_bezier(r, p0_he, p1_he, p2_he, p3_he, '-', 'blue', curve_name='front_neck_H_E')
+        self._draw_bezier(r, *seg['front_neck_H_E'], '-', 'blue')
 
         # Shoulder: H → K
         r.line(pts['H'][0], pts['H'][1], pts['K'][0], pts['K'][1], color='blue')
 
-        # Armhole: K → C1 through D1
-        self._draw_bezier(r, pts['K'], self.helper_points['K1'], self.helper_points['C11'], pts['C1'], '-', 'blue', curve_name='front_armhole_K_C1')
+        # Armhole: C1 → K through D1
+        self._draw_bezier(r, *seg['front_armhole_C1_K'], '-', 'blue')
 
     def _plot_back_curves(self, r):
         """Draw back pattern curves (green)."""
-        pts = self.points
-
-        m_A1 = self._mirror_point(pts['A1'])
-        m_B1 = self._mirror_point(pts['B1'])
-        m_C1 = self._mirror_point(pts['C1'])
-
-        m_p0_a1b1 = m_A1
-        m_p3_a1b1 = m_B1
-        m_control_dist_a1 = np.linalg.norm(m_p3_a1b1 - m_p0_a1b1) / 3
-        m_p1_a1b1 = m_p0_a1b1 + np.array([0, m_control_dist_a1])
-        m_vec_be = self._mirror_point(pts['E']) - self._mirror_point(pts['B'])
-        m_unit_be = m_vec_be / np.linalg.norm(m_vec_be)
-        m_control_dist_b1 = np.linalg.norm(m_p3_a1b1 - m_p0_a1b1) / 3
-        m_p2_a1b1 = m_p3_a1b1 - m_unit_be * m_control_dist_b1
-        self._draw_bezier(r, m_p0_a1b1, m_p1_a1b1, m_p2_a1b1, m_p3_a1b1, '-', 'green', curve_name='back_side_A1_B1')
-
-        m_p0_b1c1 = m_B1
-        m_p3_b1c1 = m_C1
-        m_p1_b1c1 = m_p0_b1c1 + m_unit_be * m_control_dist_b1
-        m_vec_b1c1 = m_C1 - m_B1
-        m_dist_b1c1 = np.linalg.norm(m_vec_b1c1)
-        m_unit_b1c1 = m_vec_b1c1 / m_dist_b1c1
-        m_p2_b1c1 = m_p3_b1c1 - m_unit_b1c1 * (m_dist_b1c1 * 0.3)
-        self._draw_bezier(r, m_p0_b1c1, m_p1_b1c1, m_p2_b1c1, m_p3_b1c1, '-', 'green', curve_name='back_side_B1_C1')
-
-        m_A = self._mirror_point(pts['A'])
-        m_F = self._mirror_point(pts['F'])
+        m_pts = self._mirrored().points
+        gap = self.pattern_gap
+        seg = {
+            name: c * np.array([-1.0, 1.0]) + np.array([gap, 0.0])
+            for name, c in self.bezier_segments().items()
+            if name.startswith('back_')
+        }
+
+        self._draw_bezier(r, *seg['back_side_A1_B1'], '-', 'green')
+        self._draw_bezier(r, *seg['back_side_B1_C1'], '-', 'green')
+
+        m_A, m_A1, m_F, m_H, m_K = (m_pts[name] for name in ('A', 'A1', 'F', 'H', 'K'))
         r.line(m_A[0], m_A[1], m_F[0], m_F[1], color='green')
-
         r.line(m_A[0], m_A[1], m_A1[0], m_A1[1], color='green')
 
-        m_H = self._mirror_point(pts['H'])
-        m_p0_hf = m_H
-        m_p3_hf = m_F
-        m_p1_hf = self._mirror_point(self.helper_points['H2'])
-        m_p2_hf = self._mirror_point(self.helper_points['F1'])
-        self._draw_bezier(r, m_p0_hf, m_p1_hf, m_p2_hf, m_p3_hf, '-', 'green', curve_name='back_neck_H_F')
+        self._draw_bezier(r, *seg['back_neck_H_F'], '-', 'green')
 
-        m_K = self._mirror_point(pts['K'])
         r.line(m_H[0], m_H[1], m_K[0], m_K[1], color='green')
 
-        m_K2 = self._mirror_point(self.helper_points['K2'])
-        m_C12 = self._mirror_point(self.helper_points['C12'])
-        self._draw_bezier(r, m_K, m_K2, m_C12, m_C1, '-', 'green', curve_name='back_armhole_K_C1')
+        self._draw_bezier(r, *seg['back_armhole_C1_K'], '-', 'green')
 
-    def _plot_reference(self, r):
-        """Plot reference sheet with coordinates for manual drawing."""
+    def _plot(self, r):
+        """Plot every layer of the pattern: guides, outline, cut, points and labels."""
         pts = self.points
-
-        self._draw_line(r, 'A', 'E', '--', 'gray')
-        self._draw_line(r, 'A', 'A1', '--', 'gray')
-
-        self._plot_front_curves(r)
-        self._plot_back_curves(r)
-
-        for name, coord in pts.items():
-            if name == 'D2':
-                continue
-            r.circle(coord[0], coord[1], 0.1, color='blue')
-            display_x = abs(coord[0] - pts['B'][0])
-            display_y = coord[1] - pts['B'][1]
-            r.text(coord[0]+0.5, coord[1], f"{name}\n({display_x:.1f}, {display_y:.1f})", size=8, color='blue')
-
-        back_points = ['A', 'A1', 'B', 'B1', 'C1', 'D2', 'F', 'H', 'K']
-        m_B = self._mirror_point(pts['B'])
-        for name in back_points:
-            if name in pts:
-                m_coord = self._mirror_point(pts[name])
-                r.circle(m_coord[0], m_coord[1], 0.1, color='green')
-                display_x = abs(m_coord[0] - m_B[0])
-                display_y = m_coord[1] - m_B[1]
-                r.text(m_coord[0]+0.5, m_coord[1], f"{name}\n({display_x:.1f}, {display_y:.1f})", size=8, color='green')
-
-        front_helpers = ['H1', 'E1', 'C11', 'K1']
-        for name in front_helpers:
-            if name in self.helper_points:
-                coord = self.helper_points[name]
-                r.circle(coord[0], coord[1], 0.07, color='gray')
-                r.text(coord[0]+0.5, coord[1], name, size=8, color='gray')
-
-        back_helpers = ['H2', 'F1', 'C12', 'K2']
-        for name in back_helpers:
-            if name in self.helper_points:
-                m_coord = self._mirror_point(self.helper_points[name])
-                r.circle(m_coord[0], m_coord[1], 0.07, color='gray')
-                r.text(m_coord[0]+0.5, m_coord[1], name, size=8, color='gray')
-
-        scale_y = min(pts['A'][1], pts['A1'][1]) - 5
-        r.line(0, scale_y, 10, scale_y, color='black', width=4)
-        r.text(5, scale_y - 2, "10 cm Scale", ha='center')
-
-        m_A = self._mirror_point(pts['A'])
-        front_center_x = (pts['A'][0] + pts['A1'][0]) / 2
-        back_center_x = (m_A[0] + self._mirror_point(pts['A1'])[0]) / 2
-        label_y = pts['B'][1]
-        r.text(front_center_x, label_y, "FRONT", size=12, ha='center', color='blue', fontweight='bold')
-        r.text(back_center_x, label_y, "BACK", size=12, ha='center', color='green', fontweight='bold')
-
-    def _plot_printable(self, r):
-        """Plot clean pattern for printing at 1:1 scale."""
-        pts = self.points
-
-        self._plot_front_curves(r)
-        self._plot_back_curves(r)
-
-        scale_y = min(pts['A'][1], pts['A1'][1]) - 5
-        r.line(0, scale_y, 10, scale_y, color='black', width=4)
-        r.text(5, scale_y - 2, "10 cm Scale", ha='center')
-
-        m_A = self._mirror_point(pts['A'])
-        front_center_x = (pts['A'][0] + pts['A1'][0]) / 2
-        back_center_x = (m_A[0] + self._mirror_point(pts['A1'])[0]) / 2
-        label_y = pts['B'][1]
-        r.text(front_center_x, label_y, "FRONT", size=12, ha='center', color='blue', fontweight='bold')
-        r.text(back_center_x, label_y, "BACK", size=12, ha='center', color='green', fontweight='bold')
-
-    def _prepare_bounds(self):
-        """Calculate pattern bounds (shared by render and generate methods)."""
-        self.pattern_gap = 5.0
-        xs = [p[0] for p in self.points.values()]
-        ys = [p[1] for p in self.points.values()]
-        min_x = min(xs) - 5
-        max_x = -min(xs) + self.pattern_gap + 5
-        self.bounds = (min_x, max_x, min(ys)-10, max(ys)+5)
-
-    def render_svg(self, variant: str = "construction") -> str:
-        """Render pattern as SVG string.
+        back = self._mirrored()
+        m_pts, m_helpers = back.points, back.helper_points
+
+        with r.on_layer("guides"):
+            self._draw_line(r, 'A', 'E', '--', 'gray')
+            self._draw_line(r, 'A', 'A1', '--', 'gray')
+
+        with r.on_layer("outline"):
+            self._plot_front_curves(r)
+            self._plot_back_curves(r)
+
+        with r.on_layer("cut"):
+            gap = self.pattern_gap
+            for piece, cut in self.cut_lines().items():
+                if piece == 'back':
+                    cut = cut * np.array([-1.0, 1.0]) + np.array([gap, 0.0])
+                r.polyline(np.vstack([cut, cut[:1]]), color='black')
+
+        labels = []
+        with r.on_layer("points"):
+            for name, coord in pts.items():
+                if name == 'D2':
+                    continue
+                r.circle(coord[0], coord[1], 0.1, color='blue')
+                display_x = abs(coord[0] - pts['B'][0])
+                display_y = coord[1] - pts['B'][1]
+                labels.append(Label(coord[0], coord[1], f"{name}\n({display_x:.1f}, {display_y:.1f})", color='blue'))
+
+            back_points = ['A', 'A1', 'B', 'B1', 'C1', 'D2', 'F', 'H', 'K']
+            m_B = m_pts['B']
+            for name in back_points:
+                if name in pts:
+                    m_coord = m_pts[name]
+                    r.circle(m_coord[0], m_coord[1], 0.1, color='green')
+                    display_x = abs(m_coord[0] - m_B[0])
+                    display_y = m_coord[1] - m_B[1]
+                    labels.append(Label(m_coord[0], m_coord[1], f"{name}\n({display_x:.1f}, {display_y:.1f})",
+                                        color='green'))
+
+            front_helpers = ['H1', 'E1', 'C11', 'K1']
+            for name in front_helpers:
+                if name in self.helper_points:
+                    coord = self.helper_points[name]
+                    r.circle(coord[0], coord[1], 0.07, color='gray')
+                    labels.append(Label(coord[0], coord[1], name, color='gray'))
+
+            back_helpers = ['H2', 'F1', 'C12', 'K2']
+            for name in back_helpers:
+                if name in self.helper_points:
+                    m_coord = m_helpers[name]
+                    r.circle(m_coord[0], m_coord[1], 0.07, color='gray')
+                    labels.append(Label(m_coord[0], m_coord[1], name, color='gray'))
+
+        with r.on_layer("labels"):
+            scale_y = min(pts['A'][1], pts['A1'][1]) - 5
+            r.line(0, scale_y, 10, scale_y, color='black', width=4)
+            r.text(5, scale_y - 2, "10 cm Scale", ha='center')
+
+            m_A = m_pts['A']
+            front_center_x = (pts['A'][0] + pts['A1'][0]) / 2
+            back_center_x = (m_A[0] + m_pts['A1'][0]) / 2
+            label_y = pts['B'][1]
+            r.text(front_center_x, label_y, "FRONT", size=12, ha='center', color='blue', fontweight='bold')
+            r.text(back_center_x, label_y, "BACK", size=12, ha='center', color='green', fontweight='bold')
+
+        with r.on_layer("points"):
+            place_labels(r, labels, y_flip=self.y_flip)
+
+    @property
+    def bounds(self) -> tuple[float, float, float, float]:
+        """Plot bounds: the front piece and the mirrored back piece, with a margin."""
+        x_lo, _, y_lo, y_hi = self.table.bounds(helper=False)
+        min_x = x_lo - 5
+        max_x = -x_lo + self.pattern_gap + 5
+        return (min_x, max_x, y_lo-10, y_hi+5)
+
+    def render(self, renderer_cls, variant: str = "construction", **options):
+        """Draw the pattern's recording into a new renderer of the given class.
 
         Args:
+            renderer_cls: Renderer class (SVGRenderer, PDFRenderer, ...).
             variant: "construction" for reference sheet with coordinates,
                      "pattern" for clean 1:1 printable pattern.
+            **options: Extra keyword arguments for the renderer.
 
         Returns:
-            SVG content as a string.
+            The renderer, ready to be serialized.
         """
-        self._prepare_bounds()
         title = None
         if variant == "construction":
             title = f"Corset Construction Draft - Full Bust: {self.m.full_bust}cm | Full Waist: {self.m.full_waist}cm"
 
-        r = SVGRenderer(self.bounds, y_flip=True, title=title)
+        r = renderer_cls(self.bounds, y_flip=self.y_flip, title=title, **options)
+        self.replay(r, variant)
+        return r
 
-        if variant == "construction":
-            self._plot_reference(r)
-        else:
-            self._plot_printable(r)
+    def render_svg(self, variant: str = "construction", compact: bool = False) -> str:
+        """Render pattern as SVG string.
+
+        Args:
+            variant: "construction" for reference sheet with coordinates,
+                     "pattern" for clean 1:1 printable pattern.
+            compact: Use the compact encoding (see CompactSVGRenderer).
 
-        return r.to_svg()
+        Returns:
+            SVG content as a string.
+        """
+        return self.render(CompactSVGRenderer if compact else SVGRenderer, variant).to_svg()
 
     def render_pdf(self, variant: str = "construction") -> bytes:
         """Render pattern as PDF bytes.
@@ -447,16 +569,4 @@ class CorsetPattern(StretchPattern):
         Returns:
             PDF content as bytes.
         """
-        self._prepare_bounds()
-        title = None
-        if variant == "construction":
-            title = f"Corset Construction Draft - Full Bust: {self.m.full_bust}cm | Full Waist: {self.m.full_waist}cm"
-
-        r = PDFRenderer(self.bounds, y_flip=True, title=title)
-
-        if variant == "construction":
-            self._plot_reference(r)
-        else:
-            self._plot_printable(r)
-
-        return r.to_pdf()
+        return self.render(PDFRenderer, variant).to_pdf()
@@ -0,0 +1,378 @@
+"""Pattern generation pipeline shared by the API endpoints.
+
+Turns a PatternRequest into a finished artifact (SVG, PDF or JSON bytes plus
+the warnings raised while drafting and rendering), and computes the canonical
+cache key of a request.
+
+Drafts are cached unstretched, keyed by pattern type, measurements and
+control parameters; stretched requests render a stretched child of the
+cached draft, and the seam allowance is applied to a child as well, so
+changing only the fabric stretch or the allowance never redrafts. The
+diagnostics reported while drafting are cached with the draft and reported
+again on every hit, and each generation renders its own copy of the draft.
+
+A draft missing from the cache is derived from the latest draft of the same
+pattern type when there is one: with_changes() recomputes only the points
+downstream of the measurements and control parameters that differ, which is
+what a client editing one value at a time sends.
+"""
+
+import copy
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+
+import numpy as np
+
+from app.core.cache import LRUCache
+from app.core.diagnostics import collect, report
+from app.core.measurements import FullMeasurements
+from app.core.stretch_pattern import StretchPattern, stretch_factors
+from app.modelist.corset import (
+    CorsetMeasurements,
+    ControlParameters as CorsetControlParameters,
+    CorsetPattern,
+)
+from app.modelist.geometry import pattern_geometry
+from app.modelist.sleeve import (
+    SleeveMeasurements,
+    ControlParameters as SleeveControlParameters,
+    SleevePattern,
+)
+from app.schemas.patterns import (
+    GarmentRequest,
+    GeometryIssue,
+    OutputFormat,
+    PatternRequest,
+    PatternResponse,
+    PatternType,
+    SVGEncoding,
+    StretchGeometry,
+    StretchPreviewRequest,
+    StretchPreviewResponse,
+)
+
+CONTROL_PARAMETERS = {
+    PatternType.corset: CorsetControlParameters,
+    PatternType.sleeve: SleeveControlParameters,
+}
+
+
+def _source_salt() -> str:
+    """Hash the drafting and rendering sources so cached artifacts expire on code changes."""
+    app_dir = Path(__file__).resolve().parent.parent
+    digest = hashlib.sha256()
+    for package in ("core", "modelist", "schemas"):
+        for path in sorted((app_dir / package).glob("*.py")):
+            digest.update(path.name.encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+CODE_VERSION = _source_salt()
+
+# Number of unstretched drafts kept in memory; override with COUTURE_DRAFT_CACHE_SIZE
+DRAFT_CACHE_SIZE = int(os.environ.get("COUTURE_DRAFT_CACHE_SIZE", 256))
+# Entries are (pattern, diagnostics reported while drafting it)
+draft_cache: LRUCache = LRUCache(DRAFT_CACHE_SIZE, sizeof=lambda entry: 1)
+# Latest draft of each pattern type, from which the next one is derived
+_latest_drafts: dict[PatternType, StretchPattern] = {}
+
+
+@dataclass(frozen=True)
+class GenerationResult:
+    """A finished generate response body with the warnings captured while building it."""
+    body: bytes
+    media_type: str
+    warnings: tuple[str, ...] = ()
+
+    @property
+    def etag(self) -> str:
+        """Strong ETag derived from the response bytes."""
+        return '"' + hashlib.sha256(self.body).hexdigest()[:32] + '"'
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.body) + sum(len(w) for w in self.warnings)
+
+
+def normalized_control_parameters(req: PatternRequest | StretchPreviewRequest) -> dict[str, float]:
+    """Return the full set of control parameters the pattern will be built with.
+
+    Unknown keys are ignored by the builders, and missing keys fall back to
+    the dataclass defaults, so both are resolved here to make equivalent
+    requests hash identically.
+    """
+    control = asdict(CONTROL_PARAMETERS[req.pattern_type]())
+    for key, value in (req.control_parameters or {}).items():
+        if key in control:
+            control[key] = float(value)
+    return control
+
+
+def _hash(payload: dict) -> str:
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _draft_payload(req: PatternRequest | StretchPreviewRequest) -> dict:
+    return {
+        "version": CODE_VERSION,
+        "pattern_type": req.pattern_type.value,
+        "measurements": {k: float(v) for k, v in sorted(req.measurements.items())},
+        "control_parameters": normalized_control_parameters(req),
+    }
+
+
+def draft_key(req: PatternRequest | StretchPreviewRequest) -> str:
+    """Canonical content hash of everything that determines the unstretched draft."""
+    return _hash(_draft_payload(req))
+
+
+def request_key(req: PatternRequest) -> str:
+    """Canonical content hash of everything that determines the generated output."""
+    payload = _draft_payload(req)
+    payload["stretch"] = req.stretch.model_dump() if req.stretch else None
+    payload["output_format"] = req.output_format.value
+    payload["seam_allowance"] = float(req.seam_allowance)
+    payload["edge_allowances"] = {k: float(v) for k, v in (req.edge_allowances or {}).items()}
+    payload["svg_encoding"] = req.svg_encoding.value
+    return _hash(payload)
+
+
+def geometry_version(req: PatternRequest) -> str:
+    """Token of the geometry drafted for a geometry request (its shortened request key)."""
+    return request_key(req)[:32]
+
+
+def _corset_inputs(req: PatternRequest | StretchPreviewRequest):
+    """Measurements and control parameters of a corset request."""
+    fm = FullMeasurements(**req.measurements)
+    corset_m = CorsetMeasurements.from_full_measurements(fm)
+
+    control = CorsetControlParameters()
+    if req.control_parameters:
+        for key, value in req.control_parameters.items():
+            if hasattr(control, key):
+                setattr(control, key, value)
+
+    return corset_m, control
+
+
+def _sleeve_inputs(req: PatternRequest | StretchPreviewRequest):
+    """Measurements and control parameters of a sleeve request.
+
+    Accepts either sleeve-specific fields (armhole_depth, armhole_measurement, ...)
+    or full body measurements (which are mapped via from_full_measurements).
+    """
+    if "armhole_depth" in req.measurements:
+        valid_fields = {f.name for f in SleeveMeasurements.__dataclass_fields__.values()}
+        filtered = {k: v for k, v in req.measurements.items() if k in valid_fields}
+        sleeve_m = SleeveMeasurements(**filtered)
+    else:
+        fm = FullMeasurements(**req.measurements)
+        sleeve_m = SleeveMeasurements.from_full_measurements(fm)
+
+    control = SleeveControlParameters()
+    if req.control_parameters:
+        for key, value in req.control_parameters.items():
+            if hasattr(control, key):
+                setattr(control, key, value)
+
+    return sleeve_m, control
+
+
+# Pattern class and input parser of each pattern type
+_DRAFTERS = {
+    PatternType.corset: (CorsetPattern, _corset_inputs),
+    PatternType.sleeve: (SleevePattern, _sleeve_inputs),
+}
+
+
+def _changes(base: StretchPattern, *inputs) -> dict[str, float]:
+    """Fields of the input dataclasses whose values differ from those base was drafted with."""
+    changes = {}
+    for attr, new in zip(base.graph_inputs, inputs):
+        old = getattr(base, attr)
+        for f in fields(new):
+            value = getattr(new, f.name)
+            if not np.array_equal(np.asarray(value), np.asarray(getattr(old, f.name))):
+                changes[f.name] = value
+    return changes
+
+
+def _draft(req: PatternRequest | StretchPreviewRequest) -> StretchPattern:
+    """Draft a request, from the latest draft of its pattern type if there is one.
+
+    Raises:
+        ValueError: If the pattern type is unknown.
+    """
+    if req.pattern_type not in _DRAFTERS:
+        raise ValueError(f"Unknown pattern type: {req.pattern_type}")
+    cls, parse = _DRAFTERS[req.pattern_type]
+    inputs = parse(req)
+    base = _latest_drafts.get(req.pattern_type)
+    if base is None:
+        pattern = cls(*inputs)
+    else:
+        pattern = base.with_changes(**_changes(base, *inputs))
+    _latest_drafts[req.pattern_type] = pattern
+    return pattern
+
+
+def draft_pattern(req: PatternRequest | StretchPreviewRequest):
+    """Return the unstretched draft for a request, from the draft cache if possible.
+
+    The returned pattern is shared between requests and must not be modified;
+    use with_stretch() to derive stretched variants. The diagnostics of the
+    draft are reported on every call, cached or not.
+
+    Raises:
+        ValueError: If the pattern type is unknown.
+    """
+    key = draft_key(req)
+    entry = draft_cache.get(key)
+    if entry is None:
+        with collect() as diagnostics:
+            pattern = _draft(req)
+        entry = (pattern, tuple(diagnostics))
+        draft_cache.put(key, entry)
+    pattern, diagnostics = entry
+    for message in diagnostics:
+        report(message)
+    return pattern
+
+
+def build_pattern(req: PatternRequest):
+    """Build the pattern object described by a request.
+
+    The result is never the cached draft itself, so rendering it (which
+    keeps the recording and validation on the pattern) leaves the draft
+    shared between requests untouched.
+
+    Raises:
+        ValueError: If the pattern type is unknown.
+    """
+    pattern = draft_pattern(req)
+    if req.stretch:
+        pattern = pattern.with_stretch(
+            horizontal=req.stretch.horizontal,
+            vertical=req.stretch.vertical,
+            usage=req.stretch.usage,
+        )
+    else:
+        # Own recording and validation state; the point table stays shared
+        pattern = copy.copy(pattern)
+    return pattern.with_seam_allowance(req.seam_allowance, req.edge_allowances)
+
+
+def generate(req: PatternRequest) -> GenerationResult:
+    """Draft and render a pattern, collecting the diagnostics reported along the way.
+
+    Diagnostics are collected per call (see app.core.diagnostics), so
+    concurrent calls never see each other's warnings.
+
+    Raises:
+        TypeError, ValueError, KeyError: If the request cannot be drafted.
+    """
+    with collect() as diagnostics:
+
+        pattern = build_pattern(req)
+        compact = req.svg_encoding == SVGEncoding.compact
+
+        if req.output_format == OutputFormat.svg:
+            body = pattern.render_svg("construction", compact).encode()
+            media_type = "image/svg+xml"
+        elif req.output_format == OutputFormat.pdf:
+            body = pattern.render_pdf("construction")
+            media_type = "application/pdf"
+        elif req.output_format == OutputFormat.geometry:
+            # Nothing is rendered: report the validation messages a render would
+            for issue in pattern.validate():
+                report(issue.message)
+            body = None
+            geometry = pattern_geometry(req.pattern_type, pattern, geometry_version(req))
+            media_type = "application/json"
+        else:
+            body = None
+            construction_svg = pattern.render_svg("construction", compact)
+            pattern_svg = pattern.render_svg("pattern", compact)
+            media_type = "application/json"
+
+        captured = tuple(diagnostics)
+
+    if req.output_format == OutputFormat.geometry:
+        geometry.warnings = list(captured)
+        body = geometry.model_dump_json().encode()
+    elif body is None:
+        body = PatternResponse(
+            construction_svg=construction_svg,
+            pattern_svg=pattern_svg,
+            warnings=list(captured),
+            issues=[GeometryIssue(**asdict(issue)) for issue in pattern.validate()],
+        ).model_dump_json().encode()
+
+    return GenerationResult(body=body, media_type=media_type, warnings=captured)
+
+
+def stretch_preview(req: StretchPreviewRequest) -> StretchPreviewResponse:
+    """Point geometry of one draft under every requested stretch, in one pass.
+
+    Raises:
+        TypeError, ValueError, KeyError: If the request cannot be drafted.
+    """
+    pattern = draft_pattern(req)
+    table = pattern.table
+    horizontal = [s.horizontal for s in req.stretches]
+    vertical = [s.vertical for s in req.stretches]
+    usage = [s.usage for s in req.stretches]
+    coords = pattern.stretched_coords(horizontal, vertical, usage).round(4).tolist()
+    names = table.names
+    helper = table.helper_mask.tolist()
+
+    geometries = []
+    for stretch, rows in zip(req.stretches, coords):
+        h, v = stretch_factors(stretch.horizontal, stretch.vertical, stretch.usage)
+        geometries.append(StretchGeometry(
+            stretch=stretch,
+            h_factor=float(h),
+            v_factor=float(v),
+            points={n: p for n, p, is_helper in zip(names, rows, helper) if not is_helper},
+            helper_points={n: p for n, p, is_helper in zip(names, rows, helper) if is_helper},
+        ))
+    return StretchPreviewResponse(pattern_type=req.pattern_type, geometries=geometries)
+
+
+def garment_requests(pieces: list, req: GarmentRequest) -> list[PatternRequest]:
+    """Expand a garment request into one PatternRequest per piece.
+
+    The measurements are checked once for the whole garment, so an invalid
+    set fails before any piece is queued; each piece still parses its own
+    copy when it is drafted. Per-piece adjustments are looked up by pattern
+    type.
+
+    Args:
+        pieces: The garment's PieceInfo list.
+        req: Garment measurements, adjustments and output format.
+
+    Raises:
+        TypeError: If the measurements are not a valid FullMeasurements set.
+        ValueError: If a piece has an unknown pattern type.
+    """
+    FullMeasurements(**req.measurements)
+    requests = []
+    for piece in pieces:
+        adjustments = req.adjustments.get(piece.pattern_type)
+        requests.append(PatternRequest(
+            pattern_type=PatternType(piece.pattern_type),
+            measurements=req.measurements,
+            control_parameters=adjustments.control_parameters if adjustments else None,
+            stretch=adjustments.stretch if adjustments else None,
+            output_format=req.output_format,
+            seam_allowance=req.seam_allowance,
+            edge_allowances=req.edge_allowances,
+            svg_encoding=req.svg_encoding,
+        ))
+    return requests
@@ -0,0 +1,212 @@
+"""Drafted geometry as JSON, for rendering on the client.
+
+The "geometry" output format sends what the server would otherwise draw:
+named construction and helper points, every piece's stitch line as cubic
+Bezier control points with its smooth joints, the cutting lines, where each
+piece sits on the sheet, and which of those layers each variant shows.
+Every collection is tagged with the DisplayList layer it is drawn on; the
+other layers (guides, measures, labels) are drawn by the server only.
+Coordinates are flat [x0, y0, x1, y1, ...] lists in cm, rounded to
+GEOMETRY_DECIMALS; the schema is versioned by GeometryResponse.version.
+
+Each geometry carries a geometry_version token. A client editing a pattern
+sends back the token of the geometry it holds, and receives a GeometryDelta
+listing only the points and edges that changed at the transmitted precision
+(see geometry_delta()). GeometryHistory keeps the recent geometries of each
+session within a byte budget, to diff against.
+"""
+
+import threading
+from dataclasses import asdict
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from app.core.cache import CacheStats, LRUCache
+from app.core.display_list import LAYERS, VARIANT_LAYERS
+from app.core.stretch_pattern import StretchPattern
+from app.schemas.patterns import (
+    CurveSet,
+    GeometryDelta,
+    GeometryIssue,
+    GeometryResponse,
+    PatternType,
+    PieceDelta,
+    PieceGeometry,
+    PointSet,
+    Polyline,
+    PolylineSplice,
+)
+
+# Decimals kept on coordinates (cm): 0.01 mm
+GEOMETRY_DECIMALS = 3
+
+
+def _flat(coords: ArrayLike) -> list[float]:
+    return np.round(np.asarray(coords, dtype=float), GEOMETRY_DECIMALS).ravel().tolist()
+
+
+def _point_set(view) -> PointSet:
+    names = list(view)
+    return PointSet(names=names, coords=_flat([view[name] for name in names]) if names else [])
+
+
+def pattern_geometry(pattern_type: PatternType, pattern: StretchPattern, geometry_version: str) -> GeometryResponse:
+    """Geometry of a drafted (possibly stretched) pattern, without warnings.
+
+    Args:
+        geometry_version: Token identifying this geometry, derived from
+                          everything that determines it (see request_key).
+    """
+    cuts = pattern.cut_lines()
+    transforms = pattern.piece_transforms()
+    pieces = []
+    present = {"points", "outline"} | ({"cut"} if cuts else set())
+    for name, outline in pattern.outlines().items():
+        cut = cuts.get(name)
+        piece = PieceGeometry(
+            name=name,
+            edges=CurveSet(
+                names=list(outline.names),
+                ctrl=_flat(outline.ctrl),
+                smooth=outline.smooth_joints().tolist(),
+            ),
+            cut_line=Polyline(coords=_flat(cut)) if cut is not None else None,
+        )
+        if name in transforms:
+            piece.transform = list(transforms[name])
+        pieces.append(piece)
+
+    return GeometryResponse(
+        pattern_type=pattern_type,
+        geometry_version=geometry_version,
+        y_up=pattern.y_flip,
+        h_factor=pattern.h_factor,
+        v_factor=pattern.v_factor,
+        bounds=[round(float(b), GEOMETRY_DECIMALS) for b in pattern.bounds],
+        variants={
+            variant: [layer for layer in LAYERS if layer in layers and layer in present]
+            for variant, layers in VARIANT_LAYERS.items()
+        },
+        points=_point_set(pattern.points),
+        helper_points=_point_set(pattern.helper_points),
+        pieces=pieces,
+        issues=[GeometryIssue(**asdict(issue)) for issue in pattern.validate()],
+    )
+
+
+def _point_changes(base: PointSet, new: PointSet) -> tuple[PointSet, list[str]]:
+    """Points of new that base lacks or places elsewhere, and names of base missing from new."""
+    old = dict(zip(base.names, zip(base.coords[0::2], base.coords[1::2])))
+    names, coords = [], []
+    for name, x, y in zip(new.names, new.coords[0::2], new.coords[1::2]):
+        if old.get(name) != (x, y):
+            names.append(name)
+            coords += [x, y]
+    kept = set(new.names)
+    return PointSet(names=names, coords=coords, layer=new.layer), [name for name in base.names if name not in kept]
+
+
+def _splice(base: list[float], new: list[float]) -> PolylineSplice:
+    """The run of points to replace in base to get new, between their common start and end."""
+    a, b = np.asarray(base).reshape(-1, 2), np.asarray(new).reshape(-1, 2)
+    n = min(len(a), len(b))
+    same = np.all(a[:n] == b[:n], axis=1)
+    head = int(np.argmin(same)) if not same.all() else n
+    same = np.all(a[::-1][:n - head] == b[::-1][:n - head], axis=1)
+    tail = int(np.argmin(same)) if not same.all() else n - head
+    return PolylineSplice(start=head, deleted=len(a) - head - tail, coords=new[2 * head:len(new) - 2 * tail])
+
+
+def _edges(curves: CurveSet) -> dict[str, tuple[list[float], bool]]:
+    return {name: (curves.ctrl[8 * k:8 * k + 8], curves.smooth[k]) for k, name in enumerate(curves.names)}
+
+
+def _piece_delta(base: PieceGeometry | None, new: PieceGeometry) -> PieceDelta | None:
+    """Changes from base to new (everything if base is None), or None if there are none."""
+    old = _edges(base.edges) if base is not None else {}
+    names, ctrl, smooth = [], [], []
+    for name, (c, s) in _edges(new.edges).items():
+        if old.get(name) != (c, s):
+            names.append(name)
+            ctrl += c
+            smooth.append(s)
+    transform = new.transform if base is None or base.transform != new.transform else None
+    edge_order = new.edges.names if base is None or base.edges.names != new.edges.names else None
+    cut_line = cut_splice = None
+    if base is not None and base.cut_line is not None and new.cut_line is not None:
+        if base.cut_line.coords != new.cut_line.coords:
+            cut_splice = _splice(base.cut_line.coords, new.cut_line.coords)
+    elif base is None or base.cut_line != new.cut_line:
+        cut_line = new.cut_line or Polyline(coords=[])
+    if base is not None and not names and all(v is None for v in (transform, edge_order, cut_line, cut_splice)):
+        return None
+    return PieceDelta(
+        name=new.name,
+        transform=transform,
+        edges=CurveSet(names=names, ctrl=ctrl, smooth=smooth, layer=new.edges.layer),
+        edge_order=edge_order,
+        cut_line=cut_line,
+        cut_splice=cut_splice,
+    )
+
+
+def geometry_delta(base: GeometryResponse, new: GeometryResponse) -> GeometryDelta:
+    """What a client holding base needs to turn it into new.
+
+    Coordinates are compared as transmitted (rounded to GEOMETRY_DECIMALS),
+    so a point moved by less than that is not resent.
+    """
+    points, removed_points = _point_changes(base.points, new.points)
+    helpers, removed_helpers = _point_changes(base.helper_points, new.helper_points)
+    old_pieces = {piece.name: piece for piece in base.pieces}
+    pieces = [delta for piece in new.pieces if (delta := _piece_delta(old_pieces.get(piece.name), piece)) is not None]
+    kept = {piece.name for piece in new.pieces}
+    return GeometryDelta(
+        pattern_type=new.pattern_type,
+        base_version=base.geometry_version,
+        geometry_version=new.geometry_version,
+        h_factor=new.h_factor,
+        v_factor=new.v_factor,
+        bounds=new.bounds,
+        points=points,
+        removed_points=removed_points,
+        helper_points=helpers,
+        removed_helper_points=removed_helpers,
+        pieces=pieces,
+        removed_pieces=[name for name in old_pieces if name not in kept],
+        issues=new.issues,
+        warnings=new.warnings,
+    )
+
+
+class GeometryHistory:
+    """Recent geometries sent to each session, by geometry_version.
+
+    Keeps the last versions_per_session geometry bodies (JSON bytes) of every
+    session; sessions are dropped least recently used first when the bodies
+    of all sessions exceed max_bytes.
+    """
+
+    def __init__(self, max_bytes: int, versions_per_session: int = 8):
+        self.versions_per_session = versions_per_session
+        self._sessions = LRUCache(max_bytes, sizeof=lambda versions: sum(len(body) for _, body in versions))
+        self._lock = threading.Lock()
+
+    def remember(self, session_id: str, geometry_version: str, body: bytes) -> None:
+        """Record a geometry body sent to a session."""
+        with self._lock:
+            versions = self._sessions.get(session_id, ())
+            versions = tuple(item for item in versions if item[0] != geometry_version) + ((geometry_version, body),)
+            self._sessions.put(session_id, versions[-self.versions_per_session:])
+
+    def get(self, session_id: str, geometry_version: str) -> bytes | None:
+        """The geometry body of that version sent to the session, if still kept."""
+        for version, body in self._sessions.get(session_id, ()):
+            if version == geometry_version:
+                return body
+        return None
+
+    def stats(self) -> CacheStats:
+        """Counters of the underlying cache of sessions."""
+        return self._sessions.stats()
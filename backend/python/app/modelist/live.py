@@ -0,0 +1,264 @@
+"""Live editing channel: latest-wins pattern generation over a WebSocket.
+
+A client editing a pattern streams LiveUpdate messages (a whole request
+first, then only the fields that change) and is pushed a LiveResult for the
+newest state only. Each connection keeps the merged request and runs at most
+max_in_flight generations at once:
+
+- updates arriving while every slot is busy are coalesced: when a slot
+  frees, only the newest is generated;
+- a generation that finishes after a newer update arrived is superseded:
+  its result is dropped instead of pushed.
+
+Generations go through the same bank, result cache and pool as the generate
+endpoint. A pool job cannot be interrupted once running, so a superseded job
+keeps its slot until it finishes; that is what bounds the work one connection
+puts on the pool, and closing a connection leaves its running generations
+to finish unobserved. Geometry results after the first are pushed as a
+GeometryDelta from the previous geometry pushed on the connection.
+"""
+
+import asyncio
+import base64
+import os
+import time
+from dataclasses import asdict, dataclass, fields
+from typing import Awaitable, Callable
+
+from pydantic import ValidationError
+
+from app.modelist.generation import GenerationResult
+from app.modelist.geometry import geometry_delta
+from app.schemas.patterns import GeometryResponse, LiveResult, LiveUpdate, OutputFormat, PatternRequest
+
+# Generations one connection may run at once; override with COUTURE_LIVE_MAX_IN_FLIGHT
+MAX_IN_FLIGHT = int(os.environ.get("COUTURE_LIVE_MAX_IN_FLIGHT", 2))
+
+# LiveUpdate fields merged key by key into the current request
+_MERGED = ("measurements", "control_parameters", "edge_allowances")
+
+
+@dataclass
+class LiveConnectionStats:
+    """Counters of one live connection, or totals over several.
+
+    Every update is eventually rejected (invalid), coalesced, superseded or
+    pushed; failed counts the pushed results that are generation errors.
+    """
+    updates: int = 0
+    rejected: int = 0
+    coalesced: int = 0
+    superseded: int = 0
+    pushed: int = 0
+    failed: int = 0
+    in_flight: int = 0
+    max_in_flight: int = 0
+    latency_ms_total: float = 0.0
+    latency_ms_max: float = 0.0
+
+    @property
+    def latency_ms_mean(self) -> float:
+        return self.latency_ms_total / self.pushed if self.pushed else 0.0
+
+    def add(self, other: "LiveConnectionStats") -> None:
+        """Fold the counters of another connection into these."""
+        for f in fields(self):
+            if f.name.endswith("_max"):
+                setattr(self, f.name, max(getattr(self, f.name), getattr(other, f.name)))
+            else:
+                setattr(self, f.name, getattr(self, f.name) + getattr(other, f.name))
+
+    def to_dict(self) -> dict:
+        return asdict(self) | {"latency_ms_mean": self.latency_ms_mean}
+
+
+class LiveConnection:
+    """Request state and generations of one live editing connection."""
+
+    def __init__(self, channel: "LiveChannel", send: Callable[[str], Awaitable[None]]):
+        self._channel = channel
+        self._send = send
+        self.state: dict = {}
+        # Revision of the newest accepted update
+        self.revision = 0
+        # Newest update not yet started: (revision, seq, request, received_at)
+        self._pending: tuple | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self._dropped = 0
+        self._geometry: GeometryResponse | None = None
+        self.closed = False
+        self.stats = LiveConnectionStats(max_in_flight=channel.max_in_flight)
+
+    async def receive(self, text: str) -> None:
+        """Handle one message from the client: merge it and schedule its generation.
+
+        Invalid updates are answered right away with a 422 LiveResult and
+        leave the state unchanged.
+        """
+        received_at = time.perf_counter()
+        self.stats.updates += 1
+        seq = None
+        try:
+            update = LiveUpdate.model_validate_json(text)
+            seq = update.seq
+            state = self._merge(update)
+            req = PatternRequest.model_validate(state)
+        except ValidationError as e:
+            self.stats.rejected += 1
+            await self._push(LiveResult(seq=seq, status_code=422, error=str(e)))
+            return
+        self.state = state
+        self.revision += 1
+        if self._pending is not None:
+            self.stats.coalesced += 1
+            self._dropped += 1
+        self._pending = (self.revision, seq, req, received_at)
+        self._dispatch()
+
+    def _merge(self, update: LiveUpdate) -> dict:
+        state = dict(self.state)
+        for name in update.model_fields_set - {"seq"}:
+            value = getattr(update, name)
+            if name in _MERGED and value is not None and state.get(name):
+                value = {**state[name], **value}
+            state[name] = value
+        return state
+
+    def _dispatch(self) -> None:
+        """Start the pending update if a slot is free."""
+        while self._pending is not None and len(self._tasks) < self._channel.max_in_flight and not self.closed:
+            job, self._pending = self._pending, None
+            task = asyncio.ensure_future(self._run(*job))
+            self._tasks.add(task)
+            task.add_done_callback(self._finished)
+        self.stats.in_flight = len(self._tasks)
+
+    def _finished(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        self._dispatch()
+
+    async def _run(self, revision: int, seq: int | None, req: PatternRequest, received_at: float) -> None:
+        try:
+            result = await self._channel.resolve(req)
+        except self._channel.errors as e:
+            message = LiveResult(seq=seq, status_code=self._channel.error_status(e), error=str(e))
+            failed = True
+        except Exception as e:
+            message = LiveResult(seq=seq, status_code=500, error=f"Generation failed: {e}")
+            failed = True
+        else:
+            message, failed = None, False
+        if self.closed:
+            return
+        if revision != self.revision:
+            self.stats.superseded += 1
+            self._dropped += 1
+            return
+        if message is None:
+            message = self._message(seq, req, result)
+        latency_ms = (time.perf_counter() - received_at) * 1000
+        message.latency_ms = round(latency_ms, 3)
+        message.dropped, self._dropped = self._dropped, 0
+        if not await self._push(message):
+            return
+        self.stats.pushed += 1
+        self.stats.failed += failed
+        self.stats.latency_ms_total += latency_ms
+        self.stats.latency_ms_max = max(self.stats.latency_ms_max, latency_ms)
+
+    def _message(self, seq: int | None, req: PatternRequest, result: GenerationResult) -> LiveResult:
+        """The LiveResult carrying a generation result, geometry as a delta from the last one pushed."""
+        body = result.body
+        if req.output_format == OutputFormat.geometry:
+            geometry = GeometryResponse.model_validate_json(body)
+            if self._geometry is not None:
+                body = geometry_delta(self._geometry, geometry).model_dump_json().encode()
+            self._geometry = geometry
+        else:
+            self._geometry = None
+        if result.media_type == "application/pdf":
+            content, encoding = base64.b64encode(body).decode(), "base64"
+        else:
+            content, encoding = body.decode(), "utf-8"
+        return LiveResult(
+            seq=seq, media_type=result.media_type, etag=result.etag, encoding=encoding,
+            content=content, warnings=list(result.warnings),
+        )
+
+    async def _push(self, message: LiveResult) -> bool:
+        """Send a message to the client; False if it was not sent.
+
+        The client may be gone before the receive loop notices: a failed
+        send closes the connection instead of escaping the generation task.
+        """
+        if self.closed:
+            return False
+        try:
+            await self._send(message.model_dump_json())
+        except Exception:
+            self.close()
+            return False
+        return True
+
+    def close(self) -> None:
+        """Stop pushing and drop the pending update.
+
+        Running generations are left to finish: they may be shared with
+        other clients, and their results still fill the caches.
+        """
+        self.closed = True
+        self._pending = None
+
+
+class LiveChannel:
+    """Open live connections and the counters of every connection so far."""
+
+    def __init__(
+        self,
+        resolve: Callable[[PatternRequest], Awaitable[GenerationResult]],
+        errors: tuple[type[Exception], ...],
+        error_status: Callable[[Exception], int],
+        max_in_flight: int = MAX_IN_FLIGHT,
+    ):
+        """Initialize the channel.
+
+        Args:
+            resolve: Coroutine function generating (or looking up) a request.
+            errors: Exceptions of resolve pushed to the client as failed results.
+            error_status: HTTP status code reported for one of those errors.
+            max_in_flight: Generations one connection may run at once.
+        """
+        self.resolve = resolve
+        self.errors = errors
+        self.error_status = error_status
+        self.max_in_flight = max_in_flight
+        self._open: set[LiveConnection] = set()
+        self._closed = LiveConnectionStats()
+        self._connections = 0
+
+    def connect(self, send: Callable[[str], Awaitable[None]]) -> LiveConnection:
+        """Open a connection pushing its results through send."""
+        connection = LiveConnection(self, send)
+        self._open.add(connection)
+        self._connections += 1
+        return connection
+
+    def disconnect(self, connection: LiveConnection) -> None:
+        """Close a connection and keep its counters in the totals."""
+        connection.close()
+        self._open.discard(connection)
+        self._closed.add(connection.stats)
+        self._closed.in_flight = 0
+
+    def stats(self) -> dict:
+        """Totals over every connection so far, and the counters of the open ones."""
+        totals = LiveConnectionStats()
+        totals.add(self._closed)
+        for connection in self._open:
+            totals.add(connection.stats)
+        totals.max_in_flight = self.max_in_flight
+        return {
+            "connections": self._connections,
+            "totals": totals.to_dict(),
+            "open": [connection.stats.to_dict() for connection in self._open],
+        }
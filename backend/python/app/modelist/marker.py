@@ -0,0 +1,134 @@
+"""Cutting markers for production orders.
+
+Expands a MarkerRequest into the cut lines of every ordered piece (through
+the same draft cache as generate) and nests them onto the fabric width with
+app.core.nesting. The result is a marker SVG or PDF, or JSON holding the
+SVG, every placement, the marker length and the fabric utilization.
+"""
+
+from dataclasses import asdict, dataclass
+
+import numpy as np
+
+from app.core.diagnostics import collect
+from app.core.flatten import flatten_path
+from app.core.measurements import STANDARD_SIZES, default_measurements
+from app.core.nesting import Marker, NestPiece, nest, render_marker
+from app.core.pdf_renderer import PDFRenderer
+from app.core.svg_renderer import CompactSVGRenderer, SVGRenderer
+from app.modelist.generation import build_pattern
+from app.schemas.patterns import (
+    MarkerOrder,
+    MarkerOutputFormat,
+    MarkerPlacement,
+    MarkerRequest,
+    MarkerResponse,
+    PatternRequest,
+    SVGEncoding,
+)
+
+
+@dataclass(frozen=True)
+class MarkerResult:
+    """A rendered marker with its length (cm) and utilization (0-1)."""
+    body: bytes
+    media_type: str
+    length: float
+    utilization: float
+
+
+def order_request(order: MarkerOrder) -> PatternRequest:
+    """The PatternRequest drafting the pieces of one order line.
+
+    Raises:
+        ValueError: If the order gives neither or both of size and measurements,
+                    or an unknown size.
+    """
+    if (order.size is None) == (order.measurements is None):
+        raise ValueError("Give either a size or measurements for every order")
+    measurements = order.measurements
+    if order.size is not None:
+        if order.size not in STANDARD_SIZES:
+            raise ValueError(f"Unknown size {order.size}; expected one of {list(STANDARD_SIZES)}")
+        measurements = asdict(default_measurements(order.size))
+    return PatternRequest(
+        pattern_type=order.pattern_type,
+        measurements=measurements,
+        control_parameters=order.control_parameters,
+        stretch=order.stretch,
+        seam_allowance=order.seam_allowance,
+        edge_allowances=order.edge_allowances,
+    )
+
+
+def marker_pieces(req: MarkerRequest) -> list[NestPiece]:
+    """Cut lines of every ordered piece, mirrored copies included.
+
+    Pieces cut without seam allowance are nested along their stitch line.
+
+    Raises:
+        TypeError, ValueError, KeyError: If an order cannot be drafted.
+    """
+    pieces = []
+    for i, order in enumerate(req.orders):
+        label = f"T{order.size}" if order.size is not None else f"#{i + 1}"
+        pattern = build_pattern(order_request(order))
+        cuts = pattern.cut_lines()
+        for piece, outline in pattern.outlines().items():
+            cut = cuts.get(piece)
+            if cut is None:
+                cut = flatten_path(outline.ctrl)[:-1]
+            for _ in range(order.quantity):
+                pieces.append(NestPiece(f"{piece} {label}", cut, allow_mirror=req.allow_mirror))
+                if order.pairs:
+                    mirrored = cut[::-1] * np.array([-1.0, 1.0])
+                    pieces.append(NestPiece(f"{piece} {label}", mirrored, allow_mirror=req.allow_mirror))
+    return pieces
+
+
+def _response(marker: Marker, svg: str, warnings: list[str]) -> MarkerResponse:
+    return MarkerResponse(
+        width=marker.width,
+        length=round(marker.length, 2),
+        utilization=round(marker.utilization, 4),
+        attempts=marker.attempts,
+        seconds=round(marker.seconds, 3),
+        placements=[
+            MarkerPlacement(name=p.name, x=round(p.x, 2), y=round(p.y, 2), turned=p.turned, mirrored=p.mirrored)
+            for p in marker.placements
+        ],
+        marker_svg=svg,
+        warnings=warnings,
+    )
+
+
+def make_marker(req: MarkerRequest) -> MarkerResult:
+    """Draft every ordered piece, nest them and render the marker.
+
+    Raises:
+        TypeError, ValueError, KeyError: If an order cannot be drafted or a
+            piece does not fit the fabric width.
+    """
+    with collect() as diagnostics:
+        marker = nest(
+            marker_pieces(req),
+            req.fabric_width,
+            resolution=req.resolution,
+            gap=req.gap,
+            time_budget=req.time_budget,
+        )
+    title = (f"Marker - width {marker.width:g} cm | length {marker.length:.1f} cm | "
+             f"utilization {marker.utilization:.1%}")
+
+    if req.output_format == MarkerOutputFormat.pdf:
+        body = render_marker(marker, PDFRenderer, title=title).to_pdf()
+        media_type = "application/pdf"
+    else:
+        renderer_cls = CompactSVGRenderer if req.svg_encoding == SVGEncoding.compact else SVGRenderer
+        svg = render_marker(marker, renderer_cls, title=title).to_svg()
+        if req.output_format == MarkerOutputFormat.svg:
+            body, media_type = svg.encode(), "image/svg+xml"
+        else:
+            body = _response(marker, svg, list(diagnostics)).model_dump_json().encode()
+            media_type = "application/json"
+    return MarkerResult(body=body, media_type=media_type, length=marker.length, utilization=marker.utilization)
@@ -1,33 +1,63 @@
 """Pattern generation API — generate pattern pieces from measurements."""
 
-import warnings
-
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import Response
-
-from app.core.measurements import FullMeasurements
-from app.modelist.corset import (
-    CorsetMeasurements,
-    ControlParameters as CorsetControlParameters,
-    CorsetPattern,
-)
-from app.modelist.sleeve import (
-    SleeveMeasurements,
-    ControlParameters as SleeveControlParameters,
-    SleevePattern,
+import asyncio
+import base64
+import os
+
+from fastapi import APIRouter, Header, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response, StreamingResponse
+
+from app.core.cache import LRUCache
+from app.core.singleflight import SingleFlight
+from app.modelist.bank import BANK_CACHE_CONTROL, bank
+from app.modelist.generation import (
+    GenerationResult,
+    garment_requests,
+    geometry_version,
+    request_key,
+    stretch_preview,
 )
+from app.modelist.geometry import GeometryHistory, geometry_delta
+from app.modelist.live import LiveChannel
+from app.modelist.marker import make_marker
+from app.modelist.workers import GenerationTimeout, PoolSaturated, pool
 from app.schemas.patterns import (
+    BankStatsResponse,
+    BatchItemResult,
+    BatchPatternRequest,
+    CacheStatsResponse,
     ControlParameterDefinition,
+    GarmentPieceResult,
+    GarmentRequest,
+    GarmentResponse,
+    GeometryResponse,
+    InFlightStatsResponse,
+    LiveStatsResponse,
+    MarkerRequest,
     MeasurementFieldDefinition,
     OutputFormat,
     PatternRequest,
-    PatternResponse,
     PatternType,
     PatternTypeInfo,
+    PoolStatsResponse,
+    StretchPreviewRequest,
+    StretchPreviewResponse,
 )
+from app.shop.garments import GARMENTS
 
 router = APIRouter(prefix="/api/modelist", tags=["modelist"])
 
+# Size limit of the generate result cache; override with COUTURE_RESULT_CACHE_BYTES
+RESULT_CACHE_BYTES = int(os.environ.get("COUTURE_RESULT_CACHE_BYTES", 64 * 1024 * 1024))
+result_cache: LRUCache = LRUCache(RESULT_CACHE_BYTES, sizeof=lambda r: r.nbytes)
+# Generate requests currently being computed, by request key
+in_flight = SingleFlight()
+# Size limit of the geometries kept per session for deltas; override with COUTURE_GEOMETRY_HISTORY_BYTES
+GEOMETRY_HISTORY_BYTES = int(os.environ.get("COUTURE_GEOMETRY_HISTORY_BYTES", 16 * 1024 * 1024))
+geometry_history = GeometryHistory(GEOMETRY_HISTORY_BYTES)
+# Largest number of patterns accepted by one batch request; override with COUTURE_MAX_BATCH
+MAX_BATCH_SIZE = int(os.environ.get("COUTURE_MAX_BATCH", 200))
+
 
 PATTERN_TYPE_INFO: dict[PatternType, PatternTypeInfo] = {
     PatternType.corset: PatternTypeInfo(
@@ -83,104 +113,314 @@ def list_pattern_types():
     return list(PATTERN_TYPE_INFO.values())
 
 
-def _build_corset(req: PatternRequest):
-    """Build a corset pattern from request data."""
-    fm = FullMeasurements(**req.measurements)
-    corset_m = CorsetMeasurements.from_full_measurements(fm)
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Return True if an If-None-Match header value matches the given ETag."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in (c.removeprefix("W/") for c in candidates)
 
-    control = CorsetControlParameters()
-    if req.control_parameters:
-        for key, value in req.control_parameters.items():
-            if hasattr(control, key):
-                setattr(control, key, value)
 
-    pattern = CorsetPattern(corset_m, control)
+async def _generate_and_cache(key: str, req: PatternRequest) -> GenerationResult:
+    result = await pool.run(req)
+    result_cache.put(key, result)
+    return result
+
+
+async def _resolve(req: PatternRequest) -> tuple[GenerationResult, bool]:
+    """Return the result for a request and whether it came from the bank.
+
+    Looks in the bank, then the result cache, then generates in the pool
+    (sharing the work with identical requests in flight).
+    """
+    key = request_key(req)
+    result = bank.get(key)
+    if result is not None:
+        return result, True
+    result = result_cache.get(key)
+    if result is None:
+        result = await in_flight.do(key, lambda: _generate_and_cache(key, req))
+    return result, False
+
+
+def _http_error(e: Exception) -> HTTPException:
+    """Map a generation failure to the HTTP error returned for it."""
+    if isinstance(e, PoolSaturated):
+        return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    if isinstance(e, GenerationTimeout):
+        return HTTPException(status_code=504, detail=str(e))
+    return HTTPException(status_code=422, detail=str(e))
+
+
+GENERATION_ERRORS = (PoolSaturated, GenerationTimeout, TypeError, ValueError, KeyError)
+
+
+async def _resolve_result(req: PatternRequest) -> GenerationResult:
+    result, _ = await _resolve(req)
+    return result
 
-    if req.stretch:
-        pattern.stretch(
-            horizontal=req.stretch.horizontal,
-            vertical=req.stretch.vertical,
-            usage=req.stretch.usage,
-        )
 
-    return pattern
+live = LiveChannel(_resolve_result, GENERATION_ERRORS, lambda e: _http_error(e).status_code)
 
 
-def _build_sleeve(req: PatternRequest):
-    """Build a sleeve pattern from request data.
+def _geometry_delta(req: PatternRequest, result: GenerationResult) -> GenerationResult | None:
+    """Remember a geometry sent to the request's session, and diff it against the request's base.
 
-    Accepts either sleeve-specific fields (armhole_depth, armhole_measurement, ...)
-    or full body measurements (which are mapped via from_full_measurements).
+    Returns:
+        The GeometryDelta from base_version to the result, or None if the
+        request has no base_version or the session no longer has it.
     """
-    if "armhole_depth" in req.measurements:
-        valid_fields = {f.name for f in SleeveMeasurements.__dataclass_fields__.values()}
-        filtered = {k: v for k, v in req.measurements.items() if k in valid_fields}
-        sleeve_m = SleeveMeasurements(**filtered)
-    else:
-        fm = FullMeasurements(**req.measurements)
-        sleeve_m = SleeveMeasurements.from_full_measurements(fm)
-
-    control = SleeveControlParameters()
-    if req.control_parameters:
-        for key, value in req.control_parameters.items():
-            if hasattr(control, key):
-                setattr(control, key, value)
-
-    pattern = SleevePattern(sleeve_m, control)
-
-    if req.stretch:
-        pattern.stretch(
-            horizontal=req.stretch.horizontal,
-            vertical=req.stretch.vertical,
-            usage=req.stretch.usage,
+    base = geometry_history.get(req.session_id, req.base_version) if req.base_version else None
+    geometry_history.remember(req.session_id, geometry_version(req), result.body)
+    if base is None:
+        return None
+    delta = geometry_delta(GeometryResponse.model_validate_json(base), GeometryResponse.model_validate_json(result.body))
+    return GenerationResult(body=delta.model_dump_json().encode(), media_type=result.media_type, warnings=result.warnings)
+
+
+@router.post("/generate")
+async def generate_pattern(req: PatternRequest, if_none_match: str | None = Header(default=None)):
+    """Generate a pattern from measurements.
+
+    Standard sizes are served from the pre-generated bank when it is warm;
+    the response's Content-Location names the GET URL of the banked artifact,
+    which HTTP caches may keep. Other artifacts are cached by request
+    content. Responses carry a strong ETag and a matching If-None-Match
+    yields 304 Not Modified.
+
+    Everything else is drafted in the generation pool, off the event loop;
+    a full queue answers 503 with Retry-After and a slow job 504. Identical
+    requests arriving while one is being generated share its result.
+
+    Geometry requests with a session_id are remembered for that session; if
+    base_version names one the session still has, the answer is a
+    GeometryDelta from it instead of the full geometry.
+    """
+    try:
+        result, banked = await _resolve(req)
+    except GENERATION_ERRORS as e:
+        raise _http_error(e)
+
+    if req.session_id and req.output_format == OutputFormat.geometry:
+        delta = _geometry_delta(req, result)
+        if delta is not None:
+            result, banked = delta, False
+
+    headers = {"ETag": result.etag}
+    if banked:
+        headers["Content-Location"] = router.url_path_for("get_banked_artifact", key=request_key(req))
+    if _etag_matches(if_none_match, result.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=result.body, media_type=result.media_type, headers=headers)
+
+
+def _item_result(index: int, result: GenerationResult | None = None, error: Exception | None = None) -> BatchItemResult:
+    """Describe the outcome of one item of a multi-pattern request."""
+    if error is not None:
+        return BatchItemResult(index=index, status_code=_http_error(error).status_code, error=str(error))
+    if result.media_type == "application/pdf":
+        return BatchItemResult(
+            index=index, media_type=result.media_type, etag=result.etag, encoding="base64",
+            content=base64.b64encode(result.body).decode(), warnings=list(result.warnings),
         )
+    return BatchItemResult(
+        index=index, media_type=result.media_type, etag=result.etag,
+        content=result.body.decode(), warnings=list(result.warnings),
+    )
+
+
+async def _resolve_many(items: list[PatternRequest], ordered: bool):
+    """Yield a BatchItemResult per request as each finishes (or in request order if ordered)."""
+    # Keep at most one job per pool worker from this call, so a large batch
+    # queues here instead of filling the pool queue for other clients.
+    slots = asyncio.Semaphore(pool.workers)
+
+    async def run(index: int, req: PatternRequest) -> BatchItemResult:
+        async with slots:
+            try:
+                result, _ = await _resolve(req)
+            except GENERATION_ERRORS as e:
+                return _item_result(index, error=e)
+            except Exception as e:
+                # One broken item must not end the stream of the others
+                return BatchItemResult(index=index, status_code=500, error=f"Generation failed: {e}")
+        return _item_result(index, result)
+
+    tasks = [asyncio.ensure_future(run(i, req)) for i, req in enumerate(items)]
+    try:
+        if ordered:
+            for task in tasks:
+                yield await task
+        else:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def _ndjson(items):
+    async for item in items:
+        yield item.model_dump_json() + "\n"
+
+
+@router.post("/generate/batch")
+async def generate_batch(batch: BatchPatternRequest):
+    """Generate many patterns in one request, streamed back as NDJSON.
+
+    Each line is a BatchItemResult with the index of its request. Failures
+    are reported per item (with the status code the single endpoint would
+    have returned) and do not stop the batch. Lines are sent as items finish,
+    or in request order if `ordered` is set.
+    """
+    try:
+        items = batch.expand()
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if len(items) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"Batch of {len(items)} patterns exceeds the limit of {MAX_BATCH_SIZE}")
+    return StreamingResponse(_ndjson(_resolve_many(items, batch.ordered)), media_type="application/x-ndjson")
 
-    return pattern
 
+@router.post("/garments/{garment_name}/generate")
+async def generate_garment(garment_name: str, req: GarmentRequest):
+    """Generate every piece of a shop garment in one request.
 
-@router.post("/generate")
-def generate_pattern(req: PatternRequest):
-    """Generate a pattern from measurements."""
-    captured_warnings: list[str] = []
+    The measurements are validated once for the whole garment, then the
+    pieces are generated concurrently (through the same bank, cache and
+    pool as single requests). Pieces are returned together in garment
+    order, or streamed as NDJSON lines as they finish when `stream` is set.
+    """
+    garment = GARMENTS.get(garment_name)
+    if garment is None:
+        raise HTTPException(status_code=404, detail=f"Garment '{garment_name}' not found")
+    try:
+        items = garment_requests(garment.pieces, req)
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    def piece_result(item: BatchItemResult) -> GarmentPieceResult:
+        piece = garment.pieces[item.index]
+        return GarmentPieceResult(**item.model_dump(), pattern_type=piece.pattern_type, label=piece.label)
+
+    if req.stream:
+        async def pieces():
+            async for item in _resolve_many(items, ordered=False):
+                yield piece_result(item)
 
+        return StreamingResponse(_ndjson(pieces()), media_type="application/x-ndjson")
+    return GarmentResponse(
+        garment=garment.name,
+        pieces=[piece_result(item) async for item in _resolve_many(items, ordered=True)],
+    )
+
+
+@router.websocket("/live")
+async def live_edit(websocket: WebSocket):
+    """Live editing channel for an open pattern.
+
+    The client sends LiveUpdate messages (JSON): a complete request first,
+    then only the fields it changes. Bursts are coalesced and results of
+    superseded updates are dropped, so a LiveResult is pushed only for the
+    newest state; geometry after the first is pushed as a GeometryDelta.
+    Each connection runs at most COUTURE_LIVE_MAX_IN_FLIGHT generations.
+    """
+    await websocket.accept()
+    connection = live.connect(websocket.send_text)
     try:
-        # Build the pattern with warning capture
-        with warnings.catch_warnings(record=True) as w:
-            warnings.simplefilter("always")
-
-            if req.pattern_type == PatternType.corset:
-                pattern = _build_corset(req)
-            elif req.pattern_type == PatternType.sleeve:
-                pattern = _build_sleeve(req)
-            else:
-                raise HTTPException(status_code=400, detail=f"Unknown pattern type: {req.pattern_type}")
-
-            captured_warnings = [str(warning.message) for warning in w]
-
-        # Generate output based on format
-        with warnings.catch_warnings(record=True) as w:
-            warnings.simplefilter("always")
-
-            if req.output_format == OutputFormat.svg:
-                svg_content = pattern.render_svg("construction")
-                captured_warnings.extend(str(warning.message) for warning in w)
-                return Response(content=svg_content, media_type="image/svg+xml")
-
-            if req.output_format == OutputFormat.pdf:
-                pdf_content = pattern.render_pdf("construction")
-                captured_warnings.extend(str(warning.message) for warning in w)
-                return Response(content=pdf_content, media_type="application/pdf")
-
-            # output_format == "all"
-            construction_svg = pattern.render_svg("construction")
-            pattern_svg = pattern.render_svg("pattern")
-            captured_warnings.extend(str(warning.message) for warning in w)
-
-            return PatternResponse(
-                construction_svg=construction_svg,
-                pattern_svg=pattern_svg,
-                warnings=captured_warnings,
-            )
+        while True:
+            await connection.receive(await websocket.receive_text())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        live.disconnect(connection)
 
+
+@router.post("/stretch", response_model=StretchPreviewResponse)
+def preview_stretch(req: StretchPreviewRequest):
+    """Return the pattern points under several fabric stretches at once.
+
+    The pattern is drafted once (or taken from the draft cache) and each
+    stretch is a rescaling of its points, so a stretch slider can preview
+    any number of values without redrafting.
+    """
+    try:
+        return stretch_preview(req)
     except (TypeError, ValueError, KeyError) as e:
         raise HTTPException(status_code=422, detail=str(e))
+
+
+@router.post("/marker")
+async def generate_marker(req: MarkerRequest):
+    """Nest the pieces of a cutting order onto a fabric width.
+
+    Every ordered pattern is drafted (through the draft cache) and its cut
+    lines are packed along the roll within the request's time budget, in
+    the generation pool. Returns the marker SVG or PDF, with its length and
+    utilization in X-Marker-Length and X-Marker-Utilization, or JSON with
+    the SVG, every placement and the same figures.
+    """
+    patterns = sum(order.quantity for order in req.orders)
+    if patterns > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"Order of {patterns} patterns exceeds the limit of {MAX_BATCH_SIZE}")
+    try:
+        result = await pool.submit(make_marker, req)
+    except GENERATION_ERRORS as e:
+        raise _http_error(e)
+    headers = {
+        "X-Marker-Length": f"{result.length:.2f}",
+        "X-Marker-Utilization": f"{result.utilization:.4f}",
+    }
+    return Response(content=result.body, media_type=result.media_type, headers=headers)
+
+
+@router.get("/cache", response_model=CacheStatsResponse)
+def get_cache_stats():
+    """Report hit/miss/eviction counters and size of the generate result cache."""
+    return CacheStatsResponse(**result_cache.stats().to_dict())
+
+
+@router.get("/sessions", response_model=CacheStatsResponse)
+def get_session_stats():
+    """Report size and evictions of the per-session geometry history used for deltas."""
+    return CacheStatsResponse(**geometry_history.stats().to_dict())
+
+
+@router.get("/live", response_model=LiveStatsResponse)
+def get_live_stats():
+    """Report update, drop and push counters and push latency of the live editing channel."""
+    return LiveStatsResponse(**live.stats())
+
+
+@router.get("/bank", response_model=BankStatsResponse)
+def get_bank_stats():
+    """Report size, hits and warm-up duration of the standard-size artifact bank."""
+    return BankStatsResponse(**bank.stats().to_dict())
+
+
+@router.get("/bank/{key}")
+def get_banked_artifact(key: str, if_none_match: str | None = Header(default=None)):
+    """Serve a banked artifact by request key (see the generate endpoint's Content-Location).
+
+    The URL names one artifact of one code version, so responses are cacheable
+    for good.
+    """
+    result = bank.get(key)
+    if result is None:
+        raise HTTPException(status_code=404, detail="No banked artifact for this key")
+    headers = {"ETag": result.etag, "Cache-Control": BANK_CACHE_CONTROL}
+    if _etag_matches(if_none_match, result.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=result.body, media_type=result.media_type, headers=headers)
+
+
+@router.get("/pool", response_model=PoolStatsResponse)
+def get_pool_stats():
+    """Report queue depth, admission counters and wait/execution times of the generation pool."""
+    return PoolStatsResponse(**pool.stats().to_dict())
+
+
+@router.get("/inflight", response_model=InFlightStatsResponse)
+def get_in_flight_stats():
+    """Report how many generate requests were computed and how many joined an identical one in flight."""
+    return InFlightStatsResponse(**in_flight.stats().to_dict())
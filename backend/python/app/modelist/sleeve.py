@@ -7,14 +7,21 @@ French pattern drafting methods with spline curve interpolation.
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Sequence
 
 import numpy as np
-
+from numpy.typing import NDArray
+
+from app.core.batch import PatternBatch
+from app.core.bezier import arc_length
+from app.core.labels import Label, place_labels
+from app.core.measurements import stack_measurements
+from app.core.point_graph import PointGraph, draft_inputs
+from app.core.seam import Outline
 from app.core.stretch_pattern import StretchPattern
-from app.core.svg_renderer import SVGRenderer
+from app.core.svg_renderer import CompactSVGRenderer, SVGRenderer
 from app.core.pdf_renderer import PDFRenderer
-from app.core.utils import cubic_spline_to_beziers
+from app.core.utils import cubic_spline_control_points, perpendicular, unit, xy
 
 if TYPE_CHECKING:
     from app.core.measurements import FullMeasurements
@@ -59,93 +66,256 @@ class ControlParameters:
     h3_perpendicular: float = 1.5   # Perpendicular offset for H3 (cm)
 
 
+# Points the sleeve cap spline passes through, from back underarm to front underarm
+CAP_CURVE = ['I', 'G3', 'G2', 'E', 'H2', 'H3', "I'"]
+
+
+def cap_beziers(points: dict[str, NDArray[np.float64]]) -> NDArray[np.float64]:
+    """Return the sleeve cap Bezier control points for one or many subjects.
+
+    Args:
+        points: Sleeve points as (2,) arrays, or (N, 2) arrays for a batch.
+
+    Returns:
+        Control points of shape (6, 4, 2), or (N, 6, 4, 2) for a batch.
+    """
+    through = np.stack([points[name] for name in CAP_CURVE], axis=-2)
+    return cubic_spline_control_points(through)
+
+
+# Drafting graph: the construction rectangle, the cap guides and helpers,
+# then the points the cap curve passes through.
+DRAFT = PointGraph()
+
+
+@DRAFT.node('width', 'armhole_measurement')
+def _width(armhole_measurement):
+    """Three quarters of the armhole plus 1 cm"""
+    return (0.75 * armhole_measurement) + 1.0
+
+
+@DRAFT.node('cap_height', 'armhole_depth')
+def _cap_height(armhole_depth):
+    """Two thirds of the armhole depth"""
+    return (2 / 3) * armhole_depth
+
+
+@DRAFT.point('A', 'width')
+def _a(width):
+    """Top left corner, at the origin"""
+    zero = np.zeros_like(width)
+    return xy(zero, zero)
+
+
+@DRAFT.point('B', 'width')
+def _b(width):
+    """Top right corner, a sleeve width from A"""
+    return xy(width, np.zeros_like(width))
+
+
+@DRAFT.point('C', 'width', 'sleeve_length')
+def _c(width, sleeve_length):
+    """Bottom left corner, a sleeve length below A"""
+    return xy(np.zeros_like(width), sleeve_length)
+
+
+@DRAFT.point('D', 'width', 'sleeve_length')
+def _d(width, sleeve_length):
+    """Bottom right corner"""
+    return xy(width, sleeve_length)
+
+
+@DRAFT.point('E', 'width')
+def _e(width):
+    """Cap top, middle of A-B"""
+    return xy(width / 2, np.zeros_like(width))
+
+
+@DRAFT.point('F', 'width', 'sleeve_length')
+def _f(width, sleeve_length):
+    """Middle of the hem line C-D"""
+    return xy(width / 2, sleeve_length)
+
+
+@DRAFT.point('I', 'width', 'cap_height')
+def _i(width, cap_height):
+    """Back underarm, a cap height below A"""
+    return xy(np.zeros_like(width), cap_height)
+
+
+@DRAFT.point("I'", 'width', 'cap_height')
+def _i_prime(width, cap_height):
+    """Front underarm, a cap height below B"""
+    return xy(width, cap_height)
+
+
+@DRAFT.point('F1', 'F', 'sleeve_bottom_width', 'sleeve_length')
+def _f1(F, sleeve_bottom_width, sleeve_length):
+    """Half the sleeve bottom width left of F"""
+    return xy(F[:, 0] - sleeve_bottom_width / 2, sleeve_length)
+
+
+@DRAFT.point('F2', 'F', 'sleeve_bottom_width', 'sleeve_length')
+def _f2(F, sleeve_bottom_width, sleeve_length):
+    """Half the sleeve bottom width right of F"""
+    return xy(F[:, 0] + sleeve_bottom_width / 2, sleeve_length)
+
+
+# Cap guides: vertical lines at a quarter and three quarters of the width
+@DRAFT.node('g_x', 'width')
+def _g_x(width):
+    return width / 4
+
+
+@DRAFT.node('h_x', 'width')
+def _h_x(width):
+    return (width / 2) + (width / 4)
+
+
+@DRAFT.helper('G', 'g_x')
+def _g(g_x):
+    """Back cap guide, a quarter width from A"""
+    return xy(g_x, np.zeros_like(g_x))
+
+
+@DRAFT.helper('G1', 'g_x', 'cap_height')
+def _g1(g_x, cap_height):
+    """Back cap guide at the underarm line"""
+    return xy(g_x, cap_height)
+
+
+@DRAFT.helper('H', 'h_x')
+def _h(h_x):
+    """Front cap guide, three quarters of the width from A"""
+    return xy(h_x, np.zeros_like(h_x))
+
+
+@DRAFT.helper('H1', 'h_x', 'cap_height')
+def _h1(h_x, cap_height):
+    """Front cap guide at the underarm line"""
+    return xy(h_x, cap_height)
+
+
+@DRAFT.helper('J', 'width', 'upper_arm_to_elbow')
+def _j(width, upper_arm_to_elbow):
+    """Elbow line, left"""
+    return xy(np.zeros_like(width), upper_arm_to_elbow)
+
+
+@DRAFT.helper("J'", 'width', 'upper_arm_to_elbow')
+def _j_prime(width, upper_arm_to_elbow):
+    """Elbow line, right"""
+    return xy(width, upper_arm_to_elbow)
+
+
+# Points of the cap curve
+@DRAFT.point('G2', 'g_x', 'cap_height')
+def _g2(g_x, cap_height):
+    """A third of the cap height down the back guide"""
+    return xy(g_x, cap_height / 3)
+
+
+@DRAFT.point('H2', 'h_x', 'cap_height')
+def _h2(h_x, cap_height):
+    """Half the cap height down the front guide"""
+    return xy(h_x, cap_height / 2)
+
+
+@DRAFT.point('G3', 'G2', 'I', 'g3_perpendicular')
+def _g3(G2, I, g3_perpendicular):
+    """Halfway between G2 and I, offset perpendicular to G2-I"""
+    mid_g2_i = (G2 + I) / 2
+    perp_i_g2 = perpendicular(unit(G2 - I))
+    return mid_g2_i + perp_i_g2 * np.asarray(g3_perpendicular)[..., None]
+
+
+@DRAFT.point('H3', 'H2', "I'", 'h3_perpendicular')
+def _h3(H2, I_prime, h3_perpendicular):
+    """Halfway between H2 and I', offset perpendicular to H2-I'"""
+    mid_h2_ip = (H2 + I_prime) / 2
+    perp_h2_ip = perpendicular(unit(I_prime - H2))
+    return mid_h2_ip + perp_h2_ip * np.asarray(h3_perpendicular)[..., None]
+
+
 class SleevePattern(StretchPattern):
     """Jersey set-in sleeve block pattern."""
 
+    graph = DRAFT
+    graph_inputs = ('m', 'c')
+
     def __init__(self, measurements: SleeveMeasurements, control: ControlParameters = None):
         super().__init__()
         self.m = measurements
         self.c = control or ControlParameters()
 
-        self.build_construction_points()
-        self.build_bezier_helper_points()
-
-        # Determine plot bounds
-        all_points = list(self.points.values()) + list(self.helper_points.values())
-        xs = [p[0] for p in all_points]
-        ys = [p[1] for p in all_points]
-        self.bounds = (min(xs) - 5, max(xs) + 5, min(ys) - 5, max(ys) + 10)
-
-    def build_construction_points(self):
-        """Build the main construction points for the sleeve pattern."""
-        width = (0.75 * self.m.armhole_measurement) + 1.0
-        length = self.m.sleeve_length
-        cap_height = (2 / 3) * self.m.armhole_depth
-
-        self.points['A'] = np.array([0.0, 0.0])
-        self.points['B'] = np.array([width, 0.0])
-        self.points['C'] = np.array([0.0, length])
-        self.points['D'] = np.array([width, length])
-
-        self.points['E'] = np.array([width / 2, 0.0])
-        self.points['F'] = np.array([width / 2, length])
-
-        self.points['I'] = np.array([0.0, cap_height])
-        self.points["I'"] = np.array([width, cap_height])
-
-        half_wrist = self.m.sleeve_bottom_width / 2
-        self.points['F1'] = np.array([self.points['F'][0] - half_wrist, length])
-        self.points['F2'] = np.array([self.points['F'][0] + half_wrist, length])
-
-    def build_bezier_helper_points(self):
-        """Compute helper points for sleeve cap curve construction."""
-        width = self.points['B'][0]
-        cap_height = self.points['I'][1]
-
-        g_x = width / 4
-        self.helper_points['G'] = np.array([g_x, 0.0])
-        self.helper_points['G1'] = np.array([g_x, cap_height])
-
-        h_x = (width / 2) + (width / 4)
-        self.helper_points['H'] = np.array([h_x, 0.0])
-        self.helper_points['H1'] = np.array([h_x, cap_height])
-
-        self.points['G2'] = np.array([g_x, cap_height / 3])
-        self.points['H2'] = np.array([h_x, cap_height / 2])
-
-        # G3: Halfway between G2 and I, perpendicular offset
-        mid_g2_i = (self.points['G2'] + self.points['I']) / 2
-        vec_i_g2 = self.points['G2'] - self.points['I']
-        norm_i_g2 = vec_i_g2 / np.linalg.norm(vec_i_g2)
-        perp_i_g2 = np.array([-norm_i_g2[1], norm_i_g2[0]])
-        self.points['G3'] = mid_g2_i + perp_i_g2 * self.c.g3_perpendicular
-
-        # H3: Halfway between H2 and I', perpendicular offset
-        mid_h2_ip = (self.points['H2'] + self.points["I'"]) / 2
-        vec_h2_ip = self.points["I'"] - self.points['H2']
-        norm_h2_ip = vec_h2_ip / np.linalg.norm(vec_h2_ip)
-        perp_h2_ip = np.array([-norm_h2_ip[1], norm_h2_ip[0]])
-        self.points['H3'] = mid_h2_ip + perp_h2_ip * self.c.h3_perpendicular
-
-        elbow_y = self.m.upper_arm_to_elbow
-        self.helper_points['J'] = np.array([0.0, elbow_y])
-        self.helper_points["J'"] = np.array([width, elbow_y])
+        self.draft()
+
+    @property
+    def bounds(self) -> tuple[float, float, float, float]:
+        """Plot bounds: the points with a margin."""
+        min_x, max_x, min_y, max_y = self.table.bounds()
+        return (min_x - 5, max_x + 5, min_y - 5, max_y + 10)
+
+    @classmethod
+    def draft_batch(
+        cls,
+        measurements: SleeveMeasurements | Sequence[SleeveMeasurements],
+        control: ControlParameters = None,
+    ) -> PatternBatch:
+        """Draft construction and helper points for N subjects in a single pass.
+
+        Args:
+            measurements: A sequence of SleeveMeasurements, or one instance whose
+                          fields are (N,) arrays.
+            control: Control parameters shared by all subjects.
+
+        Returns:
+            PatternBatch with every point as an (N, 2) array.
+        """
+        if not isinstance(measurements, SleeveMeasurements):
+            measurements = stack_measurements(measurements)
+        drafting = DRAFT.evaluate(draft_inputs(measurements, control or ControlParameters()))
+        return PatternBatch(points=drafting.points(), helper_points=drafting.helper_points())
 
     def generate_curve_points(self):
         """Returns control points for the sleeve cap curve."""
-        return [
-            self.points['I'],
-            self.points['G3'],
-            self.points['G2'],
-            self.points['E'],
-            self.points['H2'],
-            self.points['H3'],
-            self.points["I'"],
-        ]
+        return [self.points[name] for name in CAP_CURVE]
+
+    def cap_beziers(self) -> NDArray[np.float64]:
+        """Sleeve cap as a (6, 4, 2) array of cubic Bezier control points."""
+        return cap_beziers(self.points)
+
+    def bezier_segments(self) -> dict[str, NDArray[np.float64]]:
+        """Control points (4, 2) of every curve of the outline, by curve name."""
+        return {
+            f"cap_{a}_{b}": seg
+            for a, b, seg in zip(CAP_CURVE, CAP_CURVE[1:], self.cap_beziers())
+        }
+
+    def outlines(self) -> dict[str, Outline]:
+        """Closed stitch line of the sleeve: cap I → I', then down the underarm, hem and back up."""
+        pts = self.points
+        edges = dict(self.bezier_segments())
+        edges["underarm_I'_F2"] = [pts["I'"], pts['F2']]
+        edges['hem_F2_F1'] = [pts['F2'], pts['F1']]
+        edges['underarm_F1_I'] = [pts['F1'], pts['I']]
+        return {'sleeve': Outline.from_edges(edges)}
+
+    def cap_length(self) -> float:
+        """Arc length of the sleeve cap curve (I → I'), in cm.
+
+        This is the seam length that is set into the armhole; compare with
+        CorsetPattern.armhole_lengths() for the cap ease.
+        """
+        return float(arc_length(self.cap_beziers()).sum())
 
     @property
     def sleeve_cap_control(self) -> float:
-        """Total length of sleeve cap path (I-G3-G2-E-H2-H3-I') as straight segments."""
+        """Total length of sleeve cap path (I-G3-G2-E-H2-H3-I') as straight segments.
+
+        A drafting control measured with a ruler; see cap_length() for the
+        length of the curve itself.
+        """
         pts = self.generate_curve_points()
         total = 0.0
         for i in range(len(pts) - 1):
@@ -165,86 +335,94 @@ class SleevePattern(StretchPattern):
 
     def _draw_spline(self, r, curve_pts, style='-', color='blue', width=1):
         """Draw spline curve through points as cubic Bezier segments."""
-        beziers = cubic_spline_to_beziers(curve_pts)
+        beziers = cubic_spline_control_points(curve_pts)
         for p0, p1, p2, p3 in beziers:
             r.bezier(p0, p1, p2, p3, color=color, style=style, width=width)
 
-    def _plot_reference(self, r):
-        """Plot reference sheet with coordinates for manual drawing."""
+    def _plot(self, r):
+        """Plot every layer of the pattern: guides, outline, points and labels."""
         pts = self.points
 
-        self._draw_line(r, 'A', 'B', '--', 'gray')
-        self._draw_line(r, 'B', 'D', '--', 'gray')
-        self._draw_line(r, 'D', 'C', '--', 'gray')
-        self._draw_line(r, 'C', 'A', '--', 'gray')
+        with r.on_layer("guides"):
+            self._draw_line(r, 'A', 'B', '--', 'gray')
+            self._draw_line(r, 'B', 'D', '--', 'gray')
+            self._draw_line(r, 'D', 'C', '--', 'gray')
+            self._draw_line(r, 'C', 'A', '--', 'gray')
 
-        self._draw_line(r, 'E', 'F', '--', 'gray')
-        self._draw_line(r, 'I', "I'", '--', 'gray')
-        self._draw_line(r, 'J', "J'", '--', 'gray')
+            self._draw_line(r, 'E', 'F', '--', 'gray')
+            self._draw_line(r, 'I', "I'", '--', 'gray')
+            self._draw_line(r, 'J', "J'", '--', 'gray')
 
-        self._draw_line(r, 'G', 'G1', ':', 'gray', 0.5)
-        self._draw_line(r, 'H', 'H1', ':', 'gray', 0.5)
+            self._draw_line(r, 'G', 'G1', ':', 'gray', 0.5)
+            self._draw_line(r, 'H', 'H1', ':', 'gray', 0.5)
 
-        self._draw_line(r, 'I', 'F1', '-', 'blue')
-        self._draw_line(r, "I'", 'F2', '-', 'blue')
-        self._draw_line(r, 'F1', 'F2', '-', 'blue')
+        with r.on_layer("outline"):
+            self._draw_line(r, 'I', 'F1', '-', 'blue')
+            self._draw_line(r, "I'", 'F2', '-', 'blue')
+            self._draw_line(r, 'F1', 'F2', '-', 'blue')
 
-        curve_pts = self.generate_curve_points()
-        self._draw_spline(r, curve_pts, '-', 'blue')
+            curve_pts = self.generate_curve_points()
+            self._draw_spline(r, curve_pts, '-', 'blue')
 
-        for name, coord in pts.items():
-            r.circle(coord[0], coord[1], 0.1, color='black')
-            r.text(coord[0] + 0.5, coord[1], f"{name}\n({coord[0]:.1f}, {coord[1]:.1f})", size=8)
+        with r.on_layer("cut"):
+            for cut in self.cut_lines().values():
+                r.polyline(np.vstack([cut, cut[:1]]), color='black')
 
-        for name, coord in self.helper_points.items():
-            r.circle(coord[0], coord[1], 0.07, color='gray')
-            r.text(coord[0] + 0.5, coord[1], name, size=8, color='gray')
+        labels = []
+        with r.on_layer("points"):
+            for name, coord in pts.items():
+                r.circle(coord[0], coord[1], 0.1, color='black')
+                labels.append(Label(coord[0], coord[1], f"{name}\n({coord[0]:.1f}, {coord[1]:.1f})"))
 
-        min_y = max(pts['C'][1], pts['D'][1])
-        r.line(0, min_y + 3, 10, min_y + 3, color='black', width=4)
-        r.text(5, min_y + 5, "10 cm Scale", ha='center')
-
-        r.text(pts['E'][0], min_y + 8, f"Sleeve Cap Control: {self.sleeve_cap_control:.2f} cm",
-               ha='center', size=9, color='blue')
-
-    def _plot_printable(self, r):
-        """Plot clean pattern for printing at 1:1 scale."""
-        pts = self.points
+            for name, coord in self.helper_points.items():
+                r.circle(coord[0], coord[1], 0.07, color='gray')
+                labels.append(Label(coord[0], coord[1], name, color='gray'))
 
-        self._draw_line(r, 'I', 'F1', '-', 'blue')
-        self._draw_line(r, "I'", 'F2', '-', 'blue')
-        self._draw_line(r, 'F1', 'F2', '-', 'blue')
+        min_y = max(pts['C'][1], pts['D'][1])
+        with r.on_layer("labels"):
+            r.line(0, min_y + 3, 10, min_y + 3, color='black', width=4)
+            r.text(5, min_y + 5, "10 cm Scale", ha='center')
 
-        curve_pts = self.generate_curve_points()
-        self._draw_spline(r, curve_pts, '-', 'blue')
+        with r.on_layer("measures"):
+            r.text(pts['E'][0], min_y + 8, f"Sleeve Cap Control: {self.sleeve_cap_control:.2f} cm",
+                   ha='center', size=9, color='blue')
 
-        min_y = max(pts['C'][1], pts['D'][1])
-        r.line(0, min_y + 3, 10, min_y + 3, color='black', width=4)
-        r.text(5, min_y + 5, "10 cm Scale", ha='center')
+        with r.on_layer("points"):
+            place_labels(r, labels, y_flip=self.y_flip)
 
-    def render_svg(self, variant: str = "construction") -> str:
-        """Render pattern as SVG string.
+    def render(self, renderer_cls, variant: str = "construction", **options):
+        """Draw the pattern's recording into a new renderer of the given class.
 
         Args:
+            renderer_cls: Renderer class (SVGRenderer, PDFRenderer, ...).
             variant: "construction" for reference sheet with coordinates,
                      "pattern" for clean 1:1 printable pattern.
+            **options: Extra keyword arguments for the renderer.
 
         Returns:
-            SVG content as a string.
+            The renderer, ready to be serialized.
         """
         title = None
         if variant == "construction":
             title = (f"Jersey Set-In Sleeve Block - "
                      f"Armhole: {self.m.armhole_measurement}cm | Sleeve Length: {self.m.sleeve_length}cm")
 
-        r = SVGRenderer(self.bounds, y_flip=False, title=title)
+        r = renderer_cls(self.bounds, y_flip=self.y_flip, title=title, **options)
+        self.replay(r, variant)
+        return r
 
-        if variant == "construction":
-            self._plot_reference(r)
-        else:
-            self._plot_printable(r)
+    def render_svg(self, variant: str = "construction", compact: bool = False) -> str:
+        """Render pattern as SVG string.
 
-        return r.to_svg()
+        Args:
+            variant: "construction" for reference sheet with coordinates,
+                     "pattern" for clean 1:1 printable pattern.
+            compact: Use the compact encoding (see CompactSVGRenderer).
+
+        Returns:
+            SVG content as a string.
+        """
+        return self.render(CompactSVGRenderer if compact else SVGRenderer, variant).to_svg()
 
     def render_pdf(self, variant: str = "construction") -> bytes:
         """Render pattern as PDF bytes.
@@ -256,16 +434,4 @@ class SleevePattern(StretchPattern):
         Returns:
             PDF content as bytes.
         """
-        title = None
-        if variant == "construction":
-            title = (f"Jersey Set-In Sleeve Block - "
-                     f"Armhole: {self.m.armhole_measurement}cm | Sleeve Length: {self.m.sleeve_length}cm")
-
-        r = PDFRenderer(self.bounds, y_flip=False, title=title)
-
-        if variant == "construction":
-            self._plot_reference(r)
-        else:
-            self._plot_printable(r)
-
-        return r.to_pdf()
+        return self.render(PDFRenderer, variant).to_pdf()
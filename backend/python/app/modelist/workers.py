@@ -0,0 +1,202 @@
+"""Bounded execution pool for CPU-bound pattern generation.
+
+Drafting and rendering hold the GIL, so running them in the API's threadpool
+starves every other endpoint. GenerationPool runs them in a pool of worker
+processes (COUTURE_WORKERS > 0), each started with the pattern modules
+imported and its caches warmed by drafting and rendering a standard size.
+With COUTURE_WORKERS=0 (the default, for development and tests) jobs run on
+a small dedicated thread pool instead.
+
+Admission is bounded: at most workers + COUTURE_QUEUE_LIMIT jobs are pending
+at once, and further submissions fail fast with PoolSaturated (the API turns
+that into 503 with Retry-After). Each job is awaited for at most
+COUTURE_GENERATE_TIMEOUT seconds. Queue depth, queue wait and execution time
+are tracked in PoolStats.
+"""
+
+import asyncio
+import math
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+
+from app.core.measurements import default_measurements
+from app.modelist.generation import GenerationResult, generate
+from app.schemas.patterns import OutputFormat, PatternRequest, PatternType
+
+# Worker processes; 0 runs jobs on THREAD_WORKERS threads in the API process
+WORKERS = int(os.environ.get("COUTURE_WORKERS", 0))
+THREAD_WORKERS = 4
+# Jobs allowed to wait for a free worker before new ones are rejected
+QUEUE_LIMIT = int(os.environ.get("COUTURE_QUEUE_LIMIT", 32))
+# Seconds a request waits for its result (queue wait included)
+TIMEOUT = float(os.environ.get("COUTURE_GENERATE_TIMEOUT", 30))
+
+
+class PoolSaturated(Exception):
+    """Raised when the pool already holds its maximum number of pending jobs."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Generation queue is full, retry in {retry_after} s")
+        self.retry_after = retry_after
+
+
+class GenerationTimeout(Exception):
+    """Raised when a job does not finish within the pool timeout."""
+
+
+@dataclass
+class PoolStats:
+    """Admission and latency counters of a GenerationPool."""
+    workers: int = 0
+    processes: bool = False
+    queue_limit: int = 0
+    pending: int = 0
+    queue_depth: int = 0
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    rejected: int = 0
+    timeouts: int = 0
+    wait_ms_total: float = 0.0
+    wait_ms_max: float = 0.0
+    exec_ms_total: float = 0.0
+    exec_ms_max: float = 0.0
+
+    @property
+    def wait_ms_mean(self) -> float:
+        return self.wait_ms_total / self.completed if self.completed else 0.0
+
+    @property
+    def exec_ms_mean(self) -> float:
+        return self.exec_ms_total / self.completed if self.completed else 0.0
+
+    def to_dict(self) -> dict:
+        return asdict(self) | {"wait_ms_mean": self.wait_ms_mean, "exec_ms_mean": self.exec_ms_mean}
+
+
+def _timed(submitted_at: float, fn, args) -> tuple[object, float, float]:
+    """Run fn(*args) in a worker; returns (result, queue wait s, execution s)."""
+    started_at = time.time()
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, started_at - submitted_at, time.perf_counter() - start
+
+
+def _init_worker() -> None:
+    """Warm a worker process: draft and render a standard size of every pattern type."""
+    for pattern_type in PatternType:
+        for output_format in (OutputFormat.all, OutputFormat.pdf):
+            generate(PatternRequest(
+                pattern_type=pattern_type,
+                measurements=asdict(default_measurements(38)),
+                output_format=output_format,
+            ))
+
+
+def _noop() -> None:
+    pass
+
+
+class GenerationPool:
+    """Runs generation jobs off the event loop with bounded admission."""
+
+    def __init__(self, workers: int = WORKERS, queue_limit: int = QUEUE_LIMIT, timeout: float = TIMEOUT,
+                 threads: int = THREAD_WORKERS):
+        self.processes = workers > 0
+        self.workers = workers if self.processes else threads
+        self.queue_limit = queue_limit
+        self.timeout = timeout
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+        self._stats = PoolStats(workers=self.workers, processes=self.processes, queue_limit=queue_limit)
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of pending (running or queued) jobs."""
+        return self.workers + self.queue_limit
+
+    def start(self) -> None:
+        """Create the executor; worker processes are spawned and warmed right away."""
+        if self._executor is not None:
+            return
+        if self.processes:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+            for _ in range(self.workers):
+                self._executor.submit(_noop)
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="generate")
+
+    def shutdown(self) -> None:
+        """Stop the executor, cancelling queued jobs."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _retry_after(self) -> int:
+        # Time for the queue ahead of a new job to drain, at the observed job cost
+        mean_s = self._stats.exec_ms_mean / 1000 or 1.0
+        return max(1, math.ceil(mean_s * self._stats.pending / self.workers))
+
+    def _finished(self, future) -> None:
+        with self._lock:
+            self._stats.pending -= 1
+            self._stats.queue_depth = max(0, self._stats.pending - self.workers)
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                self._stats.failed += 1
+                return
+            _, wait_s, exec_s = future.result()
+            self._stats.completed += 1
+            self._stats.wait_ms_total += wait_s * 1000
+            self._stats.wait_ms_max = max(self._stats.wait_ms_max, wait_s * 1000)
+            self._stats.exec_ms_total += exec_s * 1000
+            self._stats.exec_ms_max = max(self._stats.exec_ms_max, exec_s * 1000)
+
+    async def submit(self, fn, *args):
+        """Run fn(*args) in the pool and await its result.
+
+        fn and args must be picklable when the pool uses processes.
+
+        Raises:
+            PoolSaturated: If capacity jobs are already pending.
+            GenerationTimeout: If the result is not ready within the timeout.
+        """
+        self.start()
+        with self._lock:
+            if self._stats.pending >= self.capacity:
+                self._stats.rejected += 1
+                raise PoolSaturated(self._retry_after())
+            self._stats.pending += 1
+            self._stats.submitted += 1
+            self._stats.queue_depth = max(0, self._stats.pending - self.workers)
+        future = self._executor.submit(_timed, time.time(), fn, args)
+        future.add_done_callback(self._finished)
+        try:
+            result, _, _ = await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            future.cancel()
+            with self._lock:
+                self._stats.timeouts += 1
+            raise GenerationTimeout(f"Generation did not finish within {self.timeout:g} s") from None
+        return result
+
+    async def run(self, req: PatternRequest) -> GenerationResult:
+        """Generate a pattern in the pool (see submit for the errors raised)."""
+        return await self.submit(generate, req)
+
+    def stats(self) -> PoolStats:
+        """Return a snapshot of the pool counters."""
+        with self._lock:
+            return PoolStats(**asdict(self._stats))
+
+
+pool = GenerationPool()
@@ -1,9 +1,9 @@
 """Pydantic models for pattern-related API endpoints."""
 
 from enum import Enum
-from typing import Optional
+from typing import Annotated, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class PatternType(str, Enum):
@@ -15,6 +15,29 @@ class OutputFormat(str, Enum):
     all = "all"
     svg = "svg"
     pdf = "pdf"
+    geometry = "geometry"
+
+
+class MarkerOutputFormat(str, Enum):
+    """Output formats of a marker; markers have no geometry output."""
+    all = "all"
+    svg = "svg"
+    pdf = "pdf"
+
+
+class SVGEncoding(str, Enum):
+    """How SVG output is written.
+
+    plain has one self-styled element per stroke; compact merges strokes into
+    relative paths with shared <style> classes and <use> references, for
+    browsers (react-native-svg's SvgXml does not apply <style>).
+    """
+    plain = "plain"
+    compact = "compact"
+
+
+# Per-edge seam allowances in cm, by edge name or edge name word
+EdgeAllowances = dict[str, Annotated[float, Field(ge=0)]]
 
 
 class StretchInput(BaseModel):
@@ -29,12 +52,310 @@ class PatternRequest(BaseModel):
     control_parameters: Optional[dict[str, float]] = None
     stretch: Optional[StretchInput] = None
     output_format: OutputFormat = OutputFormat.all
+    # Seam allowance in cm (0 = no cut line); edge_allowances overrides it by
+    # edge name or edge name word, e.g. {"hem": 3.0}
+    seam_allowance: float = Field(1.0, ge=0)
+    edge_allowances: Optional[EdgeAllowances] = None
+    svg_encoding: SVGEncoding = SVGEncoding.plain
+    # Geometry output only: the generate endpoint remembers the geometries it
+    # sent to a session, and answers with a GeometryDelta from base_version
+    # (the geometry_version of one of them) when it still has it
+    session_id: Optional[str] = Field(None, max_length=128)
+    base_version: Optional[str] = None
+
+
+class BatchPatternRequest(BaseModel):
+    """Either a list of requests, or one pattern type with many measurement sets."""
+    requests: Optional[list[PatternRequest]] = None
+    pattern_type: Optional[PatternType] = None
+    measurements: Optional[list[dict[str, float]]] = None
+    control_parameters: Optional[dict[str, float]] = None
+    stretch: Optional[StretchInput] = None
+    output_format: OutputFormat = OutputFormat.all
+    seam_allowance: float = Field(1.0, ge=0)
+    edge_allowances: Optional[EdgeAllowances] = None
+    svg_encoding: SVGEncoding = SVGEncoding.plain
+    ordered: bool = False
+
+    def expand(self) -> list[PatternRequest]:
+        """Return the individual requests of the batch.
+
+        Raises:
+            ValueError: If the batch sets both forms or neither.
+        """
+        if self.requests is not None:
+            if self.pattern_type is not None or self.measurements is not None:
+                raise ValueError("Give either requests or pattern_type with measurements, not both")
+            return self.requests
+        if self.pattern_type is None or self.measurements is None:
+            raise ValueError("Give either requests or pattern_type with measurements")
+        return [
+            PatternRequest(
+                pattern_type=self.pattern_type,
+                measurements=m,
+                control_parameters=self.control_parameters,
+                stretch=self.stretch,
+                output_format=self.output_format,
+                seam_allowance=self.seam_allowance,
+                edge_allowances=self.edge_allowances,
+                svg_encoding=self.svg_encoding,
+            )
+            for m in self.measurements
+        ]
+
+
+class BatchItemResult(BaseModel):
+    index: int
+    status_code: int = 200
+    media_type: Optional[str] = None
+    etag: Optional[str] = None
+    encoding: str = "utf-8"
+    content: Optional[str] = None
+    warnings: list[str] = []
+    error: Optional[str] = None
+
+
+class LiveUpdate(BaseModel):
+    """A message of the live editing channel: what changes in the open pattern.
+
+    measurements, control_parameters and edge_allowances are merged into the
+    current ones; the other fields replace them. The first update of a
+    connection must make a complete PatternRequest.
+    """
+    # Client sequence number, echoed in the result answering this update
+    seq: Optional[int] = None
+    pattern_type: Optional[PatternType] = None
+    measurements: Optional[dict[str, float]] = None
+    control_parameters: Optional[dict[str, float]] = None
+    stretch: Optional[StretchInput] = None
+    output_format: Optional[OutputFormat] = None
+    seam_allowance: Optional[float] = Field(None, ge=0)
+    edge_allowances: Optional[EdgeAllowances] = None
+    svg_encoding: Optional[SVGEncoding] = None
+
+
+class LiveResult(BaseModel):
+    """Result pushed by the live editing channel for the newest update.
+
+    Geometry after the first one on a connection is sent as a GeometryDelta
+    from the previous geometry pushed.
+    """
+    seq: Optional[int] = None
+    status_code: int = 200
+    media_type: Optional[str] = None
+    etag: Optional[str] = None
+    encoding: str = "utf-8"
+    content: Optional[str] = None
+    warnings: list[str] = []
+    error: Optional[str] = None
+    # Time from receiving the update to pushing this result
+    latency_ms: float = 0.0
+    # Updates since the previous push whose result was never sent
+    dropped: int = 0
+
+
+class PieceAdjustments(BaseModel):
+    control_parameters: Optional[dict[str, float]] = None
+    stretch: Optional[StretchInput] = None
+
+
+class GarmentRequest(BaseModel):
+    measurements: dict[str, float]
+    adjustments: dict[str, PieceAdjustments] = {}
+    output_format: OutputFormat = OutputFormat.all
+    seam_allowance: float = Field(1.0, ge=0)
+    edge_allowances: Optional[EdgeAllowances] = None
+    svg_encoding: SVGEncoding = SVGEncoding.plain
+    stream: bool = False
+
+
+class GarmentPieceResult(BatchItemResult):
+    pattern_type: str
+    label: str
+
+
+class GarmentResponse(BaseModel):
+    garment: str
+    pieces: list[GarmentPieceResult]
+
+
+class MarkerOrder(BaseModel):
+    """One line of a cutting order: a pattern in one size (or measurement set)."""
+    pattern_type: PatternType
+    size: Optional[int] = None
+    measurements: Optional[dict[str, float]] = None
+    control_parameters: Optional[dict[str, float]] = None
+    stretch: Optional[StretchInput] = None
+    seam_allowance: float = Field(1.0, ge=0)
+    edge_allowances: Optional[EdgeAllowances] = None
+    quantity: int = Field(1, ge=1)
+    # Cut every piece twice, the second mirrored (left and right sides)
+    pairs: bool = True
+
+
+class MarkerRequest(BaseModel):
+    orders: list[MarkerOrder]
+    fabric_width: float = Field(150.0, gt=0)
+    resolution: float = Field(0.5, ge=0.1, le=5.0)
+    gap: float = Field(0.0, ge=0)
+    # Fabric without a face side: pieces may also be placed mirrored
+    allow_mirror: bool = False
+    time_budget: float = Field(2.0, ge=0, le=20)
+    output_format: MarkerOutputFormat = MarkerOutputFormat.all
+    svg_encoding: SVGEncoding = SVGEncoding.plain
+
+
+class MarkerPlacement(BaseModel):
+    name: str
+    x: float
+    y: float
+    turned: bool
+    mirrored: bool
+
+
+class MarkerResponse(BaseModel):
+    width: float
+    length: float
+    utilization: float
+    attempts: int
+    seconds: float
+    placements: list[MarkerPlacement]
+    marker_svg: str
+    warnings: list[str] = []
+
+
+class GeometryIssue(BaseModel):
+    """A problem found by geometric validation (see app.core.validation)."""
+    check: str
+    edges: list[str]
+    message: str
+    point: Optional[tuple[float, float]] = None
+    value: Optional[float] = None
 
 
 class PatternResponse(BaseModel):
     construction_svg: str
     pattern_svg: str
     warnings: list[str] = []
+    issues: list[GeometryIssue] = []
+
+
+class PointSet(BaseModel):
+    """Named points; coords holds x0, y0, x1, y1, ... in the order of names."""
+    names: list[str]
+    coords: list[float]
+    layer: str = "points"
+
+
+class CurveSet(BaseModel):
+    """Cubic Bezier edges; ctrl holds the 8 control point coordinates of each edge in turn."""
+    names: list[str]
+    ctrl: list[float]
+    # Whether the joint at the end of each edge is tangent-continuous
+    smooth: list[bool]
+    layer: str = "outline"
+
+
+class Polyline(BaseModel):
+    coords: list[float]
+    layer: str = "cut"
+
+
+class PieceGeometry(BaseModel):
+    name: str
+    # SVG matrix (a, b, c, d, e, f) placing the piece on the sheet
+    transform: list[float] = [1.0, 0.0, 0.0, 1.0, 0.0, 0.0]
+    # Closed stitch line
+    edges: CurveSet
+    cut_line: Optional[Polyline] = None
+
+
+class GeometryResponse(BaseModel):
+    """Drafted geometry of a pattern, for rendering on the client (output_format "geometry")."""
+    format: str = "couture-geometry"
+    version: int = 1
+    pattern_type: PatternType
+    # Token of this geometry, to send back as base_version
+    geometry_version: str
+    units: str = "cm"
+    # The y axis points up (flip it to draw in screen coordinates)
+    y_up: bool
+    h_factor: float
+    v_factor: float
+    bounds: list[float]
+    # Layers of this geometry drawn by each variant ("construction", "pattern")
+    variants: dict[str, list[str]]
+    points: PointSet
+    helper_points: PointSet
+    pieces: list[PieceGeometry]
+    issues: list[GeometryIssue] = []
+    warnings: list[str] = []
+
+
+class PolylineSplice(BaseModel):
+    """Replace points start .. start + deleted - 1 of a polyline by the points in coords."""
+    start: int
+    deleted: int
+    coords: list[float]
+
+
+class PieceDelta(BaseModel):
+    """Changes to one piece; fields left unset are unchanged."""
+    name: str
+    transform: Optional[list[float]] = None
+    # Edges added or changed
+    edges: CurveSet
+    # Names of all the piece's edges, set when edges were added, removed or reordered
+    edge_order: Optional[list[str]] = None
+    # Replacement cut line, empty coords when the piece no longer has one; a
+    # cut line that only changed is sent as cut_splice instead
+    cut_line: Optional[Polyline] = None
+    cut_splice: Optional[PolylineSplice] = None
+
+
+class GeometryDelta(BaseModel):
+    """Changes from base_version to geometry_version of a pattern's geometry.
+
+    Points and pieces that are not listed are unchanged; issues and warnings
+    are given in full.
+    """
+    format: str = "couture-geometry-delta"
+    version: int = 1
+    pattern_type: PatternType
+    base_version: str
+    geometry_version: str
+    h_factor: float
+    v_factor: float
+    bounds: list[float]
+    # Points added or moved
+    points: PointSet
+    removed_points: list[str] = []
+    helper_points: PointSet
+    removed_helper_points: list[str] = []
+    pieces: list[PieceDelta] = []
+    removed_pieces: list[str] = []
+    issues: list[GeometryIssue] = []
+    warnings: list[str] = []
+
+
+class StretchPreviewRequest(BaseModel):
+    pattern_type: PatternType
+    measurements: dict[str, float]
+    control_parameters: Optional[dict[str, float]] = None
+    stretches: list[StretchInput] = Field(max_length=256)
+
+
+class StretchGeometry(BaseModel):
+    stretch: StretchInput
+    h_factor: float
+    v_factor: float
+    points: dict[str, tuple[float, float]]
+    helper_points: dict[str, tuple[float, float]]
+
+
+class StretchPreviewResponse(BaseModel):
+    pattern_type: PatternType
+    geometries: list[StretchGeometry]
 
 
 class ControlParameterDefinition(BaseModel):
@@ -54,3 +375,64 @@ class PatternTypeInfo(BaseModel):
     required_measurements: list[MeasurementFieldDefinition]
     control_parameters: list[ControlParameterDefinition]
     supports_stretch: bool
+
+
+class CacheStatsResponse(BaseModel):
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size_bytes: int
+    max_bytes: int
+
+
+class BankStatsResponse(BaseModel):
+    entries: int
+    size_bytes: int
+    hits: int
+    warmup_seconds: float
+    source: str
+    code_version: str
+
+
+class PoolStatsResponse(BaseModel):
+    workers: int
+    processes: bool
+    queue_limit: int
+    pending: int
+    queue_depth: int
+    submitted: int
+    completed: int
+    failed: int
+    rejected: int
+    timeouts: int
+    wait_ms_mean: float
+    wait_ms_max: float
+    exec_ms_mean: float
+    exec_ms_max: float
+
+
+class LiveConnectionStatsResponse(BaseModel):
+    updates: int
+    rejected: int
+    coalesced: int
+    superseded: int
+    pushed: int
+    failed: int
+    in_flight: int
+    max_in_flight: int
+    latency_ms_mean: float
+    latency_ms_max: float
+
+
+class LiveStatsResponse(BaseModel):
+    """Totals over every live connection, and the counters of the open ones."""
+    connections: int
+    totals: LiveConnectionStatsResponse
+    open: list[LiveConnectionStatsResponse]
+
+
+class InFlightStatsResponse(BaseModel):
+    leaders: int
+    coalesced: int
+    in_flight: int
@@ -0,0 +1,14 @@
+"""Catalogue of garments sold in the shop and the pattern pieces each is made of."""
+
+from app.schemas.shop import GarmentInfo, PieceInfo
+
+GARMENTS: dict[str, GarmentInfo] = {
+    "top": GarmentInfo(
+        name="top",
+        label="Top / Bodice Block",
+        pieces=[
+            PieceInfo(pattern_type="corset", label="Bodice"),
+            PieceInfo(pattern_type="sleeve", label="Sleeve"),
+        ],
+    ),
+}
@@ -12,21 +12,11 @@ from app.schemas.shop import (
     GarmentSelectionResponse,
     PieceInfo,
 )
+from app.shop.garments import GARMENTS
 from database import get_db
 
 router = APIRouter(prefix="/api/shop", tags=["shop"])
 
-GARMENTS: dict[str, GarmentInfo] = {
-    "top": GarmentInfo(
-        name="top",
-        label="Top / Bodice Block",
-        pieces=[
-            PieceInfo(pattern_type="corset", label="Bodice"),
-            PieceInfo(pattern_type="sleeve", label="Sleeve"),
-        ],
-    ),
-}
-
 
 @router.get("/garments", response_model=list[GarmentInfo])
 def list_garments():
@@ -0,0 +1,178 @@
+"""CLI benchmarks for pattern rendering backends.
+
+Usage:
+    python -m cli.bench pdf [--size SIZE] [--repeat N]
+    python -m cli.bench marker [--width CM] [--resolution CM] [--budget S]
+    python -m cli.bench svg [--size SIZE] [--repeat N] [--precision DIGITS]
+"""
+
+import argparse
+import gzip
+import time
+import warnings
+
+import numpy as np
+
+from app.core.measurements import STANDARD_SIZES, default_measurements
+from app.core.nesting import nest
+from app.core.compression import brotli
+from app.core.pdf_renderer import PDFRenderer
+from app.core.svg_renderer import CompactSVGRenderer, SVGRenderer
+from app.modelist.corset import CorsetMeasurements, CorsetPattern
+from app.modelist.marker import marker_pieces
+from app.modelist.sleeve import SleeveMeasurements, SleevePattern
+from app.schemas.patterns import MarkerRequest
+
+VARIANTS = ["construction", "pattern"]
+
+
+class LegacyPDFRenderer(PDFRenderer):
+    """The original PDF backend, kept as a benchmark baseline.
+
+    Samples every Bezier at 64 points, and strokes every segment separately,
+    resetting colour, width and dash state each time.
+    """
+
+    def line(self, x1, y1, x2, y2, color='black', style='-', width=1):
+        r, g, b = self._parse_color(color)
+        self.pdf.set_draw_color(r, g, b)
+        self.pdf.set_line_width(width * 0.03)
+        self._set_dash(style)
+        self.pdf.line(self._tx(x1), self._ty(y1), self._tx(x2), self._ty(y2))
+        self._set_dash('-')
+
+    def polyline(self, points, color='black', style='-', width=1):
+        for i in range(len(points) - 1):
+            self.line(points[i][0], points[i][1], points[i + 1][0], points[i + 1][1],
+                      color=color, style=style, width=width)
+
+    def bezier(self, p0, p1, p2, p3, color='black', style='-', width=1):
+        r, g, b = self._parse_color(color)
+        self.pdf.set_draw_color(r, g, b)
+        self.pdf.set_line_width(width * 0.03)
+        self._set_dash(style)
+        num = 64
+        t = np.linspace(0, 1, num)
+        pts = (np.outer((1 - t)**3, p0) + np.outer(3 * (1 - t)**2 * t, p1) +
+               np.outer(3 * (1 - t) * t**2, p2) + np.outer(t**3, p3))
+        for i in range(num - 1):
+            self.pdf.line(self._tx(pts[i, 0]), self._ty(pts[i, 1]),
+                          self._tx(pts[i + 1, 0]), self._ty(pts[i + 1, 1]))
+        self._set_dash('-')
+
+    def text(self, x, y, content, size=8, color='black', ha='left', fontweight='normal'):
+        rc, gc, bc = self._parse_color(color)
+        self.pdf.set_text_color(rc, gc, bc)
+        style = 'B' if fontweight == 'bold' else ''
+        self.pdf.set_font('Helvetica', style, size)
+        sx, sy = self._tx(x), self._ty(y)
+        for i, line_text in enumerate(str(content).split('\n')):
+            tw = self.pdf.get_string_width(line_text)
+            lx = {'center': sx - tw / 2, 'right': sx - tw}.get(ha, sx)
+            self.pdf.text(lx, sy + i * size * 0.04, line_text)
+
+
+def _patterns(size: int) -> dict:
+    fm = default_measurements(size)
+    return {
+        "corset": CorsetPattern(CorsetMeasurements.from_full_measurements(fm)),
+        "sleeve": SleevePattern(SleeveMeasurements.from_full_measurements(fm)),
+    }
+
+
+def _time(fn, repeat: int) -> tuple[float, object]:
+    """Return the best wall time in ms over repeat runs, and the last result."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def cmd_pdf(args: argparse.Namespace) -> None:
+    """Compare size and render time of the legacy and native-curve PDF backends."""
+    print(f"{'Pattern':<8} {'Variant':<13} {'Legacy B':>9} {'Native B':>9} {'Legacy ms':>10} {'Native ms':>10}")
+    print("-" * 64)
+    for name, pattern in _patterns(args.size).items():
+        for variant in VARIANTS:
+            legacy_ms, legacy = _time(lambda: pattern.render(LegacyPDFRenderer, variant).to_pdf(), args.repeat)
+            native_ms, native = _time(lambda: pattern.render(PDFRenderer, variant).to_pdf(), args.repeat)
+            print(f"{name:<8} {variant:<13} {len(legacy):>9} {len(native):>9} {legacy_ms:>10.2f} {native_ms:>10.2f}")
+
+
+def cmd_marker(args: argparse.Namespace) -> None:
+    """Nest a pair of every piece in every standard size and report the marker."""
+    req = MarkerRequest(
+        orders=[{"pattern_type": t, "size": size} for size in STANDARD_SIZES for t in ("corset", "sleeve")],
+        fabric_width=args.width,
+        resolution=args.resolution,
+    )
+    pieces = marker_pieces(req)
+    for budget in (0.0, args.budget):
+        marker = nest(pieces, args.width, resolution=args.resolution, time_budget=budget)
+        print(f"{len(pieces)} pieces, budget {budget:g} s: length {marker.length:.1f} cm, "
+              f"utilization {marker.utilization:.1%}, {marker.attempts} attempts in {marker.seconds:.2f} s")
+
+
+def cmd_svg(args: argparse.Namespace) -> None:
+    """Compare size, compressed size and render time of the plain and compact SVG encodings."""
+    codecs = {"gzip": lambda body: gzip.compress(body, 6)}
+    if brotli is not None:
+        codecs["br"] = lambda body: brotli.compress(body, quality=5, mode=brotli.MODE_TEXT)
+    header = f"{'Pattern':<8} {'Variant':<13} {'Encoding':<9} {'Bytes':>7} {'ms':>6}"
+    print(header + "".join(f" {name + ' B':>7}" for name in codecs))
+    print("-" * (len(header) + 8 * len(codecs)))
+    renderers = {"plain": (SVGRenderer, {}), "compact": (CompactSVGRenderer, {"precision": args.precision})}
+    for name, pattern in _patterns(args.size).items():
+        for variant in VARIANTS:
+            for encoding, (cls, options) in renderers.items():
+                ms, svg = _time(lambda: pattern.render(cls, variant, **options).to_svg(), args.repeat)
+                body = svg.encode()
+                sizes = "".join(f" {len(compress(body)):>7}" for compress in codecs.values())
+                print(f"{name:<8} {variant:<13} {encoding:<9} {len(body):>7} {ms:>6.2f}{sizes}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser with all subcommands.
+
+    Returns:
+        Configured ArgumentParser instance.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m cli.bench",
+        description="Benchmark pattern rendering backends.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    p_pdf = subparsers.add_parser("pdf", help="Compare legacy and native-curve PDF output")
+    p_pdf.add_argument("--size", type=int, default=38, help="French size (default: 38)")
+    p_pdf.add_argument("--repeat", type=int, default=5, help="Runs per measurement (default: 5)")
+    p_pdf.set_defaults(func=cmd_pdf)
+
+    p_marker = subparsers.add_parser("marker", help="Nest every standard size onto one marker")
+    p_marker.add_argument("--width", type=float, default=150.0, help="Fabric width in cm (default: 150)")
+    p_marker.add_argument("--resolution", type=float, default=0.5, help="Raster cell in cm (default: 0.5)")
+    p_marker.add_argument("--budget", type=float, default=5.0, help="Time budget in s (default: 5)")
+    p_marker.set_defaults(func=cmd_marker)
+
+    p_svg = subparsers.add_parser("svg", help="Compare plain and compact SVG output")
+    p_svg.add_argument("--size", type=int, default=38, help="French size (default: 38)")
+    p_svg.add_argument("--repeat", type=int, default=20, help="Runs per measurement (default: 20)")
+    p_svg.add_argument("--precision", type=int, default=2, help="Compact decimals in mm (default: 2)")
+    p_svg.set_defaults(func=cmd_svg)
+
+    return parser
+
+
+def main() -> None:
+    """Parse arguments and dispatch to the appropriate subcommand."""
+    parser = build_parser()
+    args = parser.parse_args()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        args.func(args)
+
+
+if __name__ == "__main__":
+    main()
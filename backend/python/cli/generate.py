@@ -4,6 +4,7 @@ Usage:
     python -m cli.generate corset [--size SIZE] [--stretch H V] [--output DIR]
     python -m cli.generate sleeve [--size SIZE] [--stretch H V] [--output DIR]
     python -m cli.generate measurements [--size SIZE]
+    python -m cli.generate bank [--output DIR]
 """
 
 import argparse
@@ -11,7 +12,8 @@ import os
 import sys
 from dataclasses import fields
 
-from app.core.measurements import FullMeasurements, default_measurements
+from app.core.measurements import STANDARD_SIZES, FullMeasurements, default_measurements
+from app.modelist.bank import ArtifactBank
 from app.modelist.corset import (
     ControlParameters as CorsetControlParameters,
     CorsetMeasurements,
@@ -23,7 +25,7 @@ from app.modelist.sleeve import (
     SleevePattern,
 )
 
-SUPPORTED_SIZES = list(range(34, 50, 2))  # 34, 36, 38, 40, 42, 44, 46, 48
+SUPPORTED_SIZES = list(STANDARD_SIZES)
 
 
 def _write_pattern(pattern, name: str, output_dir: str) -> list[str]:
@@ -136,6 +138,22 @@ def cmd_measurements(args: argparse.Namespace) -> None:
         print(f"{label:<30} {value:>10.2f}")
 
 
+def cmd_bank(args: argparse.Namespace) -> None:
+    """Pre-generate the standard-size artifact bank and save it for the API.
+
+    Args:
+        args: Parsed CLI arguments with an output field.
+    """
+    bank = ArtifactBank()
+    bank.build()
+    path = bank.save(args.output)
+    stats = bank.stats()
+    print(f"Generated {stats.entries} artifacts in {stats.warmup_seconds:.2f} s "
+          f"({stats.size_bytes / 1024:.0f} KiB)")
+    print(f"Saved to {path}")
+    print(f"Serve with COUTURE_BANK=1 COUTURE_BANK_DIR={args.output}")
+
+
 def _validate_size(value: str) -> int:
     """Validate and return a size argument.
 
@@ -189,6 +207,11 @@ def build_parser() -> argparse.ArgumentParser:
     p_meas.add_argument("--size", type=_validate_size, default=None, help="French size (omit to list all sizes)")
     p_meas.set_defaults(func=cmd_measurements)
 
+    # -- bank --
+    p_bank = subparsers.add_parser("bank", help="Pre-generate the standard-size artifact bank")
+    p_bank.add_argument("--output", default="bank", help="Output directory (default: bank/)")
+    p_bank.set_defaults(func=cmd_bank)
+
     return parser
 
 
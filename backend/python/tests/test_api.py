@@ -1,5 +1,8 @@
 """Integration tests for the FastAPI endpoints."""
 
+import base64
+import json
+
 import pytest
 from fastapi.testclient import TestClient
 
@@ -116,6 +119,8 @@ class TestPatternEndpoints:
         assert "<svg" in data["construction_svg"]
         assert "<svg" in data["pattern_svg"]
         assert isinstance(data["warnings"], list)
+        crossings = [i for i in data["issues"] if i["check"] == "control_crossing"]
+        assert crossings and all(i["message"] in data["warnings"] for i in crossings)
 
     def test_generate_corset_svg(self):
         m_response = client.get("/api/measurements/defaults/38")
@@ -130,6 +135,22 @@ class TestPatternEndpoints:
         assert "image/svg+xml" in response.headers["content-type"]
         assert "<svg" in response.text
 
+    @pytest.mark.parametrize("degenerate", [{"full_waist": -10.0}, "zeros"])
+    def test_generate_corset_degenerate_measurements(self, degenerate):
+        measurements = client.get("/api/measurements/defaults/38").json()
+        if degenerate == "zeros":
+            measurements = {name: 0.0 for name in measurements}
+        else:
+            measurements.update(degenerate)
+
+        response = client.post("/api/modelist/generate", json={
+            "pattern_type": "corset",
+            "measurements": measurements,
+            "output_format": "all",
+        })
+        assert response.status_code == 200
+        assert any("non-finite outline" in w for w in response.json()["warnings"])
+
     def test_generate_corset_pdf(self):
         m_response = client.get("/api/measurements/defaults/38")
         measurements = m_response.json()
@@ -186,6 +207,34 @@ class TestPatternEndpoints:
         assert "<svg" in data["construction_svg"]
         assert "<svg" in data["pattern_svg"]
 
+    def test_generate_with_seam_allowance(self):
+        request = {**TestPatternCache.REQUEST, "output_format": "all"}
+        default = client.post("/api/modelist/generate", json=request).json()
+        wide = client.post("/api/modelist/generate", json={
+            **request, "seam_allowance": 1.5, "edge_allowances": {"hem": 3.0},
+        }).json()
+        none = client.post("/api/modelist/generate", json={**request, "seam_allowance": 0}).json()
+        assert "<polyline" in default["pattern_svg"]
+        assert wide["pattern_svg"] != default["pattern_svg"]
+        assert "<polyline" not in none["pattern_svg"]
+
+        negative = client.post("/api/modelist/generate", json={**request, "seam_allowance": -1})
+        assert negative.status_code == 422
+        negative = client.post("/api/modelist/generate", json={**request, "edge_allowances": {"hem": -1}})
+        assert negative.status_code == 422
+
+        unknown = client.post("/api/modelist/generate", json={**request, "edge_allowances": {"hemm": 3.0}}).json()
+        assert any("'hemm' matches no edge" in w for w in unknown["warnings"])
+        assert not any("matches no edge" in w for w in wide["warnings"])
+
+    def test_generate_compact_svg(self):
+        plain = client.post("/api/modelist/generate", json=TestPatternCache.REQUEST)
+        compact = client.post("/api/modelist/generate", json={**TestPatternCache.REQUEST, "svg_encoding": "compact"})
+        assert compact.status_code == 200
+        assert "<style>" in compact.text and "<line" not in compact.text
+        assert len(compact.content) < len(plain.content)
+        assert compact.headers["etag"] != plain.headers["etag"]
+
     def test_generate_invalid_measurements(self):
         response = client.post("/api/modelist/generate", json={
             "pattern_type": "corset",
@@ -193,3 +242,400 @@ class TestPatternEndpoints:
             "output_format": "all",
         })
         assert response.status_code == 422
+
+
+class TestGeometryOutput:
+    def _geometry(self, pattern_type, **extra):
+        measurements = client.get("/api/measurements/defaults/38").json()
+        response = client.post("/api/modelist/generate", json={
+            "pattern_type": pattern_type,
+            "measurements": measurements,
+            "output_format": "geometry",
+            **extra,
+        })
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        return response
+
+    def test_corset_geometry(self):
+        from app.core.measurements import default_measurements
+        from app.modelist.corset import CorsetMeasurements, CorsetPattern
+
+        data = self._geometry("corset").json()
+        assert data["format"] == "couture-geometry" and data["version"] == 1
+        assert data["y_up"] is True
+        assert data["variants"] == {"construction": ["outline", "cut", "points"], "pattern": ["outline", "cut"]}
+
+        pattern = CorsetPattern(CorsetMeasurements.from_full_measurements(default_measurements(38)))
+        points = data["points"]
+        assert points["names"] == list(pattern.points)
+        assert points["coords"][:2] == pytest.approx(list(pattern.points[points["names"][0]]), abs=1e-3)
+        assert data["helper_points"]["names"] == list(pattern.helper_points)
+
+        pieces = {piece["name"]: piece for piece in data["pieces"]}
+        assert pieces["back"]["transform"] == [-1.0, 0.0, 0.0, 1.0, 5.0, 0.0]
+        front = pieces["front"]
+        assert front["edges"]["layer"] == "outline" and front["cut_line"]["layer"] == "cut"
+        assert len(front["edges"]["ctrl"]) == 8 * len(front["edges"]["names"])
+        assert front["edges"]["smooth"][front["edges"]["names"].index("front_side_A1_B1")]
+        assert [i["message"] for i in data["issues"]] == data["warnings"]
+
+    def test_variants_list_only_layers_present(self):
+        data = self._geometry("sleeve", seam_allowance=0).json()
+        assert all(piece["cut_line"] is None for piece in data["pieces"])
+        assert data["variants"] == {"construction": ["outline", "points"], "pattern": ["outline"]}
+
+    def test_geometry_is_smaller_than_svg(self):
+        geometry = self._geometry("sleeve", stretch={"horizontal": 0.2})
+        data = geometry.json()
+        assert data["h_factor"] == pytest.approx(1 / 1.2)
+        assert data["pieces"][0]["name"] == "sleeve"
+        measurements = client.get("/api/measurements/defaults/38").json()
+        svg = client.post("/api/modelist/generate", json={
+            "pattern_type": "sleeve", "measurements": measurements, "output_format": "svg",
+            "stretch": {"horizontal": 0.2},
+        })
+        assert len(geometry.content) < len(svg.content) / 2
+
+
+class TestGeometryDelta:
+    def _post(self, **extra):
+        measurements = client.get("/api/measurements/defaults/38").json()
+        response = client.post("/api/modelist/generate", json={
+            "pattern_type": "corset",
+            "measurements": measurements,
+            "output_format": "geometry",
+            **extra,
+        })
+        assert response.status_code == 200
+        return response.json()
+
+    def test_delta_from_session_base(self):
+        base = self._post(session_id="delta-1")
+        assert base["format"] == "couture-geometry"
+        delta = self._post(session_id="delta-1", base_version=base["geometry_version"],
+                           control_parameters={"armhole_curve": 0.5})
+        assert delta["format"] == "couture-geometry-delta"
+        assert delta["base_version"] == base["geometry_version"]
+        assert delta["geometry_version"] != base["geometry_version"]
+        assert delta["points"]["names"] == []
+        assert set(delta["helper_points"]["names"]) == {"C11", "C12", "K1", "K2"}
+
+        # The new version is remembered and can be the next base
+        back = self._post(session_id="delta-1", base_version=delta["geometry_version"])
+        assert back["format"] == "couture-geometry-delta"
+        assert back["geometry_version"] == base["geometry_version"]
+
+    def test_unknown_base_falls_back_to_full_geometry(self):
+        base = self._post(session_id="delta-2")
+        assert self._post(session_id="delta-3", base_version=base["geometry_version"])["format"] == "couture-geometry"
+        assert self._post(base_version=base["geometry_version"])["format"] == "couture-geometry"
+        assert self._post(session_id="delta-2", base_version="unknown")["format"] == "couture-geometry"
+
+    def test_session_stats(self):
+        self._post(session_id="delta-4")
+        stats = client.get("/api/modelist/sessions").json()
+        assert stats["entries"] >= 1 and 0 < stats["size_bytes"] <= stats["max_bytes"]
+
+
+class TestLiveChannel:
+    def test_live_geometry_updates(self):
+        measurements = client.get("/api/measurements/defaults/38").json()
+        with client.websocket_connect("/api/modelist/live") as ws:
+            ws.send_text(json.dumps({
+                "seq": 1, "pattern_type": "corset", "measurements": measurements, "output_format": "geometry",
+            }))
+            first = json.loads(ws.receive_text())
+            assert first["seq"] == 1 and first["status_code"] == 200
+            assert json.loads(first["content"])["format"] == "couture-geometry"
+
+            ws.send_text(json.dumps({"seq": 2, "control_parameters": {"armhole_curve": 0.5}}))
+            second = json.loads(ws.receive_text())
+            delta = json.loads(second["content"])
+            assert second["seq"] == 2 and second["latency_ms"] > 0
+            assert delta["format"] == "couture-geometry-delta"
+            assert set(delta["helper_points"]["names"]) == {"C11", "C12", "K1", "K2"}
+
+            ws.send_text(json.dumps({"seq": 3, "seam_allowance": -1}))
+            assert json.loads(ws.receive_text())["status_code"] == 422
+
+        stats = client.get("/api/modelist/live").json()
+        assert stats["connections"] >= 1 and stats["open"] == []
+        assert stats["totals"]["pushed"] >= 2 and stats["totals"]["rejected"] >= 1
+
+
+class TestCompression:
+    def test_gzip_when_accepted(self):
+        response = client.post("/api/modelist/generate", json=TestPatternCache.REQUEST,
+                               headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert "accept-encoding" in response.headers["vary"].lower()
+        assert "<svg" in response.text
+
+    def test_etag_is_weak_only_when_compressed(self):
+        identity = client.post("/api/modelist/generate", json=TestPatternCache.REQUEST,
+                               headers={"Accept-Encoding": "identity"})
+        gzip = client.post("/api/modelist/generate", json=TestPatternCache.REQUEST,
+                           headers={"Accept-Encoding": "gzip"})
+        strong = identity.headers["etag"]
+        assert strong.startswith('"') and gzip.headers["etag"] == "W/" + strong
+        revalidated = client.post("/api/modelist/generate", json=TestPatternCache.REQUEST,
+                                  headers={"Accept-Encoding": "gzip", "If-None-Match": gzip.headers["etag"]})
+        assert revalidated.status_code == 304 and revalidated.headers["etag"] == gzip.headers["etag"]
+
+    def test_identity_pdf_and_small_responses(self):
+        request = {**TestPatternCache.REQUEST, "output_format": "pdf"}
+        pdf = client.post("/api/modelist/generate", json=request, headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in pdf.headers
+        refused = client.post("/api/modelist/generate", json=TestPatternCache.REQUEST,
+                              headers={"Accept-Encoding": "gzip;q=0"})
+        assert "content-encoding" not in refused.headers
+        small = client.get("/health", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in small.headers
+
+    def test_streamed_response(self):
+        from dataclasses import asdict
+        from app.core.measurements import default_measurements
+
+        response = client.post("/api/modelist/garments/top/generate", headers={"Accept-Encoding": "gzip"}, json={
+            "measurements": asdict(default_measurements(38)), "output_format": "svg", "stream": True,
+        })
+        assert response.headers["content-encoding"] == "gzip"
+        assert len([json.loads(line) for line in response.text.splitlines()]) == 2
+
+
+class TestPatternCache:
+    REQUEST = {
+        "pattern_type": "sleeve",
+        "measurements": {
+            "armhole_depth": 19.5,
+            "armhole_measurement": 45,
+            "sleeve_length": 66.0,
+            "upper_arm_to_elbow": 35.0,
+            "sleeve_bottom_width": 20.0,
+        },
+        "output_format": "svg",
+    }
+
+    def test_etag_and_not_modified(self):
+        response = client.post("/api/modelist/generate", json=self.REQUEST)
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+        # Compressed by default (the test client accepts gzip): a weak ETag
+        assert etag.startswith('W/"')
+
+        cached = client.post("/api/modelist/generate", json=self.REQUEST,
+                             headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.headers["etag"] == etag
+        assert cached.content == b""
+
+    def test_identical_requests_hit_cache(self):
+        client.post("/api/modelist/generate", json=self.REQUEST)
+        before = client.get("/api/modelist/cache").json()
+        response = client.post("/api/modelist/generate", json=self.REQUEST)
+        after = client.get("/api/modelist/cache").json()
+        assert response.status_code == 200
+        assert after["hits"] == before["hits"] + 1
+        assert after["misses"] == before["misses"]
+
+    def test_default_control_parameters_share_key(self):
+        from app.modelist.generation import request_key
+        from app.schemas.patterns import PatternRequest
+
+        plain = PatternRequest(**self.REQUEST)
+        explicit = PatternRequest(**self.REQUEST, control_parameters={"g3_perpendicular": 1.0, "unknown": 3.0})
+        changed = PatternRequest(**self.REQUEST, control_parameters={"g3_perpendicular": 2.0})
+        assert request_key(plain) == request_key(explicit)
+        assert request_key(plain) != request_key(changed)
+
+
+class TestStretchPreview:
+    MEASUREMENTS = TestPatternCache.REQUEST["measurements"]
+
+    def test_preview_many_stretches(self):
+        stretches = [{"horizontal": h, "vertical": 0.1, "usage": 0.5} for h in (0.0, 0.2, 0.4)]
+        response = client.post("/api/modelist/stretch", json={
+            "pattern_type": "sleeve",
+            "measurements": self.MEASUREMENTS,
+            "stretches": stretches,
+        })
+        assert response.status_code == 200
+        geometries = response.json()["geometries"]
+        assert len(geometries) == 3
+        widths = [g["points"]["B"][0] - g["points"]["A"][0] for g in geometries]
+        assert widths[0] > widths[1] > widths[2]
+        assert "G" in geometries[0]["helper_points"]
+        assert geometries[2]["h_factor"] == pytest.approx(1 / 1.2)
+
+    def test_stretch_count_is_bounded(self):
+        response = client.post("/api/modelist/stretch", json={
+            "pattern_type": "sleeve",
+            "measurements": self.MEASUREMENTS,
+            "stretches": [{"horizontal": 0.1}] * 257,
+        })
+        assert response.status_code == 422
+
+    def test_generate_with_stretch_reuses_draft(self):
+        from app.modelist.generation import draft_cache
+
+        request = dict(TestPatternCache.REQUEST, output_format="pdf")
+        client.post("/api/modelist/generate", json=request)
+        before = draft_cache.stats()
+        stretched = dict(request, stretch={"horizontal": 0.3, "vertical": 0.0, "usage": 1.0})
+        response = client.post("/api/modelist/generate", json=stretched)
+        after = draft_cache.stats()
+        assert response.status_code == 200
+        assert after.hits == before.hits + 1
+        assert after.misses == before.misses
+
+
+class TestBatchGenerate:
+    def _lines(self, response) -> list[dict]:
+        return [json.loads(line) for line in response.text.splitlines()]
+
+    def test_many_measurement_sets(self):
+        from dataclasses import asdict
+        from app.core.measurements import default_measurements
+
+        sizes = (36, 40, 44)
+        response = client.post("/api/modelist/generate/batch", json={
+            "pattern_type": "corset",
+            "measurements": [asdict(default_measurements(s)) for s in sizes],
+            "output_format": "svg",
+            "ordered": True,
+        })
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        items = self._lines(response)
+        assert [item["index"] for item in items] == [0, 1, 2]
+        assert all("<svg" in item["content"] for item in items)
+        assert all(item["warnings"] for item in items)
+
+    def test_per_item_errors(self):
+        good = dict(TestPatternCache.REQUEST, output_format="pdf")
+        bad = {"pattern_type": "corset", "measurements": {"full_bust": 88.0}}
+        response = client.post("/api/modelist/generate/batch", json={"requests": [good, bad]})
+        assert response.status_code == 200
+        items = sorted(self._lines(response), key=lambda item: item["index"])
+        assert items[0]["status_code"] == 200
+        assert items[0]["encoding"] == "base64"
+        assert base64.b64decode(items[0]["content"]).startswith(b"%PDF")
+        assert items[1]["status_code"] == 422
+        assert items[1]["error"]
+
+    def test_unexpected_item_error(self, monkeypatch):
+        from app.modelist import router as modelist_router
+
+        resolve = modelist_router._resolve
+
+        async def flaky_resolve(req):
+            if req.seam_allowance == 2.0:
+                raise RuntimeError("boom")
+            return await resolve(req)
+
+        monkeypatch.setattr(modelist_router, "_resolve", flaky_resolve)
+        bad = dict(TestPatternCache.REQUEST, seam_allowance=2.0)
+        response = client.post("/api/modelist/generate/batch", json={
+            "requests": [TestPatternCache.REQUEST, bad], "ordered": True,
+        })
+        assert response.status_code == 200
+        items = self._lines(response)
+        assert [item["status_code"] for item in items] == [200, 500]
+        assert "boom" in items[1]["error"]
+
+    def test_batch_size_guard(self, monkeypatch):
+        from app.modelist import router as modelist_router
+
+        monkeypatch.setattr(modelist_router, "MAX_BATCH_SIZE", 2)
+        response = client.post("/api/modelist/generate/batch", json={
+            "requests": [TestPatternCache.REQUEST] * 3,
+        })
+        assert response.status_code == 413
+
+    def test_ambiguous_batch(self):
+        response = client.post("/api/modelist/generate/batch", json={
+            "requests": [TestPatternCache.REQUEST],
+            "pattern_type": "sleeve",
+            "measurements": [TestPatternCache.REQUEST["measurements"]],
+        })
+        assert response.status_code == 422
+
+
+class TestGarmentGenerate:
+    def _measurements(self) -> dict:
+        from dataclasses import asdict
+        from app.core.measurements import default_measurements
+
+        return asdict(default_measurements(40))
+
+    def test_all_pieces_together(self):
+        response = client.post("/api/modelist/garments/top/generate", json={
+            "measurements": self._measurements(),
+            "adjustments": {"sleeve": {"stretch": {"horizontal": 0.2, "vertical": 0.0, "usage": 1.0}}},
+            "output_format": "svg",
+        })
+        assert response.status_code == 200
+        data = response.json()
+        assert data["garment"] == "top"
+        assert [p["pattern_type"] for p in data["pieces"]] == ["corset", "sleeve"]
+        assert all(p["status_code"] == 200 and "<svg" in p["content"] for p in data["pieces"])
+
+    def test_stream_pieces(self):
+        response = client.post("/api/modelist/garments/top/generate", json={
+            "measurements": self._measurements(),
+            "output_format": "pdf",
+            "stream": True,
+        })
+        assert response.status_code == 200
+        pieces = [json.loads(line) for line in response.text.splitlines()]
+        assert sorted(p["label"] for p in pieces) == ["Bodice", "Sleeve"]
+        assert all(p["encoding"] == "base64" for p in pieces)
+
+    def test_unknown_garment(self):
+        response = client.post("/api/modelist/garments/cape/generate", json={"measurements": {}})
+        assert response.status_code == 404
+
+    def test_invalid_measurements(self):
+        response = client.post("/api/modelist/garments/top/generate", json={"measurements": {"full_bust": 88.0}})
+        assert response.status_code == 422
+
+
+class TestMarker:
+    ORDER = {
+        "orders": [
+            {"pattern_type": "corset", "size": 38},
+            {"pattern_type": "sleeve", "size": 38},
+        ],
+        "resolution": 1.0,
+        "time_budget": 0,
+    }
+
+    def test_marker_json(self):
+        response = client.post("/api/modelist/marker", json=self.ORDER)
+        assert response.status_code == 200
+        data = response.json()
+        # front + back + sleeve, each cut as a pair
+        assert len(data["placements"]) == 6
+        assert 0 < data["utilization"] < 1
+        assert data["length"] == pytest.approx(float(response.headers["x-marker-length"]), abs=0.01)
+        assert "<svg" in data["marker_svg"]
+
+    def test_marker_svg_and_pdf(self):
+        svg = client.post("/api/modelist/marker", json={**self.ORDER, "output_format": "svg"})
+        assert svg.headers["content-type"].startswith("image/svg+xml")
+        pdf = client.post("/api/modelist/marker", json={**self.ORDER, "output_format": "pdf"})
+        assert pdf.content[:5] == b"%PDF-"
+        assert float(pdf.headers["x-marker-utilization"]) > 0
+
+    def test_invalid_orders(self):
+        unknown = client.post("/api/modelist/marker", json={"orders": [{"pattern_type": "corset", "size": 39}]})
+        assert unknown.status_code == 422
+        geometry = client.post("/api/modelist/marker", json={**self.ORDER, "output_format": "geometry"})
+        assert geometry.status_code == 422
+        narrow = client.post("/api/modelist/marker", json={**self.ORDER, "fabric_width": 20})
+        assert narrow.status_code == 422
+        huge = client.post("/api/modelist/marker", json={
+            "orders": [{"pattern_type": "corset", "size": 38, "quantity": 10_000}],
+        })
+        assert huge.status_code == 413
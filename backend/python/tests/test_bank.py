@@ -0,0 +1,67 @@
+"""Tests for the standard-size artifact bank."""
+
+from dataclasses import asdict
+
+from fastapi.testclient import TestClient
+
+from app.core.measurements import default_measurements
+from app.main import app
+from app.modelist.bank import BANK_CACHE_CONTROL, ArtifactBank, bank, standard_requests
+from app.modelist.generation import request_key
+
+client = TestClient(app)
+
+
+class TestArtifactBank:
+    def test_build(self):
+        b = ArtifactBank()
+        b.build(sizes=(38,))
+        stats = b.stats()
+        assert stats.entries == len(standard_requests((38,))) == 8
+        assert stats.source == "built"
+        assert stats.size_bytes > 0
+        for req in standard_requests((38,)):
+            assert request_key(req) in b
+
+    def test_save_and_load(self, tmp_path):
+        b = ArtifactBank()
+        b.build(sizes=(40,))
+        b.save(tmp_path)
+
+        reloaded = ArtifactBank()
+        assert reloaded.load(tmp_path)
+        assert reloaded.stats().source == "disk"
+        for req in standard_requests((40,)):
+            key = request_key(req)
+            assert reloaded.get(key) == b.get(key)
+
+    def test_load_missing(self, tmp_path):
+        assert not ArtifactBank().load(tmp_path)
+
+
+class TestBankEndpoint:
+    def test_standard_request_served_from_bank(self):
+        bank.build(sizes=(42,))
+        try:
+            request = {
+                "pattern_type": "corset",
+                "measurements": asdict(default_measurements(42)),
+                "output_format": "svg",
+            }
+            response = client.post("/api/modelist/generate", json=request)
+            assert response.status_code == 200
+            assert "cache-control" not in response.headers
+            assert client.get("/api/modelist/bank").json()["hits"] == 1
+
+            banked = client.get(response.headers["content-location"])
+            assert banked.headers["cache-control"] == BANK_CACHE_CONTROL
+            assert banked.content == response.content
+            assert banked.headers["etag"] == response.headers["etag"]
+
+            request["control_parameters"] = {"armhole_curve": 0.5}
+            response = client.post("/api/modelist/generate", json=request)
+            assert response.status_code == 200
+            assert "content-location" not in response.headers
+            assert client.get("/api/modelist/bank/unknown").status_code == 404
+        finally:
+            bank.clear()
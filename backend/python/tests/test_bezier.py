@@ -0,0 +1,58 @@
+"""Unit tests for the vectorized Bezier metrics."""
+
+import numpy as np
+
+from app.core import bezier
+
+SEGMENT = np.array([[0.0, 0.0], [1.0, 2.0], [3.0, 3.0], [4.0, 0.0]])
+# Standard cubic approximation of a unit quarter circle
+KAPPA = 4 * (np.sqrt(2) - 1) / 3
+QUARTER = np.array([[1.0, 0.0], [1.0, KAPPA], [KAPPA, 1.0], [0.0, 1.0]])
+
+
+def _polyline_length(ctrl, n=100_001):
+    pts = bezier.point(ctrl, np.linspace(0, 1, n))
+    return np.linalg.norm(np.diff(pts, axis=0), axis=1).sum()
+
+
+class TestBezierMetrics:
+    def test_point_endpoints(self):
+        np.testing.assert_allclose(bezier.point(SEGMENT, 0), SEGMENT[0])
+        np.testing.assert_allclose(bezier.point(SEGMENT, 1), SEGMENT[3])
+
+    def test_arc_length_matches_dense_polyline(self):
+        assert abs(bezier.arc_length(SEGMENT) - _polyline_length(SEGMENT)) < 1e-6
+
+    def test_straight_segment(self):
+        line = np.array([[0.0, 0.0], [1.0, 0.0], [2.0, 0.0], [3.0, 0.0]])
+        assert abs(bezier.arc_length(line) - 3.0) < 1e-12
+        np.testing.assert_allclose(bezier.param_at_length(line, 1.5), 0.5)
+
+    def test_batched_shapes(self):
+        batch = np.stack([SEGMENT, 2 * SEGMENT, QUARTER])
+        lengths = bezier.arc_length(batch)
+        assert lengths.shape == (3,)
+        np.testing.assert_allclose(lengths[1], 2 * lengths[0])
+        nested = np.stack([batch, batch])
+        assert bezier.arc_length(nested).shape == (2, 3)
+        assert bezier.bounding_box(nested).shape == (2, 3, 2, 2)
+        assert bezier.tangent(batch, 0.5).shape == (3, 2)
+
+    def test_param_at_length_inverts_arc_length(self):
+        batch = np.stack([SEGMENT, QUARTER])
+        s = np.array([2.0, 0.5])
+        t = bezier.param_at_length(batch, s)
+        np.testing.assert_allclose(bezier.arc_length(batch, t), s, atol=1e-8)
+        np.testing.assert_allclose(bezier.param_at_length(batch, [100.0, -1.0]), [1.0, 0.0])
+
+    def test_quarter_circle(self):
+        assert abs(bezier.arc_length(QUARTER) - np.pi / 2) < 1e-3
+        np.testing.assert_allclose(bezier.curvature(QUARTER, [0.0, 0.5, 1.0]), 1.0, atol=0.03)
+        np.testing.assert_allclose(bezier.tangent(QUARTER, 0.0), [0.0, 1.0])
+
+    def test_bounding_box_is_exact(self):
+        box = bezier.bounding_box(SEGMENT)
+        pts = bezier.point(SEGMENT, np.linspace(0, 1, 100_001))
+        np.testing.assert_allclose(box[0], pts.min(axis=0), atol=1e-9)
+        np.testing.assert_allclose(box[1], pts.max(axis=0), atol=1e-9)
+        assert box[1, 1] < SEGMENT[:, 1].max()
@@ -0,0 +1,35 @@
+"""Unit tests for the byte-bounded LRU cache."""
+
+from app.core.cache import LRUCache
+
+
+class TestLRUCache:
+    def test_get_put(self):
+        cache = LRUCache(max_bytes=100)
+        cache.put("a", b"12345")
+        assert cache.get("a") == b"12345"
+        assert cache.get("b") is None
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.size_bytes) == (1, 1, 5)
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(max_bytes=10)
+        cache.put("a", b"aaaa")
+        cache.put("b", b"bbbb")
+        cache.get("a")
+        cache.put("c", b"cccc")
+        assert "a" in cache
+        assert "b" not in cache
+        assert cache.stats().evictions == 1
+        assert cache.stats().size_bytes == 8
+
+    def test_oversized_value_not_stored(self):
+        cache = LRUCache(max_bytes=3)
+        cache.put("a", b"abcd")
+        assert len(cache) == 0
+
+    def test_replace_updates_size(self):
+        cache = LRUCache(max_bytes=10)
+        cache.put("a", b"aaaa")
+        cache.put("a", b"aa")
+        assert cache.stats().size_bytes == 2
@@ -0,0 +1,111 @@
+"""Tests for the context-local diagnostics channel."""
+
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+
+import pytest
+
+from app.core.diagnostics import collect, report
+from app.core.measurements import default_measurements
+from app.modelist.generation import draft_cache, draft_key, draft_pattern, generate
+from app.schemas.patterns import PatternRequest
+
+
+class TestDiagnostics:
+    def test_collect(self):
+        with collect() as messages:
+            report("one")
+            report("two")
+        assert messages == ["one", "two"]
+
+    def test_nested_collectors(self):
+        with collect() as outer:
+            report("outer")
+            with collect() as inner:
+                report("inner")
+        assert outer == ["outer"]
+        assert inner == ["inner"]
+
+    def test_fallback_warns(self):
+        with pytest.warns(UserWarning, match="no collector"):
+            report("no collector")
+
+    def test_threads_do_not_share_sinks(self):
+        barrier = threading.Barrier(8)
+        results = {}
+
+        def work(i):
+            with collect() as messages:
+                barrier.wait()
+                for _ in range(50):
+                    report(f"thread {i}")
+            results[i] = messages
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        for i, messages in results.items():
+            assert messages == [f"thread {i}"] * 50
+
+
+class TestConcurrentGenerate:
+    def _requests(self) -> list[PatternRequest]:
+        return [
+            PatternRequest(
+                pattern_type=pattern_type,
+                measurements=asdict(default_measurements(size)),
+                control_parameters={"armhole_curve": curve},
+                output_format="svg",
+            )
+            for pattern_type in ("corset", "sleeve")
+            for size in (34, 42, 48)
+            for curve in (0.2, 0.8)
+        ]
+
+    def test_draft_diagnostics_survive_cache_hits(self):
+        req = self._requests()[0]
+        pattern = draft_pattern(req)
+        draft_cache.put(draft_key(req), (pattern, ("drafted",)))
+        for _ in range(2):
+            assert "drafted" in generate(req).warnings
+        # Renders work on copies: the shared draft keeps no recording
+        assert pattern._display_list is None and pattern._issues is None
+        draft_cache.clear()
+
+    def test_derived_draft_keeps_drafting_diagnostics(self):
+        from app.modelist import generation
+
+        draft_cache.clear()
+        generation._latest_drafts.clear()
+        size_48 = asdict(default_measurements(48))
+        req = PatternRequest(pattern_type="corset", measurements=size_48, output_format="svg")
+        drafted = generate(req).warnings
+        assert any("Armhole control" in w for w in drafted)
+
+        edited = req.model_copy(update={"control_parameters": {"front_neck_center": 0.7}})
+        pattern = draft_pattern(edited)
+        assert 0 < pattern.drafting.evaluations < len(pattern.graph.nodes)
+        derived = generate(edited).warnings
+        generation._latest_drafts.clear()
+        draft_cache.clear()
+        assert derived == generate(edited).warnings
+        assert [w for w in derived if "Armhole" in w] == [w for w in drafted if "Armhole" in w]
+        draft_cache.clear()
+
+    def test_each_request_keeps_its_warnings(self):
+        requests = self._requests()
+        expected = [generate(req).warnings for req in requests]
+        assert len(set(expected)) > 3
+
+        draft_cache.clear()
+        order = [i for i in range(len(requests)) for _ in range(12)]
+        random.Random(0).shuffle(order)
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(lambda i: generate(requests[i]).warnings, order))
+
+        for i, warnings in zip(order, results):
+            assert warnings == expected[i]
@@ -0,0 +1,94 @@
+"""Unit tests for the display list and layered pattern recordings."""
+
+from app.core.display_list import VARIANT_LAYERS, DisplayList
+from app.core.measurements import default_measurements
+from app.modelist.corset import CorsetMeasurements, CorsetPattern
+from app.modelist.sleeve import SleeveMeasurements, SleevePattern
+
+
+class CallLog:
+    """Renderer stand-in that records the calls it receives."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args, kwargs))
+
+
+class TestDisplayList:
+    def _recording(self) -> DisplayList:
+        dl = DisplayList()
+        with dl.on_layer("guides"):
+            dl.line(0, 0, 1, 1, color='gray', style='--')
+        dl.bezier((0, 0), (1, 2), (3, 2), (4, 0), color='blue')
+        with dl.on_layer("points"):
+            dl.circle(1, 1, 0.1)
+            dl.text(1, 1, "A", size=8)
+        return dl.freeze()
+
+    def test_arrays(self):
+        dl = self._recording()
+        assert len(dl) == 4
+        assert dl.ops.shape == (4, 5)
+        assert dl.coords.shape == (2 + 4 + 1 + 1, 2)
+        assert dl.layers == ["guides", "outline", "points"]
+
+    def test_replay_all(self):
+        log = CallLog()
+        self._recording().replay(log)
+        assert [c[0] for c in log.calls] == ["line", "bezier", "circle", "text"]
+        assert log.calls[1][1] == ([0, 0], [1, 2], [3, 2], [4, 0])
+        assert log.calls[3][2]["size"] == 8
+
+    def test_replay_layer_filter(self):
+        log = CallLog()
+        self._recording().replay(log, {"outline"})
+        assert [c[0] for c in log.calls] == ["bezier"]
+
+    def test_record_after_freeze(self):
+        dl = self._recording()
+        dl.line(5, 5, 6, 6)
+        log = CallLog()
+        dl.freeze().replay(log, {"outline"})
+        assert log.calls[-1][1] == (5, 5, 6, 6)
+
+    def test_styles_are_interned(self):
+        dl = DisplayList()
+        for i in range(10):
+            dl.line(i, 0, i, 1, color='gray')
+        dl.freeze()
+        assert len(dl.params) == 1
+
+
+class TestPatternRecording:
+    def _patterns(self):
+        fm = default_measurements(38)
+        return [
+            CorsetPattern(CorsetMeasurements.from_full_measurements(fm)),
+            SleevePattern(SleeveMeasurements.from_full_measurements(fm)),
+        ]
+
+    def test_recorded_once(self):
+        for pattern in self._patterns():
+            dl = pattern.record()
+            pattern.render_svg("construction")
+            pattern.render_pdf("pattern")
+            assert pattern.record() is dl
+
+    def test_pattern_variant_is_subset(self):
+        for pattern in self._patterns():
+            dl = pattern.record()
+            n_pattern = dl.layer_mask(VARIANT_LAYERS["pattern"]).sum()
+            assert 0 < n_pattern < len(dl)
+            construction = pattern.render_svg("construction")
+            printable = pattern.render_svg("pattern")
+            assert "<circle" in construction
+            assert "<circle" not in printable
+
+    def test_stretch_invalidates_recording(self):
+        pattern = self._patterns()[1]
+        before = pattern.record().coords.copy()
+        pattern.stretch(horizontal=0.5)
+        after = pattern.record().coords
+        assert after[:, 0].max() < before[:, 0].max()
@@ -0,0 +1,73 @@
+"""Tests for tolerance-driven Bezier flattening."""
+
+import numpy as np
+import pytest
+
+from app.core import bezier
+from app.core.flatten import TOLERANCES, flatten, flatten_path, segment_counts
+
+ARC = np.array([[0, 0], [0, 5.5], [4.5, 10], [10, 10]], dtype=float)
+LINE = np.array([[0, 0], [1, 1], [2, 2], [3, 3]], dtype=float)
+
+
+def _max_deviation(ctrl, polyline):
+    """Largest distance from a dense sampling of the curve to the polyline."""
+    pts = bezier.point(ctrl, np.linspace(0, 1, 2001))
+    a, b = polyline[:-1], polyline[1:]
+    ab = b - a
+    ap = pts[:, None, :] - a
+    u = np.clip((ap * ab).sum(-1) / (ab * ab).sum(-1), 0, 1)
+    dist = np.linalg.norm(ap - u[..., None] * ab, axis=-1)
+    return dist.min(axis=1).max()
+
+
+class TestSegmentCounts:
+    def test_straight_segment_is_one_step(self):
+        assert segment_counts(LINE).tolist() == [1]
+
+    def test_counts_grow_as_inverse_sqrt_tolerance(self):
+        coarse = segment_counts(ARC, 0.04)[0]
+        fine = segment_counts(ARC, 0.01)[0]
+        assert fine == pytest.approx(2 * coarse, abs=1)
+
+    def test_presets(self):
+        for name, tol in TOLERANCES.items():
+            assert segment_counts(ARC, name)[0] == segment_counts(ARC, tol)[0]
+
+    def test_max_steps(self):
+        assert segment_counts(ARC, 1e-9, max_steps=50).tolist() == [50]
+
+    @pytest.mark.parametrize("tolerance", [0, -1, "fine"])
+    def test_invalid_tolerance(self, tolerance):
+        with pytest.raises(ValueError):
+            segment_counts(ARC, tolerance)
+
+    def test_non_finite_segment(self):
+        bad = ARC.copy()
+        bad[1, 0] = np.nan
+        with pytest.raises(ValueError, match="segment 1"):
+            segment_counts(np.stack([ARC, bad]))
+
+
+class TestFlatten:
+    @pytest.mark.parametrize("tolerance", [0.1, 0.01, 0.001])
+    def test_within_tolerance(self, tolerance):
+        points, _ = flatten(ARC, tolerance)
+        assert _max_deviation(ARC, points) <= tolerance
+
+    def test_offsets_and_end_points(self):
+        ctrl = np.stack([ARC, LINE])
+        points, offsets = flatten(ctrl)
+        assert offsets[0] == 0 and offsets[-1] == len(points)
+        for k, seg in enumerate(ctrl):
+            poly = points[offsets[k]:offsets[k + 1]]
+            np.testing.assert_allclose(poly[[0, -1]], seg[[0, 3]])
+        assert offsets[2] - offsets[1] == 2
+
+    def test_path_shares_joints(self):
+        second = ARC + [10, 10]
+        ctrl = np.stack([ARC, second])
+        points, offsets = flatten(ctrl)
+        path = flatten_path(ctrl)
+        assert len(path) == len(points) - 1
+        assert not np.any(np.all(np.diff(path, axis=0) == 0, axis=1))
@@ -0,0 +1,92 @@
+"""Tests for collision-free label placement."""
+
+import numpy as np
+
+from app.core.diagnostics import collect
+from app.core.display_list import TEXT, DisplayList
+from app.core.labels import GridIndex, Label, place_labels, text_box
+from app.core.measurements import default_measurements
+from app.modelist.corset import CorsetMeasurements, CorsetPattern
+
+
+def _texts(dl: DisplayList):
+    dl.freeze()
+    return [
+        (dl.coords[start], dl.params[param])
+        for kind, _, param, start, _ in dl.ops.tolist() if kind == TEXT
+    ]
+
+
+class TestTextBox:
+    def test_lines_go_down_the_page(self):
+        x0, y0, x1, y1 = text_box(0, 0, "AB\nCD", size=10)
+        assert x0 == 0 and x1 > 0
+        assert y1 > -y0 > 0
+        fx0, fy0, fx1, fy1 = text_box(0, 0, "AB\nCD", size=10, y_flip=True)
+        assert (fy0, fy1) == (-y1, -y0)
+
+    def test_alignment(self):
+        left = text_box(5, 0, "label")
+        right = text_box(5, 0, "label", ha='right')
+        center = text_box(5, 0, "label", ha='center')
+        assert left[0] == right[2] == 5
+        assert center[0] + center[2] == 10
+
+
+class TestGridIndex:
+    def test_segment_crossing_box(self):
+        index = GridIndex(cell=1.0)
+        index.add_polyline([[-5, 0.5], [5, 0.5]])
+        assert index.hits((0, 0, 1, 1))
+        assert not index.hits((0, 1, 1, 2))
+
+    def test_boxes(self):
+        index = GridIndex(cell=1.0)
+        index.add_box((0, 0, 2, 2))
+        assert index.hits((1, 1, 3, 3))
+        assert not index.hits((2.5, 0, 3, 1))
+
+
+class TestPlaceLabels:
+    def test_avoids_curve(self):
+        dl = DisplayList()
+        # A line right through the preferred spot, right of the point
+        dl.line(0.2, 0.0, 5.0, 0.0)
+        unplaced = place_labels(dl, [Label(0, 0, "P")])
+        assert unplaced == []
+        (x, y), params = _texts(dl)[0]
+        box = text_box(x, y, "P", ha=params[3])
+        assert not (box[1] < 0 < box[3] and box[0] < 5)
+
+    def test_labels_do_not_overlap(self):
+        dl = DisplayList()
+        labels = [Label(0, 0, "first\nline"), Label(0.1, 0, "second\nline")]
+        assert place_labels(dl, labels) == []
+        (p1, a), (p2, b) = _texts(dl)
+        b1 = text_box(*p1, a[0], ha=a[3])
+        b2 = text_box(*p2, b[0], ha=b[3])
+        assert b1[2] <= b2[0] or b2[2] <= b1[0] or b1[3] <= b2[1] or b2[3] <= b1[1]
+
+    def test_reports_unplaced(self):
+        dl = DisplayList()
+        # Dense grid of lines around the point leaves no room
+        for v in np.arange(-3, 3.1, 0.2):
+            dl.line(-3, v, 3, v)
+        with collect() as messages:
+            unplaced = place_labels(dl, [Label(0, 0, "hidden")])
+        assert [label.text for label in unplaced] == ["hidden"]
+        assert "hidden" in messages[0]
+        assert len(_texts(dl)) == 1
+
+    def test_corset_point_labels(self):
+        pattern = CorsetPattern(CorsetMeasurements.from_full_measurements(default_measurements(36)))
+        with collect() as messages:
+            dl = pattern.record()
+        assert not [m for m in messages if "Label" in m]
+        boxes = [
+            text_box(*xy, params[0], params[1], params[3], y_flip=True)
+            for xy, params in _texts(dl) if params[2] in ('blue', 'green', 'gray') and params[1] == 8
+        ]
+        for i, a in enumerate(boxes):
+            for b in boxes[i + 1:]:
+                assert a[2] <= b[0] or b[2] <= a[0] or a[3] <= b[1] or b[3] <= a[1]
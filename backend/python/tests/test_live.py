@@ -0,0 +1,173 @@
+"""Tests for the latest-wins live editing channel."""
+
+import asyncio
+import json
+
+from app.modelist.generation import GenerationResult
+from app.modelist.live import LiveChannel
+
+REQUEST = {
+    "pattern_type": "sleeve",
+    "measurements": {
+        "armhole_depth": 19.5,
+        "armhole_measurement": 45,
+        "sleeve_length": 60.0,
+        "upper_arm_to_elbow": 35.0,
+        "sleeve_bottom_width": 20.0,
+    },
+    "output_format": "svg",
+}
+
+
+class GatedResolve:
+    """Fake generation that records requests and waits for the test to release them."""
+
+    def __init__(self):
+        self.requests = []
+        self.gate = asyncio.Event()
+
+    async def __call__(self, req):
+        self.requests.append(req)
+        await self.gate.wait()
+        if req.seam_allowance > 5:
+            raise ValueError("too wide")
+        return GenerationResult(body=f"<svg>{req.control_parameters}</svg>".encode(), media_type="image/svg+xml")
+
+
+def _channel(resolve, max_in_flight=1):
+    return LiveChannel(resolve, (ValueError,), lambda e: 422, max_in_flight=max_in_flight)
+
+
+async def _settle():
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+class TestLiveChannel:
+    def test_burst_pushes_only_newest(self):
+        async def scenario():
+            resolve = GatedResolve()
+            channel = _channel(resolve)
+            sent = []
+
+            async def send(text):
+                sent.append(json.loads(text))
+
+            connection = channel.connect(send)
+            await connection.receive(json.dumps({"seq": 1, **REQUEST}))
+            for seq, value in ((2, 1.1), (3, 1.2), (4, 1.3)):
+                await connection.receive(json.dumps({"seq": seq, "control_parameters": {"g3_perpendicular": value}}))
+            await _settle()
+            assert len(resolve.requests) == 1
+            resolve.gate.set()
+            await _settle()
+            return resolve, channel, connection, sent
+
+        resolve, channel, connection, sent = asyncio.run(scenario())
+        assert [m["seq"] for m in sent] == [4]
+        assert sent[0]["dropped"] == 3 and "1.3" in sent[0]["content"]
+        # The first update ran and was superseded; 2 and 3 never ran
+        assert len(resolve.requests) == 2
+        assert resolve.requests[1].measurements == REQUEST["measurements"]
+        stats = connection.stats
+        assert (stats.updates, stats.coalesced, stats.superseded, stats.pushed) == (4, 2, 1, 1)
+        assert channel.stats()["totals"]["latency_ms_max"] > 0
+
+    def test_in_flight_limit(self):
+        async def scenario():
+            resolve = GatedResolve()
+            connection = _channel(resolve, max_in_flight=2).connect(lambda text: asyncio.sleep(0))
+            for seq in range(1, 5):
+                await connection.receive(json.dumps({"seq": seq, **REQUEST}))
+            await _settle()
+            started, in_flight = len(resolve.requests), connection.stats.in_flight
+            resolve.gate.set()
+            await _settle()
+            return started, in_flight, connection.stats
+
+        started, in_flight, stats = asyncio.run(scenario())
+        assert (started, in_flight) == (2, 2)
+        assert (stats.coalesced, stats.superseded, stats.pushed, stats.in_flight) == (1, 2, 1, 0)
+
+    def test_invalid_update_is_rejected(self):
+        async def scenario():
+            resolve = GatedResolve()
+            resolve.gate.set()
+            sent = []
+
+            async def send(text):
+                sent.append(json.loads(text))
+
+            connection = _channel(resolve).connect(send)
+            await connection.receive(json.dumps({"seq": 1, "control_parameters": {"g3_perpendicular": 1.0}}))
+            await connection.receive(json.dumps({"seq": 2, **REQUEST, "seam_allowance": 6}))
+            await _settle()
+            return connection, sent
+
+        connection, sent = asyncio.run(scenario())
+        assert [(m["seq"], m["status_code"]) for m in sent] == [(1, 422), (2, 422)]
+        assert "too wide" in sent[1]["error"]
+        assert connection.stats.rejected == 1 and connection.stats.failed == 1
+
+    def test_disconnect_detaches_generations(self):
+        async def scenario():
+            resolve = GatedResolve()
+            channel = _channel(resolve)
+            sent = []
+
+            async def send(text):
+                sent.append(text)
+
+            connection = channel.connect(send)
+            await connection.receive(json.dumps(REQUEST))
+            await _settle()
+            channel.disconnect(connection)
+            await _settle()
+            running = connection.stats.in_flight
+            resolve.gate.set()
+            await _settle()
+            return channel, connection, running, sent
+
+        channel, connection, running, sent = asyncio.run(scenario())
+        # The generation kept running after the disconnect, and finished unpushed
+        assert running == 1
+        assert connection.stats.in_flight == 0 and sent == []
+        stats = channel.stats()
+        assert stats["open"] == [] and stats["totals"]["updates"] == 1
+
+    def test_failed_send_closes_connection(self):
+        async def scenario():
+            resolve = GatedResolve()
+            resolve.gate.set()
+
+            async def send(text):
+                raise RuntimeError("client gone")
+
+            connection = _channel(resolve).connect(send)
+            await connection.receive(json.dumps({"seq": 1, **REQUEST}))
+            await _settle()
+            return connection
+
+        connection = asyncio.run(scenario())
+        assert connection.closed
+        assert connection.stats.pushed == 0 and connection.stats.in_flight == 0
+
+    def test_unexpected_error_is_pushed_as_500(self):
+        async def resolve(req):
+            raise RuntimeError("boom")
+
+        async def scenario():
+            sent = []
+
+            async def send(text):
+                sent.append(json.loads(text))
+
+            connection = _channel(resolve).connect(send)
+            await connection.receive(json.dumps({"seq": 1, **REQUEST}))
+            await _settle()
+            return connection, sent
+
+        connection, sent = asyncio.run(scenario())
+        assert [(m["seq"], m["status_code"]) for m in sent] == [(1, 500)]
+        assert "boom" in sent[0]["error"]
+        assert connection.stats.failed == 1 and connection.stats.in_flight == 0
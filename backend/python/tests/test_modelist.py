@@ -1,8 +1,12 @@
 """Unit tests for pattern render methods."""
 
+import numpy as np
 import pytest
 
-from app.core.measurements import default_measurements
+from app.core.diagnostics import collect
+from app.core.flatten import flatten_path
+from app.core.measurements import FullMeasurements, default_measurements
+from app.core.seam import signed_area
 from app.modelist.corset import CorsetPattern, CorsetMeasurements
 from app.modelist.sleeve import SleevePattern, SleeveMeasurements
 
@@ -72,3 +76,260 @@ class TestSleeveRender:
         pdf = pattern.render_pdf("pattern")
         assert isinstance(pdf, bytes)
         assert pdf[:5] == b"%PDF-"
+
+
+class TestBatchDrafting:
+    SIZES = [34, 38, 42, 48]
+
+    def test_corset_batch_matches_single(self):
+        fms = [default_measurements(size) for size in self.SIZES]
+        batch_m = CorsetMeasurements.from_full_measurements(
+            FullMeasurements.from_matrix(FullMeasurements.to_matrix(fms))
+        )
+        batch = CorsetPattern.draft_batch(batch_m)
+        assert len(batch) == len(self.SIZES)
+        for i, fm in enumerate(fms):
+            single = CorsetPattern(CorsetMeasurements.from_full_measurements(fm))
+            points, helpers = batch.subject(i)
+            assert list(points) == list(single.points)
+            for name, p in single.points.items():
+                np.testing.assert_allclose(points[name], p, atol=1e-9)
+            for name, p in single.helper_points.items():
+                np.testing.assert_allclose(helpers[name], p, atol=1e-6)
+
+    def test_sleeve_batch_matches_single(self):
+        sms = [SleeveMeasurements.from_full_measurements(default_measurements(size)) for size in self.SIZES]
+        batch = SleevePattern.draft_batch(sms)
+        for i, sm in enumerate(sms):
+            single = SleevePattern(sm)
+            points, helpers = batch.subject(i)
+            assert set(points) == set(single.points)
+            for name, p in single.points.items():
+                np.testing.assert_allclose(points[name], p, atol=1e-9)
+            for name, p in single.helper_points.items():
+                np.testing.assert_allclose(helpers[name], p, atol=1e-9)
+
+    def test_sleeve_cap_beziers_batch(self):
+        from app.modelist.sleeve import cap_beziers
+
+        sms = [SleeveMeasurements.from_full_measurements(default_measurements(size)) for size in self.SIZES]
+        batch = SleevePattern.draft_batch(sms)
+        caps = cap_beziers(batch.points)
+        assert caps.shape == (len(self.SIZES), 6, 4, 2)
+        for i, sm in enumerate(sms):
+            np.testing.assert_allclose(caps[i], SleevePattern(sm).cap_beziers(), atol=1e-9)
+
+
+class TestUnsolvableArmhole:
+    def test_reported_with_bounded_handle(self):
+        from app.core.diagnostics import collect
+
+        with collect() as diagnostics:
+            pattern = CorsetPattern(CorsetMeasurements.from_full_measurements(default_measurements(48)))
+        assert any("K1" in message for message in diagnostics)
+        K, K1, C1 = (pattern.helper_points.get(n, pattern.points.get(n)) for n in ("K", "K1", "C1"))
+        assert np.linalg.norm(K1 - K) == pytest.approx(np.linalg.norm(C1 - K) / 3)
+        size_46 = CorsetPattern(CorsetMeasurements.from_full_measurements(default_measurements(46)))
+        for piece, cut in pattern.cut_lines().items():
+            assert abs(signed_area(cut)) > abs(signed_area(size_46.cut_lines()[piece]))
+
+
+class TestStretchViews:
+    def _pattern(self):
+        return SleevePattern(SleeveMeasurements.from_full_measurements(default_measurements(38)))
+
+    def test_with_stretch_leaves_base_unchanged(self):
+        base = self._pattern()
+        before = base.table.coords.copy()
+        svg = base.render_svg("pattern")
+        child = base.with_stretch(horizontal=0.4, usage=0.5)
+        np.testing.assert_array_equal(base.table.coords, before)
+        assert not base.stretched and child.stretched
+        assert child.points['B'][0] == pytest.approx(base.points['B'][0] / 1.2)
+        assert base.render_svg("pattern") == svg
+        assert child.render_svg("pattern") != svg
+
+    def test_with_stretch_matches_in_place_stretch(self):
+        child = self._pattern().with_stretch(0.3, 0.2, 0.5)
+        stretched = self._pattern()
+        stretched.stretch(0.3, 0.2, 0.5)
+        assert child.render_svg("construction") == stretched.render_svg("construction")
+
+    def test_stretched_coords_batch(self):
+        base = self._pattern()
+        coords = base.stretched_coords([0.0, 0.2, 0.4], [0.1, 0.0, 0.3], 0.5)
+        assert coords.shape == (3, len(base.table), 2)
+        for k, (h, v) in enumerate([(0.0, 0.1), (0.2, 0.0), (0.4, 0.3)]):
+            np.testing.assert_allclose(coords[k], base.with_stretch(h, v, 0.5).table.coords)
+
+
+class TestIncrementalDrafting:
+    def _corset(self):
+        return CorsetPattern(CorsetMeasurements.from_full_measurements(default_measurements(38)))
+
+    def test_control_parameter_moves_its_helpers_only(self):
+        base = self._corset()
+        child = base.with_changes(armhole_curve=0.5)
+        assert child.changed_points == {'C11', 'C12', 'K1', 'K2'}
+        assert child.drafting.evaluations == 4
+        assert base.b.armhole_curve == 0.4 and child.b.armhole_curve == 0.5
+
+    @pytest.mark.parametrize("change", [{'armhole_curve': 0.5}, {'shoulder_length': 13.0}, {'full_hip': 99.0}])
+    def test_matches_full_draft(self, change):
+        base = self._corset()
+        child = base.with_changes(**change)
+        m = CorsetMeasurements(**{**vars(base.m), **{k: v for k, v in change.items() if hasattr(base.m, k)}})
+        b = type(base.b)(**{**vars(base.b), **{k: v for k, v in change.items() if hasattr(base.b, k)}})
+        np.testing.assert_array_equal(child.table.coords, CorsetPattern(m, b).table.coords)
+        moved = np.any(child.table.coords != base.table.coords, axis=1)
+        assert {n for n, m in zip(child.table.names, moved) if m} == child.changed_points
+
+    def test_measurement_change_on_stretched_sleeve(self):
+        base = SleevePattern(SleeveMeasurements.from_full_measurements(default_measurements(38)))
+        child = base.with_stretch(0.2).with_changes(sleeve_length=65.0)
+        assert child.changed_points == {'C', 'D', 'F', 'F1', 'F2'}
+        expected = base.with_changes(sleeve_length=65.0).with_stretch(0.2)
+        np.testing.assert_allclose(child.table.coords, expected.table.coords)
+        assert child.render_svg() == expected.render_svg()
+
+    def test_unknown_name(self):
+        with pytest.raises(ValueError, match="Unknown measurements"):
+            self._corset().with_changes(sleeve_length=65.0)
+
+
+class TestCurveMetrics:
+    def test_corset_armhole_lengths(self):
+        pattern = CorsetPattern(CorsetMeasurements.from_full_measurements(default_measurements(38)))
+        lengths = pattern.armhole_lengths()
+        for name, seg in (("front", "front_armhole_C1_K"), ("back", "back_armhole_C1_K")):
+            ctrl = pattern.bezier_segments()[seg]
+            chord = np.linalg.norm(ctrl[3] - ctrl[0])
+            polygon = np.linalg.norm(np.diff(ctrl, axis=0), axis=1).sum()
+            assert chord < lengths[name] <= polygon
+
+    def test_curves_are_named_like_outline_edges(self):
+        pattern = CorsetPattern(CorsetMeasurements.from_full_measurements(default_measurements(38)))
+        edges = {name for outline in pattern.outlines().values() for name in outline.names}
+        assert set(pattern.curve_lengths()) <= edges
+        with collect() as diagnostics:
+            pattern.with_seam_allowance(1.0, {"front_armhole_C1_K": 2.0}).cut_lines()
+        assert diagnostics == []
+
+    def test_sleeve_cap_length(self):
+        pattern = SleevePattern(SleeveMeasurements.from_full_measurements(default_measurements(38)))
+        cap = pattern.cap_length()
+        # The curve is longer than the straight-segment control through its knots
+        assert cap > pattern.sleeve_cap_control
+        assert cap == pytest.approx(sum(pattern.curve_lengths().values()))
+        assert len(pattern.bezier_segments()) == 6
+
+    def test_stretch_shortens_curves(self):
+        base = CorsetPattern(CorsetMeasurements.from_full_measurements(default_measurements(38)))
+        stretched = base.with_stretch(horizontal=0.3)
+        for name, length in stretched.curve_lengths().items():
+            assert length <= base.curve_lengths()[name] + 1e-12
+
+
+class TestSeamAllowance:
+    @pytest.fixture(params=["corset", "sleeve"])
+    def pattern(self, request):
+        fm = default_measurements(38)
+        if request.param == "corset":
+            return CorsetPattern(CorsetMeasurements.from_full_measurements(fm))
+        return SleevePattern(SleeveMeasurements.from_full_measurements(fm))
+
+    def test_cut_line_encloses_stitch_line(self, pattern):
+        cuts = pattern.cut_lines()
+        assert set(cuts) == set(pattern.outlines())
+        for piece, outline in pattern.outlines().items():
+            stitch = flatten_path(outline.ctrl)
+            assert abs(signed_area(cuts[piece])) > abs(signed_area(stitch))
+            # Every cut point lies at least the allowance away from the stitch line
+            a, ab = stitch[:-1], np.diff(stitch, axis=0)
+            ap = cuts[piece][:, None, :] - a
+            u = np.clip((ap * ab).sum(-1) / (ab * ab).sum(-1), 0, 1)
+            distance = np.linalg.norm(ap - u[..., None] * ab, axis=-1).min(axis=1)
+            assert distance.min() == pytest.approx(pattern.seam_allowance, abs=0.01)
+
+    def test_with_seam_allowance(self, pattern):
+        assert pattern.with_seam_allowance(pattern.seam_allowance) is pattern
+        assert pattern.with_seam_allowance(0).cut_lines() == {}
+        wider = pattern.with_seam_allowance(2.0, {"hem": 4.0})
+        assert wider.table is pattern.table
+        assert "<polyline" in pattern.render_svg("pattern")
+        assert "<polyline" not in pattern.with_seam_allowance(0).render_svg("pattern")
+        for piece, cut in wider.cut_lines().items():
+            assert abs(signed_area(cut)) > abs(signed_area(pattern.cut_lines()[piece]))
+
+
+class TestGeometryDelta:
+    @staticmethod
+    def _geometry(pattern, version):
+        from app.modelist.geometry import pattern_geometry
+        from app.schemas.patterns import PatternType
+
+        return pattern_geometry(PatternType.corset, pattern.with_seam_allowance(1.0), version)
+
+    @pytest.fixture
+    def pattern(self):
+        return CorsetPattern(CorsetMeasurements.from_full_measurements(default_measurements(38)))
+
+    def test_only_changes_are_sent(self, pattern):
+        from app.modelist.geometry import geometry_delta
+
+        base = self._geometry(pattern, "v1")
+        new = self._geometry(pattern.with_changes(armhole_curve=0.5), "v2")
+        delta = geometry_delta(base, new)
+        assert (delta.base_version, delta.geometry_version) == ("v1", "v2")
+        assert delta.points.names == [] and delta.removed_points == []
+        assert set(delta.helper_points.names) == {"C11", "C12", "K1", "K2"}
+        pieces = {piece.name: piece for piece in delta.pieces}
+        assert all(name.startswith(("front_armhole", "back_armhole")) for p in pieces.values() for name in p.edges.names)
+        assert len(pieces["front"].edges.ctrl) == 8 * len(pieces["front"].edges.names)
+        assert pieces["front"].edge_order is None and pieces["front"].transform is None
+        splice = pieces["front"].cut_splice
+        assert pieces["front"].cut_line is None and 0 < splice.deleted < len(base.pieces[0].cut_line.coords) // 2
+        cut = np.reshape(base.pieces[0].cut_line.coords, (-1, 2)).tolist()
+        cut[splice.start:splice.start + splice.deleted] = np.reshape(splice.coords, (-1, 2)).tolist()
+        assert np.ravel(cut).tolist() == new.pieces[0].cut_line.coords
+
+    def test_identical_geometry_gives_empty_delta(self, pattern):
+        from app.modelist.geometry import geometry_delta
+
+        geometry = self._geometry(pattern, "v1")
+        delta = geometry_delta(geometry, geometry)
+        assert delta.points.names == [] and delta.helper_points.names == [] and delta.pieces == []
+
+    def test_removed_cut_line(self, pattern):
+        from app.modelist.geometry import geometry_delta, pattern_geometry
+        from app.schemas.patterns import PatternType
+
+        base = self._geometry(pattern, "v1")
+        new = pattern_geometry(PatternType.corset, pattern.with_seam_allowance(0.0), "v2")
+        delta = geometry_delta(base, new)
+        assert {piece.name for piece in delta.pieces} == {"front", "back"}
+        assert all(piece.cut_line.coords == [] and piece.edges.names == [] for piece in delta.pieces)
+
+
+class TestGeometryHistory:
+    def test_keeps_recent_versions_per_session(self):
+        from app.modelist.geometry import GeometryHistory
+
+        history = GeometryHistory(max_bytes=1000, versions_per_session=2)
+        for version in ("a", "b", "c"):
+            history.remember("s1", version, version.encode() * 10)
+        assert history.get("s1", "a") is None
+        assert history.get("s1", "c") == b"c" * 10
+        assert history.get("s2", "c") is None
+
+    def test_byte_budget_drops_least_recent_session(self):
+        from app.modelist.geometry import GeometryHistory
+
+        history = GeometryHistory(max_bytes=250)
+        history.remember("s1", "a", b"x" * 100)
+        history.remember("s2", "a", b"y" * 100)
+        history.get("s1", "a")
+        history.remember("s3", "a", b"z" * 100)
+        assert history.get("s2", "a") is None
+        assert history.get("s1", "a") is not None
+        assert history.stats().evictions == 1
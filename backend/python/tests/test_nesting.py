@@ -0,0 +1,88 @@
+"""Tests for the marker nesting engine."""
+
+import numpy as np
+import pytest
+
+from app.core.nesting import NestPiece, nest, rasterize
+from app.core.seam import signed_area
+
+
+def _rect(w, h, x0=0.0, y0=0.0):
+    return np.array([[x0, y0], [x0 + w, y0], [x0 + w, y0 + h], [x0, y0 + h]], dtype=float)
+
+
+def _boxes_disjoint(marker, gap=0.0):
+    boxes = [(p.polygon.min(axis=0), p.polygon.max(axis=0)) for p in marker.placements]
+    for i, (lo1, hi1) in enumerate(boxes):
+        for lo2, hi2 in boxes[i + 1:]:
+            if np.all(lo1 < hi2 + gap) and np.all(lo2 < hi1 + gap):
+                return False
+    return True
+
+
+class TestRasterize:
+    def test_rectangle(self):
+        mask = rasterize(_rect(4, 2, 10, 10), 1.0)
+        assert mask.shape == (3, 5)
+        assert mask.all()
+
+    def test_triangle_interior_and_boundary(self):
+        mask = rasterize(np.array([[0, 0], [10, 0], [0, 10]]), 1.0)
+        assert mask[0].all()
+        assert mask[:, 0].all()
+        assert not mask[9, 9]
+        assert mask.sum() < mask.size
+
+    def test_pad(self):
+        assert rasterize(_rect(4, 2), 1.0, pad=2).shape == (7, 9)
+
+
+class TestNest:
+    def test_rectangles(self):
+        # Grain (drafting y) runs along the roll: each piece is 20 long, 10 across
+        pieces = [NestPiece(f"p{i}", _rect(10, 20)) for i in range(6)]
+        marker = nest(pieces, 34.0, resolution=1.0, time_budget=0)
+        assert len(marker.placements) == 6
+        assert _boxes_disjoint(marker)
+        for p in marker.placements:
+            assert p.polygon[:, 1].min() >= 0 and p.polygon[:, 1].max() <= 34.0
+            assert np.ptp(p.polygon[:, 0]) == pytest.approx(20)
+        assert marker.length <= 42
+        assert marker.utilization == pytest.approx(6 * 200 / (34 * marker.length))
+
+    def test_orientations(self):
+        piece = np.array([[0, 0], [6, 0], [1, 12], [0, 12]], dtype=float)
+        fixed = nest([NestPiece("a", piece, allow_turn=False) for _ in range(4)], 20.0, resolution=0.5, time_budget=0)
+        assert not any(p.turned or p.mirrored for p in fixed.placements)
+        free = nest([NestPiece("a", piece, allow_mirror=True) for _ in range(4)], 20.0, resolution=0.5, time_budget=0)
+        assert free.length <= fixed.length
+        for p in free.placements:
+            assert abs(signed_area(p.polygon)) == pytest.approx(abs(signed_area(piece)))
+
+    def test_gap(self):
+        pieces = [NestPiece(f"p{i}", _rect(5, 5)) for i in range(8)]
+        marker = nest(pieces, 20.0, resolution=0.5, gap=2.0, time_budget=0)
+        assert _boxes_disjoint(marker, gap=2.0 - 1e-9)
+
+    def test_time_budget_and_seed(self):
+        rng = np.random.default_rng(1)
+        pieces = [NestPiece(f"p{i}", _rect(*rng.uniform(3, 12, size=2))) for i in range(12)]
+        first = nest(pieces, 30.0, resolution=1.0, time_budget=0)
+        assert first.attempts == 1
+        improved = nest(pieces, 30.0, resolution=1.0, time_budget=0.5)
+        assert improved.length <= first.length
+        assert improved.seconds < 2.0
+
+    def test_time_limit_coarsens_first_pass(self):
+        from app.core.diagnostics import collect
+
+        pieces = [NestPiece(f"p{i}", _rect(6, 4)) for i in range(6)]
+        with collect() as diagnostics:
+            marker = nest(pieces, 40.0, resolution=0.5, time_budget=0, time_limit=0)
+        assert marker.resolution == 4.0
+        assert len(marker.placements) == 6 and _boxes_disjoint(marker)
+        assert len(diagnostics) == 3 and "4 cm resolution" in diagnostics[-1]
+
+    def test_piece_wider_than_fabric(self):
+        with pytest.raises(ValueError, match="wider"):
+            nest([NestPiece("wide", _rect(40, 10))], 30.0)
@@ -0,0 +1,104 @@
+"""Tests for the declarative point dependency graph."""
+
+import numpy as np
+import pytest
+
+from app.core.point_graph import PointGraph
+
+
+def _graph():
+    graph = PointGraph()
+
+    @graph.point('A', 'width')
+    def _a(width):
+        return np.stack([width, np.zeros_like(width)], axis=-1)
+
+    @graph.node('half', 'height')
+    def _half(height):
+        """Half the height"""
+        return height / 2
+
+    @graph.point('B', 'A', 'half')
+    def _b(A, half):
+        """Above A by half the height"""
+        return A + np.stack([np.zeros_like(half), half], axis=-1)
+
+    @graph.helper('C', 'B', 'bend')
+    def _c(B, bend):
+        return B * np.sign(bend)
+
+    return graph
+
+
+INPUTS = {'width': np.array([2.0]), 'height': np.array([4.0]), 'bend': np.array([1.0])}
+
+
+class TestPointGraph:
+    def test_evaluate(self):
+        drafting = _graph().evaluate(INPUTS)
+        assert list(drafting.points()) == ['A', 'B']
+        assert list(drafting.helper_points()) == ['C']
+        np.testing.assert_array_equal(drafting['B'], [[2.0, 2.0]])
+        assert drafting.evaluations == 4
+
+    def test_inputs_and_dependencies(self):
+        graph = _graph()
+        assert graph.inputs == {'width', 'height', 'bend'}
+        assert graph.upstream('B') == {'A', 'half', 'width', 'height'}
+        assert graph.downstream(['height']) == {'half', 'B', 'C'}
+        assert graph.derivation('B') == "B: Above A by half the height [from A, half]"
+
+    def test_missing_input(self):
+        with pytest.raises(ValueError, match="Missing drafting inputs"):
+            _graph().evaluate({'width': np.array([1.0])})
+
+    def test_declaration_order(self):
+        graph = PointGraph()
+        graph.point('B', 'A')(lambda A: A)
+        with pytest.raises(ValueError, match="after a node using it"):
+            graph.point('A', 'x')(lambda x: x)
+        with pytest.raises(ValueError, match="declared twice"):
+            graph.point('B', 'x')(lambda x: x)
+
+
+class TestUpdate:
+    def test_recomputes_downstream_only(self):
+        base = _graph().evaluate(INPUTS)
+        drafting = base.update({'height': np.array([6.0])})
+        assert drafting.changed == {'half', 'B', 'C'}
+        assert drafting.changed_points() == {'B', 'C'}
+        assert drafting.evaluations == 3
+        np.testing.assert_array_equal(drafting['C'], [[2.0, 3.0]])
+        np.testing.assert_array_equal(base['C'], [[2.0, 2.0]])
+
+    def test_stops_at_unchanged_values(self):
+        drafting = _graph().evaluate(INPUTS).update({'bend': np.array([3.0])})
+        assert drafting.evaluations == 1
+        assert drafting.changed == set()
+
+    def test_diagnostics_are_kept_per_node(self):
+        from app.core.diagnostics import collect, report
+
+        graph = _graph()
+
+        @graph.node('check', 'width')
+        def _check(width):
+            if np.any(width > 1):
+                report("wide")
+            return width
+
+        with collect() as messages:
+            base = graph.evaluate(INPUTS)
+            kept = base.update({'height': np.array([6.0])})
+            cleared = base.update({'width': np.array([1.0])})
+        assert messages == ["wide", "wide"]
+        assert kept.evaluations == 3 and kept.diagnostics() == ("wide",)
+        assert cleared.diagnostics() == ()
+
+    def test_same_input_is_ignored(self):
+        drafting = _graph().evaluate(INPUTS).update({'width': np.array([2.0])})
+        assert drafting.evaluations == 0
+
+    def test_unknown_input(self):
+        with pytest.raises(ValueError, match="Unknown drafting input"):
+            _graph().evaluate(INPUTS).update({'B': np.zeros((1, 2))})
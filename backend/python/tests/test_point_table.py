@@ -0,0 +1,65 @@
+"""Unit tests for the structure-of-arrays point table."""
+
+import numpy as np
+import pytest
+
+from app.core.point_table import PointTable
+
+
+def _table() -> PointTable:
+    t = PointTable(capacity=2)
+    t.points['A'] = (0.0, 0.0)
+    t.points['B'] = (4.0, -2.0)
+    t.helper_points['A1'] = (1.0, 3.0)
+    t.points['C'] = (-1.0, 5.0)
+    return t
+
+
+class TestPointTable:
+    def test_views_keep_insertion_order(self):
+        t = _table()
+        assert list(t.points) == ['A', 'B', 'C']
+        assert list(t.helper_points) == ['A1']
+        assert len(t) == 4
+        assert t.coords.shape == (4, 2)
+        assert 'A1' not in t.points
+        with pytest.raises(KeyError):
+            t.points['A1']
+
+    def test_rows_are_views(self):
+        t = _table()
+        t.points['B'][0] *= 2
+        assert t.coords[t.index('B')][0] == 8.0
+
+    def test_flag_conflict(self):
+        t = _table()
+        with pytest.raises(ValueError):
+            t.helper_points['A'] = (0, 0)
+
+    def test_delete(self):
+        t = _table()
+        del t.points['B']
+        assert list(t.points) == ['A', 'C']
+        np.testing.assert_array_equal(t.points['C'], [-1.0, 5.0])
+        np.testing.assert_array_equal(t.helper_points['A1'], [1.0, 3.0])
+
+    def test_scale_and_bounds(self):
+        t = _table()
+        t.scale(0.5, 2.0)
+        np.testing.assert_allclose(t.points['B'], [2.0, -4.0])
+        np.testing.assert_allclose(t.helper_points['A1'], [0.5, 6.0])
+        assert t.bounds() == (-0.5, 2.0, -4.0, 10.0)
+        assert t.bounds(helper=True) == (0.5, 0.5, 6.0, 6.0)
+
+    def test_transform_subset(self):
+        t = _table()
+        t.transform(((0, -1), (1, 0)), (10, 0), helper=True)
+        np.testing.assert_allclose(t.helper_points['A1'], [7.0, 1.0])
+        np.testing.assert_allclose(t.points['B'], [4.0, -2.0])
+
+    def test_mirrored_is_a_copy(self):
+        t = _table()
+        back = t.mirrored(5.0)
+        np.testing.assert_allclose(back.points['B'], [1.0, -2.0])
+        np.testing.assert_allclose(t.points['B'], [4.0, -2.0])
+        assert list(back.helper_points) == ['A1']
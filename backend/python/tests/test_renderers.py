@@ -0,0 +1,133 @@
+"""Unit tests for the SVG and PDF rendering backends."""
+
+import re
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+from app.core.pdf_renderer import PDFRenderer
+from app.core.svg_renderer import CompactSVGRenderer, SVGRenderer, format_numbers
+from app.modelist.sleeve import SleeveMeasurements, SleevePattern
+
+SVG = "{http://www.w3.org/2000/svg}"
+
+
+def _content(renderer: PDFRenderer) -> str:
+    renderer.pdf.set_compression(False)
+    return renderer.to_pdf().decode("latin-1")
+
+
+def _path_vertices(d: str) -> list[list[float]]:
+    """End points of every command of a path made of M, m, l, h, v, c and z."""
+    tokens = re.findall(r"[Mmlhvcz]|-?(?:\d+\.?\d*|\.\d+)", d)
+    vertices, position, start, i = [], np.zeros(2), np.zeros(2), 0
+    letter = None
+    while i < len(tokens):
+        if tokens[i].isalpha():
+            letter, i = tokens[i], i + 1
+            if letter == "z":
+                position = start.copy()
+                continue
+        arity = {"M": 2, "m": 2, "l": 2, "h": 1, "v": 1, "c": 6}[letter]
+        values = np.array(tokens[i:i + arity], dtype=float)
+        i += arity
+        if letter == "M":
+            position = values
+        elif letter == "h":
+            position = position + [values[0], 0]
+        elif letter == "v":
+            position = position + [0, values[0]]
+        else:
+            position = position + values[-2:]
+        if letter in "Mm":
+            start = position.copy()
+        vertices.append(position.tolist())
+    return vertices
+
+
+class TestCompactSVGRenderer:
+    BOUNDS = (0, 20, 0, 20)
+
+    def test_format_numbers(self):
+        values = [0, 0.05, -0.05, 0.5, -1, 123.45, 2.999, -0.001]
+        assert format_numbers(values) == ["0", ".05", "-.05", ".5", "-1", "123.45", "3", "0"]
+        assert format_numbers([1.25, 0.04], precision=1) == ["1.2", "0"]
+
+    def test_path_keeps_end_points(self):
+        r = CompactSVGRenderer(self.BOUNDS, precision=2)
+        r.bezier((1, 1), (2, 5), (6, 5), (8, 1), color="blue")
+        r.line(8, 1, 8, 10, color="blue")
+        r.polyline([(8, 10), (4.123, 12), (1, 10)], color="blue")
+        root = ET.fromstring(r.to_svg())
+        paths = root.findall(f"{SVG}path")
+        assert len(paths) == 1
+        expected = np.array([(1, 1), (8, 1), (8, 10), (4.123, 12), (1, 10)]) * 10
+        np.testing.assert_allclose(_path_vertices(paths[0].get("d")), expected, atol=0.005)
+
+    def test_repeated_and_mirrored_paths_are_references(self):
+        r = CompactSVGRenderer(self.BOUNDS)
+        shape = np.array([(0, 0), (3, 0), (4, 2), (1, 3), (0, 0)])
+        # Labels between the pieces, as on a marker, keep them separate paths
+        r.polyline(shape + (2, 2))
+        r.text(3, 3, "A")
+        r.polyline(shape + (10, 2))
+        r.text(11, 3, "B")
+        r.polyline(shape * (-1, 1) + (18, 10))
+        root = ET.fromstring(r.to_svg())
+        (path,) = root.findall(f"{SVG}path")
+        shifted, mirrored = root.findall(f"{SVG}use")
+        assert shifted.get("href") == mirrored.get("href") == "#" + path.get("id")
+        assert (shifted.get("x"), shifted.get("y")) == ("80", "0")
+        # matrix(-1 0 0 1 tx ty) puts the first point (20, 20) on (180, 100)
+        _, _, _, _, tx, ty = map(float, mirrored.get("transform")[7:-1].split())
+        assert (-20 + tx, 20 + ty) == (180, 100)
+
+    def test_smaller_than_plain_with_content_derived_classes(self):
+        pattern = SleevePattern(SleeveMeasurements(armhole_depth=19.5, armhole_measurement=45))
+        for variant in ("construction", "pattern"):
+            plain = pattern.render(SVGRenderer, variant).to_svg()
+            compact = pattern.render(CompactSVGRenderer, variant).to_svg()
+            root = ET.fromstring(compact)
+            assert len(compact) < 0.7 * len(plain)
+            classes = {el.get("class") for el in root.iter() if el.get("class")}
+            assert classes and all(re.fullmatch(r"[st][0-9a-f]{4}", name) for name in classes)
+            assert all(f".{name}{{" in root.find(f"{SVG}style").text for name in classes)
+
+
+class TestPDFRenderer:
+    BOUNDS = (0, 20, 0, 20)
+
+    def test_bezier_uses_native_curve(self):
+        r = PDFRenderer(self.BOUNDS)
+        r.bezier((1, 1), (2, 5), (6, 5), (8, 1))
+        content = _content(r)
+        assert len(re.findall(r" c\b", content)) == 1
+        assert len(re.findall(r" l\b", content)) == 0
+
+    def test_connected_segments_share_one_path(self):
+        r = PDFRenderer(self.BOUNDS)
+        r.bezier((1, 1), (2, 5), (6, 5), (8, 1), color='blue')
+        r.line(8, 1, 8, 10, color='blue')
+        r.polyline([(8, 10), (4, 12), (1, 10)], color='blue')
+        content = _content(r)
+        assert content.count(" S") == 1
+        assert content.count(" m ") == 1
+
+    def test_style_change_starts_new_path(self):
+        r = PDFRenderer(self.BOUNDS)
+        r.line(1, 1, 5, 1, color='blue')
+        r.line(5, 1, 5, 5, color='green')
+        assert _content(r).count(" S") == 2
+
+    def test_sampled_curves(self):
+        r = PDFRenderer(self.BOUNDS, curve_tolerance="preview")
+        r.bezier((1, 1), (2, 5), (6, 5), (8, 1))
+        content = _content(r)
+        assert len(re.findall(r" l\b", content)) == 9
+        assert len(re.findall(r" c\b", content)) == 0
+
+    def test_text_width_cache(self):
+        r = PDFRenderer(self.BOUNDS)
+        r.text(5, 5, "label", ha='center')
+        r.text(6, 6, "label", ha='center')
+        assert len(r._text_widths) == 1
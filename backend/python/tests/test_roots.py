@@ -0,0 +1,76 @@
+"""Unit tests for the bracketed root finders."""
+
+import numpy as np
+import pytest
+
+from app.core.roots import brent, illinois, reset_solver_stats, solver_stats
+from app.core.utils import dichotomic_search
+
+
+def cubic(x):
+    return x**3 - 2 * x - 5
+
+
+ROOT = 2.0945514815423265
+
+
+class TestBrent:
+    def test_converges(self):
+        result = brent(cubic, 2.0, 3.0)
+        assert result.converged
+        assert result.root == pytest.approx(ROOT, abs=1e-10)
+
+    def test_fewer_evaluations_than_bisection(self):
+        calls = []
+
+        def counted(x):
+            calls.append(x)
+            return cubic(x)
+
+        dichotomic_search(counted, 2.0, 3.0)
+        result = brent(cubic, 2.0, 3.0)
+        assert result.evaluations < len(calls) / 2
+
+    def test_known_endpoint_values_are_not_recomputed(self):
+        result = brent(cubic, 2.0, 3.0, fa=cubic(2.0), fb=cubic(3.0))
+        plain = brent(cubic, 2.0, 3.0)
+        assert result.evaluations == plain.evaluations - 2
+
+    def test_unbracketed_raises(self):
+        with pytest.raises(ValueError):
+            brent(cubic, 3.0, 4.0)
+
+
+class TestIllinois:
+    def test_scalar(self):
+        result = illinois(cubic, 2.0, 3.0)
+        assert isinstance(result.root, float)
+        assert result.root == pytest.approx(ROOT, abs=1e-9)
+
+    def test_array_mode(self):
+        c = np.linspace(1.0, 100.0, 5000)
+        result = illinois(lambda x: x**2 - c, 0.0, 200.0)
+        assert result.root.shape == c.shape
+        assert result.converged.all()
+        np.testing.assert_allclose(result.root, np.sqrt(c), atol=1e-8)
+        # One vectorized call of f per iteration, plus the two endpoints
+        assert result.evaluations == result.iterations + 2
+
+    def test_unbracketed_entries_not_converged(self):
+        c = np.array([4.0, -1.0])
+        result = illinois(lambda x: x**2 - c, 0.0, 10.0)
+        assert result.converged.tolist() == [True, False]
+        assert result.root[0] == pytest.approx(2.0)
+        assert result.root[1] == 0.0
+
+    def test_iteration_budget(self):
+        result = illinois(cubic, 2.0, 3.0, maxiter=2)
+        assert not result.converged
+        assert result.iterations == 2
+
+    def test_stats(self):
+        reset_solver_stats()
+        illinois(cubic, 2.0, 3.0)
+        stats = solver_stats()["illinois"]
+        assert stats.solves == 1
+        assert stats.evaluations > 2
@@ -0,0 +1,128 @@
+"""Tests for the seam allowance offset engine."""
+
+import numpy as np
+import pytest
+
+from app.core.seam import Outline, offset_outline, remove_self_intersections, signed_area
+
+SQUARE = {
+    "bottom": [[0, 0], [10, 0]],
+    "right": [[10, 0], [10, 10]],
+    "top": [[10, 10], [0, 10]],
+    "left": [[0, 10], [0, 0]],
+}
+# L-shaped piece with one concave corner at (4, 4)
+ELL = {
+    "hem": [[0, 0], [10, 0]],
+    "side": [[10, 0], [10, 4]],
+    "step_a": [[10, 4], [4, 4]],
+    "step_b": [[4, 4], [4, 10]],
+    "top": [[4, 10], [0, 10]],
+    "center": [[0, 10], [0, 0]],
+}
+
+
+def _reverse(edges):
+    return {name: np.asarray(points)[::-1] for name, points in reversed(list(edges.items()))}
+
+
+class TestOutline:
+    def test_lines_become_cubics(self):
+        outline = Outline.from_edges(SQUARE)
+        assert outline.ctrl.shape == (4, 4, 2)
+        np.testing.assert_allclose(outline.ctrl[0, 1], [10 / 3, 0])
+
+    def test_open_chain_raises(self):
+        with pytest.raises(ValueError, match="not closed"):
+            Outline.from_edges({"a": [[0, 0], [1, 0]], "b": [[1, 0], [1, 1]]})
+
+    def test_allowance_overrides(self):
+        outline = Outline.from_edges({
+            "front_hem_A_A1": [[0, 0], [1, 0]],
+            "front_side_A1_B1": [[1, 0], [1, 1]],
+            "front_center_B1_A": [[1, 1], [0, 0]],
+        })
+        allowance = outline.allowances(1.0, {"hem": 3.0, "front_center_B1_A": 0.0, "front": 2.0})
+        assert allowance.tolist() == [3.0, 2.0, 0.0]
+
+    def test_matched_overrides(self):
+        outline = Outline.from_edges({
+            "front_hem_A_A1": [[0, 0], [1, 0]],
+            "front_side_A1_B1": [[1, 0], [1, 1]],
+            "front_center_B1_A": [[1, 1], [0, 0]],
+        })
+        overrides = {"hem": 3.0, "front_center_B1_A": 0.0, "hemline": 2.0, "sleeve": 1.0}
+        assert outline.matched(overrides) == {"hem", "front_center_B1_A"}
+
+
+class TestOffsetOutline:
+    @pytest.mark.parametrize("join, area", [("miter", 144.0), ("square", 144.0), ("bevel", 142.0)])
+    def test_square_joins(self, join, area):
+        cut = offset_outline(Outline.from_edges(SQUARE), 1.0, join=join)
+        assert signed_area(cut) == pytest.approx(area)
+
+    def test_orientation_is_kept(self):
+        cut = offset_outline(Outline.from_edges(_reverse(SQUARE)), 1.0)
+        assert signed_area(cut) == pytest.approx(-144.0)
+
+    def test_concave_corner_loop_removed(self):
+        for edges in (ELL, _reverse(ELL)):
+            cut = offset_outline(Outline.from_edges(edges), 1.0)
+            assert abs(signed_area(cut)) == pytest.approx(108.0)
+            assert [5, 5] in np.round(cut, 9).tolist()
+
+    def test_per_edge_allowance(self):
+        outline = Outline.from_edges(SQUARE)
+        cut = offset_outline(outline, outline.allowances(1.0, {"bottom": 3.0, "left": 0.0}))
+        lo, hi = cut.min(axis=0), cut.max(axis=0)
+        np.testing.assert_allclose([lo, hi], [[0, -3], [11, 11]])
+
+    def test_curve_distance(self):
+        # Quarter-circle-like bulge: every cut point is 1.5 cm from the stitch line
+        kappa = 4 * (np.sqrt(2) - 1) / 3
+        outline = Outline.from_edges({
+            "arc": [[10, 0], [10, 10 * kappa], [10 * kappa, 10], [0, 10]],
+            "left": [[0, 10], [0, 0]],
+            "bottom": [[0, 0], [10, 0]],
+        })
+        cut = offset_outline(outline, 1.5, join="bevel")
+        arc = cut[(cut[:, 0] > 0.5) & (cut[:, 1] > 0.5)]
+        assert np.linalg.norm(arc, axis=1) == pytest.approx(11.5, abs=0.03)
+
+    def test_tight_concave_curve(self):
+        # A notch narrower than twice the allowance must not leave a loop
+        outline = Outline.from_edges({
+            "hem": [[0, 0], [10, 0]],
+            "side": [[10, 0], [10, 10]],
+            "notch": [[10, 10], [6, 10], [5.5, 9], [5, 9]],
+            "notch_b": [[5, 9], [4.5, 9], [4, 10], [0, 10]],
+            "center": [[0, 10], [0, 0]],
+        })
+        cut = offset_outline(outline, 1.0)
+        assert remove_self_intersections(cut).shape == cut.shape
+        assert signed_area(cut) > signed_area(np.array([[0, 0], [10, 0], [10, 10], [0, 10]]))
+
+    def test_zero_allowance_is_stitch_line(self):
+        outline = Outline.from_edges(SQUARE)
+        cut = offset_outline(outline, 0.0)
+        assert signed_area(cut) == pytest.approx(100.0)
+
+    def test_invalid_arguments(self):
+        outline = Outline.from_edges(SQUARE)
+        with pytest.raises(ValueError):
+            offset_outline(outline, 1.0, join="round")
+        with pytest.raises(ValueError):
+            offset_outline(outline, -1.0)
+
+
+class TestRemoveSelfIntersections:
+    def test_bow_tie_keeps_larger_lobe(self):
+        # (0,0)-(4,4) crosses (4,0)-(0,2) at (4/3, 4/3)
+        bow = np.array([[0, 0], [4, 4], [4, 0], [0, 2]], dtype=float)
+        simple = remove_self_intersections(bow, orientation=-1)
+        assert len(simple) == 3
+        assert abs(signed_area(simple)) == pytest.approx(0.5 * (4 - 4 / 3) * 4)
+
+    def test_simple_polygon_unchanged(self):
+        square = np.array([[0, 0], [1, 0], [1, 1], [0, 1]], dtype=float)
+        np.testing.assert_array_equal(remove_self_intersections(square), square)
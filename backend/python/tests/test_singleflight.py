@@ -0,0 +1,120 @@
+"""Tests for single-flight request coalescing."""
+
+import asyncio
+import threading
+from dataclasses import asdict
+
+from fastapi.testclient import TestClient
+
+from app.core.measurements import default_measurements
+from app.core.singleflight import SingleFlight
+from app.main import app
+from app.modelist import router as modelist_router
+
+
+class TestSingleFlight:
+    def test_concurrent_calls_share_one_computation(self):
+        flights = SingleFlight()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return object()
+
+        async def burst():
+            return await asyncio.gather(*(flights.do("k", compute) for _ in range(5)))
+
+        results = asyncio.run(burst())
+        assert len(calls) == 1
+        assert all(r is results[0] for r in results)
+        stats = flights.stats()
+        assert (stats.leaders, stats.coalesced, stats.in_flight) == (1, 4, 0)
+
+    def test_exceptions_are_shared(self):
+        flights = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.02)
+            raise ValueError("bad")
+
+        async def burst():
+            return await asyncio.gather(*(flights.do("k", fail) for _ in range(3)), return_exceptions=True)
+
+        results = asyncio.run(burst())
+        assert all(isinstance(r, ValueError) for r in results)
+        assert flights.stats().leaders == 1
+
+    def test_cancelled_leader_does_not_cancel_followers(self):
+        flights = SingleFlight()
+        calls = []
+
+        async def compute():
+            await asyncio.sleep(0.05)
+            calls.append(1)
+            return "done"
+
+        async def scenario():
+            leader = asyncio.ensure_future(flights.do("k", compute))
+            await asyncio.sleep(0)
+            followers = [asyncio.ensure_future(flights.do("k", compute)) for _ in range(2)]
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            results = await asyncio.gather(*followers)
+            return leader, results
+
+        leader, results = asyncio.run(scenario())
+        assert leader.cancelled()
+        assert results == ["done", "done"]
+        assert len(calls) == 1
+        assert flights.stats().in_flight == 0
+
+    def test_sequential_calls_are_not_coalesced(self):
+        flights = SingleFlight()
+
+        async def compute():
+            return 1
+
+        asyncio.run(flights.do("k", compute))
+        asyncio.run(flights.do("k", compute))
+        assert flights.stats().leaders == 2
+        assert flights.stats().coalesced == 0
+
+
+class TestGenerateCoalescing:
+    def test_identical_requests_generate_once(self, monkeypatch):
+        calls = []
+        run = modelist_router.pool.run
+
+        async def slow_run(req):
+            calls.append(req)
+            await asyncio.sleep(0.3)
+            return await run(req)
+
+        monkeypatch.setattr(modelist_router.pool, "run", slow_run)
+        request = {
+            "pattern_type": "sleeve",
+            "measurements": asdict(default_measurements(44)),
+            "control_parameters": {"h3_perpendicular": 1.75},
+            "output_format": "svg",
+        }
+        before = modelist_router.in_flight.stats()
+        barrier = threading.Barrier(4)
+        responses = []
+
+        def post():
+            client = TestClient(app)
+            barrier.wait()
+            responses.append(client.post("/api/modelist/generate", json=request))
+
+        threads = [threading.Thread(target=post) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        after = modelist_router.in_flight.stats()
+        assert len(calls) == 1
+        assert after.coalesced - before.coalesced == 3
+        assert {r.status_code for r in responses} == {200}
+        assert len({r.content for r in responses}) == 1
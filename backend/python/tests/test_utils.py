@@ -0,0 +1,93 @@
+"""Unit tests for the spline and tridiagonal utilities."""
+
+import numpy as np
+import pytest
+
+from app.core.utils import (
+    cubic_spline_control_points,
+    cubic_spline_to_beziers,
+    solve_cyclic_tridiagonal,
+    solve_tridiagonal,
+)
+
+
+def bezier_point(seg, t):
+    return ((1 - t)**3 * seg[0] + 3 * (1 - t)**2 * t * seg[1]
+            + 3 * (1 - t) * t**2 * seg[2] + t**3 * seg[3])
+
+
+class TestTridiagonal:
+    def test_matches_dense_solve(self):
+        rng = np.random.default_rng(0)
+        n = 8
+        a, c = rng.uniform(0, 1, (2, 3, n))
+        b = 4 + rng.uniform(0, 1, (3, n))
+        d = rng.normal(size=(3, n, 2))
+        x = solve_tridiagonal(a, b, c, d)
+        for k in range(3):
+            dense = np.diag(b[k]) + np.diag(a[k, 1:], -1) + np.diag(c[k, :-1], 1)
+            np.testing.assert_allclose(dense @ x[k], d[k])
+
+    def test_cyclic_matches_dense_solve(self):
+        rng = np.random.default_rng(1)
+        n = 6
+        a, c = rng.uniform(0, 1, (2, n))
+        b = 4 + rng.uniform(0, 1, n)
+        d = rng.normal(size=(n, 1))
+        x = solve_cyclic_tridiagonal(a, b, c, d)
+        dense = np.diag(b) + np.diag(a[1:], -1) + np.diag(c[:-1], 1)
+        dense[0, -1] = a[0]
+        dense[-1, 0] = c[-1]
+        np.testing.assert_allclose(dense @ x, d)
+
+
+class TestCubicSpline:
+    POINTS = np.array([[0.0, 13.0], [4.0, 6.0], [9.0, 4.4], [18.0, 0.0], [27.0, 6.5], [32.0, 8.0], [36.0, 13.0]])
+
+    def test_interpolates_and_is_smooth(self):
+        beziers = cubic_spline_control_points(self.POINTS)
+        assert beziers.shape == (6, 4, 2)
+        np.testing.assert_allclose(beziers[:, 0], self.POINTS[:-1])
+        np.testing.assert_allclose(beziers[:, 3], self.POINTS[1:])
+        # C1 continuity: outgoing and incoming handles are collinear and opposite
+        incoming = beziers[:-1, 3] - beziers[:-1, 2]
+        outgoing = beziers[1:, 1] - beziers[1:, 0]
+        cross = incoming[:, 0] * outgoing[:, 1] - incoming[:, 1] * outgoing[:, 0]
+        np.testing.assert_allclose(cross, 0, atol=1e-9)
+
+    def test_stack_matches_individual(self):
+        stack = np.stack([self.POINTS, self.POINTS * 1.1, self.POINTS + 2])
+        beziers = cubic_spline_control_points(stack)
+        assert beziers.shape == (3, 6, 4, 2)
+        for k in range(3):
+            np.testing.assert_allclose(beziers[k], cubic_spline_control_points(stack[k]))
+
+    def test_list_wrapper(self):
+        segments = cubic_spline_to_beziers(self.POINTS)
+        assert len(segments) == 6
+        assert all(len(seg) == 4 for seg in segments)
+
+    def test_two_points_is_straight_line(self):
+        (seg,) = cubic_spline_control_points([[0, 0], [3, 0]])
+        np.testing.assert_allclose(seg, [[0, 0], [1, 0], [2, 0], [3, 0]])
+
+    def test_clamped_tangents(self):
+        beziers = cubic_spline_control_points(self.POINTS, 'clamped', end_tangents=([0, -1], [0, 1]))
+        start = beziers[0, 1] - beziers[0, 0]
+        end = beziers[-1, 3] - beziers[-1, 2]
+        assert start[0] == pytest.approx(0, abs=1e-12) and start[1] < 0
+        assert end[0] == pytest.approx(0, abs=1e-12) and end[1] > 0
+
+    def test_periodic_closed_circle(self):
+        theta = np.linspace(0, 2 * np.pi, 13)
+        circle = np.stack([np.cos(theta), np.sin(theta)], axis=-1)
+        beziers = cubic_spline_control_points(circle, 'periodic')
+        mid = bezier_point(beziers.transpose(1, 0, 2), 0.5)
+        np.testing.assert_allclose(np.linalg.norm(mid, axis=-1), 1.0, atol=1e-3)
+        start = beziers[0, 1] - beziers[0, 0]
+        end = beziers[-1, 3] - beziers[-1, 2]
+        np.testing.assert_allclose(start / np.linalg.norm(start), end / np.linalg.norm(end), atol=1e-9)
+
+    def test_periodic_requires_closed_curve(self):
+        with pytest.raises(ValueError):
+            cubic_spline_control_points(self.POINTS, 'periodic')
@@ -0,0 +1,166 @@
+"""Tests for batched geometric validation of piece outlines."""
+
+import warnings
+
+import numpy as np
+import pytest
+
+from app.core.measurements import default_measurements
+from app.core.seam import Outline
+from app.core.validation import (
+    control_crossings,
+    curve_intersections,
+    inflected,
+    joint_angles,
+    self_intersections,
+    validate_outline,
+    validate_outlines,
+)
+from app.modelist.corset import CorsetMeasurements, CorsetPattern
+from app.modelist.sleeve import SleeveMeasurements, SleevePattern
+
+# Closed piece: a straight hem and a two-segment side curve smooth at (10, 5)
+PIECE = {
+    "hem_A_B": [[0, 0], [10, 0]],
+    "side_B_C": [[10, 0], [11, 2], [11, 4], [10, 5]],
+    "side_C_D": [[10, 5], [9, 6], [8, 8], [8, 10]],
+    "top_D_E": [[8, 10], [0, 10]],
+    "center_E_A": [[0, 10], [0, 0]],
+}
+
+
+def _checks(issues):
+    return [issue.check for issue in issues]
+
+
+class TestChecks:
+    def test_control_crossings(self):
+        ctrl = np.array([
+            [[0, 0], [1, 1], [2, 1], [3, 0]],    # arch: no crossing
+            [[0, 0], [0, 1], [1, 1], [-1, 2]],   # bends back across the P0-P1 line
+            [[-1, 2], [1, 1], [0, 1], [0, 0]],   # the same, reversed
+            [[0, 0], [1, 0], [2, 0], [3, 0]],    # straight line
+        ], dtype=float)
+        start, end = control_crossings(ctrl)
+        assert start.tolist() == [False, True, False, False]
+        assert end.tolist() == [False, False, True, False]
+
+    def test_inflected(self):
+        ctrl = np.array([
+            [[0, 0], [1, 1], [2, 1], [3, 0]],
+            [[0, 0], [1, 2], [2, -2], [3, 0]],
+            [[0, 0], [1, 0], [2, 0], [3, 0]],
+        ], dtype=float)
+        assert inflected(ctrl).tolist() == [False, True, False]
+
+    def test_self_intersection(self):
+        ctrl = np.array([
+            [[0, 0], [12, 10], [-2, 10], [10, 0]],
+            [[0, 0], [3, 3], [6, 3], [9, 0]],
+        ], dtype=float)
+        hit, st = self_intersections(ctrl)
+        assert hit.tolist() == [True, False]
+        s, t = st[0]
+        assert s == pytest.approx(0.2598, abs=1e-4)
+        assert t == pytest.approx(1 - s)
+
+    def test_curve_intersections(self):
+        a = np.array([[[0, 0], [1, 1], [2, 1], [3, 0]], [[0, 0], [1, 1], [2, 1], [3, 0]]], dtype=float)
+        b = np.array([[[0, 1], [1, 0], [2, 0], [3, 1]], [[0, 2], [1, 2], [2, 2], [3, 2]]], dtype=float)
+        hit, point, undetermined = curve_intersections(a, b)
+        assert hit.tolist() == [True, False] and not undetermined.any()
+        np.testing.assert_allclose(point[0], [0.634, 0.5], atol=2e-3)
+
+    def test_degenerate_pair_does_not_hide_others(self):
+        line = [[0, 0], [1, 0], [2, 0], [3, 0]]
+        a = np.array([line, [[0, 0], [1, 1], [2, 1], [3, 0]], [[0, 0], [1, 1], [2, 1], [3, 0]]], dtype=float)
+        b = np.array([line, [[0, 1], [1, 0], [2, 0], [3, 1]], [[0, 2], [1, 2], [2, 2], [3, 2]]], dtype=float)
+        hit, _, undetermined = curve_intersections(a, b, max_pairs=8)
+        # The collinear overlap is found or flagged; the other pairs are unaffected
+        assert hit[0] or undetermined[0]
+        assert hit.tolist()[1:] == [True, False] and not undetermined[1:].any()
+
+        # Curves 0.01 cm apart along their length: capped, so not reported clean
+        arc = [[0, 0], [1, 1], [2, 1], [3, 0]]
+        near = [[0, 0.01], [1, 1.01], [2, 1.01], [3, 0.01]]
+        hit, _, undetermined = curve_intersections([arc], [near], max_pairs=8)
+        assert not hit[0] and undetermined[0]
+
+    def test_adjacent_curves_may_share_their_end_point(self):
+        a = np.array([[[0, 0], [1, 1], [2, 1], [3, 0]]], dtype=float)
+        b = np.array([[[3, 0], [4, -1], [5, -1], [6, 0]]], dtype=float)
+        assert not curve_intersections(a, b, [True])[0][0]
+        assert curve_intersections(a, b, [False])[0][0]
+
+    def test_joint_angles(self):
+        angles = joint_angles(Outline.from_edges(PIECE).ctrl)
+        np.testing.assert_allclose(angles, [63.43, 0.0, 90.0, 90.0, 90.0], atol=0.01)
+
+
+class TestValidateOutline:
+    def test_clean_piece(self):
+        assert validate_outline(Outline.from_edges(PIECE)) == []
+
+    def test_kink_at_smooth_joint(self):
+        edges = dict(PIECE, side_C_D=[[10, 5], [10, 7], [8, 8], [8, 10]])
+        issues = validate_outline(Outline.from_edges(edges))
+        assert _checks(issues) == ["tangent_discontinuity"]
+        assert issues[0].edges == ("side_B_C", "side_C_D")
+        assert issues[0].point == (10.0, 5.0)
+        assert issues[0].value == pytest.approx(45.0, abs=1e-3)
+
+    def test_crossing_edges(self):
+        # The side bulges past the center line
+        edges = dict(PIECE, side_B_C=[[10, 0], [-12, 2], [-12, 4], [10, 5]])
+        issues = validate_outline(Outline.from_edges(edges))
+        crossings = [i for i in issues if i.check == "outline_intersection"]
+        assert {i.edges for i in crossings} == {("side_B_C", "center_E_A")}
+        assert "control_crossing" not in _checks(issues)
+
+    def test_batch_matches_single(self):
+        outline = Outline.from_edges(PIECE)
+        kinked = Outline.from_edges(dict(PIECE, side_C_D=[[10, 5], [10, 7], [8, 8], [8, 10]]))
+        batch = validate_outlines(outline.names, np.stack([outline.ctrl, kinked.ctrl]), outline.smooth_joints())
+        assert batch == [validate_outline(outline), validate_outline(kinked)]
+
+
+class TestPatternValidation:
+    @pytest.fixture(params=["corset", "sleeve"])
+    def pattern(self, request):
+        fm = default_measurements(38)
+        if request.param == "corset":
+            return CorsetPattern(CorsetMeasurements.from_full_measurements(fm))
+        return SleevePattern(SleeveMeasurements.from_full_measurements(fm))
+
+    def test_smooth_joints_are_smooth(self, pattern):
+        for outline in pattern.outlines().values():
+            assert outline.smooth_joints().any()
+        assert "tangent_discontinuity" not in _checks(pattern.validate())
+
+    def test_s_shaped_seam_is_not_a_crossing(self):
+        pattern = SleevePattern(SleeveMeasurements.from_full_measurements(default_measurements(38)))
+        cap = pattern.bezier_segments()["cap_H2_H3"]
+        assert inflected(cap) and control_crossings(cap)[0]
+        assert "control_crossing" not in _checks(pattern.validate())
+
+    def test_computed_once_per_geometry(self, pattern, monkeypatch):
+        from app.core import stretch_pattern
+
+        calls = []
+        validate_outline_ = stretch_pattern.validate_outline
+        monkeypatch.setattr(stretch_pattern, "validate_outline",
+                            lambda outline: calls.append(outline) or validate_outline_(outline))
+        issues = pattern.validate()
+        pieces = len(calls)
+        assert pattern.validate() is issues
+        assert pattern.with_seam_allowance(2.0).validate() is issues
+        assert len(calls) == pieces
+        pattern.with_stretch(0.2).validate()
+        assert len(calls) == 2 * pieces
+
+    def test_reported_by_render(self, pattern):
+        with warnings.catch_warnings(record=True) as record:
+            warnings.simplefilter("always")
+            pattern.render_svg()
+        messages = [str(w.message) for w in record]
+        assert all(issue.message in messages for issue in pattern.validate())
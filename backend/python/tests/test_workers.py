@@ -0,0 +1,100 @@
+"""Tests for the bounded generation pool."""
+
+import asyncio
+import time
+from dataclasses import asdict
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.measurements import default_measurements
+from app.main import app
+from app.modelist import router as modelist_router
+from app.modelist.generation import generate
+from app.modelist.workers import GenerationPool, GenerationTimeout, PoolSaturated
+from app.schemas.patterns import PatternRequest
+
+client = TestClient(app)
+
+REQUEST = PatternRequest(
+    pattern_type="sleeve",
+    measurements=asdict(default_measurements(36)),
+    output_format="svg",
+)
+
+
+class TestGenerationPool:
+    def test_thread_pool_matches_generate(self):
+        pool = GenerationPool(workers=0, threads=2)
+        try:
+            result = asyncio.run(pool.run(REQUEST))
+        finally:
+            pool.shutdown()
+        assert result == generate(REQUEST)
+        stats = pool.stats()
+        assert stats.completed == 1 and stats.pending == 0
+        assert stats.exec_ms_mean > 0
+
+    def test_process_pool_matches_generate(self):
+        pool = GenerationPool(workers=1)
+        try:
+            result = asyncio.run(pool.run(REQUEST))
+        finally:
+            pool.shutdown()
+        assert pool.stats().processes
+        assert result.body == generate(REQUEST).body
+
+    def test_saturation(self):
+        pool = GenerationPool(workers=0, threads=1, queue_limit=1)
+
+        async def burst():
+            jobs = [asyncio.ensure_future(pool.submit(time.sleep, 0.2)) for _ in range(3)]
+            return await asyncio.gather(*jobs, return_exceptions=True)
+
+        try:
+            results = asyncio.run(burst())
+        finally:
+            pool.shutdown()
+        rejected = [r for r in results if isinstance(r, PoolSaturated)]
+        assert len(rejected) == 1
+        assert rejected[0].retry_after >= 1
+        assert pool.stats().rejected == 1
+        assert pool.stats().completed == 2
+
+    def test_timeout(self):
+        pool = GenerationPool(workers=0, threads=1, timeout=0.05)
+        try:
+            with pytest.raises(GenerationTimeout):
+                asyncio.run(pool.submit(time.sleep, 0.3))
+        finally:
+            pool.shutdown()
+        assert pool.stats().timeouts == 1
+
+    def test_errors_propagate(self):
+        pool = GenerationPool(workers=0, threads=1)
+        bad = PatternRequest(pattern_type="corset", measurements={"full_bust": 88.0})
+        try:
+            with pytest.raises(TypeError):
+                asyncio.run(pool.run(bad))
+        finally:
+            pool.shutdown()
+        assert pool.stats().failed == 1
+
+
+class TestPoolEndpoints:
+    def test_saturated_returns_503(self, monkeypatch):
+        async def saturated(req):
+            raise PoolSaturated(retry_after=3)
+
+        monkeypatch.setattr(modelist_router.pool, "run", saturated)
+        body = REQUEST.model_dump(mode="json") | {"control_parameters": {"g3_perpendicular": 1.25}}
+        response = client.post("/api/modelist/generate", json=body)
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "3"
+
+    def test_pool_stats(self):
+        response = client.get("/api/modelist/pool")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["workers"] >= 1
+        assert "queue_depth" in data and "wait_ms_mean" in data
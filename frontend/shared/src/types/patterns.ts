@@ -55,13 +55,131 @@ export interface PatternRequest {
   measurements: Record<string, number>;
   control_parameters?: Record<string, number>;
   stretch?: StretchInput;
-  output_format: "all" | "svg" | "pdf";
+  output_format: "all" | "svg" | "pdf" | "geometry";
+  /** "compact" uses <style> and <use>: fine inlined in a browser, not for react-native-svg's SvgXml. */
+  svg_encoding?: "plain" | "compact";
+  /** Geometry only: answer with a GeometryDelta from base_version if the session has it. */
+  session_id?: string;
+  base_version?: string;
+}
+
+export interface GeometryIssue {
+  check: string;
+  edges: string[];
+  message: string;
+  point?: [number, number] | null;
+  value?: number | null;
 }
 
 export interface PatternResponse {
   construction_svg: string;
   pattern_svg: string;
   warnings: string[];
+  issues: GeometryIssue[];
+}
+
+/** Flat coordinate lists: [x0, y0, x1, y1, ...] in cm. */
+export interface PointSet {
+  names: string[];
+  coords: number[];
+  layer: string;
+}
+
+export interface CurveSet {
+  names: string[];
+  /** 8 control point coordinates per cubic edge. */
+  ctrl: number[];
+  smooth: boolean[];
+  layer: string;
+}
+
+export interface PieceGeometry {
+  name: string;
+  /** SVG matrix (a, b, c, d, e, f). */
+  transform: number[];
+  edges: CurveSet;
+  cut_line: { coords: number[]; layer: string } | null;
+}
+
+/** Response of output_format "geometry". */
+export interface GeometryResponse {
+  format: "couture-geometry";
+  version: number;
+  pattern_type: string;
+  geometry_version: string;
+  units: "cm";
+  y_up: boolean;
+  h_factor: number;
+  v_factor: number;
+  bounds: [number, number, number, number];
+  /** Layers of this geometry (points, outline, cut) each variant shows. */
+  variants: Record<string, string[]>;
+  points: PointSet;
+  helper_points: PointSet;
+  pieces: PieceGeometry[];
+  issues: GeometryIssue[];
+  warnings: string[];
+}
+
+/** Replace points start .. start + deleted - 1 of a polyline by coords. */
+export interface PolylineSplice {
+  start: number;
+  deleted: number;
+  coords: number[];
+}
+
+/** Changes to one piece; null fields are unchanged. */
+export interface PieceDelta {
+  name: string;
+  transform: number[] | null;
+  /** Edges added or changed. */
+  edges: CurveSet;
+  edge_order: string[] | null;
+  /** Empty coords when the piece no longer has a cut line. */
+  cut_line: { coords: number[]; layer: string } | null;
+  cut_splice: PolylineSplice | null;
+}
+
+/** Response of output_format "geometry" when the session has base_version. */
+export interface GeometryDelta {
+  format: "couture-geometry-delta";
+  version: number;
+  pattern_type: string;
+  base_version: string;
+  geometry_version: string;
+  h_factor: number;
+  v_factor: number;
+  bounds: [number, number, number, number];
+  points: PointSet;
+  removed_points: string[];
+  helper_points: PointSet;
+  removed_helper_points: string[];
+  pieces: PieceDelta[];
+  removed_pieces: string[];
+  issues: GeometryIssue[];
+  warnings: string[];
+}
+
+/** Message sent on the /api/modelist/live WebSocket; dict fields are merged into the current request. */
+export interface LiveUpdate extends Partial<Omit<PatternRequest, "session_id" | "base_version">> {
+  seq?: number;
+  seam_allowance?: number;
+  edge_allowances?: Record<string, number>;
+}
+
+/** Result pushed on the live WebSocket, for the newest update only. */
+export interface LiveResult {
+  seq: number | null;
+  status_code: number;
+  media_type: string | null;
+  etag: string | null;
+  encoding: "utf-8" | "base64";
+  /** GeometryResponse, GeometryDelta, PatternResponse JSON or SVG text. */
+  content: string | null;
+  warnings: string[];
+  error: string | null;
+  latency_ms: number;
+  dropped: number;
 }
 
 export interface PieceInfo {